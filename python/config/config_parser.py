@@ -84,7 +84,7 @@ class ConfigParser:
                             verification = self._parse_verification(fields, line_num)
                         elif action_type == 'Config':
                             eclipse_timings = self._parse_config(fields, line_num)
-                        elif action_type in ['Photo', 'Boucle', 'Interval']:
+                        elif action_type in ['Photo', 'Boucle', 'Interval', 'Burst', 'Bracket']:
                             actions.append(self._parse_action(fields, line_num))
                         else:
                             self.logger.warning(f"Line {line_num}: Unknown action type '{action_type}'")
@@ -223,7 +223,7 @@ class ConfigParser:
     
     def _parse_action(self, fields: List[str], line_num: int) -> ActionConfig:
         """
-        Parse action line (Photo, Boucle, or Interval).
+        Parse action line (Photo, Boucle, Interval, Burst or Bracket).
         
         Supports two formats:
         
@@ -235,16 +235,25 @@ class ConfigParser:
             Photo,time_ref,start_op,start_time,_,_,_,_,_,aperture,iso,shutter,mlu
             Boucle,time_ref,start_op,start_time,end_op,end_time,interval,_,_,aperture,iso,shutter,mlu
             Interval,time_ref,start_op,start_time,end_op,end_time,count,_,_,aperture,iso,shutter,mlu
+        
+        Burst lines use either format. The release is held in continuous drive
+        from start to end, or until the frame count is reached; one of the
+        two may be '-':
+            Burst,time_ref,start_op,start_time,end_op,end_time,frames,aperture,iso,shutter,mlu
+        
+        Bracket lines only use the extended format. The shutter field is the
+        base exposure at the centre of count frames spaced by step EV:
+            Bracket,time_ref,start_op,start_time,_,_,count,step,_,aperture,iso,shutter,mlu
         """
         action_type = fields[0]
         
         # Determine camera settings offset based on action type and field count
-        if action_type == 'Photo':
+        if action_type in ['Photo', 'Bracket']:
             if len(fields) < 13:
                 raise ConfigParserError(
-                    f"Photo line requires at least 13 fields, got {len(fields)}", line_num)
+                    f"{action_type} line requires at least 13 fields, got {len(fields)}", line_num)
             camera_offset = 9
-        elif action_type in ['Boucle', 'Interval']:
+        elif action_type in ['Boucle', 'Interval', 'Burst']:
             if len(fields) >= 13:
                 # Extended format with placeholder dashes at positions 7 and 8
                 camera_offset = 9
@@ -285,16 +294,42 @@ class ConfigParser:
                     aperture=aperture,
                     iso=iso,
                     shutter_speed=shutter_speed,
-                    mlu_delay=mlu_delay
+                    mlu_delay=mlu_delay,
+                    line_number=line_num
+                )
+            
+            elif action_type == 'Bracket':
+                if fields[6] == '-' or fields[7] == '-' or not shutter_speed:
+                    raise ConfigParserError("Bracket requires a count, an EV step and a base shutter speed",
+                                            line_num)
+                
+                return ActionConfig(
+                    action_type=action_type,
+                    time_ref=time_ref,
+                    start_operator=start_operator,
+                    start_time=start_time,
+                    interval_or_count=float(fields[6]),
+                    bracket_step=float(fields[7]),
+                    aperture=aperture,
+                    iso=iso,
+                    shutter_speed=shutter_speed,
+                    mlu_delay=mlu_delay,
+                    line_number=line_num
                 )
             
-            elif action_type in ['Boucle', 'Interval']:
+            elif action_type in ['Boucle', 'Interval', 'Burst']:
                 end_operator = fields[4]
-                end_time = self._parse_time_string(fields[5], line_num)
+                if action_type == 'Burst' and fields[5] == '-':
+                    # Burst limited by its frame count only
+                    end_time = None
+                else:
+                    end_time = self._parse_time_string(fields[5], line_num)
                 interval_or_count = float(fields[6]) if fields[6] and fields[6] != '-' else None
                 
                 if end_operator not in ['+', '-', '']:
                     raise ConfigParserError(f"Invalid end operator '{end_operator}'", line_num)
+                if action_type == 'Burst' and end_time is None and not interval_or_count:
+                    raise ConfigParserError("Burst requires an end time or a frame count", line_num)
                 
                 return ActionConfig(
                     action_type=action_type,
@@ -307,7 +342,8 @@ class ConfigParser:
                     aperture=aperture,
                     iso=iso,
                     shutter_speed=shutter_speed,
-                    mlu_delay=mlu_delay
+                    mlu_delay=mlu_delay,
+                    line_number=line_num
                 )
             
             else:
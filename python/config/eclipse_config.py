@@ -24,24 +24,32 @@ class EclipseTimings:
 @dataclass
 class ActionConfig:
     """Configuration for a single photographic action."""
-    action_type: str  # 'Photo', 'Boucle', 'Interval'
+    action_type: str  # 'Photo', 'Boucle', 'Interval', 'Burst', 'Bracket'
     time_ref: str     # 'C1', 'C2', 'Max', 'C3', 'C4', '-' (absolute)
     start_operator: str  # '+', '-'
     start_time: time
-    end_operator: Optional[str] = None    # '+', '-' (for Boucle/Interval)
-    end_time: Optional[time] = None       # (for Boucle/Interval)
-    interval_or_count: Optional[float] = None  # seconds or count
+    end_operator: Optional[str] = None    # '+', '-' (for Boucle/Interval/Burst)
+    end_time: Optional[time] = None       # (for Boucle/Interval, optional for Burst)
+    interval_or_count: Optional[float] = None  # seconds, count, burst or bracket frames
     aperture: Optional[float] = None      # f-number (e.g., 8.0 for f/8)
     iso: Optional[int] = None
     shutter_speed: Optional[float] = None # seconds (e.g., 0.008 for 1/125)
     mlu_delay: int = 0                    # Mirror lockup delay in milliseconds
     camera_ids: Optional[List[int]] = None # Specific camera IDs (future use)
+    line_number: Optional[int] = None     # Source line in the configuration file
+    bracket_step: Optional[float] = None  # EV between Bracket frames
 
     def __post_init__(self):
         """Validate action configuration after initialization."""
         if self.action_type in ['Boucle', 'Interval']:
             if self.end_time is None or self.interval_or_count is None:
                 raise ValueError(f"{self.action_type} requires end_time and interval_or_count")
+        elif self.action_type == 'Burst':
+            if self.end_time is None and not self.interval_or_count:
+                raise ValueError("Burst requires end_time or a frame count")
+        elif self.action_type == 'Bracket':
+            if self.interval_or_count is None or self.bracket_step is None:
+                raise ValueError("Bracket requires a frame count and an EV step")
 
 
 @dataclass
@@ -2,5 +2,14 @@
 
 from .camera_controller import CameraController
 from .multi_camera_manager import MultiCameraManager
+from .camera_worker import CameraWorker
+from .download_pipeline import DownloadPipeline
+from .capabilities import CameraCapabilities, CapabilityCache
+from .setting_values import SettingsResolver
+from .health_monitor import HealthMonitor
+from .hotplug import HotplugMonitor
+from .circuit_breaker import CircuitBreaker
 
-__all__ = ['CameraController', 'MultiCameraManager']
\ No newline at end of file
+__all__ = ['CameraController', 'MultiCameraManager', 'CameraWorker', 'DownloadPipeline',
+           'CameraCapabilities', 'CapabilityCache', 'SettingsResolver', 'HealthMonitor', 'HotplugMonitor',
+           'CircuitBreaker']
\ No newline at end of file
@@ -7,7 +7,8 @@ Provides camera connection, configuration, and capture functionality.
 
 import logging
 import time
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 
 # Import gphoto2 with fallback for development/testing
@@ -24,6 +25,10 @@ except ImportError:
             pass
         
         GP_CAPTURE_IMAGE = 0
+        GP_EVENT_UNKNOWN = 0
+        GP_EVENT_TIMEOUT = 1
+        GP_EVENT_FILE_ADDED = 2
+        GP_FILE_TYPE_NORMAL = 1
         
         @staticmethod
         def gp_camera_new():
@@ -65,6 +70,33 @@ except ImportError:
                     self.name = f"test_image_{int(time.time())}.jpg"
             return MockFilePath()
         
+        @staticmethod
+        def gp_camera_trigger_capture(camera):
+            pass
+        
+        @staticmethod
+        def gp_camera_wait_for_event(camera, timeout):
+            return MockGPhoto2.GP_EVENT_TIMEOUT, None
+        
+        @staticmethod
+        def gp_camera_file_get(camera, folder, name, file_type):
+            return "mock_file"
+        
+        @staticmethod
+        def gp_file_get_data_and_size(camera_file):
+            return b""
+        
+        @staticmethod
+        def gp_camera_file_get_info(camera, folder, name):
+            class MockFileInfo:
+                class file:
+                    size = 0
+            return MockFileInfo()
+        
+        @staticmethod
+        def gp_camera_file_delete(camera, folder, name):
+            pass
+        
         @staticmethod
         def gp_camera_autodetect():
             return [("Mock Canon Camera", "usb:001,002")]
@@ -72,6 +104,33 @@ except ImportError:
     gp = MockGPhoto2()
 
 from config.eclipse_config import CameraSettings, CameraStatus
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.constants import (
+    CONFIG_CACHE_TTL, CAPTURE_TARGET_RAM, CAPTURE_TARGET_CARD, TRIGGER_BUSY_RETRIES, TRIGGER_BUSY_WAIT_MS,
+    BURST_DRIVE_MODE, BURST_FLUSH_TIMEOUT, BURST_SIMULATED_FPS, BULB_SHUTTER, BULB_MIN_EXPOSURE,
+    BULB_FILE_TIMEOUT, GPHOTO2_SHUTTER_VALUES
+)
+from .capabilities import CAPABILITY_WIDGETS, IDENTITY_WIDGETS, CameraCapabilities, CapabilityCache
+from .download_pipeline import camera_directory, unique_path, write_buffer
+
+if TYPE_CHECKING:
+    from scheduling.deadline_waiter import DeadlineWaiter
+
+
+# Widgets indexed as soon as the camera is connected
+INDEXED_WIDGETS = ('iso', 'f-number', 'shutterspeed', 'batterylevel', 'capturetarget', 'autofocus')
+
+# Upper bound on events consumed by a single drain
+MAX_EVENTS_PER_DRAIN = 100
+
+# Prefix of the placeholder returned by capture_image in trigger mode
+TRIGGERED_PREFIX = "triggered:"
+
+# Longest single event wait while collecting the files of triggered frames
+FILE_WAIT_SLICE_MS = 100
+
+# Event silence after which the buffer of a released burst is considered written
+BURST_FLUSH_WAIT_MS = 1000
 
 
 class CameraController:
@@ -85,23 +144,62 @@ class CameraController:
     - camera.shoot() -> GPhoto2 capture
     """
     
-    def __init__(self, camera_id: int = 0, name: str = None):
+    def __init__(self, camera_id: int = 0, name: str = None, clock: Optional[Clock] = None,
+                 config_ttl: float = CONFIG_CACHE_TTL, capability_cache: Optional[CapabilityCache] = None,
+                 waiter: Optional['DeadlineWaiter'] = None):
         """
         Initialize camera controller.
         
         Args:
             camera_id: Unique identifier for this camera
             name: Human-readable name for the camera
+            clock: Clock for timestamps and delays (default: system clock)
+            config_ttl: Seconds a downloaded configuration tree is reused
+            capability_cache: On-disk store of probed capabilities (default: probe on every connection)
+            waiter: Deadline waiter timing bulb exposures (default: uncalibrated waiter on the clock)
         """
         self.camera_id = camera_id
+        self.clock = clock or SYSTEM_CLOCK
+        if waiter is None:
+            from scheduling.deadline_waiter import DeadlineWaiter
+            waiter = DeadlineWaiter(clock=self.clock)
+        self.waiter = waiter
         self.name = name or f"Camera_{camera_id}"
         self.camera = None
         self.connected = False
+        self.address: Optional[str] = None  # GPhoto2 port (e.g. "usb:001,005")
+        self.config_ttl_ns = int(config_ttl * 1_000_000_000)
         self.logger = logging.getLogger(f'camera_{camera_id}')
         
-        # Cache for camera capabilities
-        self._capabilities_cache = {}
+        # Widgets and accepted values, probed or loaded at connection (None: unknown)
+        self.capabilities: Optional[CameraCapabilities] = None
+        self.capability_cache = capability_cache
+        
+        # Cached configuration tree and its widget index (name -> widget)
         self._config_cache = {}
+        self._config_tree = None
+        self._config_fetched_ns = 0
+        
+        # Last value written to each widget, to send only what changed
+        self._applied_values: Dict[str, str] = {}
+        
+        # Settings last applied, written again after a reconnection
+        self.settings: Optional[CameraSettings] = None
+        
+        # Host directory receiving captures streamed from the camera RAM (None: card)
+        self.ram_capture_dir: Optional[Path] = None
+        
+        # Trigger mode: fire without waiting for the file, collect it from FILE_ADDED events
+        self.trigger_mode = False
+        self.pending_frames = 0
+        self.frames_triggered = 0
+        self.file_added: Optional[Callable[[int, str], None]] = None  # (camera ID, image path)
+        
+        # Monotonic instant the mirror was locked up for the next capture (None: mirror down)
+        self.mirror_up_ns: Optional[int] = None
+        
+        # Measured monotonic (open, close) of the last bulb exposure
+        self.last_bulb: Optional[Tuple[int, int]] = None
     
     def connect(self, address: str = None) -> bool:
         """
@@ -113,6 +211,9 @@ class CameraController:
         Returns:
             True if connection successful, False otherwise
         """
+        self._applied_values.clear()
+        self.address = address
+        
         try:
             if not GPHOTO2_AVAILABLE:
                 self.logger.info(f"Mock connection to {self.name}")
@@ -121,15 +222,18 @@ class CameraController:
                 
             self.camera = gp.gp_camera_new()
             
-            # If specific address provided, configure port
+            # Bind the handle to this camera's port, not the first camera found
             if address:
-                # TODO: Implement specific port configuration
-                pass
+                port_info_list = gp.gp_port_info_list_new()
+                gp.gp_port_info_list_load(port_info_list)
+                port_index = gp.gp_port_info_list_lookup_path(port_info_list, address)
+                gp.gp_camera_set_port_info(self.camera, gp.gp_port_info_list_get_info(port_info_list, port_index))
                 
             gp.gp_camera_init(self.camera)
             self.connected = True
             
             # Cache camera model and capabilities
+            self._index_config()
             self._detect_capabilities()
             
             self.logger.info(f"{self.name} connected successfully")
@@ -155,6 +259,56 @@ class CameraController:
         
         self.connected = False
         self.camera = None
+        self.pending_frames = 0
+        self._applied_values.clear()
+        self.invalidate_config()
+    
+    def reconnect(self, address: Optional[str] = None) -> bool:
+        """
+        Open the camera again after it dropped off the bus, and restore its state.
+        
+        The stale handle is released, the camera is connected at its new
+        port, and the last applied settings and capture target are written
+        again, so it can rejoin the next shot as it left.
+        
+        Args:
+            address: New USB address (default: the previous one)
+        
+        Returns:
+            True if connected and restored, False otherwise (left disconnected)
+        """
+        self.disconnect()
+        if not self.connect(address or self.address):
+            return False
+        
+        restored = True
+        if self.settings is not None:
+            restored &= self.configure_settings(self.settings)
+        if self.ram_capture_dir is not None:
+            restored &= self.set_capture_target(CAPTURE_TARGET_RAM)
+        
+        if not restored:
+            self.logger.error(f"{self.name} reconnected but its settings could not be restored")
+            self.disconnect()
+            return False
+        
+        self.logger.info(f"{self.name} reconnected at {self.address}")
+        return True
+    
+    def probe(self) -> bool:
+        """
+        Check that the camera answers on the bus.
+        
+        get_status tolerates read errors and may answer from the cached
+        configuration tree; a probe downloads a fresh tree and fails if the
+        camera does not send it.
+        
+        Returns:
+            True if the camera answered, False otherwise
+        """
+        if not self.connected:
+            return False
+        return self._get_config(refresh=True) is not None
     
     def get_status(self) -> CameraStatus:
         """
@@ -173,6 +327,7 @@ class CameraController:
             return CameraStatus(connected=False, last_error="Not connected")
         
         try:
+            self.drain_events()
             config = self._get_config()
             
             # Battery level (if supported)
@@ -208,9 +363,12 @@ class CameraController:
         - camera.aperture.value = aperture  
         - camera.shutter.value = shutter_speed
         
+        Only widgets whose value differs from the last one applied are
+        written; if nothing changed, the camera is not accessed at all.
+        
         Args:
             settings: Camera settings to apply
-            
+        
         Returns:
             True if configuration successful, False otherwise
         """
@@ -218,53 +376,112 @@ class CameraController:
             self.logger.error(f"Cannot configure {self.name}: not connected")
             return False
         
+        unsupported = self.unsupported_settings(settings)
+        if unsupported:
+            self.logger.error(f"{self.name} does not support {', '.join(unsupported)}")
+            return False
+        
+        changes = {
+            widget_name: value
+            for widget_name, value in self._settings_widgets(settings).items()
+            if self._applied_values.get(widget_name) != value
+        }
+        if not changes:
+            self.logger.debug(f"{self.name} already configured: ISO {settings.iso}, "
+                              f"{settings.aperture}, {settings.shutter}")
+            self.settings = settings
+            return True
+        
         try:
             config = self._get_config()
             success = True
             
-            # Configure ISO
-            if settings.iso:
-                success &= self._set_config_value(config, 'iso', str(settings.iso))
-            
-            # Configure aperture
-            if settings.aperture:
-                success &= self._set_config_value(config, 'f-number', settings.aperture)
-            
-            # Configure shutter speed
-            if settings.shutter:
-                success &= self._set_config_value(config, 'shutterspeed', settings.shutter)
+            for widget_name, value in changes.items():
+                success &= self._set_config_value(config, widget_name, value)
             
             # Apply configuration
             if GPHOTO2_AVAILABLE and success:
                 gp.gp_camera_set_config(self.camera, config)
             
             if success:
+                self._applied_values.update(changes)
+                self.settings = settings
                 self.logger.info(f"{self.name} configured: ISO {settings.iso}, "
-                               f"f/{settings.aperture}, {settings.shutter}")
+                               f"f/{settings.aperture}, {settings.shutter} "
+                               f"({', '.join(changes)} changed)")
             else:
+                self._forget_values(changes)
+                self.invalidate_config()
                 self.logger.warning(f"{self.name}: Some settings may not have been applied")
             
             return success
-            
+        
         except Exception as e:
+            self._forget_values(changes)
+            self.invalidate_config()
             self.logger.error(f"Error configuring {self.name}: {e}")
             return False
     
+    def verify_settings(self, settings: CameraSettings) -> bool:
+        """
+        Check that the camera reports the given settings.
+        
+        Args:
+            settings: Camera settings expected to be applied
+        
+        Returns:
+            True if every configured setting matches, False otherwise
+        """
+        if not self.connected:
+            return False
+        
+        if not GPHOTO2_AVAILABLE:
+            return True
+        
+        try:
+            # Read back from the camera, not from the tree the values were written to
+            config = self._get_config(refresh=True)
+            
+            mismatches = []
+            for widget_name, value in self._settings_widgets(settings).items():
+                actual = self._get_config_value(config, widget_name)
+                if actual != value:
+                    # Changed on the body or not applied: write it again next time
+                    self._applied_values.pop(widget_name, None)
+                    mismatches.append(f"{widget_name}={actual} (expected {value})")
+            
+            if mismatches:
+                self.logger.warning(f"{self.name} settings not applied: {', '.join(mismatches)}")
+                return False
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error verifying settings for {self.name}: {e}")
+            return False
+    
     def capture_image(self, test_mode: bool = False) -> Optional[str]:
         """
         Capture a photo.
         
         Equivalent to Magic Lantern camera.shoot(false).
         
+        In trigger mode the shutter is released without waiting for the
+        camera to write the file; the file is reported later by a FILE_ADDED
+        event (see wait_for_files), so consecutive shots overlap.
+        
         Args:
             test_mode: If True, simulate capture without actually taking photo
             
         Returns:
-            Path to captured image file, or None if failed
+            Path to captured image file, a TRIGGERED_PREFIX placeholder in
+            trigger mode, or None if failed
         """
+        # The release ends any mirror lockup
+        self.mirror_up_ns = None
+        
         if test_mode:
             self.logger.info(f"TEST MODE: {self.name} photo simulated")
-            return f"test_image_{self.camera_id}_{int(time.time())}.jpg"
+            return f"test_image_{self.camera_id}_{int(self.clock.time())}.jpg"
         
         if not self.connected:
             self.logger.error(f"Cannot capture with {self.name}: not connected")
@@ -274,10 +491,15 @@ class CameraController:
             if not GPHOTO2_AVAILABLE:
                 # Mock capture for development
                 self.logger.info(f"Mock capture with {self.name}")
-                return f"mock_image_{self.camera_id}_{int(time.time())}.jpg"
+                return f"mock_image_{self.camera_id}_{int(self.clock.time())}.jpg"
+            
+            if self.trigger_mode:
+                return self._trigger()
             
             # Perform capture
             file_path = gp.gp_camera_capture(self.camera, gp.GP_CAPTURE_IMAGE)
+            if self.ram_capture_dir is not None:
+                return self._save_ram_capture(file_path.folder, file_path.name)
             image_path = f"{file_path.folder}/{file_path.name}"
             
             self.logger.info(f"{self.name} captured: {image_path}")
@@ -287,45 +509,599 @@ class CameraController:
             self.logger.error(f"Error capturing with {self.name}: {e}")
             return None
     
-    def mirror_lockup(self, enabled: bool, delay_ms: int = 0) -> bool:
+    def download_file(self, camera_path: str, target_path: str, delete: bool = False) -> Optional[int]:
         """
-        Configure mirror lockup if supported.
+        Copy a captured image from the camera to the host.
         
         Args:
-            enabled: Enable or disable mirror lockup
-            delay_ms: Delay in milliseconds after mirror lockup
+            camera_path: Path of the image on the camera, as returned by capture_image
+            target_path: Host file to write
+            delete: If True, delete the image from the camera once the host
+                copy is verified to have the size reported by the camera
+        
+        Returns:
+            Number of bytes written, or None if failed
+        """
+        if not self.connected:
+            self.logger.error(f"Cannot download from {self.name}: not connected")
+            return None
+        
+        folder, _, name = camera_path.rpartition('/')
+        folder = folder or '/'
+        
+        try:
+            camera_file = gp.gp_camera_file_get(self.camera, folder, name, gp.GP_FILE_TYPE_NORMAL)
+            size = write_buffer(target_path, gp.gp_file_get_data_and_size(camera_file))
             
+            if delete:
+                info = gp.gp_camera_file_get_info(self.camera, folder, name)
+                if info.file.size == size:
+                    gp.gp_camera_file_delete(self.camera, folder, name)
+                else:
+                    self.logger.warning(f"{self.name}: {camera_path} kept on camera, host copy has "
+                                        f"{size} bytes instead of {info.file.size}")
+            
+            self.logger.debug(f"{self.name} downloaded {camera_path} to {target_path} ({size} bytes)")
+            return size
+        
+        except Exception as e:
+            self.logger.error(f"Error downloading {camera_path} from {self.name}: {e}")
+            return None
+    
+    def _trigger(self) -> str:
+        """
+        Release the shutter without waiting for the image file.
+        
+        The camera may still be writing the previous frame and report busy;
+        its events are drained while retrying. Frames finished meanwhile
+        are collected after the trigger, never before it.
+        
+        Returns:
+            Placeholder naming the triggered frame
+        """
+        for attempt in range(TRIGGER_BUSY_RETRIES + 1):
+            try:
+                gp.gp_camera_trigger_capture(self.camera)
+                break
+            except Exception as e:
+                if attempt == TRIGGER_BUSY_RETRIES:
+                    raise
+                self.logger.debug(f"{self.name} busy, retrying trigger: {e}")
+                self.drain_events(TRIGGER_BUSY_WAIT_MS)
+        
+        self.pending_frames += 1
+        self.frames_triggered += 1
+        self.drain_events()
+        return f"{TRIGGERED_PREFIX}{self.frames_triggered}"
+    
+    def wait_for_files(self, timeout_ms: int) -> int:
+        """
+        Collect the files of triggered frames from camera events.
+        
+        Args:
+            timeout_ms: Total time to wait for pending frames in milliseconds
+        
+        Returns:
+            Number of triggered frames whose file has not been reported yet
+        """
+        deadline_ns = self.clock.monotonic_ns() + timeout_ms * 1_000_000
+        while self.pending_frames and self.connected:
+            remaining_ms = (deadline_ns - self.clock.monotonic_ns()) // 1_000_000
+            if remaining_ms <= 0:
+                break
+            self.drain_events(min(remaining_ms, FILE_WAIT_SLICE_MS))
+        return self.pending_frames
+    
+    def capture_burst(self, duration_ns: int, max_frames: int = 0, test_mode: bool = False) -> List[str]:
+        """
+        Hold the release in continuous drive and collect the frames.
+        
+        The camera is switched to BURST_DRIVE_MODE and the release is held
+        (Canon eosremoterelease) until the duration elapses or max_frames
+        files have been reported. Cameras without a remote release widget
+        are triggered again as soon as the previous file is reported. Frames
+        still in the camera buffer when the release is let go are collected
+        afterwards, then the previous drive mode is restored.
+        
+        Args:
+            duration_ns: Longest time the release is held, in nanoseconds
+            max_frames: Frames after which the release is let go (0: no limit)
+            test_mode: If True, simulate the burst at BURST_SIMULATED_FPS
+        
         Returns:
-            True if successfully configured, False otherwise
+            Paths of the captured frames (host paths for RAM captures), empty if failed
         """
+        if test_mode or (self.connected and not GPHOTO2_AVAILABLE):
+            return self._simulate_burst(duration_ns, max_frames, test_mode)
+        
         if not self.connected:
+            self.logger.error(f"Cannot burst with {self.name}: not connected")
+            return []
+        
+        frames: List[str] = []
+        previous_drive = None
+        held = False
+        try:
+            previous_drive = self._get_config_value(self._get_config(), 'drivemode')
+            if not self._apply_widget('drivemode', BURST_DRIVE_MODE):
+                self.logger.warning(f"{self.name}: drive mode '{BURST_DRIVE_MODE}' not available")
+            
+            held = self._apply_widget('eosremoterelease', 'Press Full')
+            if not held:
+                self.logger.info(f"{self.name}: no remote release, triggering the burst frame by frame")
+            
+            deadline_ns = self.clock.monotonic_ns() + duration_ns
+            waiting = False
+            while not max_frames or len(frames) < max_frames:
+                # Rounded up, so the release is held for the whole duration
+                remaining_ms = -((self.clock.monotonic_ns() - deadline_ns) // 1_000_000)
+                if remaining_ms <= 0:
+                    break
+                if not held and not waiting:
+                    try:
+                        gp.gp_camera_trigger_capture(self.camera)
+                        waiting = True
+                    except Exception as e:
+                        self.logger.debug(f"{self.name} busy, retrying trigger: {e}")
+                if self._wait_frame(frames, min(remaining_ms, FILE_WAIT_SLICE_MS)):
+                    waiting = False
+        
+        except Exception as e:
+            self.logger.error(f"Error during burst with {self.name}: {e}")
+        
+        finally:
+            try:
+                if held:
+                    self._apply_widget('eosremoterelease', 'Release Full')
+                
+                flush_deadline_ns = self.clock.monotonic_ns() + BURST_FLUSH_TIMEOUT * 1_000_000_000
+                while self.clock.monotonic_ns() < flush_deadline_ns:
+                    if self._wait_frame(frames, BURST_FLUSH_WAIT_MS) is None:
+                        break
+                
+                if previous_drive:
+                    self._apply_widget('drivemode', previous_drive)
+            except Exception as e:
+                self.invalidate_config()
+                self.logger.error(f"Error ending burst with {self.name}: {e}")
+        
+        self.logger.info(f"{self.name} burst: {len(frames)} frames")
+        return frames
+    
+    def capture_bulb(self, duration_ns: int, test_mode: bool = False) -> Optional[str]:
+        """
+        Take a bulb exposure timed by the host.
+        
+        The shutter is opened with the remote release held (Canon
+        eosremoterelease) or the bulb widget of other drivers, kept open
+        until the host's monotonic clock reaches the end of the exposure,
+        then closed. The instants the camera acted on the open and close
+        commands (the middle of each USB call) are kept in last_bulb.
+        
+        Args:
+            duration_ns: Exposure time in nanoseconds
+            test_mode: If True, simulate the exposure
+        
+        Returns:
+            Path to the captured image (host path for RAM captures), or None if failed
+        """
+        self.mirror_up_ns = None
+        self.last_bulb = None
+        
+        if test_mode or (self.connected and not GPHOTO2_AVAILABLE):
+            open_ns = self.clock.monotonic_ns()
+            self.waiter.wait(open_ns + duration_ns)
+            self.last_bulb = (open_ns, self.clock.monotonic_ns())
+            prefix = "test" if test_mode else "mock"
+            self.logger.info(f"{'TEST MODE' if test_mode else 'Mock'}: {self.name} bulb {duration_ns / 1e9:g}s simulated")
+            return f"{prefix}_image_{self.camera_id}_{int(self.clock.time())}.jpg"
+        
+        if not self.connected:
+            self.logger.error(f"Cannot expose with {self.name}: not connected")
+            return None
+        
+        opened = None
+        try:
+            if not self._set_shutter(BULB_SHUTTER):
+                self.logger.error(f"{self.name}: bulb mode not available")
+                return None
+            
+            for widget_name, open_value, close_value in (('eosremoterelease', 'Press Full', 'Release Full'),
+                                                         ('bulb', '1', '0')):
+                before_ns = self.clock.monotonic_ns()
+                if self._apply_widget(widget_name, open_value):
+                    opened = (widget_name, close_value)
+                    open_ns = (before_ns + self.clock.monotonic_ns()) // 2
+                    break
+            if opened is None:
+                self.logger.error(f"{self.name}: no remote release or bulb widget")
+                return None
+            
+            self.waiter.wait(open_ns + duration_ns)
+            before_ns = self.clock.monotonic_ns()
+            self._apply_widget(*opened)
+            self.last_bulb = (open_ns, (before_ns + self.clock.monotonic_ns()) // 2)
+            opened = None
+            
+            # Long exposure noise reduction may take a dark frame as long as the exposure
+            frames: List[str] = []
+            file_deadline_ns = self.clock.monotonic_ns() + duration_ns + BULB_FILE_TIMEOUT * 1_000_000_000
+            while not frames and self.clock.monotonic_ns() < file_deadline_ns:
+                self._wait_frame(frames, FILE_WAIT_SLICE_MS)
+            if not frames:
+                self.logger.error(f"{self.name}: no file reported after the bulb exposure")
+                return None
+            
+            self.logger.info(f"{self.name} bulb {(self.last_bulb[1] - self.last_bulb[0]) / 1e9:.3f}s "
+                             f"captured: {frames[0]}")
+            return frames[0]
+        
+        except Exception as e:
+            self.logger.error(f"Error during bulb exposure with {self.name}: {e}")
+            if opened is not None:
+                # Never leave the shutter open
+                try:
+                    self._apply_widget(*opened)
+                except Exception:
+                    self.invalidate_config()
+            return None
+    
+    def capture_bracket(self, shutters: Sequence[str], test_mode: bool = False) -> List[str]:
+        """
+        Capture an exposure bracket, changing only the shutter speed between frames.
+        
+        ISO and aperture stay as configured for the shot. Each rung writes
+        the shutterspeed widget alone (nothing when the camera already holds
+        it) and fires at once, so the bracket costs little more than its
+        exposures.
+        
+        Args:
+            shutters: GPhoto2 shutter values in capture order
+            test_mode: If True, simulate the captures
+        
+        Returns:
+            Paths of the captured frames (placeholders in trigger mode)
+        """
+        frames: List[str] = []
+        for shutter in shutters:
+            if self.connected and not self._set_shutter(shutter):
+                self.logger.warning(f"{self.name}: bracket frame at {shutter} skipped")
+                continue
+            path = self.capture_image(test_mode)
+            if path is not None:
+                frames.append(path)
+        return frames
+    
+    def _set_shutter(self, shutter: str) -> bool:
+        """Write the shutterspeed widget alone, tracked like configure_settings."""
+        if self._applied_values.get('shutterspeed') == shutter:
+            return True
+        
+        try:
+            if GPHOTO2_AVAILABLE and not self._apply_widget('shutterspeed', shutter):
+                self._forget_values(['shutterspeed'])
+                return False
+        except Exception as e:
+            self._forget_values(['shutterspeed'])
+            self.invalidate_config()
+            self.logger.error(f"Error setting shutter speed of {self.name}: {e}")
+            return False
+        
+        self._applied_values['shutterspeed'] = shutter
+        return True
+    
+    def _wait_frame(self, frames: List[str], timeout_ms: int) -> Optional[bool]:
+        """
+        Wait for one camera event during a burst or after a bulb exposure.
+        
+        Args:
+            frames: Frame paths, extended with the reported file
+            timeout_ms: Time to wait for the event in milliseconds
+        
+        Returns:
+            True if a frame was added, False for another event, None on timeout
+        """
+        event_type, event_data = gp.gp_camera_wait_for_event(self.camera, timeout_ms)
+        if event_type == gp.GP_EVENT_TIMEOUT:
+            return None
+        if event_type != gp.GP_EVENT_FILE_ADDED or event_data is None:
+            self.handle_event(event_type, event_data)
+            return False
+        
+        if self.ram_capture_dir is not None:
+            frames.append(self._save_ram_capture(event_data.folder, event_data.name))
+        else:
+            frames.append(f"{event_data.folder}/{event_data.name}")
+        return True
+    
+    def _simulate_burst(self, duration_ns: int, max_frames: int, test_mode: bool) -> List[str]:
+        """Simulate a burst at BURST_SIMULATED_FPS, taking as long as the real one."""
+        count = max(1, duration_ns * BURST_SIMULATED_FPS // 1_000_000_000)
+        if max_frames:
+            count = min(count, max_frames)
+        
+        # Sleep to an end instant, so cameras bursting together on a jumping clock end together
+        end_ns = self.clock.monotonic_ns() + count * 1_000_000_000 // BURST_SIMULATED_FPS
+        self.clock.sleep((end_ns - self.clock.monotonic_ns()) / 1e9)
+        
+        prefix = "test" if test_mode else "mock"
+        self.logger.info(f"{'TEST MODE' if test_mode else 'Mock'}: {self.name} burst of {count} frames simulated")
+        stamp = int(self.clock.time())
+        return [f"{prefix}_image_{self.camera_id}_{stamp}_{index:03d}.jpg" for index in range(count)]
+    
+    def _apply_widget(self, widget_name: str, value: str) -> bool:
+        """Set a single widget and send the configuration to the camera."""
+        config = self._get_config()
+        if config is None or not self._set_config_value(config, widget_name, value):
+            return False
+        gp.gp_camera_set_config(self.camera, config)
+        return True
+    
+    def set_capture_target(self, target: str) -> bool:
+        """
+        Select where the camera stores its captures.
+        
+        Args:
+            target: capturetarget choice (CAPTURE_TARGET_RAM or CAPTURE_TARGET_CARD)
+        
+        Returns:
+            True if the camera reports the new target, False otherwise
+        """
+        if not self.connected:
+            self.logger.error(f"Cannot set capture target of {self.name}: not connected")
             return False
         
+        if not GPHOTO2_AVAILABLE:
+            self._applied_values['capturetarget'] = target
+            return True
+        
         try:
-            # Implementation depends on camera model
-            # Some Canon models use 'eosremoterelease', others use different methods
-            if enabled and delay_ms > 0:
-                self.logger.info(f"{self.name} mirror lockup enabled, delay: {delay_ms}ms")
-                # TODO: Implement camera-specific mirror lockup
-            else:
-                self.logger.info(f"{self.name} mirror lockup disabled")
+            config = self._get_config()
+            if not self._set_config_value(config, 'capturetarget', target):
+                return False
+            gp.gp_camera_set_config(self.camera, config)
+            self._applied_values['capturetarget'] = target
             
+            # Same read as get_status, on a fresh tree
+            actual = self._get_config_value(self._get_config(refresh=True), 'capturetarget')
+            if actual != target:
+                self._applied_values.pop('capturetarget', None)
+                self.logger.warning(f"{self.name} capture target is {actual}, not {target}")
+                return False
+            return True
+        
+        except Exception as e:
+            self.invalidate_config()
+            self.logger.error(f"Error setting capture target of {self.name}: {e}")
+            return False
+    
+    def enable_ram_capture(self, download_dir: Optional[str]) -> bool:
+        """
+        Capture into the camera RAM and stream each image to the host, or back to the card.
+        
+        With RAM capture, capture_image transfers the image as part of the
+        capture and returns its host path, so the card write speed no longer
+        limits burst rates.
+        
+        Args:
+            download_dir: Root host directory for the images, or None to
+                capture to the memory card again
+        
+        Returns:
+            True if the camera switched target, False otherwise
+        """
+        target = CAPTURE_TARGET_RAM if download_dir else CAPTURE_TARGET_CARD
+        if not self.set_capture_target(target):
+            return False
+        
+        self.ram_capture_dir = camera_directory(download_dir, self.camera_id, self.name) if download_dir else None
+        self.logger.info(f"{self.name} capturing to {target}")
+        return True
+    
+    def _save_ram_capture(self, folder: str, name: str) -> str:
+        """
+        Stream a capture from the camera RAM to the host.
+        
+        Args:
+            folder: Camera folder of the capture
+            name: Camera file name of the capture
+        
+        Returns:
+            Host path of the image
+        """
+        camera_file = gp.gp_camera_file_get(self.camera, folder, name, gp.GP_FILE_TYPE_NORMAL)
+        target_path = unique_path(self.ram_capture_dir, name)
+        size = write_buffer(str(target_path), gp.gp_file_get_data_and_size(camera_file))
+        
+        try:
+            # Free the camera buffer for the next frame
+            gp.gp_camera_file_delete(self.camera, folder, name)
+        except Exception as e:
+            self.logger.debug(f"{self.name}: could not delete {folder}/{name} from RAM: {e}")
+        
+        self.logger.info(f"{self.name} captured to RAM: {target_path} ({size} bytes)")
+        return str(target_path)
+    
+    def mirror_lockup(self, enabled: bool, delay_ms: int = 0, test_mode: bool = False) -> bool:
+        """
+        Lock the mirror up ahead of the next capture.
+        
+        With mirror lockup enabled in the camera's custom functions, a full
+        press and release of the remote release (Canon eosremoterelease)
+        only raises the mirror; the next capture opens the shutter. The
+        instant the mirror went up is kept in mirror_up_ns so the caller
+        can release the shutter delay_ms later and check the settle time.
+        Nothing waits here: the delay is the scheduler's job.
+        
+        Args:
+            enabled: Lock the mirror up, or forget a previous lockup
+            delay_ms: Planned delay between mirror up and shutter, for the log
+            test_mode: If True, simulate the lockup
+            
+        Returns:
+            True if the mirror is up (or lockup was disabled), False otherwise
+        """
+        self.mirror_up_ns = None
+        if not enabled or delay_ms <= 0:
+            return True
+        
+        if test_mode or (self.connected and not GPHOTO2_AVAILABLE):
+            self.mirror_up_ns = self.clock.monotonic_ns()
+            self.logger.debug(f"{'TEST MODE' if test_mode else 'Mock'}: {self.name} mirror up, "
+                              f"shutter in {delay_ms}ms")
+            return True
+        
+        if not self.connected:
+            return False
+        
+        try:
+            if not self._apply_widget('eosremoterelease', 'Press Full'):
+                self.logger.warning(f"{self.name}: no remote release, mirror lockup not available")
+                return False
+            self._apply_widget('eosremoterelease', 'Release Full')
+            self.mirror_up_ns = self.clock.monotonic_ns()
+            self.logger.debug(f"{self.name} mirror up, shutter in {delay_ms}ms")
             return True
             
         except Exception as e:
-            self.logger.error(f"Error configuring mirror lockup for {self.name}: {e}")
+            self.invalidate_config()
+            self.logger.error(f"Error locking the mirror of {self.name}: {e}")
             return False
     
-    def _get_config(self):
-        """Get camera configuration, with caching."""
+    @staticmethod
+    def _settings_widgets(settings: CameraSettings) -> Dict[str, str]:
+        """Map camera settings to GPhoto2 widget values, skipping unset ones."""
+        values = {
+            'iso': str(settings.iso) if settings.iso else None,
+            'f-number': settings.aperture,
+            'shutterspeed': settings.shutter
+        }
+        return {widget_name: value for widget_name, value in values.items() if value}
+    
+    def _forget_values(self, widget_names: Iterable[str]):
+        """Drop applied values whose state on the camera is unknown."""
+        for widget_name in widget_names:
+            self._applied_values.pop(widget_name, None)
+    
+    def invalidate_config(self):
+        """Drop the cached configuration tree and its widget index."""
+        self._config_tree = None
+        self._config_cache.clear()
+    
+    def drain_events(self, timeout_ms: int = 0) -> int:
+        """
+        Consume pending camera events.
+        
+        Args:
+            timeout_ms: Time to wait for each event in milliseconds
+        
+        Returns:
+            Number of events consumed
+        """
+        if not self.connected or not GPHOTO2_AVAILABLE:
+            return 0
+        
+        count = 0
+        try:
+            while count < MAX_EVENTS_PER_DRAIN:
+                event_type, event_data = gp.gp_camera_wait_for_event(self.camera, timeout_ms)
+                if event_type == gp.GP_EVENT_TIMEOUT:
+                    break
+                count += 1
+                self.handle_event(event_type, event_data)
+        
+        except Exception as e:
+            self.logger.warning(f"Error reading events from {self.name}: {e}")
+            self.invalidate_config()
+        
+        return count
+    
+    def handle_event(self, event_type: int, event_data):
+        """
+        React to a camera event.
+        
+        Property changes are reported as unknown events (e.g. Canon "PTP
+        Property d102 changed"); they make the cached configuration stale,
+        and the values last written may have been changed on the body.
+        New files complete the frames released in trigger mode.
+        
+        Args:
+            event_type: GPhoto2 event type
+            event_data: Event payload
+        """
+        if event_type == gp.GP_EVENT_UNKNOWN and event_data:
+            self.logger.debug(f"{self.name} event: {event_data}")
+            self._applied_values.clear()
+            self.invalidate_config()
+        elif event_type == gp.GP_EVENT_FILE_ADDED and event_data is not None:
+            self._file_added(event_data.folder, event_data.name)
+    
+    def _file_added(self, folder: str, name: str):
+        """Record the file of a triggered frame, streaming it from RAM if needed."""
+        self.pending_frames = max(0, self.pending_frames - 1)
+        
+        if self.ram_capture_dir is not None:
+            try:
+                path = self._save_ram_capture(folder, name)
+            except Exception as e:
+                self.logger.error(f"Error streaming {folder}/{name} from {self.name}: {e}")
+                return
+        else:
+            path = f"{folder}/{name}"
+            self.logger.info(f"{self.name} file added: {path}")
+        
+        if self.file_added is not None:
+            self.file_added(self.camera_id, path)
+    
+    def _get_config(self, refresh: bool = False):
+        """
+        Get camera configuration, with caching.
+        
+        The tree is downloaded again once older than the configured TTL, after
+        an invalidation, or when refresh is requested.
+        """
         if not GPHOTO2_AVAILABLE:
             return "mock_config"
         
+        now_ns = self.clock.monotonic_ns()
+        if (not refresh and self._config_tree is not None
+                and now_ns - self._config_fetched_ns < self.config_ttl_ns):
+            return self._config_tree
+        
         try:
-            return gp.gp_camera_get_config(self.camera)
+            config = gp.gp_camera_get_config(self.camera)
         except Exception as e:
             self.logger.error(f"Error getting config for {self.name}: {e}")
+            self.invalidate_config()
             return None
+        
+        self.invalidate_config()
+        self._config_tree = config
+        self._config_fetched_ns = now_ns
+        return config
+    
+    def _index_config(self):
+        """Download the configuration tree and index the widgets used on the hot path."""
+        config = self._get_config(refresh=True)
+        if config is None or not GPHOTO2_AVAILABLE:
+            return
+        
+        for widget_name in INDEXED_WIDGETS:
+            try:
+                self._find_widget(config, widget_name)
+            except Exception:
+                self.logger.debug(f"{self.name} has no {widget_name} widget")
+    
+    def _find_widget(self, config, widget_name: str):
+        """Get a widget by name, through the index when the tree is the cached one."""
+        if config is not self._config_tree:
+            return gp.gp_widget_get_child_by_name(config, widget_name)[1]
+        
+        widget = self._config_cache.get(widget_name)
+        if widget is None:
+            widget = gp.gp_widget_get_child_by_name(config, widget_name)[1]
+            self._config_cache[widget_name] = widget
+        return widget
     
     def _get_config_value(self, config, widget_name: str, value_type=str):
         """Get configuration value with error handling."""
@@ -333,13 +1109,13 @@ class CameraController:
             # Return mock values for development
             mock_values = {
                 'batterylevel': 85,
-                'capturetarget': 'Memory card',
+                'capturetarget': self._applied_values.get('capturetarget', CAPTURE_TARGET_CARD),
                 'autofocus': 'On'
             }
             return mock_values.get(widget_name)
         
         try:
-            widget = gp.gp_widget_get_child_by_name(config, widget_name)[1]
+            widget = self._find_widget(config, widget_name)
             value = gp.gp_widget_get_value(widget)
             
             if value_type == int:
@@ -358,7 +1134,7 @@ class CameraController:
             return True
         
         try:
-            widget = gp.gp_widget_get_child_by_name(config, widget_name)[1]
+            widget = self._find_widget(config, widget_name)
             gp.gp_widget_set_value(widget, value)
             return True
             
@@ -366,18 +1142,72 @@ class CameraController:
             self.logger.warning(f"Could not set {widget_name} = {value}: {e}")
             return False
     
+    def unsupported_settings(self, settings: CameraSettings) -> List[str]:
+        """
+        List the settings this camera is known to refuse, without accessing it.
+        
+        Args:
+            settings: Camera settings to check
+        
+        Returns:
+            Descriptions of the refused widget values (empty if accepted or unknown)
+        """
+        if self.capabilities is None:
+            return []
+        return self.capabilities.unsupported(settings)
+    
     def _detect_capabilities(self):
-        """Detect and cache camera capabilities."""
-        if not self.connected:
+        """
+        Detect and cache camera capabilities.
+        
+        The capabilities stored for this body are reused when its firmware
+        and lens are unchanged; otherwise the widget choices are probed and
+        stored again.
+        """
+        self.capabilities = None
+        if not self.connected or not GPHOTO2_AVAILABLE:
+            return
+        
+        config = self._get_config()
+        if config is None:
             return
         
-        # TODO: Implement capability detection
-        # - Supported ISO values
-        # - Supported aperture values  
-        # - Supported shutter speeds
-        # - Mirror lockup support
-        # - Battery level support
-        pass
+        identity = {
+            role: next((value for value in (self._get_config_value(config, widget_name)
+                                            for widget_name in widget_names) if value), "")
+            for role, widget_names in IDENTITY_WIDGETS.items()
+        }
+        if not identity['model']:
+            identity['model'] = self.name
+        
+        cached = None
+        if self.capability_cache is not None and identity['serial']:
+            cached = self.capability_cache.load(identity['model'], identity['serial'])
+        if cached is not None and cached.same_setup(identity['firmware'], identity['lens']):
+            self.capabilities = cached
+            self.logger.info(f"{self.name} capabilities loaded from cache")
+            return
+        
+        choices = {}
+        for widget_name in CAPABILITY_WIDGETS:
+            try:
+                widget = self._find_widget(config, widget_name)
+            except Exception:
+                self.logger.debug(f"{self.name} has no {widget_name} widget")
+                continue
+            try:
+                choices[widget_name] = [gp.gp_widget_get_choice(widget, index)
+                                        for index in range(int(gp.gp_widget_count_choices(widget)))]
+            except Exception:
+                # Text or range widget: present, but takes free values
+                choices[widget_name] = []
+        
+        self.capabilities = CameraCapabilities(choices=choices, **identity)
+        self.logger.info(f"{self.name} capabilities probed"
+                         f"{' (firmware or lens changed)' if cached is not None else ''}: "
+                         + ", ".join(f"{widget_name} {len(values)}" for widget_name, values in choices.items()))
+        if self.capability_cache is not None and identity['serial']:
+            self.capability_cache.save(self.capabilities)
     
     def _estimate_free_space(self) -> Optional[int]:
         """Estimate free space on camera storage."""
@@ -426,4 +1256,40 @@ def format_gphoto2_shutter(seconds: float) -> str:
         if fraction == int(fraction):
             return f"1/{int(fraction)}"
         else:
-            return f"1/{fraction:.0f}"
\ No newline at end of file
+            return f"1/{fraction:.0f}"
+
+
+def parse_gphoto2_shutter(value: str) -> float:
+    """
+    Parse a GPhoto2 shutter speed string.
+    
+    Args:
+        value: GPhoto2 shutter string (e.g., "1/125", "2", "0.3")
+    
+    Returns:
+        Shutter speed in seconds
+    """
+    numerator, _, denominator = value.partition('/')
+    seconds = float(numerator) / float(denominator) if denominator else float(numerator)
+    if seconds <= 0:
+        raise ValueError(f"Shutter speed must be positive, got {value}")
+    return seconds
+
+
+def needs_bulb(seconds: float) -> bool:
+    """
+    Tell whether an exposure must be timed by the host in bulb mode.
+    
+    Exposures from BULB_MIN_EXPOSURE that are not one of the preset speeds
+    (within 1%), including any longer than the longest one, are bulb.
+    
+    Args:
+        seconds: Exposure time in seconds
+    
+    Returns:
+        True for a bulb exposure
+    """
+    if seconds < BULB_MIN_EXPOSURE:
+        return False
+    return not any(abs(parse_gphoto2_shutter(value) - seconds) <= seconds * 0.01
+                   for value in GPHOTO2_SHUTTER_VALUES)
\ No newline at end of file
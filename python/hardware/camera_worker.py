@@ -0,0 +1,184 @@
+"""
+Per-camera worker thread for Eclipse Photography Controller.
+
+Each camera gets one long-lived thread that executes its commands in
+submission order from a queue. Captures no longer pay for thread creation,
+and a camera handle is only ever used from its own thread. A ReleaseBarrier
+lines several workers up so their cameras fire at the same instant.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.constants import RELEASE_SYNC_MARGIN, RELEASE_SYNC_TIMEOUT
+
+
+class CameraWorker:
+    """
+    Long-lived thread running the commands of one camera.
+    
+    The thread is a daemon and is started at creation, so a camera hung in
+    a USB call cannot block interpreter exit and the first capture does not
+    wait for a thread to start.
+    """
+    
+    def __init__(self, camera_id: int, name: Optional[str] = None):
+        """
+        Initialize and start camera worker.
+        
+        Args:
+            camera_id: ID of the camera served by this worker
+            name: Thread name (default: Camera<id>)
+        """
+        self.camera_id = camera_id
+        self.logger = logging.getLogger(f'camera_worker_{camera_id}')
+        self._queue: queue.Queue = queue.Queue()
+        self._stopped = False
+        self._running = False
+        self._thread = threading.Thread(target=self._run, name=name or f'Camera{camera_id}', daemon=True)
+        self._thread.start()
+    
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue a command for the camera thread.
+        
+        Args:
+            func: Callable to run on the camera thread
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            Future resolved with the command result
+        
+        Raises:
+            RuntimeError: If the worker has been stopped
+        """
+        if self._stopped:
+            raise RuntimeError(f"Worker for camera {self.camera_id} is stopped")
+        
+        future: Future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+    
+    def pending(self) -> int:
+        """Get number of commands waiting behind the running one."""
+        return self._queue.qsize()
+    
+    def is_alive(self) -> bool:
+        """True if the worker thread is running."""
+        return self._thread.is_alive()
+    
+    def is_idle(self) -> bool:
+        """True if no command is running or waiting."""
+        return not self._running and self._queue.empty()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the worker once the queued commands are done.
+        
+        Args:
+            timeout: Seconds to wait for the thread to finish (None: do not wait)
+        """
+        if self._stopped:
+            return
+        
+        self._stopped = True
+        self._queue.put(None)
+        if timeout is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                self.logger.warning(f"Worker for camera {self.camera_id} still busy after {timeout}s")
+    
+    def _run(self):
+        """Execute queued commands until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            
+            future, func, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            
+            self._running = True
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                self._running = False
+
+
+class ReleaseBarrier:
+    """
+    Synchronized shutter release across camera workers.
+    
+    Each worker stages its capture and blocks on a shared barrier; when the
+    last one arrives, a common release instant is fixed (the requested
+    deadline, or a short margin from now if it has passed) and every worker
+    busy-waits to it before triggering. The barrier removes the scatter of
+    thread wake-ups; the shared instant removes the order of arrival.
+    """
+    
+    def __init__(self, parties: int, clock: Optional[Clock] = None, release_at_ns: Optional[int] = None,
+                 margin: float = RELEASE_SYNC_MARGIN, timeout: float = RELEASE_SYNC_TIMEOUT):
+        """
+        Initialize release barrier.
+        
+        Args:
+            parties: Number of workers that will call wait()
+            clock: Clock defining the release instant (default: system clock)
+            release_at_ns: Monotonic release deadline (default: as soon as all are staged)
+            margin: Seconds between the last arrival and the release, so every
+                worker is spinning when the instant comes
+            timeout: Seconds to wait for the other workers before firing alone
+        """
+        self.clock = clock or SYSTEM_CLOCK
+        self.release_at_ns = release_at_ns
+        self.margin_ns = int(margin * 1_000_000_000)
+        self.release_ns: Optional[int] = None
+        self._barrier = threading.Barrier(parties, action=self._fix_release, timeout=timeout)
+    
+    def wait(self) -> bool:
+        """
+        Block until the shared release instant (worker thread).
+        
+        Returns:
+            True if released together with the other workers, False if the
+            barrier timed out and the caller should fire on its own
+        """
+        try:
+            self._barrier.wait()
+        except threading.BrokenBarrierError:
+            return False
+        
+        while self.clock.monotonic_ns() < self.release_ns:
+            pass
+        return True
+    
+    def _fix_release(self):
+        """Set the release instant once every worker is staged."""
+        earliest_ns = self.clock.monotonic_ns() + self.margin_ns
+        self.release_ns = max(self.release_at_ns or earliest_ns, earliest_ns)
+
+
+def release_skew_ns(capture_timings: Dict[int, Tuple[int, int]]) -> Optional[int]:
+    """
+    Get the spread of shutter releases across cameras.
+    
+    Args:
+        capture_timings: Dictionary mapping camera ID to monotonic (start, end) of its capture
+    
+    Returns:
+        Nanoseconds between the first and last release, or None for fewer than two cameras
+    """
+    if len(capture_timings) < 2:
+        return None
+    starts = [start_ns for start_ns, _ in capture_timings.values()]
+    return max(starts) - min(starts)
@@ -0,0 +1,160 @@
+"""
+Camera capability discovery cache for Eclipse Photography Controller.
+
+Reading the choices of every settings widget takes a full configuration
+download and one call per choice, several seconds on some bodies. The
+probed capabilities are stored on disk, one file per camera body (model and
+serial number), so later connections load them at once; they are probed
+again only when the firmware or the lens differs from the stored ones.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.eclipse_config import CameraSettings
+
+
+# Settings and status widgets whose choices are probed
+CAPABILITY_WIDGETS = ('iso', 'f-number', 'shutterspeed', 'drivemode', 'capturetarget', 'batterylevel')
+
+# Identity widgets, by role, in the order their names are tried
+IDENTITY_WIDGETS = {
+    'model': ('cameramodel', 'model'),
+    'serial': ('serialnumber', 'eosserialnumber'),
+    'firmware': ('deviceversion', 'firmwareversion'),
+    'lens': ('lensname',)
+}
+
+
+@dataclass
+class CameraCapabilities:
+    """Widgets available on a camera body and the values they accept."""
+    model: str
+    serial: str
+    firmware: str = ""
+    lens: str = ""
+    # Widget name -> accepted values (empty list: free value, e.g. battery text)
+    choices: Dict[str, List[str]] = field(default_factory=dict)
+    
+    def has_widget(self, widget_name: str) -> bool:
+        """True if the camera exposes the widget."""
+        return widget_name in self.choices
+    
+    def supports(self, widget_name: str, value: str) -> bool:
+        """
+        Check whether a widget accepts a value.
+        
+        Widgets that were not probed or take free values are assumed to
+        accept anything, so only values the camera is known to refuse fail.
+        
+        Args:
+            widget_name: GPhoto2 widget name
+            value: Value to write
+        
+        Returns:
+            False only if the widget lists its choices and the value is not one of them
+        """
+        accepted = self.choices.get(widget_name)
+        return not accepted or value in accepted
+    
+    def unsupported(self, settings: CameraSettings) -> List[str]:
+        """
+        List the settings the camera refuses.
+        
+        Args:
+            settings: Camera settings to check
+        
+        Returns:
+            Descriptions of the refused widget values (empty if all are accepted)
+        """
+        values = {
+            'iso': str(settings.iso) if settings.iso else None,
+            'f-number': settings.aperture,
+            'shutterspeed': settings.shutter
+        }
+        return [f"{widget_name}={value}" for widget_name, value in values.items()
+                if value and not self.supports(widget_name, value)]
+    
+    def same_setup(self, firmware: str, lens: str) -> bool:
+        """True if the capabilities were probed with this firmware and lens."""
+        return self.firmware == firmware and self.lens == lens
+
+
+class CapabilityCache:
+    """
+    On-disk store of probed camera capabilities, one JSON file per body.
+    
+    The cache is best effort: unreadable or unwritable files are logged and
+    treated as missing, and the camera is simply probed again.
+    """
+    
+    def __init__(self, cache_dir: str):
+        """
+        Initialize capability cache.
+        
+        Args:
+            cache_dir: Directory holding the cache files (created on first save)
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.logger = logging.getLogger('capability_cache')
+    
+    def path(self, model: str, serial: str) -> Path:
+        """Get the cache file of a camera body."""
+        key = re.sub(r'[^A-Za-z0-9_-]+', '_', f"{model}_{serial}").strip('_')
+        return self.cache_dir / f"{key}.json"
+    
+    def load(self, model: str, serial: str) -> Optional[CameraCapabilities]:
+        """
+        Load the stored capabilities of a camera body.
+        
+        Args:
+            model: Camera model
+            serial: Camera serial number
+        
+        Returns:
+            Stored capabilities, or None if missing or unreadable
+        """
+        path = self.path(model, serial)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return CameraCapabilities(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring capability cache {path}: {e}")
+            return None
+    
+    def save(self, capabilities: CameraCapabilities) -> bool:
+        """
+        Store the capabilities of a camera body.
+        
+        The file is written next to its final name and renamed over it, so
+        an interrupted save never leaves a truncated cache.
+        
+        Args:
+            capabilities: Probed capabilities
+        
+        Returns:
+            True if stored, False otherwise
+        """
+        path = self.path(capabilities.model, capabilities.serial)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(asdict(capabilities), f, indent=1)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            self.logger.warning(f"Could not write capability cache {path}: {e}")
+            return False
+        return True
@@ -0,0 +1,185 @@
+"""
+Per-camera circuit breaker for Eclipse Photography Controller.
+
+A camera that keeps failing its captures still costs every shot a worker
+slot, error logs and, when it hangs, the whole capture timeout before the
+results of the healthy cameras are reported. After a run of consecutive
+failed captures the breaker trips and takes the camera out of the active
+set. A background thread then probes it with an uncached configuration
+read on its idle worker, outside trigger windows, and puts it back as soon
+as the camera answers.
+
+A restored camera is on probation: one more failed capture trips the
+breaker again.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+
+from utils.constants import (
+    BREAKER_FAILURE_THRESHOLD, BREAKER_PROBE_INTERVAL, HEALTH_HOLD_OFF_POLL, CAMERA_COMMAND_TIMEOUT
+)
+
+if TYPE_CHECKING:
+    from .multi_camera_manager import MultiCameraManager
+
+
+class CircuitBreaker:
+    """
+    Consecutive capture failure tracking and recovery, for every camera of a manager.
+    """
+    
+    def __init__(self, camera_manager: 'MultiCameraManager', threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 probe_interval: float = BREAKER_PROBE_INTERVAL,
+                 hold_off: Optional[Callable[[], bool]] = None, timeout: float = CAMERA_COMMAND_TIMEOUT):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            camera_manager: Manager owning the cameras and their workers
+            threshold: Consecutive failed captures tripping the breaker
+            probe_interval: Seconds between probes of tripped cameras
+            hold_off: Callback returning True while probes must wait (near a trigger)
+            timeout: Seconds a probed camera may take to answer
+        """
+        if threshold < 1:
+            raise ValueError(f"Invalid failure threshold: {threshold}")
+        
+        self.camera_manager = camera_manager
+        self.threshold = threshold
+        self.probe_interval = probe_interval
+        self.hold_off = hold_off
+        self.timeout = timeout
+        self.logger = logging.getLogger('circuit_breaker')
+        
+        self._failures: Dict[int, int] = {}  # camera -> consecutive failed captures
+        self._tripped: Dict[int, str] = {}  # camera -> last failure
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.trips = 0
+        self.restores = 0
+    
+    def start(self):
+        """Start probing tripped cameras in the background."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='CircuitBreaker', daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop probing. Tripped cameras stay out of the active set.
+        
+        Args:
+            timeout: Seconds to wait for a probe in progress (None: do not wait)
+        """
+        self._stopping.set()
+        if self._thread is not None and timeout is not None:
+            self._thread.join(timeout)
+    
+    def record(self, camera_id: int, success: bool, reason: str = "capture failed"):
+        """
+        Record the outcome of a capture, tripping the breaker on too many failures in a row.
+        
+        Args:
+            camera_id: Camera ID
+            success: True if the capture produced an image
+            reason: Description of the failure, for the logs
+        """
+        with self._lock:
+            if camera_id in self._tripped:
+                return
+            if success:
+                self._failures.pop(camera_id, None)
+                return
+            failures = self._failures.get(camera_id, 0) + 1
+            self._failures[camera_id] = failures
+            if failures < self.threshold:
+                return
+            self._tripped[camera_id] = reason
+            self.trips += 1
+        
+        self.logger.error(f"Camera {camera_id} taken out of the shots after {failures} "
+                          f"failed captures ({reason})")
+        self.camera_manager.suspend(camera_id)
+    
+    def tripped_cameras(self) -> List[int]:
+        """Get the cameras currently taken out by the breaker."""
+        with self._lock:
+            return sorted(self._tripped)
+    
+    def forget(self, camera_id: int):
+        """Drop the state of a camera handled elsewhere (removed or unplugged)."""
+        with self._lock:
+            self._failures.pop(camera_id, None)
+            self._tripped.pop(camera_id, None)
+    
+    def probe_once(self) -> List[int]:
+        """
+        Probe the tripped cameras and restore those that answer.
+        
+        A camera whose worker is still busy (e.g. hung in the failed
+        capture) is not probed: it is not ready to shoot either.
+        
+        Returns:
+            Cameras put back in the active set
+        """
+        restored = []
+        for camera_id in self.tripped_cameras():
+            while self.hold_off is not None and self.hold_off() and not self._stopping.is_set():
+                self._stopping.wait(HEALTH_HOLD_OFF_POLL)
+            if self._stopping.is_set():
+                break
+            
+            controller = self.camera_manager.cameras.get(camera_id)
+            if controller is None:
+                self.forget(camera_id)
+                continue
+            worker = self.camera_manager.get_worker(camera_id)
+            if not worker.is_idle():
+                continue
+            
+            try:
+                answered = worker.submit(controller.probe).result(self.timeout)
+            except Exception as e:
+                self.logger.debug(f"Probe of camera {camera_id} failed: {str(e) or 'timed out'}")
+                continue
+            if not answered:
+                self.logger.debug(f"Camera {camera_id} not answering")
+                continue
+            
+            with self._lock:
+                if self._tripped.pop(camera_id, None) is None:
+                    continue
+                # Probation: the next failure trips the breaker again
+                self._failures[camera_id] = self.threshold - 1
+                self.restores += 1
+            self.logger.info(f"Camera {camera_id} answers again, back in the shots")
+            self.camera_manager.rejoin(camera_id)
+            restored.append(camera_id)
+        return restored
+    
+    def format_report(self) -> List[str]:
+        """
+        Format the breaker statistics as report lines for the log.
+        
+        Returns:
+            List of human-readable lines
+        """
+        with self._lock:
+            lines = [f"Circuit breaker: {self.trips} cameras taken out after failed captures, "
+                     f"{self.restores} restored"]
+            if self._tripped:
+                lines.append(f"Cameras still out: {sorted(self._tripped)}")
+        return lines
+    
+    def _run(self):
+        """Probe every interval until stopped (breaker thread)."""
+        while not self._stopping.wait(self.probe_interval):
+            try:
+                self.probe_once()
+            except Exception as e:
+                self.logger.error(f"Circuit breaker error: {e}")
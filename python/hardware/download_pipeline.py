@@ -0,0 +1,304 @@
+"""
+Background image download for Eclipse Photography Controller.
+
+Captured images are queued as soon as the capture returns and copied to the
+host by one download thread per camera, so cards do not fill up during the
+sequence and the pictures are safe on disk without waiting for the end of
+the eclipse. The transfer itself runs on the camera's worker thread (the
+only thread allowed to use its handle) and is held off while a shot is
+about to be released, so downloads never delay a trigger.
+"""
+
+import logging
+import os
+import queue
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.constants import DOWNLOAD_QUEUE_SIZE, DOWNLOAD_HOLD_OFF_POLL
+
+if TYPE_CHECKING:
+    from .multi_camera_manager import MultiCameraManager
+
+
+def camera_directory(download_dir: str, camera_id: int, camera_name: str) -> Path:
+    """
+    Get (and create) the host directory receiving the images of a camera.
+    
+    Args:
+        download_dir: Root download directory
+        camera_id: Camera ID
+        camera_name: Camera name, sanitized into the directory name
+    
+    Returns:
+        Path of the camera directory
+    """
+    directory = Path(download_dir) / f"camera{camera_id}_{re.sub(r'[^A-Za-z0-9_-]+', '_', camera_name)}"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def unique_path(directory: Path, name: str) -> Path:
+    """
+    Get a path for a file name that does not overwrite an existing file.
+    
+    Camera file numbers wrap around, so a name already present gets a
+    numbered suffix instead of replacing the earlier image.
+    
+    Args:
+        directory: Target directory
+        name: File name from the camera
+    
+    Returns:
+        Free path in the directory
+    """
+    path = directory / name
+    stem, suffix = path.stem, path.suffix
+    counter = 1
+    while path.exists():
+        path = directory / f"{stem}_{counter}{suffix}"
+        counter += 1
+    return path
+
+
+def write_buffer(path: str, data) -> int:
+    """
+    Write an image buffer to a host file without copying it.
+    
+    The file is preallocated to the image size, then written straight from
+    a memoryview over the buffer; partial writes advance through slices of
+    the view, which share its memory.
+    
+    Args:
+        path: Host file to create or replace
+        data: Object exposing the buffer protocol (gphoto2 file data, bytes)
+    
+    Returns:
+        Number of bytes written
+    """
+    view = memoryview(data).cast('B')
+    size = view.nbytes
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if size and hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(fd, 0, size)
+        offset = 0
+        while offset < size:
+            offset += os.write(fd, view[offset:])
+    finally:
+        os.close(fd)
+    return size
+
+
+class DownloadPipeline:
+    """
+    Bounded per-camera download queues feeding the camera workers.
+    
+    enqueue() never blocks: when a camera's queue is full the image is left
+    on the card and counted as deferred.
+    """
+    
+    def __init__(self, camera_manager: 'MultiCameraManager', download_dir: str,
+                 max_queue: int = DOWNLOAD_QUEUE_SIZE, delete_after_download: bool = False,
+                 hold_off: Optional[Callable[[], bool]] = None, clock: Optional[Clock] = None):
+        """
+        Initialize download pipeline.
+        
+        Args:
+            camera_manager: Manager owning the cameras and their workers
+            download_dir: Host directory receiving one subdirectory per camera
+            max_queue: Maximum images waiting for download per camera
+            delete_after_download: If True, delete verified images from the camera
+            hold_off: Callback returning True while downloads must wait (near a trigger)
+            clock: Clock for throughput measurement (default: system clock)
+        """
+        self.camera_manager = camera_manager
+        self.download_dir = Path(download_dir)
+        self.max_queue = max_queue
+        self.delete_after_download = delete_after_download
+        self.hold_off = hold_off
+        self.clock = clock or SYSTEM_CLOCK
+        self.logger = logging.getLogger('download_pipeline')
+        
+        self._queues: Dict[int, queue.Queue] = {}
+        self._threads: Dict[int, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        
+        self.downloaded = 0
+        self.failed = 0
+        self.deferred = 0
+        self.bytes_downloaded = 0
+        self.max_backlog = 0
+        self._in_progress = 0
+        self._first_start_ns: Optional[int] = None
+        self._last_end_ns: Optional[int] = None
+    
+    def enqueue(self, camera_id: int, camera_path: str) -> bool:
+        """
+        Queue a captured image for download without blocking.
+        
+        Args:
+            camera_id: Camera holding the image
+            camera_path: Path of the image on the camera
+        
+        Returns:
+            True if queued, False if the pipeline is stopped or the camera's queue is full
+        """
+        if self._stopping.is_set():
+            return False
+        
+        try:
+            self._camera_queue(camera_id).put_nowait(camera_path)
+        except queue.Full:
+            with self._lock:
+                self.deferred += 1
+            self.logger.warning(f"Download queue of camera {camera_id} full, {camera_path} left on the card")
+            return False
+        
+        with self._lock:
+            self.max_backlog = max(self.max_backlog, self._backlog_locked())
+        return True
+    
+    def backlog(self) -> int:
+        """Get number of images queued or being downloaded."""
+        with self._lock:
+            return self._backlog_locked()
+    
+    def stop(self, timeout: Optional[float] = None) -> int:
+        """
+        Finish the queued downloads and stop the download threads.
+        
+        Stopping again only waits for the downloads still running.
+        
+        Args:
+            timeout: Seconds to wait for the pending downloads (None: wait until done)
+        
+        Returns:
+            Number of images still waiting when the timeout expired
+        """
+        with self._lock:
+            first_stop = not self._stopping.is_set()
+            self._stopping.set()
+            queues = list(self._queues.values())
+            threads = list(self._threads.values())
+        
+        if first_stop:
+            for camera_queue in queues:
+                camera_queue.put(None)
+        
+        deadline_ns = None if timeout is None else self.clock.monotonic_ns() + int(timeout * 1_000_000_000)
+        for thread in threads:
+            remaining = None if deadline_ns is None else max(0.0, (deadline_ns - self.clock.monotonic_ns()) / 1e9)
+            thread.join(remaining)
+        
+        pending = self.backlog()
+        if pending:
+            self.logger.warning(f"{pending} images not downloaded, still on the cameras")
+        return pending
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Get download statistics.
+        
+        Returns:
+            Dictionary with counts, bytes, throughput and backlog
+        """
+        with self._lock:
+            elapsed_s = 0.0
+            if self._first_start_ns is not None and self._last_end_ns is not None:
+                elapsed_s = (self._last_end_ns - self._first_start_ns) / 1e9
+            return {
+                'downloaded': self.downloaded,
+                'failed': self.failed,
+                'deferred': self.deferred,
+                'bytes': self.bytes_downloaded,
+                'throughput_mbps': self.bytes_downloaded / elapsed_s / 1e6 if elapsed_s > 0 else 0.0,
+                'backlog': self._backlog_locked(),
+                'max_backlog': self.max_backlog
+            }
+    
+    def format_report(self) -> List[str]:
+        """
+        Format the download statistics as report lines for the log.
+        
+        Returns:
+            List of human-readable lines
+        """
+        stats = self.stats()
+        return [
+            f"Downloads: {stats['downloaded']} images, {stats['bytes'] / 1e6:.1f}MB "
+            f"at {stats['throughput_mbps']:.1f}MB/s to {self.download_dir}",
+            f"Download backlog: {stats['backlog']} pending, max {stats['max_backlog']}, "
+            f"{stats['failed']} failed, {stats['deferred']} left on cards"
+        ]
+    
+    def _backlog_locked(self) -> int:
+        """Backlog with the lock held."""
+        return sum(camera_queue.qsize() for camera_queue in self._queues.values()) + self._in_progress
+    
+    def _camera_queue(self, camera_id: int) -> queue.Queue:
+        """Get the download queue of a camera, starting its download thread if needed."""
+        with self._lock:
+            camera_queue = self._queues.get(camera_id)
+            if camera_queue is None:
+                camera_queue = queue.Queue(maxsize=self.max_queue)
+                self._queues[camera_id] = camera_queue
+                thread = threading.Thread(target=self._run, args=(camera_id, camera_queue),
+                                          name=f'Download{camera_id}', daemon=True)
+                self._threads[camera_id] = thread
+                thread.start()
+            return camera_queue
+    
+    def _run(self, camera_id: int, camera_queue: queue.Queue):
+        """Download the images of one camera until stopped (download thread)."""
+        while True:
+            camera_path = camera_queue.get()
+            if camera_path is None:
+                break
+            
+            with self._lock:
+                self._in_progress += 1
+            try:
+                self._download(camera_id, camera_path)
+            finally:
+                with self._lock:
+                    self._in_progress -= 1
+    
+    def _download(self, camera_id: int, camera_path: str):
+        """Transfer one image on the camera's worker thread, outside trigger windows."""
+        while self.hold_off is not None and self.hold_off() and not self._stopping.is_set():
+            self._stopping.wait(DOWNLOAD_HOLD_OFF_POLL)
+        
+        controller = self.camera_manager.cameras.get(camera_id)
+        if controller is None:
+            self.logger.error(f"Cannot download {camera_path}: camera {camera_id} removed")
+            with self._lock:
+                self.failed += 1
+            return
+        
+        target_path = unique_path(camera_directory(self.download_dir, camera_id, controller.name),
+                                  camera_path.rpartition('/')[2])
+        start_ns = self.clock.monotonic_ns()
+        try:
+            worker = self.camera_manager.get_worker(camera_id)
+            size = worker.submit(controller.download_file, camera_path, str(target_path),
+                                 self.delete_after_download).result()
+        except Exception as e:
+            self.logger.error(f"Error downloading {camera_path} from camera {camera_id}: {e}")
+            size = None
+        end_ns = self.clock.monotonic_ns()
+        
+        with self._lock:
+            if size is None:
+                self.failed += 1
+                return
+            self.downloaded += 1
+            self.bytes_downloaded += size
+            if self._first_start_ns is None:
+                self._first_start_ns = start_ns
+            self._last_end_ns = end_ns
+    
@@ -0,0 +1,182 @@
+"""
+Background camera health monitor for Eclipse Photography Controller.
+
+Reading a camera's status downloads its whole configuration tree. The
+monitor does it on a low-priority schedule from its own thread and keeps
+the last status of every camera, so status and camera information queries
+are answered from memory. Polls run on the camera's worker thread only
+while the worker is idle, and are held off while a shot is about to be
+released, so a status read never competes with a capture on the USB bus.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from config.eclipse_config import CameraStatus
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.constants import STATUS_POLL_INTERVAL, HEALTH_STATUS_TTL, HEALTH_HOLD_OFF_POLL, CAMERA_COMMAND_TIMEOUT
+
+if TYPE_CHECKING:
+    from .multi_camera_manager import MultiCameraManager
+
+
+class HealthMonitor:
+    """
+    Periodic status poller serving cached camera status snapshots.
+    
+    A snapshot is served until it is older than the TTL; after that the
+    camera is treated as unknown and callers query it directly.
+    """
+    
+    def __init__(self, camera_manager: 'MultiCameraManager', interval: float = STATUS_POLL_INTERVAL,
+                 ttl: float = HEALTH_STATUS_TTL, hold_off: Optional[Callable[[], bool]] = None,
+                 clock: Optional[Clock] = None, timeout: float = CAMERA_COMMAND_TIMEOUT):
+        """
+        Initialize health monitor.
+        
+        Args:
+            camera_manager: Manager owning the cameras and their workers
+            interval: Seconds between polls of all active cameras
+            ttl: Seconds a snapshot is served from the cache
+            hold_off: Callback returning True while polls must wait (near a trigger)
+            clock: Clock dating the snapshots (default: system clock)
+            timeout: Seconds a camera may take to report its status
+        """
+        self.camera_manager = camera_manager
+        self.interval = interval
+        self.ttl_ns = int(ttl * 1_000_000_000)
+        self.hold_off = hold_off
+        self.clock = clock or SYSTEM_CLOCK
+        self.timeout = timeout
+        self.logger = logging.getLogger('health_monitor')
+        
+        self._snapshots: Dict[int, Tuple[CameraStatus, int]] = {}  # camera -> (status, monotonic ns)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.polls = 0
+        self.deferred = 0
+        self.failed = 0
+    
+    def start(self):
+        """Start polling in the background, beginning with an immediate poll."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='HealthMonitor', daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop polling.
+        
+        Args:
+            timeout: Seconds to wait for a poll in progress (None: do not wait)
+        """
+        self._stopping.set()
+        if self._thread is not None and timeout is not None:
+            self._thread.join(timeout)
+    
+    def record(self, camera_id: int, status: CameraStatus):
+        """Store a status read by the monitor or by a direct query."""
+        with self._lock:
+            self._snapshots[camera_id] = (status, self.clock.monotonic_ns())
+    
+    def forget(self, camera_id: int):
+        """Drop the snapshot of a removed camera."""
+        with self._lock:
+            self._snapshots.pop(camera_id, None)
+    
+    def snapshot(self, camera_id: int) -> Optional[CameraStatus]:
+        """
+        Get the cached status of a camera.
+        
+        Args:
+            camera_id: Camera ID
+        
+        Returns:
+            Status no older than the TTL, or None
+        """
+        return self.snapshots([camera_id]).get(camera_id)
+    
+    def snapshots(self, camera_ids: Optional[List[int]] = None) -> Dict[int, CameraStatus]:
+        """
+        Get the cached statuses still within the TTL.
+        
+        Args:
+            camera_ids: Cameras to look up (default: every camera with a snapshot)
+        
+        Returns:
+            Dictionary mapping camera ID to status, for fresh snapshots only
+        """
+        now_ns = self.clock.monotonic_ns()
+        with self._lock:
+            if camera_ids is None:
+                camera_ids = list(self._snapshots)
+            return {
+                camera_id: snapshot[0]
+                for camera_id, snapshot in ((camera_id, self._snapshots.get(camera_id)) for camera_id in camera_ids)
+                if snapshot is not None and now_ns - snapshot[1] < self.ttl_ns
+            }
+    
+    def poll_once(self) -> int:
+        """
+        Refresh the status of the active cameras, one camera at a time.
+        
+        Cameras whose worker is busy are skipped until the next round, and
+        the round waits while the hold-off callback is True.
+        
+        Returns:
+            Number of cameras refreshed
+        """
+        refreshed = 0
+        for camera_id in list(self.camera_manager.active_cameras):
+            while self.hold_off is not None and self.hold_off() and not self._stopping.is_set():
+                self._stopping.wait(HEALTH_HOLD_OFF_POLL)
+            if self._stopping.is_set():
+                break
+            
+            controller = self.camera_manager.cameras.get(camera_id)
+            worker = self.camera_manager.get_worker(camera_id)
+            if controller is None or not worker.is_idle():
+                with self._lock:
+                    self.deferred += 1
+                continue
+            
+            try:
+                status = worker.submit(controller.get_status).result(self.timeout)
+            except Exception as e:
+                self.logger.warning(f"Status poll of camera {camera_id} failed: {str(e) or 'timed out'}")
+                with self._lock:
+                    self.failed += 1
+                continue
+            
+            self.record(camera_id, status)
+            refreshed += 1
+            if not status.connected:
+                self.logger.warning(f"Camera {camera_id} reported disconnected")
+        
+        with self._lock:
+            self.polls += refreshed
+        return refreshed
+    
+    def format_report(self) -> List[str]:
+        """
+        Format the monitor statistics as report lines for the log.
+        
+        Returns:
+            List of human-readable lines
+        """
+        with self._lock:
+            return [f"Health checks: {self.polls} status polls, {self.deferred} deferred "
+                    f"on busy cameras, {self.failed} failed"]
+    
+    def _run(self):
+        """Poll every interval until stopped (monitor thread)."""
+        while not self._stopping.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.logger.error(f"Health monitor error: {e}")
+            self._stopping.wait(self.interval)
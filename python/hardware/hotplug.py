@@ -0,0 +1,230 @@
+"""
+USB hot-plug handling for Eclipse Photography Controller.
+
+A camera that drops off the bus mid-sequence would otherwise stay in the
+active set, and every later shot would wait for its capture to time out.
+The monitor compares the cameras GPhoto2 detects with the active ones:
+cameras that disappeared are taken out of the fan-out, and when a camera of
+the same model shows up again it is reconnected on its own worker thread,
+restored to its last settings and put back in the active set for the next
+shot. The scheduler never waits for any of it.
+
+Scans run every HOTPLUG_POLL_INTERVAL; with pyudev installed, a USB event
+also triggers an immediate scan.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from utils.constants import HOTPLUG_POLL_INTERVAL, HEALTH_HOLD_OFF_POLL
+
+try:
+    import pyudev
+    PYUDEV_AVAILABLE = True
+except ImportError:
+    PYUDEV_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from .multi_camera_manager import MultiCameraManager
+
+
+# Longest wait for a udev event before checking for a stop request
+UDEV_POLL_SLICE = 0.5
+
+
+class HotplugMonitor:
+    """
+    Background detection of unplugged and returning cameras.
+    
+    Lost cameras keep their ID, name and controller; only their port
+    changes when they come back.
+    """
+    
+    def __init__(self, camera_manager: 'MultiCameraManager', interval: float = HOTPLUG_POLL_INTERVAL,
+                 hold_off: Optional[Callable[[], bool]] = None, use_udev: bool = True):
+        """
+        Initialize hot-plug monitor.
+        
+        Args:
+            camera_manager: Manager owning the cameras and their workers
+            interval: Seconds between scans of the USB cameras
+            hold_off: Callback returning True while scans must wait (near a trigger)
+            use_udev: Also scan on USB udev events, if pyudev is installed
+        """
+        self.camera_manager = camera_manager
+        self.interval = interval
+        self.hold_off = hold_off
+        self.use_udev = use_udev and PYUDEV_AVAILABLE
+        self.logger = logging.getLogger('hotplug')
+        
+        self.lost: Dict[int, str] = {}  # camera -> last known port
+        self._reconnecting: Dict[int, Tuple[str, Future]] = {}  # camera -> (new port, reconnection)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._udev = None
+        
+        self.disconnects = 0
+        self.reconnects = 0
+        self.failed = 0
+    
+    def start(self):
+        """Start scanning in the background."""
+        if self._thread is not None:
+            return
+        if self.use_udev:
+            self._udev = self._open_udev()
+        self._thread = threading.Thread(target=self._run, name='Hotplug', daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop scanning. Reconnections in progress finish on their camera workers.
+        
+        Args:
+            timeout: Seconds to wait for a scan in progress (None: do not wait)
+        """
+        self._stopping.set()
+        if self._thread is not None and timeout is not None:
+            self._thread.join(timeout)
+    
+    def scan_once(self) -> Tuple[List[int], List[int]]:
+        """
+        Compare the detected cameras with the managed ones and act on the differences.
+        
+        Returns:
+            Tuple of (cameras found missing, cameras whose reconnection was started)
+        """
+        while self.hold_off is not None and self.hold_off() and not self._stopping.is_set():
+            self._stopping.wait(HEALTH_HOLD_OFF_POLL)
+        if self._stopping.is_set():
+            return [], []
+        
+        try:
+            detected = self.camera_manager.autodetect()
+        except Exception as e:
+            # No information: do not mistake a failed scan for unplugged cameras
+            self.logger.warning(f"Camera scan failed: {e}")
+            return [], []
+        
+        ports = {address: name for name, address in detected}
+        manager = self.camera_manager
+        
+        # Cameras taken out by the circuit breaker are still plugged in and hold their port
+        watched = set(manager.active_cameras)
+        if manager.breaker is not None:
+            watched.update(manager.breaker.tripped_cameras())
+        
+        missing = []
+        for camera_id in sorted(watched):
+            controller = manager.cameras.get(camera_id)
+            if controller is None or controller.address is None or controller.address in ports:
+                continue
+            self.logger.error(f"Camera {camera_id} ({controller.name}) no longer detected at {controller.address}")
+            manager.mark_lost(camera_id)
+            with self._lock:
+                self.lost[camera_id] = controller.address
+                self.disconnects += 1
+            missing.append(camera_id)
+        
+        with self._lock:
+            claimed = {controller.address for camera_id, controller in manager.cameras.items()
+                       if camera_id in watched and camera_id not in missing}
+            claimed.update(address for address, _ in self._reconnecting.values())
+            waiting = [camera_id for camera_id in sorted(self.lost) if camera_id not in self._reconnecting]
+        
+        started = []
+        for camera_id in waiting:
+            controller = manager.cameras.get(camera_id)
+            if controller is None:
+                with self._lock:
+                    self.lost.pop(camera_id, None)
+                continue
+            address = next((address for address, name in ports.items()
+                            if name == controller.name and address not in claimed), None)
+            if address is None:
+                continue
+            
+            claimed.add(address)
+            self.logger.info(f"Camera {camera_id} ({controller.name}) detected at {address}, reconnecting")
+            future = manager.reconnect(camera_id, address)
+            with self._lock:
+                self._reconnecting[camera_id] = (address, future)
+            future.add_done_callback(lambda done, camera_id=camera_id: self._reconnected(camera_id, done))
+            started.append(camera_id)
+        
+        return missing, started
+    
+    def format_report(self) -> List[str]:
+        """
+        Format the monitor statistics as report lines for the log.
+        
+        Returns:
+            List of human-readable lines
+        """
+        with self._lock:
+            lines = [f"Hot-plug: {self.disconnects} cameras lost, {self.reconnects} reconnected, "
+                     f"{self.failed} failed reconnections"]
+            if self.lost:
+                lines.append(f"Cameras still missing: {sorted(self.lost)}")
+        return lines
+    
+    def _reconnected(self, camera_id: int, future: Future):
+        """Put a reconnected camera back in the active set (camera worker thread)."""
+        try:
+            success = not future.cancelled() and future.result()
+        except Exception as e:
+            self.logger.error(f"Reconnection of camera {camera_id} failed: {e}")
+            success = False
+        
+        with self._lock:
+            self._reconnecting.pop(camera_id, None)
+            if not success:
+                self.failed += 1
+                return
+            self.lost.pop(camera_id, None)
+            self.reconnects += 1
+        self.camera_manager.rejoin(camera_id)
+    
+    def _open_udev(self):
+        """Open a udev monitor for USB device events, or None to poll only."""
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by(subsystem='usb', device_type='usb_device')
+            monitor.start()
+        except Exception as e:
+            self.logger.info(f"udev events unavailable ({e}), polling every {self.interval:g}s")
+            return None
+        self.logger.info("Watching udev USB events")
+        return monitor
+    
+    def _wait(self):
+        """Wait for the next scan: the poll interval, cut short by a USB event."""
+        if self._udev is None:
+            self._stopping.wait(self.interval)
+            return
+        
+        waited = 0.0
+        while waited < self.interval and not self._stopping.is_set():
+            try:
+                device = self._udev.poll(timeout=UDEV_POLL_SLICE)
+            except Exception as e:
+                self.logger.warning(f"udev monitor failed ({e}), polling every {self.interval:g}s")
+                self._udev = None
+                self._stopping.wait(max(0.0, self.interval - waited))
+                return
+            if device is not None:
+                self.logger.debug(f"USB {device.action}: {device.device_path}")
+                return
+            waited += UDEV_POLL_SLICE
+    
+    def _run(self):
+        """Scan until stopped (monitor thread)."""
+        while not self._stopping.is_set():
+            try:
+                self.scan_once()
+            except Exception as e:
+                self.logger.error(f"Hot-plug monitor error: {e}")
+            self._wait()
@@ -7,8 +7,8 @@ across all connected cameras.
 
 import threading
 import logging
-from typing import Dict, List, Optional, Any
-import time
+from concurrent.futures import Future, wait as futures_wait
+from typing import Callable, Dict, Iterable, List, Optional, Any, Sequence, Tuple, TYPE_CHECKING
 
 # Import with fallback for development
 try:
@@ -20,7 +20,23 @@ except ImportError:
     from .camera_controller import gp
 
 from .camera_controller import CameraController
+from .capabilities import CapabilityCache
+from .setting_values import SettingsResolver
+from .camera_worker import CameraWorker, ReleaseBarrier, release_skew_ns
+from .download_pipeline import DownloadPipeline
+from .health_monitor import HealthMonitor
+from .hotplug import HotplugMonitor
+from .circuit_breaker import CircuitBreaker
 from config.eclipse_config import CameraSettings, CameraStatus
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.constants import (
+    MAX_CAPTURE_TIMEOUT, CAMERA_CONNECT_TIMEOUT, CAMERA_COMMAND_TIMEOUT, FILE_COLLECT_TIMEOUT,
+    STATUS_POLL_INTERVAL, HEALTH_STATUS_TTL, HOTPLUG_POLL_INTERVAL, BREAKER_FAILURE_THRESHOLD,
+    BREAKER_PROBE_INTERVAL
+)
+
+if TYPE_CHECKING:
+    from scheduling.deadline_waiter import DeadlineWaiter
 
 
 class MultiCameraManager:
@@ -32,20 +48,56 @@ class MultiCameraManager:
     - Synchronized configuration
     - Parallel capture operations
     - Error isolation per camera
+    
+    Operations fanned out to several cameras run concurrently on the
+    cameras' worker threads, so they cost the latency of the slowest camera
+    rather than the sum of all of them.
     """
     
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None, capability_cache: Optional[CapabilityCache] = None,
+                 waiter: Optional['DeadlineWaiter'] = None):
+        """
+        Initialize multi-camera manager.
+        
+        Args:
+            clock: Clock for delays and timestamps, shared with the cameras (default: system clock)
+            capability_cache: On-disk store of probed camera capabilities, shared
+                with the cameras (default: probe on every connection)
+            waiter: Calibrated deadline waiter timing the cameras' bulb
+                exposures (default: one uncalibrated waiter per camera)
+        """
+        self.clock = clock or SYSTEM_CLOCK
+        self.capability_cache = capability_cache
+        self.waiter = waiter
         self.cameras: Dict[int, CameraController] = {}
         self.active_cameras: List[int] = []
         self.logger = logging.getLogger('multi_camera_manager')
         
         # Thread safety for parallel operations
         self._operation_lock = threading.Lock()
+        self._workers: Dict[int, CameraWorker] = {}
+        
+        # Optional background transfer of captured images to the host
+        self.downloads: Optional[DownloadPipeline] = None
         
-    def discover_cameras(self) -> List[int]:
+        # Optional background status polling serving cached statuses
+        self.health: Optional[HealthMonitor] = None
+        
+        # Optional detection of unplugged cameras and their reconnection
+        self.hotplug: Optional[HotplugMonitor] = None
+        
+        # Optional exclusion of cameras failing their captures, until they answer again
+        self.breaker: Optional[CircuitBreaker] = None
+    
+    def discover_cameras(self, timeout: float = CAMERA_CONNECT_TIMEOUT) -> List[int]:
         """
         Discover and connect to all available cameras.
         
+        Cameras are connected in parallel, each on its own worker thread.
+        
+        Args:
+            timeout: Seconds to wait for the cameras to connect
+        
         Returns:
             List of camera IDs that were successfully connected
         """
@@ -53,27 +105,34 @@ class MultiCameraManager:
         
         try:
             if not GPHOTO2_AVAILABLE:
-                # Mock discovery for development
                 self.logger.info("Mock camera discovery")
-                camera_list = [("Mock Canon Camera 1", "usb:001,002"),
-                              ("Mock Canon Camera 2", "usb:001,003")]
-            else:
-                camera_list = gp.gp_camera_autodetect()
+            camera_list = self.autodetect()
 
-            discovered_cameras = []
-            
+            controllers = {}
+            addresses = {}
             for index, (name, address) in enumerate(camera_list):
                 self.logger.info(f"Found camera {index}: {name} at {address}")
-                
-                # Create controller and attempt connection
-                controller = CameraController(index, name)
-                
-                if controller.connect(address):
+                controllers[index] = CameraController(index, name, clock=self.clock,
+                                                      capability_cache=self.capability_cache,
+                                                      waiter=self.waiter)
+                addresses[index] = address
+            
+            connected = self._run_on_workers(
+                list(controllers), "Connection",
+                lambda camera_id: controllers[camera_id].connect(addresses[camera_id]),
+                timeout, lambda camera_id, error: False)
+            
+            discovered_cameras = []
+            for index, controller in controllers.items():
+                if connected[index]:
                     self.cameras[index] = controller
                     discovered_cameras.append(index)
                     self.logger.info(f"Camera {index} connected successfully")
                 else:
                     self.logger.warning(f"Failed to connect to camera {index}")
+                    # Release the camera if a late connection still goes through
+                    self.get_worker(index).submit(controller.disconnect)
+                    self._stop_worker(index)
             
             self.active_cameras = discovered_cameras
             self.logger.info(f"Discovery complete: {len(discovered_cameras)} cameras available")
@@ -84,6 +143,370 @@ class MultiCameraManager:
             self.logger.error(f"Error during camera discovery: {e}")
             return []
     
+    def autodetect(self) -> List[Tuple[str, str]]:
+        """
+        List the cameras currently on the bus, without connecting to them.
+        
+        Returns:
+            List of (camera name, port) pairs
+        """
+        if not GPHOTO2_AVAILABLE:
+            # Mock discovery for development
+            return [("Mock Canon Camera 1", "usb:001,002"),
+                    ("Mock Canon Camera 2", "usb:001,003")]
+        return list(gp.gp_camera_autodetect())
+    
+    def mark_lost(self, camera_id: int):
+        """
+        Take a camera that dropped off the bus out of all operations.
+        
+        The camera keeps its ID and controller so it can rejoin. Its worker
+        is replaced, since the old one may be stuck in a call to the
+        vanished device.
+        
+        Args:
+            camera_id: ID of the lost camera
+        """
+        self.suspend(camera_id)
+        self._stop_worker(camera_id)
+        if self.health is not None:
+            self.health.forget(camera_id)
+        if self.breaker is not None:
+            self.breaker.forget(camera_id)
+        self.logger.warning(f"Camera {camera_id} lost, {len(self.active_cameras)} cameras remain active")
+    
+    def suspend(self, camera_id: int):
+        """
+        Take a camera out of the active set, keeping its controller and worker.
+        
+        Args:
+            camera_id: ID of the camera to leave out of operations
+        """
+        with self._operation_lock:
+            self.active_cameras = [cid for cid in self.active_cameras if cid != camera_id]
+    
+    def reconnect(self, camera_id: int, address: Optional[str] = None) -> Future:
+        """
+        Reconnect a lost camera on its worker thread, without waiting for it.
+        
+        Args:
+            camera_id: ID of the lost camera
+            address: Port the camera now answers on (default: its previous port)
+        
+        Returns:
+            Future resolved with True once the camera is connected and its
+            settings restored
+        """
+        return self.get_worker(camera_id).submit(self.cameras[camera_id].reconnect, address)
+    
+    def rejoin(self, camera_id: int):
+        """
+        Put a reconnected camera back in the active set, for the next operations.
+        
+        Args:
+            camera_id: ID of the reconnected camera
+        """
+        with self._operation_lock:
+            if camera_id not in self.cameras or camera_id in self.active_cameras:
+                return
+            self.active_cameras = sorted(self.active_cameras + [camera_id])
+        self.logger.info(f"Camera {camera_id} back in service, {len(self.active_cameras)} cameras active")
+    
+    def submit_captures(self, camera_ids: List[int], test_mode: bool = False,
+                        release_at_ns: Optional[int] = None, burst_ns: int = 0,
+                        burst_frames: int = 0, bracket: Sequence[str] = (),
+                        bulb_ns: int = 0) -> Dict[int, Future]:
+        """
+        Queue a synchronized capture on the workers of several cameras.
+        
+        Idle workers stage the capture and fire together through a shared
+        ReleaseBarrier. A worker still busy with a previous command cannot
+        join the barrier without holding the others back, so it fires as
+        soon as it is free.
+        
+        Args:
+            camera_ids: Cameras to capture with
+            test_mode: If True, simulate captures
+            release_at_ns: Monotonic release instant (default: as soon as staged)
+            burst_ns: If set, hold the release in continuous drive this long
+                (see CameraController.capture_burst) instead of taking one frame
+            burst_frames: Frames after which a burst is let go (0: no limit)
+            bracket: If set, capture one frame per shutter value in this order
+                (see CameraController.capture_bracket)
+            bulb_ns: If set, take a bulb exposure this long, timed by the host
+                (see CameraController.capture_bulb)
+        
+        Returns:
+            Dictionary mapping camera ID to a future resolved with (file path,
+            list of frame paths for a burst or bracket, or None if failed,
+            start_ns, end_ns) of its capture call; for a bulb exposure, start_ns
+            and end_ns are the measured shutter open and close
+        """
+        workers = {camera_id: self.get_worker(camera_id) for camera_id in camera_ids}
+        staged = [camera_id for camera_id, worker in workers.items() if worker.is_idle()]
+        busy = [camera_id for camera_id in camera_ids if camera_id not in staged]
+        if busy:
+            self.logger.warning(f"Cameras {busy} still busy, released without synchronization")
+        
+        release = ReleaseBarrier(len(staged), self.clock, release_at_ns) if staged else None
+        
+        def capture_single_camera(camera_id: int, synchronized: bool) -> Tuple[Optional[str], int, int]:
+            """Capture on the camera's worker thread."""
+            if synchronized and not release.wait():
+                self.logger.warning(f"Camera {camera_id} released alone: barrier timed out")
+            controller = self.cameras[camera_id]
+            start_ns = self.clock.monotonic_ns()
+            if burst_ns:
+                result = controller.capture_burst(burst_ns, burst_frames, test_mode) or None
+            elif bracket:
+                result = controller.capture_bracket(bracket, test_mode) or None
+            elif bulb_ns:
+                result = controller.capture_bulb(bulb_ns, test_mode)
+            else:
+                result = controller.capture_image(test_mode)
+            end_ns = self.clock.monotonic_ns()
+            if bulb_ns and controller.last_bulb is not None:
+                start_ns, end_ns = controller.last_bulb
+            if (result and not test_mode and self.downloads is not None and controller.ram_capture_dir is None
+                    and (burst_ns or bulb_ns or not controller.trigger_mode)):
+                # RAM captures are already on the host; triggered frames arrive as events,
+                # burst and bulb frames are collected by the capture itself
+                for path in (result if isinstance(result, list) else [result]):
+                    self.downloads.enqueue(camera_id, path)
+            return result, start_ns, end_ns
+        
+        return {
+            camera_id: worker.submit(capture_single_camera, camera_id, camera_id in staged)
+            for camera_id, worker in workers.items()
+        }
+    
+    def record_capture(self, camera_id: int, success: bool, reason: str = "capture failed"):
+        """
+        Count a capture outcome towards the camera's circuit breaker, if enabled.
+        
+        Called once per capture by the code awaiting it, so a capture that
+        timed out is not counted again when it completes late.
+        
+        Args:
+            camera_id: Camera ID
+            success: True if the capture produced an image
+            reason: Description of the failure, for the logs
+        """
+        if self.breaker is not None:
+            self.breaker.record(camera_id, success, reason)
+    
+    def enable_circuit_breaker(self, hold_off: Optional[Callable[[], bool]] = None,
+                               threshold: int = BREAKER_FAILURE_THRESHOLD,
+                               probe_interval: float = BREAKER_PROBE_INTERVAL) -> CircuitBreaker:
+        """
+        Take cameras out of the shots after consecutive failed captures, and back once they answer.
+        
+        Args:
+            hold_off: Callback returning True while probes must wait (near a trigger)
+            threshold: Consecutive failed or timed out captures tripping the breaker
+            probe_interval: Seconds between probes of the cameras taken out
+        
+        Returns:
+            Started circuit breaker
+        """
+        if self.breaker is not None:
+            self.breaker.stop()
+        self.breaker = CircuitBreaker(self, threshold, probe_interval, hold_off=hold_off)
+        self.breaker.start()
+        self.logger.info(f"Cameras taken out after {threshold} failed captures, probed every {probe_interval:g}s")
+        return self.breaker
+    
+    def enable_downloads(self, download_dir: str, delete_after_download: bool = False,
+                         hold_off: Optional[Callable[[], bool]] = None) -> DownloadPipeline:
+        """
+        Copy every real capture to the host in the background.
+        
+        Args:
+            download_dir: Host directory receiving one subdirectory per camera
+            delete_after_download: If True, delete verified images from the cameras
+            hold_off: Callback returning True while downloads must wait (near a trigger)
+        
+        Returns:
+            Download pipeline fed by capture_all
+        """
+        self.downloads = DownloadPipeline(self, download_dir, delete_after_download=delete_after_download,
+                                          hold_off=hold_off, clock=self.clock)
+        self.logger.info(f"Images will be downloaded to {download_dir}"
+                         f"{' and deleted from the cameras' if delete_after_download else ''}")
+        return self.downloads
+    
+    def enable_health_monitor(self, hold_off: Optional[Callable[[], bool]] = None,
+                              interval: float = STATUS_POLL_INTERVAL,
+                              ttl: float = HEALTH_STATUS_TTL) -> HealthMonitor:
+        """
+        Poll camera status in the background and serve status queries from the cache.
+        
+        Args:
+            hold_off: Callback returning True while polls must wait (near a trigger)
+            interval: Seconds between polls of all active cameras
+            ttl: Seconds a polled status is served before cameras are queried again
+        
+        Returns:
+            Started health monitor
+        """
+        if self.health is not None:
+            self.health.stop()
+        self.health = HealthMonitor(self, interval, ttl, hold_off=hold_off, clock=self.clock)
+        self.health.start()
+        self.logger.info(f"Camera health polled every {interval:g}s, cached for {ttl:g}s")
+        return self.health
+    
+    def enable_hotplug(self, hold_off: Optional[Callable[[], bool]] = None,
+                       interval: float = HOTPLUG_POLL_INTERVAL) -> HotplugMonitor:
+        """
+        Watch for cameras leaving and returning to the bus, and reconnect them in the background.
+        
+        Args:
+            hold_off: Callback returning True while scans must wait (near a trigger)
+            interval: Seconds between scans
+        
+        Returns:
+            Started hot-plug monitor
+        """
+        if self.hotplug is not None:
+            self.hotplug.stop()
+        self.hotplug = HotplugMonitor(self, interval, hold_off=hold_off)
+        self.hotplug.start()
+        self.logger.info(f"Watching for camera hot-plug every {interval:g}s")
+        return self.hotplug
+    
+    def enable_ram_capture(self, download_dir: Optional[str],
+                           timeout: float = CAMERA_COMMAND_TIMEOUT) -> Dict[int, bool]:
+        """
+        Switch the active cameras to RAM capture streamed to the host, or back to the card.
+        
+        Cameras that cannot switch keep their current target; with downloads
+        enabled, their card images are still copied in the background.
+        
+        Args:
+            download_dir: Root host directory for the images, or None to capture to the cards
+            timeout: Seconds to wait for the cameras to switch
+        
+        Returns:
+            Dictionary mapping camera ID to success status
+        """
+        results = self._run_on_workers(
+            list(self.active_cameras), "Capture target change",
+            lambda camera_id: self.cameras[camera_id].enable_ram_capture(download_dir),
+            timeout, lambda camera_id, error: False)
+        
+        failed = [camera_id for camera_id, success in results.items() if not success]
+        if failed:
+            self.logger.warning(f"Cameras {failed} could not change capture target")
+        return results
+    
+    def enable_trigger_mode(self, enabled: bool = True):
+        """
+        Release shutters without waiting for the image files on the active cameras.
+        
+        Each capture then returns as soon as the shutter is triggered, and
+        the next one can start while the camera is still writing the
+        previous frame. The files are collected from camera events after
+        later triggers, during status polls, and by collect_files.
+        
+        Args:
+            enabled: True for trigger mode, False to wait for each file again
+        """
+        for camera_id in self.active_cameras:
+            controller = self.cameras[camera_id]
+            controller.trigger_mode = enabled
+            controller.file_added = self._file_added if enabled else None
+        self.logger.info(f"Trigger capture mode {'enabled' if enabled else 'disabled'}")
+    
+    def collect_files(self, timeout: float = FILE_COLLECT_TIMEOUT) -> Dict[int, int]:
+        """
+        Wait for the files of every triggered frame.
+        
+        Args:
+            timeout: Seconds to wait for the cameras to report their files
+        
+        Returns:
+            Dictionary mapping camera ID to number of frames still without a file
+        """
+        pending = [camera_id for camera_id in self.active_cameras if self.cameras[camera_id].pending_frames]
+        remaining = self._run_on_workers(
+            pending, "File collection",
+            lambda camera_id: self.cameras[camera_id].wait_for_files(int(timeout * 1000)),
+            timeout + 1, lambda camera_id, error: self.cameras[camera_id].pending_frames)
+        
+        for camera_id, count in remaining.items():
+            if count:
+                self.logger.warning(f"Camera {camera_id}: {count} triggered frames not reported")
+        return remaining
+    
+    def _file_added(self, camera_id: int, path: str):
+        """Queue the file of a triggered frame for download (camera worker thread)."""
+        if self.downloads is not None and self.cameras[camera_id].ram_capture_dir is None:
+            self.downloads.enqueue(camera_id, path)
+    
+    def get_worker(self, camera_id: int) -> CameraWorker:
+        """
+        Get the persistent worker thread of a camera, starting it if needed.
+        
+        Args:
+            camera_id: Camera ID
+        
+        Returns:
+            Worker running the camera's commands in order
+        """
+        with self._operation_lock:
+            worker = self._workers.get(camera_id)
+            if worker is None:
+                worker = CameraWorker(camera_id)
+                self._workers[camera_id] = worker
+            return worker
+    
+    def _run_on_workers(self, camera_ids: List[int], operation: str, func: Callable[[int], Any],
+                        timeout: float, on_error: Callable[[int, str], Any]) -> Dict[int, Any]:
+        """
+        Run a command on several camera workers concurrently.
+        
+        All commands share one deadline. A camera that fails or misses it
+        gets a fallback result without affecting the others; its command is
+        cancelled if it has not started yet.
+        
+        Args:
+            camera_ids: Cameras to run the command on
+            operation: Operation name for log messages
+            func: Command called with the camera ID on the camera's worker
+            timeout: Seconds to wait for all cameras
+            on_error: Called with the camera ID and error message to build
+                the result of a failed camera
+        
+        Returns:
+            Dictionary mapping camera ID to command result
+        """
+        futures = {camera_id: self.get_worker(camera_id).submit(func, camera_id) for camera_id in camera_ids}
+        futures_wait(futures.values(), timeout=timeout)
+        
+        results = {}
+        for camera_id, future in futures.items():
+            if not future.done():
+                future.cancel()
+                self.logger.warning(f"{operation} on camera {camera_id} timed out after {timeout}s")
+                results[camera_id] = on_error(camera_id, f"{operation} timed out after {timeout}s")
+                continue
+            
+            try:
+                results[camera_id] = future.result()
+            except Exception as e:
+                self.logger.error(f"{operation} error on camera {camera_id}: {e}")
+                results[camera_id] = on_error(camera_id, str(e))
+        
+        return results
+    
+    def _stop_worker(self, camera_id: int):
+        """Stop a camera's worker thread after its queued commands."""
+        with self._operation_lock:
+            worker = self._workers.pop(camera_id, None)
+        if worker is not None:
+            worker.stop()
+    
     def get_camera_count(self) -> int:
         """Get number of active cameras."""
         return len(self.active_cameras)
@@ -92,12 +515,15 @@ class MultiCameraManager:
         """Get mapping of camera IDs to names."""
         return {cid: self.cameras[cid].name for cid in self.active_cameras}
     
-    def configure_all(self, settings: CameraSettings) -> Dict[int, bool]:
+    def configure_all(self, settings: CameraSettings, camera_ids: Optional[List[int]] = None,
+                      timeout: float = CAMERA_COMMAND_TIMEOUT) -> Dict[int, bool]:
         """
-        Configure all active cameras with the same settings.
+        Configure all active cameras with the same settings, in parallel.
         
         Args:
             settings: Camera settings to apply
+            camera_ids: Restrict to these cameras (default: all active cameras)
+            timeout: Seconds to wait for the cameras to be configured
             
         Returns:
             Dictionary mapping camera ID to success status
@@ -105,25 +531,120 @@ class MultiCameraManager:
         self.logger.info(f"Configuring all cameras: ISO {settings.iso}, "
                         f"{settings.aperture}, {settings.shutter}")
         
-        results = {}
+        results = self._run_on_workers(
+            self.select_cameras(camera_ids), "Configuration",
+            lambda camera_id: self.cameras[camera_id].configure_settings(settings),
+            timeout, lambda camera_id, error: False)
         
-        for camera_id in self.active_cameras:
-            try:
-                success = self.cameras[camera_id].configure_settings(settings)
-                results[camera_id] = success
-                
-                if not success:
-                    self.logger.warning(f"Configuration failed for camera {camera_id}")
-            
-            except Exception as e:
-                self.logger.error(f"Error configuring camera {camera_id}: {e}")
-                results[camera_id] = False
+        for camera_id, success in results.items():
+            if not success:
+                self.logger.warning(f"Configuration failed for camera {camera_id}")
         
         successful_configs = sum(1 for success in results.values() if success)
         self.logger.info(f"Configuration complete: {successful_configs}/{len(results)} successful")
         
         return results
     
+    def verify_all(self, settings: CameraSettings, camera_ids: Optional[List[int]] = None,
+                   timeout: float = CAMERA_COMMAND_TIMEOUT) -> Dict[int, bool]:
+        """
+        Check in parallel that cameras report the given settings.
+        
+        Args:
+            settings: Camera settings expected to be applied
+            camera_ids: Restrict to these cameras (default: all active cameras)
+            timeout: Seconds to wait for the cameras to answer
+        
+        Returns:
+            Dictionary mapping camera ID to verification status
+        """
+        return self._run_on_workers(
+            self.select_cameras(camera_ids), "Verification",
+            lambda camera_id: self.cameras[camera_id].verify_settings(settings),
+            timeout, lambda camera_id, error: False)
+    
+    def raise_mirrors(self, camera_ids: Optional[List[int]] = None, test_mode: bool = False,
+                      delay_ms: int = 0, timeout: float = CAMERA_COMMAND_TIMEOUT) -> Dict[int, Optional[int]]:
+        """
+        Lock the mirrors of several cameras up in parallel.
+        
+        Args:
+            camera_ids: Restrict to these cameras (default: all active cameras)
+            test_mode: If True, simulate the lockup
+            delay_ms: Planned delay between mirror up and shutter
+            timeout: Seconds to wait for the mirrors to go up
+        
+        Returns:
+            Dictionary mapping camera ID to the monotonic instant its mirror
+            went up, or None if the lockup failed
+        """
+        def lock_up(camera_id: int) -> Optional[int]:
+            controller = self.cameras[camera_id]
+            if not controller.mirror_lockup(True, delay_ms, test_mode):
+                return None
+            return controller.mirror_up_ns
+        
+        return self._run_on_workers(self.select_cameras(camera_ids), "Mirror lockup", lock_up,
+                                    timeout, lambda camera_id, error: None)
+    
+    def unsupported_settings(self, settings_list: Iterable[CameraSettings],
+                             camera_ids: Optional[List[int]] = None) -> Dict[int, List[str]]:
+        """
+        Check settings against the capabilities of the cameras, without accessing them.
+        
+        Args:
+            settings_list: Camera settings the sequence will apply
+            camera_ids: Cameras to check (default: active cameras)
+        
+        Returns:
+            Dictionary mapping the ID of each camera refusing a value to the
+            refused widget values, without duplicates
+        """
+        settings_list = list(settings_list)
+        refused = {}
+        for camera_id in self.select_cameras(camera_ids):
+            unsupported = []
+            for settings in settings_list:
+                for value in self.cameras[camera_id].unsupported_settings(settings):
+                    if value not in unsupported:
+                        unsupported.append(value)
+            if unsupported:
+                refused[camera_id] = unsupported
+        return refused
+    
+    def settings_resolver(self, camera_ids: Optional[List[int]] = None) -> SettingsResolver:
+        """
+        Build a resolver snapping settings to values every camera accepts.
+        
+        Each widget is indexed from the choices common to the cameras whose
+        capabilities are known; widgets with no known or no common choices
+        fall back to the GPhoto2 tables, and the capability check reports
+        the values a camera refuses.
+        
+        Args:
+            camera_ids: Cameras the settings are for (default: active cameras)
+        
+        Returns:
+            Settings resolver
+        """
+        choices: Dict[str, List[str]] = {}
+        for camera_id in self.select_cameras(camera_ids):
+            capabilities = self.cameras[camera_id].capabilities
+            if capabilities is None:
+                continue
+            for widget_name, values in capabilities.choices.items():
+                if not values:
+                    continue
+                if widget_name in choices:
+                    choices[widget_name] = [value for value in choices[widget_name] if value in values]
+                else:
+                    choices[widget_name] = list(values)
+        
+        for widget_name, values in choices.items():
+            if not values:
+                self.logger.warning(f"No {widget_name} value is accepted by every camera")
+        return SettingsResolver(choices)
+    
     def configure_individual(self, camera_id: int, settings: CameraSettings) -> bool:
         """
         Configure a specific camera.
@@ -141,73 +662,108 @@ class MultiCameraManager:
         
         return self.cameras[camera_id].configure_settings(settings)
     
-    def capture_all(self, test_mode: bool = False) -> Dict[int, Optional[str]]:
+    def capture_all(self, test_mode: bool = False, camera_ids: Optional[List[int]] = None,
+                    capture_timings: Optional[Dict[int, Tuple[int, int]]] = None,
+                    timeout: float = MAX_CAPTURE_TIMEOUT,
+                    release_at_ns: Optional[int] = None, burst_ns: int = 0,
+                    burst_frames: int = 0, bracket: Sequence[str] = (),
+                    bulb_ns: int = 0) -> Dict[int, Any]:
         """
         Capture photos with all cameras simultaneously.
         
-        Uses threading for parallel capture to minimize timing differences.
+        Each capture is queued to the camera's persistent worker thread, and
+        the idle workers are released together through a ReleaseBarrier.
         
         Args:
             test_mode: If True, simulate captures
-            
+            camera_ids: Restrict to these cameras (default: all active cameras)
+            capture_timings: Optional dictionary filled with the monotonic
+                (start, end) nanoseconds of each camera's capture call, or of
+                its shutter open and close for a bulb exposure
+            timeout: Total seconds to wait for all cameras
+            release_at_ns: Monotonic instant at which the shutters should be
+                released (default: as soon as every camera is staged)
+            burst_ns: If set, hold the release in continuous drive this long
+            burst_frames: Frames after which a burst is let go (0: no limit)
+            bracket: If set, capture one frame per shutter value in this order
+            bulb_ns: If set, take a bulb exposure this long, timed by the host
+        
         Returns:
-            Dictionary mapping camera ID to captured file path (or None if failed)
+            Dictionary mapping camera ID to captured file path, or list of
+            frame paths for a burst or bracket (None if failed)
         """
-        self.logger.info(f"Capturing with all cameras (test_mode={test_mode})")
+        sequence_text = ""
+        if burst_ns:
+            sequence_text = f", burst {burst_ns / 1e9:g}s"
+        elif bracket:
+            sequence_text = f", bracket {' '.join(bracket)}"
+        elif bulb_ns:
+            sequence_text = f", bulb {bulb_ns / 1e9:g}s"
+        self.logger.info(f"Capturing with all cameras (test_mode={test_mode}{sequence_text})")
         
-        results = {}
-        threads = []
+        futures = self.submit_captures(self.select_cameras(camera_ids), test_mode, release_at_ns,
+                                       burst_ns, burst_frames, bracket, bulb_ns)
         
-        # Capture start time for synchronization
-        capture_start_time = time.time()
+        # One deadline for the whole shot, not one per camera
+        futures_wait(futures.values(), timeout=timeout)
         
-        def capture_single_camera(camera_id: int):
-            """Capture function for individual camera thread."""
+        results = {}
+        timings = {}
+        for camera_id, future in futures.items():
+            if not future.done():
+                self.logger.warning(f"Capture on camera {camera_id} timed out after {timeout}s")
+                self.record_capture(camera_id, False, f"timed out after {timeout}s")
+                results[camera_id] = None
+                continue
+            
             try:
-                # Small delay to synchronize start times
-                sleep_time = 0.1 - (time.time() - capture_start_time)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                
-                result = self.cameras[camera_id].capture_image(test_mode)
-                
-                with self._operation_lock:
-                    results[camera_id] = result
-                    
+                results[camera_id], start_ns, end_ns = future.result()
+                timings[camera_id] = (start_ns, end_ns)
             except Exception as e:
                 self.logger.error(f"Error capturing with camera {camera_id}: {e}")
-                with self._operation_lock:
-                    results[camera_id] = None
+                self.record_capture(camera_id, False, str(e))
+                results[camera_id] = None
+            else:
+                self.record_capture(camera_id, results[camera_id] is not None)
         
-        # Start capture threads
-        for camera_id in self.active_cameras:
-            thread = threading.Thread(
-                target=capture_single_camera,
-                args=(camera_id,),
-                name=f"Capture_Camera_{camera_id}"
-            )
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all captures to complete
-        for thread in threads:
-            thread.join(timeout=30.0)  # 30 second timeout per capture
-            
-            if thread.is_alive():
-                self.logger.warning(f"Capture thread {thread.name} timed out")
+        if capture_timings is not None:
+            capture_timings.update(timings)
         
         # Log results
         successful_captures = sum(1 for result in results.values() if result is not None)
-        self.logger.info(f"Capture complete: {successful_captures}/{len(results)} successful")
+        skew_ns = release_skew_ns(timings)
+        skew_text = f", release skew {skew_ns / 1e6:.3f}ms" if skew_ns is not None else ""
+        self.logger.info(f"Capture complete: {successful_captures}/{len(results)} successful{skew_text}")
         
         for camera_id, result in results.items():
-            if result:
+            if isinstance(result, list):
+                self.logger.info(f"Camera {camera_id}: {len(result)} frames, {result[0]} to {result[-1]}")
+            elif result:
                 self.logger.info(f"Camera {camera_id}: {result}")
             else:
                 self.logger.error(f"Camera {camera_id}: Capture failed")
         
         return results
     
+    def select_cameras(self, camera_ids: Optional[List[int]]) -> List[int]:
+        """
+        Get the active cameras targeted by an operation.
+        
+        Args:
+            camera_ids: Requested camera IDs, or None for all active cameras
+            
+        Returns:
+            Requested cameras that are currently active
+        """
+        if camera_ids is None:
+            return list(self.active_cameras)
+        
+        inactive = [cid for cid in camera_ids if cid not in self.active_cameras]
+        if inactive:
+            self.logger.warning(f"Ignoring inactive cameras: {inactive}")
+        
+        return [cid for cid in camera_ids if cid in self.active_cameras]
+    
     def capture_sequence(self, count: int, interval: float, test_mode: bool = False) -> List[Dict[int, Optional[str]]]:
         """
         Capture a sequence of photos with all cameras.
@@ -233,40 +789,54 @@ class MultiCameraManager:
             
             # Wait for interval (except on last capture)
             if i < count - 1:
-                time.sleep(interval)
+                self.clock.sleep(interval)
         
         self.logger.info("Sequence complete")
         return sequence_results
     
-    def get_all_status(self) -> Dict[int, CameraStatus]:
+    def get_all_status(self, timeout: float = CAMERA_COMMAND_TIMEOUT) -> Dict[int, CameraStatus]:
         """
         Get status of all active cameras.
         
-        Returns:
-            Dictionary mapping camera ID to status
-        """
-        status_dict = {}
+        With the health monitor enabled, fresh cached statuses are returned
+        at once; only cameras without one are queried, in parallel.
         
-        for camera_id in self.active_cameras:
-            try:
-                status = self.cameras[camera_id].get_status()
-                status_dict[camera_id] = status
-            except Exception as e:
-                self.logger.error(f"Error getting status for camera {camera_id}: {e}")
-                status_dict[camera_id] = CameraStatus(connected=False, last_error=str(e))
+        Args:
+            timeout: Seconds to wait for the cameras to answer
         
-        return status_dict
+        Returns:
+            Dictionary mapping camera ID to status (disconnected with the
+            error for cameras that failed or did not answer in time)
+        """
+        return self._get_status(list(self.active_cameras), timeout)
+    
+    def _get_status(self, camera_ids: List[int], timeout: float) -> Dict[int, CameraStatus]:
+        """Get the status of cameras from the health cache, querying the others in parallel."""
+        cached = self.health.snapshots(camera_ids) if self.health is not None else {}
+        queried = self._run_on_workers(
+            [camera_id for camera_id in camera_ids if camera_id not in cached], "Status query",
+            lambda camera_id: self.cameras[camera_id].get_status(),
+            timeout, lambda camera_id, error: CameraStatus(connected=False, last_error=error))
+        
+        if self.health is not None:
+            for camera_id, status in queried.items():
+                if status.connected:
+                    self.health.record(camera_id, status)
+        return {camera_id: cached.get(camera_id) or queried[camera_id] for camera_id in camera_ids}
     
-    def validate_all_cameras(self) -> bool:
+    def validate_all_cameras(self, timeout: float = CAMERA_COMMAND_TIMEOUT) -> bool:
         """
         Validate that all cameras are ready for photography.
         
+        Args:
+            timeout: Seconds to wait for the cameras to report their status
+        
         Returns:
             True if all cameras are ready, False otherwise
         """
         self.logger.info("Validating all cameras...")
         
-        all_status = self.get_all_status()
+        all_status = self.get_all_status(timeout)
         all_ready = True
         
         for camera_id, status in all_status.items():
@@ -302,11 +872,22 @@ class MultiCameraManager:
         """Disconnect all cameras cleanly."""
         self.logger.info("Disconnecting all cameras...")
         
+        if self.hotplug is not None:
+            self.hotplug.stop(CAMERA_COMMAND_TIMEOUT)
+            self.hotplug = None
+        if self.breaker is not None:
+            self.breaker.stop(CAMERA_COMMAND_TIMEOUT)
+            self.breaker = None
+        if self.health is not None:
+            self.health.stop(CAMERA_COMMAND_TIMEOUT)
+            self.health = None
+        
         for camera_id, controller in self.cameras.items():
             try:
                 controller.disconnect()
             except Exception as e:
                 self.logger.error(f"Error disconnecting camera {camera_id}: {e}")
+            self._stop_worker(camera_id)
         
         self.cameras.clear()
         self.active_cameras.clear()
@@ -327,6 +908,11 @@ class MultiCameraManager:
                 self.logger.error(f"Error disconnecting camera {camera_id}: {e}")
             
             del self.cameras[camera_id]
+            self._stop_worker(camera_id)
+            if self.health is not None:
+                self.health.forget(camera_id)
+            if self.breaker is not None:
+                self.breaker.forget(camera_id)
             
             if camera_id in self.active_cameras:
                 self.active_cameras.remove(camera_id)
@@ -359,10 +945,11 @@ class MultiCameraManager:
             Dictionary with camera info
         """
         info = {}
+        all_status = self._get_status(list(self.cameras), CAMERA_COMMAND_TIMEOUT)
         
         for camera_id in self.cameras:
             controller = self.cameras[camera_id]
-            status = controller.get_status()
+            status = all_status[camera_id]
             
             info[camera_id] = {
                 'name': controller.name,
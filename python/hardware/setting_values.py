@@ -0,0 +1,203 @@
+"""
+Setting value lookup for Eclipse Photography Controller.
+
+Formatted settings do not always match the strings a camera lists for its
+widgets ("f/4" against "f/4.0", 1/2100 s between two stops). The values a
+widget accepts are indexed once, sorted by exposure, so any requested value
+is resolved to the nearest accepted one with a binary search. Resolution
+happens when the plan is compiled, and mismatches are reported before the
+event instead of failing when the settings are written.
+"""
+
+import math
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config.eclipse_config import CameraSettings
+from utils.constants import GPHOTO2_ISO_VALUES, GPHOTO2_APERTURE_VALUES, GPHOTO2_SHUTTER_VALUES
+from .camera_controller import parse_gphoto2_shutter
+
+
+def parse_iso(value: str) -> float:
+    """
+    Parse a GPhoto2 ISO string.
+    
+    Args:
+        value: GPhoto2 ISO string (e.g., "1600")
+    
+    Returns:
+        ISO sensitivity
+    
+    Raises:
+        ValueError: For non-numeric choices such as "Auto"
+    """
+    return float(value)
+
+
+def parse_aperture(value: str) -> float:
+    """
+    Parse a GPhoto2 aperture string.
+    
+    Args:
+        value: GPhoto2 aperture string (e.g., "f/5.6", "8")
+    
+    Returns:
+        Aperture f-number
+    
+    Raises:
+        ValueError: For non-numeric choices such as "implicit auto"
+    """
+    return float(value[2:] if value.startswith('f/') else value)
+
+
+# Settings widgets resolved at compile time: widget name -> (fallback table, parser)
+SETTING_TABLES = {
+    'iso': (GPHOTO2_ISO_VALUES, parse_iso),
+    'f-number': (GPHOTO2_APERTURE_VALUES, parse_aperture),
+    'shutterspeed': (GPHOTO2_SHUTTER_VALUES, parse_gphoto2_shutter)
+}
+
+# Relative difference under which two values are the same stop written differently
+SAME_VALUE_TOLERANCE = 0.01
+
+
+class ValueIndex:
+    """
+    Accepted values of a widget, sorted on a logarithmic (stop) scale.
+    
+    Choices that do not parse as numbers (bulb, Auto) are left out; they
+    only match themselves.
+    """
+    
+    def __init__(self, values: Iterable[str], parse: Callable[[str], float]):
+        """
+        Build the index.
+        
+        Args:
+            values: Accepted widget values, in any order
+            parse: Function converting a value to a positive number
+        """
+        self.parse = parse
+        self._accepted = set(values)
+        entries = []
+        for value in self._accepted:
+            try:
+                number = parse(value)
+            except (ValueError, ZeroDivisionError):
+                continue
+            if number > 0:
+                entries.append((math.log2(number), value))
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self.values = [value for _, value in entries]
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def nearest(self, number: float) -> Optional[str]:
+        """
+        Get the accepted value closest to a number, in stops.
+        
+        Args:
+            number: Positive setting value (seconds, f-number, ISO)
+        
+        Returns:
+            Closest accepted value, or None if the index is empty
+        """
+        if not self._keys:
+            return None
+        key = math.log2(number)
+        position = bisect_left(self._keys, key)
+        candidates = [index for index in (position - 1, position) if 0 <= index < len(self._keys)]
+        return self.values[min(candidates, key=lambda index: abs(self._keys[index] - key))]
+    
+    def snap(self, value: str) -> Optional[str]:
+        """
+        Resolve a formatted value to an accepted one.
+        
+        Args:
+            value: Formatted widget value
+        
+        Returns:
+            The value itself if accepted, else the nearest accepted value, or
+            None if the value is not numeric or nothing is indexed
+        """
+        if value in self._accepted:
+            return value
+        try:
+            number = self.parse(value)
+        except (ValueError, ZeroDivisionError):
+            return None
+        return self.nearest(number) if number > 0 else None
+
+
+class SettingsResolver:
+    """
+    Resolver snapping camera settings to the values the cameras accept.
+    
+    Each widget is indexed from the choices reported by the cameras when
+    known, and from the GPhoto2 value tables otherwise.
+    """
+    
+    def __init__(self, choices: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize settings resolver.
+        
+        Args:
+            choices: Widget name -> values accepted by every camera (default: GPhoto2 tables)
+        """
+        choices = choices or {}
+        self.indexes = {
+            widget_name: ValueIndex(choices.get(widget_name) or table, parse)
+            for widget_name, (table, parse) in SETTING_TABLES.items()
+        }
+    
+    @property
+    def shutters(self) -> ValueIndex:
+        """Index of the accepted shutter speeds."""
+        return self.indexes['shutterspeed']
+    
+    def resolve(self, settings: CameraSettings) -> CameraSettings:
+        """
+        Snap settings to accepted values.
+        
+        Values that cannot be resolved (bulb, unknown formats) are kept as
+        they are, for the capability check to report.
+        
+        Args:
+            settings: Formatted camera settings
+        
+        Returns:
+            Settings using accepted values
+        """
+        iso = self.indexes['iso'].snap(str(settings.iso)) if settings.iso else None
+        aperture = self.indexes['f-number'].snap(settings.aperture) if settings.aperture else None
+        shutter = self.indexes['shutterspeed'].snap(settings.shutter) if settings.shutter else None
+        return CameraSettings(
+            iso=int(iso) if iso else settings.iso,
+            aperture=aperture or settings.aperture,
+            shutter=shutter or settings.shutter
+        )
+    
+    def adjustments(self, settings: CameraSettings, resolved: CameraSettings) -> List[str]:
+        """
+        Describe the values changed by a resolution, ignoring notation-only changes.
+        
+        Args:
+            settings: Settings before resolution
+            resolved: Settings returned by resolve()
+        
+        Returns:
+            Descriptions of the changed values (e.g. "shutter 1/2100 -> 1/2000")
+        """
+        changes = []
+        for label, widget_name, before, after in (
+                ('ISO', 'iso', str(settings.iso), str(resolved.iso)),
+                ('aperture', 'f-number', settings.aperture, resolved.aperture),
+                ('shutter', 'shutterspeed', settings.shutter, resolved.shutter)):
+            if before == after:
+                continue
+            parse = self.indexes[widget_name].parse
+            if abs(parse(after) / parse(before) - 1) > SAME_VALUE_TOLERANCE:
+                changes.append(f"{label} {before} -> {after}")
+        return changes
@@ -9,23 +9,29 @@ Usage:
     python main.py config_eclipse.txt [options]
     python main.py config_eclipse.txt --test-mode --log-level DEBUG
     python main.py config_eclipse.txt --cameras 0 1 2 --log-file eclipse.log
+    python main.py config_eclipse.txt --test-mode --time-warp instant
+    python main.py config_eclipse.txt --download-dir ~/eclipse_images
 """
 
 import argparse
 import sys
 import signal
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 # Import application modules
 from config import parse_config_file
 from config.eclipse_config import SystemConfig
-from hardware import MultiCameraManager
-from scheduling import TimeCalculator, ActionScheduler
+from hardware import MultiCameraManager, CapabilityCache, SettingsResolver
+from scheduling import (
+    TimeCalculator, ActionScheduler, ConflictPolicy, OverrunPolicy, ExecutionEngine, compile_shot_plan
+)
 from utils import setup_logging, SystemValidator
+from utils.clock import Clock, VirtualClock, INSTANT, SYSTEM_CLOCK
 from utils.constants import (
     APP_NAME, APP_VERSION, APP_DESCRIPTION, 
-    ERROR_MESSAGES, SUCCESS_MESSAGES
+    ERROR_MESSAGES, SUCCESS_MESSAGES, REHEARSAL_LEAD_TIME, DOWNLOAD_DRAIN_TIMEOUT, CAPABILITY_CACHE_DIR
 )
 
 
@@ -50,6 +56,8 @@ class EclipsePhotographyController:
         self.time_calculator: Optional[TimeCalculator] = None
         self.scheduler: Optional[ActionScheduler] = None
         self.validator: Optional[SystemValidator] = None
+        self.settings_resolver: Optional[SettingsResolver] = None
+        self.clock: Clock = SYSTEM_CLOCK
         
         # Runtime state
         self.is_running = False
@@ -95,9 +103,20 @@ class EclipsePhotographyController:
                 self.logger.error("Configuration validation failed")
                 return False
             
+            # Select real or time-warped clock
+            self.clock = self._create_clock()
+            
+            # Initialize time calculator, its waiter also timing the cameras' bulb exposures
+            self.time_calculator = TimeCalculator(self.config.eclipse_timings, self.clock)
+            if not self.clock.is_virtual:
+                self.time_calculator.waiter.calibrate()
+            
             # Initialize camera manager
             self.logger.info("Initializing camera system...")
-            self.camera_manager = MultiCameraManager()
+            capability_cache = None
+            if self.options.get('capability_cache') != 'none':
+                capability_cache = CapabilityCache(self.options.get('capability_cache') or CAPABILITY_CACHE_DIR)
+            self.camera_manager = MultiCameraManager(self.clock, capability_cache, self.time_calculator.waiter)
             
             # Discover cameras
             detected_cameras = self.camera_manager.discover_cameras()
@@ -128,16 +147,54 @@ class EclipsePhotographyController:
                     self.logger.error("Camera validation failed")
                     return False
             
-            # Initialize time calculator
-            self.time_calculator = TimeCalculator(self.config.eclipse_timings)
+            # Snap the planned settings to what the cameras accept and check them, before the event
+            self.settings_resolver = self.camera_manager.settings_resolver()
+            if not self.validator.validate_plan_settings(
+                    self.camera_manager,
+                    compile_shot_plan(self.config, self.time_calculator, resolver=self.settings_resolver)):
+                self.logger.error("Planned settings not supported by the cameras")
+                return False
             
             # Initialize action scheduler
             self.scheduler = ActionScheduler(
                 self.camera_manager, 
                 self.time_calculator, 
-                self.config.test_mode
+                self.config.test_mode,
+                conflict_policy=ConflictPolicy(self.options.get('conflict_policy') or 'queue'),
+                overrun_policy=OverrunPolicy(self.options.get('overrun_policy') or 'skip'),
+                engine=ExecutionEngine(self.options.get('engine') or 'threads'),
+                settings_resolver=self.settings_resolver
             )
             
+            # Copy images to the host during the sequence, outside trigger windows
+            if self.options.get('download_dir'):
+                self.camera_manager.enable_downloads(
+                    self.options['download_dir'],
+                    delete_after_download=self.options.get('delete_after_download', False),
+                    hold_off=self.scheduler.near_trigger
+                )
+                if self.options.get('capture_to_ram') and not self.config.test_mode:
+                    self.camera_manager.enable_ram_capture(self.options['download_dir'])
+            
+            if self.options.get('trigger_capture'):
+                self.camera_manager.enable_trigger_mode()
+            
+            if self.clock.is_virtual:
+                # The monitors poll on real time while trigger windows follow the warped clock
+                self.logger.info("Time-warped rehearsal: health monitor, hotplug and circuit breaker disabled")
+            else:
+                # Keep camera status fresh in the background, outside trigger windows
+                if not self.options.get('no_health_monitor'):
+                    self.camera_manager.enable_health_monitor(hold_off=self.scheduler.near_trigger)
+                
+                # Take unplugged cameras out of the shots and bring them back when they return
+                if not self.options.get('no_hotplug'):
+                    self.camera_manager.enable_hotplug(hold_off=self.scheduler.near_trigger)
+                
+                # Stop shooting with cameras that keep failing until they answer again
+                if not self.options.get('no_circuit_breaker'):
+                    self.camera_manager.enable_circuit_breaker(hold_off=self.scheduler.near_trigger)
+            
             self.logger.info("Initialization complete")
             return True
             
@@ -148,6 +205,34 @@ class EclipsePhotographyController:
                 print(f"Initialization failed: {e}")
             return False
     
+    def _create_clock(self) -> Clock:
+        """
+        Create the clock driving the sequence.
+        
+        With --time-warp, the sequence is rehearsed on a virtual clock starting
+        shortly before its first shot and running faster than real time.
+        
+        Returns:
+            System clock, or a VirtualClock for rehearsals
+        """
+        time_warp = self.options.get('time_warp')
+        if time_warp is None:
+            return SYSTEM_CLOCK
+        
+        # Resolve the shot times once to find where the rehearsal should start
+        probe = compile_shot_plan(self.config, TimeCalculator(self.config.eclipse_timings))
+        first_seconds = min((event.wall_seconds for event in probe), default=0.0)
+        
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start = midnight + timedelta(seconds=first_seconds - REHEARSAL_LEAD_TIME)
+        
+        warp_label = 'instant' if time_warp == INSTANT else f'x{time_warp:g}'
+        self.logger.info(f"Time warp {warp_label}: rehearsal starting at {start.time()}")
+        if not self.config.test_mode:
+            self.logger.warning("Time warp without test mode: cameras will really be triggered")
+        
+        return VirtualClock(start, time_warp)
+    
     def run(self) -> int:
         """
         Run the eclipse photography sequence.
@@ -182,26 +267,22 @@ class EclipsePhotographyController:
                 status = "ACTIVE" if info['active'] else "INACTIVE"
                 self.logger.info(f"  Camera {camera_id}: {info['name']} ({status})")
             
-            # Execute action sequence
-            self.logger.info(f"Starting eclipse sequence: {len(self.config.actions)} actions")
+            # Compile the whole sequence into absolute shot deadlines before the first action
+            plan = compile_shot_plan(self.config, self.time_calculator, resolver=self.settings_resolver)
             
-            for i, action_config in enumerate(self.config.actions):
-                if self.shutdown_requested:
-                    self.logger.info("Shutdown requested, stopping sequence")
-                    break
-                
-                self.logger.info(f"=== Action {i + 1}/{len(self.config.actions)} ===")
-                
-                success = self.scheduler.execute_action(action_config)
-                
-                if not success:
-                    self.logger.error(f"Action {i + 1} failed")
-                    # Continue with remaining actions unless in strict mode
-                    if not self.options.get('strict_mode', False):
-                        continue
-                    else:
-                        self.logger.error("Strict mode enabled, stopping sequence")
-                        return 1
+            if plan.rejected and self.options.get('strict_mode', False):
+                self.logger.error("Strict mode enabled, invalid actions in sequence")
+                return 1
+            
+            # Execute shot plan
+            self.logger.info(f"Starting eclipse sequence: {len(self.config.actions)} actions, "
+                             f"{len(plan)} shots")
+            
+            self.scheduler.execute_plan(
+                plan,
+                should_stop=lambda: self.shutdown_requested,
+                stop_on_failure=self.options.get('strict_mode', False)
+            )
             
             # Show execution statistics
             stats = self.scheduler.get_execution_stats()
@@ -209,6 +290,34 @@ class EclipsePhotographyController:
             self.logger.info(f"  Actions executed: {stats['actions_executed']}")
             self.logger.info(f"  Photos taken: {stats['photos_taken']}")
             self.logger.info(f"  Errors: {stats['execution_errors']}")
+            if stats['bursts']:
+                requested = stats['burst_frames_requested']
+                self.logger.info(f"  Burst frames: {stats['burst_frames']} in {stats['bursts']} bursts"
+                                 f"{f' ({requested} requested)' if requested else ''}")
+            if stats['brackets']:
+                self.logger.info(f"  Bracket frames: {stats['bracket_frames']} in {stats['brackets']} brackets, "
+                                 f"longest cycle {stats['max_bracket_cycle_s']:.2f}s")
+            if stats['bulb_exposures']:
+                self.logger.info(f"  Bulb exposures: {stats['bulb_exposures']}, "
+                                 f"max error {stats['max_bulb_error_ms']:.1f}ms")
+            for line in self.scheduler.metrics.format_report():
+                self.logger.info(f"  {line}")
+            if self.options.get('trigger_capture'):
+                self.camera_manager.collect_files()
+            if self.camera_manager.downloads is not None:
+                self.logger.info("Finishing image downloads...")
+                self.camera_manager.downloads.stop(DOWNLOAD_DRAIN_TIMEOUT)
+                for line in self.camera_manager.downloads.format_report():
+                    self.logger.info(f"  {line}")
+            if self.camera_manager.health is not None:
+                for line in self.camera_manager.health.format_report():
+                    self.logger.info(f"  {line}")
+            if self.camera_manager.hotplug is not None:
+                for line in self.camera_manager.hotplug.format_report():
+                    self.logger.info(f"  {line}")
+            if self.camera_manager.breaker is not None:
+                for line in self.camera_manager.breaker.format_report():
+                    self.logger.info(f"  {line}")
             
             if stats['execution_errors'] == 0:
                 self.logger.info(SUCCESS_MESSAGES['sequence_complete'])
@@ -232,6 +341,11 @@ class EclipsePhotographyController:
         
         if self.camera_manager:
             try:
+                if self.camera_manager.downloads is not None:
+                    # No-op if the sequence already drained the queue
+                    self.camera_manager.downloads.stop(DOWNLOAD_DRAIN_TIMEOUT)
+                if self.options.get('capture_to_ram') and not self.config.test_mode:
+                    self.camera_manager.enable_ram_capture(None)
                 self.logger.info("Disconnecting cameras...")
                 self.camera_manager.disconnect_all()
             except Exception as e:
@@ -247,6 +361,19 @@ class EclipsePhotographyController:
             self.logger.info(f"Received signal {signum}, initiating shutdown...")
 
 
+def parse_time_warp(value: str) -> float:
+    """Parse a --time-warp factor ("instant" or a positive number)."""
+    if value.lower() == 'instant':
+        return INSTANT
+    try:
+        factor = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time warp factor: {value}")
+    if factor <= 0:
+        raise argparse.ArgumentTypeError(f"time warp factor must be positive: {value}")
+    return factor
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create command line argument parser."""
     parser = argparse.ArgumentParser(
@@ -258,6 +385,10 @@ Examples:
   %(prog)s config_eclipse.txt --test-mode
   %(prog)s config_eclipse.txt --cameras 0 1 2 --log-level DEBUG
   %(prog)s config_eclipse.txt --log-file /var/log/eclipse.log
+  %(prog)s config_eclipse.txt --test-mode --time-warp instant
+  %(prog)s config_eclipse.txt --download-dir ~/eclipse_images --delete-after-download
+  %(prog)s config_eclipse.txt --download-dir ~/eclipse_images --capture-to-ram
+  %(prog)s config_eclipse.txt --trigger-capture
         """
     )
     
@@ -299,6 +430,96 @@ Examples:
         help='Stop sequence on first action failure'
     )
     
+    parser.add_argument(
+        '--conflict-policy',
+        default='queue',
+        choices=[policy.value for policy in ConflictPolicy],
+        help='Handling of overlapping shots on busy cameras: queue (fire late), '
+             'skip (drop), merge (fold identical shots) (default: queue)'
+    )
+    
+    parser.add_argument(
+        '--overrun-policy',
+        default='skip',
+        choices=[policy.value for policy in OverrunPolicy],
+        help='Handling of loop shots that miss their slot: skip (stay on the grid), '
+             'compress (fire late shots back-to-back), shift (delay the rest of the loop) '
+             '(default: skip)'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        default='threads',
+        choices=[engine.value for engine in ExecutionEngine],
+        help='Execution engine: threads (worker threads) or asyncio (single event loop '
+             'with background status polling) (default: threads)'
+    )
+    
+    parser.add_argument(
+        '--time-warp',
+        type=parse_time_warp,
+        metavar='FACTOR',
+        help='Rehearse the sequence on a simulated clock running FACTOR times '
+             'faster than real time, or "instant" to skip all waits; the background '
+             'camera monitors are disabled'
+    )
+    
+    parser.add_argument(
+        '--download-dir',
+        metavar='DIR',
+        help='Download every image to DIR during the sequence, one subdirectory per camera'
+    )
+    
+    parser.add_argument(
+        '--delete-after-download',
+        action='store_true',
+        help='Delete images from the camera cards once their download is verified '
+             '(requires --download-dir)'
+    )
+    
+    parser.add_argument(
+        '--capture-to-ram',
+        action='store_true',
+        help='Capture into the camera RAM and stream every image straight to the '
+             'download directory, bypassing the card (requires --download-dir)'
+    )
+    
+    parser.add_argument(
+        '--trigger-capture',
+        action='store_true',
+        help='Trigger the shutter without waiting for each image file, so the next '
+             'shot can start while the previous frame is still being written'
+    )
+    
+    parser.add_argument(
+        '--no-health-monitor',
+        action='store_true',
+        help='Do not poll camera status in the background; every status request '
+             'queries the cameras'
+    )
+    
+    parser.add_argument(
+        '--no-hotplug',
+        action='store_true',
+        help='Do not watch for unplugged cameras; a camera that disconnects is not '
+             'reconnected during the sequence'
+    )
+    
+    parser.add_argument(
+        '--no-circuit-breaker',
+        action='store_true',
+        help='Keep shooting with cameras whose captures repeatedly fail instead of '
+             'taking them out of the shots'
+    )
+    
+    parser.add_argument(
+        '--capability-cache',
+        metavar='DIR',
+        help='Directory storing the capabilities probed on each camera body, reused '
+             'until its firmware or lens changes, or "none" to probe at every start '
+             f'(default: {CAPABILITY_CACHE_DIR})'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -325,9 +546,26 @@ def main() -> int:
         'test_mode': args.test_mode,
         'log_level': args.log_level,
         'log_file': args.log_file,
-        'strict_mode': args.strict_mode
+        'strict_mode': args.strict_mode,
+        'conflict_policy': args.conflict_policy,
+        'overrun_policy': args.overrun_policy,
+        'time_warp': args.time_warp,
+        'engine': args.engine,
+        'download_dir': args.download_dir,
+        'delete_after_download': args.delete_after_download,
+        'capture_to_ram': args.capture_to_ram,
+        'trigger_capture': args.trigger_capture,
+        'no_health_monitor': args.no_health_monitor,
+        'no_hotplug': args.no_hotplug,
+        'no_circuit_breaker': args.no_circuit_breaker,
+        'capability_cache': args.capability_cache
     }
     
+    if args.delete_after_download and not args.download_dir:
+        parser.error("--delete-after-download requires --download-dir")
+    if args.capture_to_ram and not args.download_dir:
+        parser.error("--capture-to-ram requires --download-dir")
+    
     if args.cameras:
         options['cameras'] = args.cameras
     
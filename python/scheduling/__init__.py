@@ -1,7 +1,19 @@
 """Scheduling module package initialization."""
 
-from .time_calculator import TimeCalculator
+from .time_calculator import TimeCalculator, EclipsePhase
 from .action_types import ActionType
 from .action_scheduler import ActionScheduler
+from .shot_plan import ShotEvent, ShotPlan, PlanCompiler, compile_shot_plan
+from .deadline_waiter import DeadlineWaiter, WaitResult
+from .event_scheduler import EventScheduler, ConflictPolicy, OverrunPolicy, ExecutionEngine
+from .async_scheduler import AsyncEventScheduler
+from .shot_metrics import LatencyHistogram, ShotMetrics
 
-__all__ = ['TimeCalculator', 'ActionType', 'ActionScheduler']
\ No newline at end of file
+__all__ = [
+    'TimeCalculator', 'EclipsePhase', 'ActionType', 'ActionScheduler',
+    'ShotEvent', 'ShotPlan', 'PlanCompiler', 'compile_shot_plan',
+    'DeadlineWaiter', 'WaitResult',
+    'EventScheduler', 'ConflictPolicy', 'OverrunPolicy', 'ExecutionEngine',
+    'AsyncEventScheduler',
+    'LatencyHistogram', 'ShotMetrics',
+]
\ No newline at end of file
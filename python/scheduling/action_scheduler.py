@@ -6,15 +6,26 @@ scheduling logic with Python equivalents.
 """
 
 import logging
-import time
-from datetime import datetime, time as time_obj
-from typing import Dict, Any
+import math
+import threading
+from datetime import datetime, timedelta, time as time_obj
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
-from .time_calculator import TimeCalculator
+from .time_calculator import TimeCalculator, wrap_day_offset
 from .action_types import create_action, ActionType
+from .shot_plan import ShotPlan, ShotEvent, PlanCompiler, action_camera_settings, action_bulb_ns
+from .event_scheduler import EventScheduler, ConflictPolicy, OverrunPolicy, ExecutionEngine
+from .async_scheduler import AsyncEventScheduler
+from .shot_metrics import ShotMetrics
 from config.eclipse_config import ActionConfig, CameraSettings
+from hardware.camera_worker import release_skew_ns
 from hardware.multi_camera_manager import MultiCameraManager
-from hardware.camera_controller import format_gphoto2_aperture, format_gphoto2_shutter
+from hardware.setting_values import SettingsResolver
+from utils.constants import (
+    MAX_CONCURRENT_SHOTS, MAX_CAPTURE_TIMEOUT, RELEASE_SYNC_MARGIN, RELEASE_SKEW_WARNING, MLU_RAISE_LEAD,
+    MLU_RAISE_LEAD_MAX,
+    BULB_ERROR_WARNING
+)
 
 
 class ActionScheduler:
@@ -25,9 +36,20 @@ class ActionScheduler:
     - do_action() -> execute_action()
     - take_shoot() -> execute_photo_action()  
     - boucle() -> execute_loop_action()
+    
+    Burst actions have no Lua equivalent: they hold the release in
+    continuous drive for sub-second frame rates around C2 and C3. Neither
+    do Bracket actions, which run an exposure ladder changing only the
+    shutter speed between frames, or bulb exposures, which the host times
+    beyond the camera's preset speeds.
     """
     
-    def __init__(self, camera_manager: MultiCameraManager, time_calculator: TimeCalculator, test_mode: bool = False):
+    def __init__(self, camera_manager: MultiCameraManager, time_calculator: TimeCalculator, test_mode: bool = False,
+                 conflict_policy: ConflictPolicy = ConflictPolicy.QUEUE,
+                 max_concurrent_shots: int = MAX_CONCURRENT_SHOTS,
+                 overrun_policy: OverrunPolicy = OverrunPolicy.SKIP,
+                 engine: ExecutionEngine = ExecutionEngine.THREADS,
+                 settings_resolver: Optional[SettingsResolver] = None):
         """
         Initialize action scheduler.
         
@@ -35,16 +57,44 @@ class ActionScheduler:
             camera_manager: Multi-camera manager for hardware control
             time_calculator: Time calculation utilities
             test_mode: If True, simulate actions without actual photography
+            conflict_policy: Policy for overlapping shots competing for the same cameras
+            max_concurrent_shots: Maximum number of shots in flight on disjoint cameras
+            overrun_policy: Policy for Boucle shots that miss their grid slot
+            engine: Engine running the shot timeline (threads or asyncio)
+            settings_resolver: Resolver snapping action settings to the values
+                the cameras accept (default: GPhoto2 value tables)
         """
         self.camera_manager = camera_manager
         self.time_calculator = time_calculator
+        self.clock = time_calculator.clock
         self.test_mode = test_mode
+        self.conflict_policy = conflict_policy
+        self.max_concurrent_shots = max_concurrent_shots
+        self.overrun_policy = overrun_policy
+        self.engine = engine
+        self.settings_resolver = settings_resolver or SettingsResolver()
         self.logger = logging.getLogger('action_scheduler')
         
         # Statistics tracking
         self.actions_executed = 0
         self.photos_taken = 0
         self.execution_errors = 0
+        self.shots_skipped = 0
+        self.shot_lateness: Dict[Tuple[int, int], int] = {}  # (action, shot) -> lateness in ns
+        self.trigger_times: Dict[Tuple[int, int], datetime] = {}  # (action, shot) -> trigger time
+        self.burst_frames: Dict[Tuple[int, int], Tuple[int, Dict[int, int]]] = {}  # -> (requested, camera frames)
+        self.bracket_cycles: Dict[Tuple[int, int], Dict[int, Tuple[int, int]]] = {}  # -> camera (frames, ns)
+        self.bulb_exposures: Dict[Tuple[int, int], Tuple[int, Dict[int, int]]] = {}  # -> (planned, measured ns)
+        self.metrics = ShotMetrics()
+        self._stats_lock = threading.Lock()
+        self._event_scheduler: Optional[EventScheduler] = None
+        
+        # Cameras are staged this long before a deadline and released together
+        self.release_margin_ns = int(RELEASE_SYNC_MARGIN * 1_000_000_000)
+        self.skew_warning_ns = int(RELEASE_SKEW_WARNING * 1_000_000_000)
+        
+        # Slowest mirror-up command seen so far (None: assume MLU_RAISE_LEAD)
+        self._mirror_latency_ns: Optional[int] = None
     
     def execute_action(self, action_config: ActionConfig) -> bool:
         """
@@ -69,6 +119,10 @@ class ActionScheduler:
                 success = self.execute_loop_action(action_config)
             elif action.action_type == ActionType.INTERVAL:
                 success = self.execute_interval_action(action_config)
+            elif action.action_type == ActionType.BURST:
+                success = self.execute_burst_action(action_config)
+            elif action.action_type == ActionType.BRACKET:
+                success = self.execute_bracket_action(action_config)
             else:
                 self.logger.error(f"Unknown action type: {action_config.action_type}")
                 success = False
@@ -87,6 +141,318 @@ class ActionScheduler:
             self.execution_errors += 1
             return False
     
+    def execute_plan(self, plan: ShotPlan, should_stop: Optional[Callable[[], bool]] = None,
+                     stop_on_failure: bool = False) -> bool:
+        """
+        Execute a precompiled shot plan.
+        
+        All times and settings are resolved at compile time. The shots of every
+        action are merged into one timeline by the event scheduler, so
+        overlapping actions fire at their intended instants.
+        
+        Args:
+            plan: Compiled shot plan
+            should_stop: Optional callback polled between shots to abort the plan
+            stop_on_failure: If True, abort the plan on the first failed shot
+        
+        Returns:
+            True if every action produced at least one successful capture
+        """
+        self.logger.info(f"Executing shot plan: {len(plan)} shots, {plan.action_count} actions")
+        
+        event_scheduler = self._create_event_scheduler()
+        self._event_scheduler = event_scheduler
+        try:
+            shots_ok = event_scheduler.run(plan, should_stop, stop_on_failure)
+        finally:
+            self._event_scheduler = None
+        
+        self.shots_skipped += len(event_scheduler.skipped)
+        
+        # Rejected actions count as errors, like a failed execute_action call
+        self.execution_errors += len(plan.rejected)
+        
+        for action_index, successful_shots in shots_ok.items():
+            if successful_shots > 0:
+                self.actions_executed += 1
+            else:
+                self.execution_errors += 1
+                self.logger.error(f"Action {action_index + 1}: no successful capture")
+        
+        return not plan.rejected and all(count > 0 for count in shots_ok.values())
+    
+    def near_trigger(self) -> bool:
+        """
+        True while a plan is running and a shot is in flight or about to be released.
+        
+        Background camera work (image downloads, status polls) is held off
+        while this is True so the cameras are free at the trigger.
+        """
+        event_scheduler = self._event_scheduler
+        return event_scheduler is not None and event_scheduler.near_trigger()
+    
+    def execute_shot(self, event: ShotEvent, camera_ids: Optional[List[int]] = None) -> bool:
+        """
+        Wait for a shot deadline and trigger the cameras.
+        
+        The cameras are staged shortly before the deadline and release their
+        shutters together at the deadline itself. With mirror lockup, the
+        mirrors are raised in parallel so that they settle for the MLU delay
+        before the deadline, and the settle time achieved is checked.
+        
+        Args:
+            event: Shot event with precomputed deadline
+            camera_ids: Cameras to trigger, or None for all active cameras
+        
+        Returns:
+            True if at least one camera captured successfully
+        """
+        mirror_up = None
+        if event.mlu_delay > 0:
+            self.time_calculator.wait_until_deadline(self.mirror_raise_ns(event))
+            mirror_up = self._apply_mirror_lockup(event.mlu_delay, camera_ids)
+        self.time_calculator.wait_until_deadline(event.deadline_ns - self.release_margin_ns)
+        
+        staged_ns = self.clock.monotonic_ns()
+        trigger_time = self.release_time(event)
+        capture_timings: Dict[int, Tuple[int, int]] = {}
+        capture_results = self.camera_manager.capture_all(self.test_mode, camera_ids=camera_ids,
+                                                          capture_timings=capture_timings,
+                                                          timeout=MAX_CAPTURE_TIMEOUT + event.capture_ns / 1e9,
+                                                          release_at_ns=event.deadline_ns,
+                                                          burst_ns=event.burst_ns,
+                                                          burst_frames=event.burst_frames,
+                                                          bracket=event.bracket,
+                                                          bulb_ns=event.bulb_ns)
+        
+        lateness_ns = self.release_lateness(event, capture_timings, staged_ns)
+        if mirror_up is not None:
+            self.check_mirror_lockup(event, mirror_up, capture_timings)
+        return self.record_shot(event, lateness_ns, trigger_time, capture_results, capture_timings)
+    
+    def mirror_raise_ns(self, event: ShotEvent) -> int:
+        """
+        Get the monotonic instant at which to raise the mirrors for a shot.
+        
+        The mirror-up command is issued ahead of the MLU delay by the
+        slowest command latency seen so far, up to MLU_RAISE_LEAD_MAX, so
+        the mirrors settle for the whole delay and the shutter still opens
+        at the deadline. The instant is never earlier than the dispatch of
+        the shot (ShotEvent.lead_ns), which allows for the longest lead.
+        
+        Args:
+            event: Shot event with mirror lockup
+        
+        Returns:
+            Monotonic instant in nanoseconds
+        """
+        return event.deadline_ns - event.mlu_ns - self._mirror_lead_ns()
+    
+    def record_mirror_latency(self, raised_ns: int, mirror_up: Dict[int, Optional[int]]):
+        """
+        Learn the mirror-up command latency from a lockup.
+        
+        Args:
+            raised_ns: Monotonic instant the mirror-up command was issued
+            mirror_up: Dictionary mapping camera ID to the monotonic instant
+                its mirror went up (None if the lockup failed)
+        """
+        up_instants = [up_ns for up_ns in mirror_up.values() if up_ns is not None]
+        if not up_instants:
+            return
+        latency_ns = max(up_instants) - raised_ns
+        with self._stats_lock:
+            self._mirror_latency_ns = max(self._mirror_latency_ns or 0, latency_ns)
+    
+    def check_mirror_lockup(self, event: ShotEvent, mirror_up: Dict[int, Optional[int]],
+                            capture_timings: Dict[int, Tuple[int, int]]):
+        """
+        Verify that the mirrors settled for the MLU delay before the shutters opened.
+        
+        Args:
+            event: Shot event that was fired
+            mirror_up: Dictionary mapping camera ID to the monotonic instant
+                its mirror went up (None if the lockup failed)
+            capture_timings: Dictionary mapping camera ID to monotonic (start, end)
+                of its capture call
+        """
+        failed = sorted(camera_id for camera_id, up_ns in mirror_up.items() if up_ns is None)
+        if failed:
+            self.logger.warning(f"{event.describe()}: cameras {failed} fired without mirror lockup")
+        
+        settle = self.metrics.record_mirror_lockup(event, mirror_up, capture_timings)
+        for camera_id, settle_ns in sorted(settle.items()):
+            if settle_ns < event.mlu_ns - self.skew_warning_ns:
+                self.logger.warning(f"{event.describe()}: camera {camera_id} mirror settled "
+                                    f"{settle_ns / 1e6:.0f}ms of {event.mlu_delay}ms")
+        if settle:
+            self.logger.debug(f"{event.describe()}: mirrors settled {min(settle.values()) / 1e6:.1f}"
+                              f"-{max(settle.values()) / 1e6:.1f}ms for {event.mlu_delay}ms MLU")
+    
+    def _mirror_lead_ns(self) -> int:
+        """
+        Time allowed for the mirror-up command: the slowest one seen, MLU_RAISE_LEAD until measured.
+        
+        The lead grows with slow bodies so their mirrors still settle for the
+        whole MLU delay, but is bounded by MLU_RAISE_LEAD_MAX: one stalled
+        command must not move every later lockup seconds ahead.
+        """
+        with self._stats_lock:
+            if self._mirror_latency_ns is None:
+                return int(MLU_RAISE_LEAD * 1_000_000_000)
+            return min(int(MLU_RAISE_LEAD_MAX * 1_000_000_000), self._mirror_latency_ns)
+    
+    def release_time(self, event: ShotEvent) -> datetime:
+        """
+        Get the wall clock time at which a staged shot will be released.
+        
+        Args:
+            event: Shot event about to be released
+        
+        Returns:
+            Planned wall clock time of the shot, or now if its deadline has passed
+        """
+        now = self.clock.now()
+        if self.clock.monotonic_ns() >= event.deadline_ns:
+            return now
+        
+        # Taken from the plan: the monotonic deadline converts with rounding errors
+        seconds_of_day = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+        return now + timedelta(seconds=wrap_day_offset(event.wall_seconds - seconds_of_day))
+    
+    def release_lateness(self, event: ShotEvent, capture_timings: Dict[int, Tuple[int, int]],
+                         staged_ns: int) -> int:
+        """
+        Get the delay between a shot's deadline and its first shutter release.
+        
+        Args:
+            event: Shot event that was fired
+            capture_timings: Dictionary mapping camera ID to monotonic (start, end) of its capture
+            staged_ns: Monotonic time the cameras were staged, used if no capture started
+        
+        Returns:
+            Lateness in nanoseconds (0 if released on time)
+        """
+        if capture_timings:
+            released_ns = min(start_ns for start_ns, _ in capture_timings.values())
+        else:
+            released_ns = staged_ns
+        return max(0, released_ns - event.deadline_ns)
+    
+    def record_shot(self, event: ShotEvent, lateness_ns: int, trigger_time: datetime,
+                    capture_results: Dict[int, Any],
+                    capture_timings: Optional[Dict[int, Tuple[int, int]]] = None) -> bool:
+        """
+        Record the outcome of a fired shot in the execution statistics.
+        
+        Args:
+            event: Shot event that was fired
+            lateness_ns: Delay between the deadline and the trigger
+            trigger_time: Wall clock time of the trigger
+            capture_results: Dictionary mapping camera ID to captured file,
+                list of frames for a burst or bracket, or None
+            capture_timings: Dictionary mapping camera ID to the monotonic
+                (start, end) of its capture call, for the latency metrics
+                (shutter open and close for a bulb exposure)
+        
+        Returns:
+            True if at least one camera captured successfully
+        """
+        successful_captures = sum(1 for result in capture_results.values() if result is not None)
+        frames = {
+            camera_id: len(result) if isinstance(result, list) else int(result is not None)
+            for camera_id, result in capture_results.items()
+        }
+        with self._stats_lock:
+            self.photos_taken += sum(frames.values())
+            self.shot_lateness[(event.action_index, event.shot_index)] = lateness_ns
+            self.trigger_times[(event.action_index, event.shot_index)] = trigger_time
+            if event.is_burst:
+                self.burst_frames[(event.action_index, event.shot_index)] = (event.burst_frames, frames)
+            if event.bracket:
+                self.bracket_cycles[(event.action_index, event.shot_index)] = {
+                    camera_id: (frames[camera_id], end_ns - start_ns)
+                    for camera_id, (start_ns, end_ns) in (capture_timings or {}).items()
+                }
+            exposures = {
+                camera_id: end_ns - start_ns
+                for camera_id, (start_ns, end_ns) in (capture_timings or {}).items()
+                if capture_results.get(camera_id) is not None
+            }
+            if event.is_bulb:
+                self.bulb_exposures[(event.action_index, event.shot_index)] = (event.bulb_ns, exposures)
+        
+        if event.is_burst:
+            self._log_burst(event, frames, capture_timings or {})
+        elif event.bracket:
+            self._log_bracket(event, frames, capture_timings or {})
+        elif event.is_bulb:
+            self._log_bulb(event, exposures)
+        
+        phase = self.time_calculator.eclipse_phase(event.wall_seconds)
+        self.metrics.record(event, phase, lateness_ns, capture_timings)
+        
+        skew_ns = release_skew_ns(capture_timings or {})
+        skew_text = ""
+        if skew_ns is not None:
+            skew_text = f", skew {skew_ns / 1e6:.3f}ms"
+            if skew_ns > self.skew_warning_ns:
+                self.logger.warning(f"{event.describe()}: cameras released {skew_ns / 1e6:.1f}ms apart")
+        
+        if lateness_ns > 1_000_000_000:
+            self.logger.warning(f"{event.describe()} fired {lateness_ns / 1e9:.1f}s late")
+        
+        if successful_captures == 0:
+            self.logger.error(f"{event.describe()}: all captures failed")
+            return False
+        
+        self.logger.info(f"{event.describe()}: {successful_captures}/{len(capture_results)} captured "
+                         f"at {trigger_time.strftime('%H:%M:%S.%f')[:-3]}{skew_text}")
+        return True
+    
+    def _log_burst(self, event: ShotEvent, frames: Dict[int, int],
+                   capture_timings: Dict[int, Tuple[int, int]]):
+        """Report the frames each camera achieved in a burst against the request."""
+        requested = f"/{event.burst_frames}" if event.burst_frames else ""
+        for camera_id, count in sorted(frames.items()):
+            rate_text = ""
+            if camera_id in capture_timings and count > 1:
+                start_ns, end_ns = capture_timings[camera_id]
+                rate_text = f", {count / ((end_ns - start_ns) / 1e9):.1f} fps"
+            self.logger.info(f"{event.describe()}: camera {camera_id} {count}{requested} frames{rate_text}")
+            if event.burst_frames and count < event.burst_frames:
+                self.logger.warning(f"{event.describe()}: camera {camera_id} short of "
+                                    f"{event.burst_frames - count} frames")
+    
+    def _log_bracket(self, event: ShotEvent, frames: Dict[int, int],
+                     capture_timings: Dict[int, Tuple[int, int]]):
+        """Report the cycle time of each camera's bracket and its overhead over the exposures."""
+        exposures_s = event.capture_ns / 1e9
+        for camera_id, count in sorted(frames.items()):
+            if camera_id not in capture_timings:
+                continue
+            start_ns, end_ns = capture_timings[camera_id]
+            cycle_s = (end_ns - start_ns) / 1e9
+            overhead_text = ""
+            if count:
+                overhead_text = f", {max(0.0, cycle_s - exposures_s) / count * 1000:.0f}ms overhead per frame"
+            self.logger.info(f"{event.describe()}: camera {camera_id} {count}/{len(event.bracket)} frames "
+                             f"in {cycle_s:.2f}s for {exposures_s:.2f}s of exposure{overhead_text}")
+            if count < len(event.bracket):
+                self.logger.warning(f"{event.describe()}: camera {camera_id} missed "
+                                    f"{len(event.bracket) - count} bracket frames")
+    
+    def _log_bulb(self, event: ShotEvent, exposures: Dict[int, int]):
+        """Report the measured duration of each camera's bulb exposure against the planned one."""
+        for camera_id, exposure_ns in sorted(exposures.items()):
+            error_ns = exposure_ns - event.bulb_ns
+            message = (f"{event.describe()}: camera {camera_id} bulb {exposure_ns / 1e9:.3f}s "
+                       f"for {event.bulb_ns / 1e9:g}s ({error_ns / 1e6:+.1f}ms)")
+            if abs(error_ns) > BULB_ERROR_WARNING * 1_000_000_000:
+                self.logger.warning(message)
+            else:
+                self.logger.info(message)
+    
     def execute_photo_action(self, action: ActionConfig) -> bool:
         """
         Execute a single photo action.
@@ -112,20 +478,27 @@ class ActionScheduler:
             # Wait until trigger time, accounting for mirror lockup delay
             # Lua equivalent: waits until timeStart - (mluDelay/1000)
             if action.mlu_delay > 0:
-                mlu_seconds = action.mlu_delay / 1000.0
+                # wait_until has whole-second resolution: wake up early, then raise
+                # the mirrors on the monotonic clock so the shutter opens on time
+                mlu_ns = action.mlu_delay * 1_000_000
                 trigger_seconds = self.time_calculator.time_to_seconds(trigger_time)
-                early_seconds = trigger_seconds - int(mlu_seconds + 1)
-                if early_seconds < 0:
-                    early_seconds += 86400
-                early_trigger = self.time_calculator.seconds_to_time(early_seconds)
-                self.time_calculator.wait_until(early_trigger)
+                early_seconds = trigger_seconds - math.ceil((mlu_ns + self._mirror_lead_ns()) / 1e9) - 1
+                self.time_calculator.wait_until(self.time_calculator.seconds_to_time(early_seconds))
+                
+                release_at_ns = self.time_calculator.wall_seconds_to_deadline_ns(trigger_seconds)
+                self.time_calculator.wait_until_deadline(release_at_ns - mlu_ns - self._mirror_lead_ns())
                 self._apply_mirror_lockup(action.mlu_delay)
+                self.time_calculator.wait_until_deadline(release_at_ns - self.release_margin_ns)
+                
+                self.logger.info(f"Triggering photo capture at {trigger_time}")
+                capture_results = self.camera_manager.capture_all(self.test_mode, release_at_ns=release_at_ns,
+                                                                  bulb_ns=action_bulb_ns(action))
             else:
                 self.time_calculator.wait_until(trigger_time)
-            
-            # Execute capture
-            self.logger.info(f"Triggering photo capture at {datetime.now().time()}")
-            capture_results = self.camera_manager.capture_all(self.test_mode)
+                
+                # Execute capture
+                self.logger.info(f"Triggering photo capture at {self.clock.now().time()}")
+                capture_results = self.camera_manager.capture_all(self.test_mode, bulb_ns=action_bulb_ns(action))
             
             # Count successful captures
             successful_captures = sum(1 for result in capture_results.values() if result is not None)
@@ -148,7 +521,10 @@ class ActionScheduler:
         """
         Execute a loop action with regular intervals.
         
-        Equivalent to Magic Lantern boucle() function.
+        Equivalent to Magic Lantern boucle() function. Every shot is given an
+        absolute deadline on the start + k * interval grid before the loop
+        starts, so slow captures never drift the following shots; shots that
+        miss their slot are handled by the overrun policy.
         
         Args:
             action: Loop action configuration
@@ -157,82 +533,20 @@ class ActionScheduler:
             True if successful, False otherwise
         """
         try:
-            # Calculate start and end times
-            start_time = self._calculate_action_time(action, 'start')
-            end_time = self._calculate_action_time(action, 'end')
-            interval_seconds = action.interval_or_count
-            
-            self.logger.info(f"Loop action: {start_time} -> {end_time}, interval: {interval_seconds}s")
-            
-            # Validate and enforce minimum interval (like Lua: minimum 1s)
-            if interval_seconds <= 0:
-                self.logger.error("Invalid interval for loop action")
+            plan = PlanCompiler(self.time_calculator, self.settings_resolver).compile([action])
+            if plan.rejected:
+                self.logger.error(f"Invalid loop action: {plan.rejected[0][1]}")
                 return False
-            if interval_seconds < 1:
-                interval_seconds = 1
-                self.logger.warning("Loop interval set to minimum 1s")
             
-            # Configure cameras
-            if not self._configure_cameras_for_action(action):
-                return False
+            first, last = plan.events[0], plan.events[-1]
+            self.logger.info(f"Loop action: {first.wall_time} -> {last.wall_time}, "
+                             f"{len(plan)} shots every {first.interval_ns / 1e9:g}s")
             
-            # Wait for start time, accounting for MLU delay
-            if action.mlu_delay > 0:
-                mlu_seconds = action.mlu_delay / 1000.0
-                wait_target_seconds = self.time_calculator.time_to_seconds(start_time) - int(mlu_seconds + 1)
-                if wait_target_seconds < 0:
-                    wait_target_seconds += 86400
-                wait_target = self.time_calculator.seconds_to_time(wait_target_seconds)
-                self.time_calculator.wait_until(wait_target)
-            else:
-                self.time_calculator.wait_until(start_time)
+            event_scheduler = self._create_event_scheduler()
+            capture_count = event_scheduler.run(plan).get(0, 0)
+            self.shots_skipped += len(event_scheduler.skipped)
             
-            # Execute loop
-            loop_start_time = time.time()
-            next_capture_time = loop_start_time
-            capture_count = 0
-            
-            while True:
-                current_time = datetime.now().time()
-                current_seconds = self.time_calculator.time_to_seconds(current_time)
-                end_seconds = self.time_calculator.time_to_seconds(end_time)
-                
-                # Check if we've passed the end time
-                # Also check that the next capture fits within the window
-                if current_seconds > end_seconds:
-                    break
-                
-                # Check if there's still enough time for one more capture
-                remaining = end_seconds - current_seconds
-                if remaining < 0:
-                    break
-                
-                # Check if it's time for next capture
-                if time.time() >= next_capture_time:
-                    self.logger.info(f"Loop capture {capture_count + 1} at {current_time}")
-                    
-                    # Apply mirror lockup if specified
-                    if action.mlu_delay > 0:
-                        self._apply_mirror_lockup(action.mlu_delay)
-                    
-                    # Capture with all cameras
-                    capture_results = self.camera_manager.capture_all(self.test_mode)
-                    
-                    # Count successful captures
-                    successful_captures = sum(1 for result in capture_results.values() if result is not None)
-                    self.photos_taken += successful_captures
-                    capture_count += 1
-                    
-                    if successful_captures == 0:
-                        self.logger.warning(f"All captures failed in loop iteration {capture_count}")
-                    
-                    # Schedule next capture
-                    next_capture_time += interval_seconds
-                
-                # Sleep briefly to avoid busy waiting
-                time.sleep(0.1)
-            
-            self.logger.info(f"Loop action complete: {capture_count} capture iterations")
+            self.logger.info(f"Loop action complete: {capture_count}/{len(plan)} capture iterations")
             return capture_count > 0
             
         except Exception as e:
@@ -280,19 +594,23 @@ class ActionScheduler:
             self.time_calculator.wait_until(start_time)
             
             # Execute interval captures
-            interval_start_time = time.time()
+            interval_start_time = self.clock.time()
             
             for i in range(photo_count):
-                current_time = datetime.now().time()
+                current_time = self.clock.now().time()
                 
                 self.logger.info(f"Interval capture {i + 1}/{photo_count} at {current_time}")
                 
-                # Apply mirror lockup if specified
+                # Apply mirror lockup if specified, and release once the mirrors have settled
                 if action.mlu_delay > 0:
                     self._apply_mirror_lockup(action.mlu_delay)
-                
-                # Capture with all cameras
-                capture_results = self.camera_manager.capture_all(self.test_mode)
+                    release_at_ns = self.clock.monotonic_ns() + action.mlu_delay * 1_000_000
+                    self.time_calculator.wait_until_deadline(release_at_ns - self.release_margin_ns)
+                    capture_results = self.camera_manager.capture_all(self.test_mode, release_at_ns=release_at_ns,
+                                                                      bulb_ns=action_bulb_ns(action))
+                else:
+                    # Capture with all cameras
+                    capture_results = self.camera_manager.capture_all(self.test_mode, bulb_ns=action_bulb_ns(action))
                 
                 # Count successful captures
                 successful_captures = sum(1 for result in capture_results.values() if result is not None)
@@ -304,10 +622,10 @@ class ActionScheduler:
                 # Wait for next capture (except on last iteration)
                 if i < photo_count - 1:
                     next_capture_time = interval_start_time + (i + 1) * interval_seconds
-                    sleep_time = next_capture_time - time.time()
+                    sleep_time = next_capture_time - self.clock.time()
                     
                     if sleep_time > 0:
-                        time.sleep(sleep_time)
+                        self.clock.sleep(sleep_time)
             
             self.logger.info(f"Interval action complete: {photo_count} photos taken")
             return True
@@ -316,6 +634,65 @@ class ActionScheduler:
             self.logger.error(f"Error in interval action: {e}", exc_info=True)
             return False
     
+    def execute_burst_action(self, action: ActionConfig) -> bool:
+        """
+        Execute a burst action in continuous drive.
+        
+        The release is held from the start time to the end time, or until
+        the requested number of frames, on every camera at once.
+        
+        Args:
+            action: Burst action configuration
+        
+        Returns:
+            True if at least one camera captured a frame, False otherwise
+        """
+        return self._execute_single_shot_action(
+            action, "Burst",
+            lambda event: (f"{event.wall_time}, up to {event.burst_ns / 1e9:g}s"
+                           f"{f' or {event.burst_frames} frames' if event.burst_frames else ''}"))
+    
+    def execute_bracket_action(self, action: ActionConfig) -> bool:
+        """
+        Execute an exposure bracket action.
+        
+        The shutter ladder is resolved before the start time; at the start
+        time every camera runs it in a tight loop, changing only the shutter
+        speed between frames.
+        
+        Args:
+            action: Bracket action configuration
+        
+        Returns:
+            True if at least one camera captured a frame, False otherwise
+        """
+        return self._execute_single_shot_action(
+            action, "Bracket",
+            lambda event: f"{event.wall_time}, shutter {' '.join(event.bracket)}")
+    
+    def _execute_single_shot_action(self, action: ActionConfig, label: str,
+                                    describe: Callable[[ShotEvent], str]) -> bool:
+        """Compile and run an action made of a single shot on the event scheduler."""
+        try:
+            plan = PlanCompiler(self.time_calculator, self.settings_resolver).compile([action])
+            if plan.rejected:
+                self.logger.error(f"Invalid {label.lower()} action: {plan.rejected[0][1]}")
+                return False
+            
+            self.logger.info(f"{label} action: {describe(plan.events[0])}")
+            
+            event_scheduler = self._create_event_scheduler()
+            if event_scheduler.run(plan).get(0, 0) == 0:
+                self.logger.error(f"{label} action: no frame captured")
+                return False
+            
+            self.logger.info(f"{label} action complete")
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error in {label.lower()} action: {e}", exc_info=True)
+            return False
+    
     def _calculate_action_time(self, action: ActionConfig, time_type: str) -> time_obj:
         """
         Calculate absolute time for action start or end.
@@ -355,17 +732,30 @@ class ActionScheduler:
             True if configuration was successful, False otherwise
         """
         try:
-            # Create camera settings from action config
-            settings = CameraSettings(
-                iso=action.iso or 1600,  # Default ISO
-                aperture=format_gphoto2_aperture(action.aperture) if action.aperture else "f/8",
-                shutter=format_gphoto2_shutter(action.shutter_speed) if action.shutter_speed else "1/125"
-            )
-            
+            # Create camera settings from action config, snapped to accepted values
+            settings = self.settings_resolver.resolve(action_camera_settings(action))
+        except Exception as e:
+            self.logger.error(f"Error configuring cameras for action: {e}")
+            return False
+        
+        return self.configure_cameras(settings)
+    
+    def configure_cameras(self, settings: CameraSettings, camera_ids: Optional[List[int]] = None) -> bool:
+        """
+        Configure cameras with pre-formatted settings.
+        
+        Args:
+            settings: GPhoto2-formatted camera settings
+            camera_ids: Cameras to configure, or None for all active cameras
+        
+        Returns:
+            True if configuration was successful, False otherwise
+        """
+        try:
             self.logger.info(f"Configuring cameras: ISO {settings.iso}, {settings.aperture}, {settings.shutter}")
             
             # Apply configuration to all cameras
-            config_results = self.camera_manager.configure_all(settings)
+            config_results = self.camera_manager.configure_all(settings, camera_ids=camera_ids)
             
             # Check if any configurations failed
             failed_configs = [cid for cid, success in config_results.items() if not success]
@@ -380,28 +770,45 @@ class ActionScheduler:
             self.logger.error(f"Error configuring cameras for action: {e}")
             return False
     
-    def _apply_mirror_lockup(self, delay_ms: int):
+    def _apply_mirror_lockup(self, delay_ms: int, camera_ids: Optional[List[int]] = None) -> Dict[int, Optional[int]]:
         """
-        Apply mirror lockup delay to all cameras.
+        Lock the mirrors of the cameras up, all cameras in parallel.
+        
+        Nothing waits for the delay here: the caller releases the shutters
+        delay_ms after the mirrors went up. The mirror-up command latency is
+        learned from the lockup.
         
         Args:
             delay_ms: Mirror lockup delay in milliseconds
+            camera_ids: Cameras to lock up, or None for all active cameras
+        
+        Returns:
+            Dictionary mapping camera ID to the monotonic instant its mirror
+            went up (None if the lockup failed)
         """
         if delay_ms <= 0:
-            return
+            return {}
         
         self.logger.info(f"Applying mirror lockup: {delay_ms}ms delay")
         
+        raised_ns = self.clock.monotonic_ns()
         try:
-            # Apply mirror lockup to all active cameras
-            for camera_id in self.camera_manager.active_cameras:
-                self.camera_manager.cameras[camera_id].mirror_lockup(True, delay_ms)
-            
-            # Wait for the specified delay
-            time.sleep(delay_ms / 1000.0)
-            
+            mirror_up = self.camera_manager.raise_mirrors(camera_ids, self.test_mode, delay_ms)
         except Exception as e:
             self.logger.error(f"Error applying mirror lockup: {e}")
+            return {}
+        
+        if not isinstance(mirror_up, dict):
+            self.logger.warning("Mirror lockup did not report when the mirrors went up")
+            return {}
+        self.record_mirror_latency(raised_ns, mirror_up)
+        return mirror_up
+    
+    def _create_event_scheduler(self) -> EventScheduler:
+        """Create an event scheduler for the selected engine using this scheduler's policies."""
+        scheduler_class = AsyncEventScheduler if self.engine == ExecutionEngine.ASYNCIO else EventScheduler
+        return scheduler_class(self, self.conflict_policy, self.max_concurrent_shots,
+                               overrun_policy=self.overrun_policy)
     
     def get_execution_stats(self) -> Dict[str, Any]:
         """
@@ -410,10 +817,30 @@ class ActionScheduler:
         Returns:
             Dictionary with execution statistics
         """
+        lateness = list(self.shot_lateness.values())
+        burst_requested = sum(requested * len(frames) for requested, frames in self.burst_frames.values())
+        bracket_cycles = [cycle_ns for cycles in self.bracket_cycles.values() for _, cycle_ns in cycles.values()]
+        bulb_errors = [
+            abs(exposure_ns - planned_ns)
+            for planned_ns, exposures in self.bulb_exposures.values() for exposure_ns in exposures.values()
+        ]
         return {
             'actions_executed': self.actions_executed,
             'photos_taken': self.photos_taken,
             'execution_errors': self.execution_errors,
+            'shots_skipped': self.shots_skipped,
+            'max_lateness_ms': max(lateness) / 1e6 if lateness else 0.0,
+            'mean_lateness_ms': sum(lateness) / len(lateness) / 1e6 if lateness else 0.0,
+            'latency': self.metrics.summary(),
+            'bursts': len(self.burst_frames),
+            'burst_frames': sum(sum(frames.values()) for _, frames in self.burst_frames.values()),
+            'burst_frames_requested': burst_requested,
+            'brackets': len(self.bracket_cycles),
+            'bracket_frames': sum(frames for cycles in self.bracket_cycles.values()
+                                  for frames, _ in cycles.values()),
+            'max_bracket_cycle_s': max(bracket_cycles) / 1e9 if bracket_cycles else 0.0,
+            'bulb_exposures': len(bulb_errors),
+            'max_bulb_error_ms': max(bulb_errors) / 1e6 if bulb_errors else 0.0,
             'test_mode': self.test_mode
         }
     
@@ -421,4 +848,11 @@ class ActionScheduler:
         """Reset execution statistics."""
         self.actions_executed = 0
         self.photos_taken = 0
-        self.execution_errors = 0
\ No newline at end of file
+        self.execution_errors = 0
+        self.shots_skipped = 0
+        self.shot_lateness.clear()
+        self.trigger_times.clear()
+        self.burst_frames.clear()
+        self.bracket_cycles.clear()
+        self.bulb_exposures.clear()
+        self.metrics.reset()
\ No newline at end of file
@@ -15,6 +15,8 @@ class ActionType(Enum):
     PHOTO = "Photo"
     LOOP = "Boucle"
     INTERVAL = "Interval"
+    BURST = "Burst"
+    BRACKET = "Bracket"
 
 
 class BaseAction(ABC):
@@ -152,6 +154,86 @@ class IntervalAction(BaseAction):
             return f"{self.config.time_ref} {self.config.end_operator} {self.config.end_time}"
 
 
+class BurstAction(BaseAction):
+    """Continuous-drive burst held for a time window or a number of frames."""
+    
+    def validate(self) -> bool:
+        """Validate burst action configuration."""
+        if self.config.action_type != ActionType.BURST.value:
+            return False
+        
+        frames = self.config.interval_or_count
+        return (self.config.start_time is not None and 
+                (frames is None or frames >= 0) and
+                (self.config.end_time is not None or bool(frames)))
+    
+    def get_description(self) -> str:
+        """Get description of burst action."""
+        start_desc = self._format_time_reference('start')
+        
+        limits = []
+        if self.config.end_time is not None:
+            limits.append(f"until {self._format_time_reference('end')}")
+        if self.config.interval_or_count:
+            limits.append(f"for {int(self.config.interval_or_count)} frames")
+        
+        settings_desc = []
+        if self.config.iso:
+            settings_desc.append(f"ISO {self.config.iso}")
+        if self.config.aperture:
+            settings_desc.append(f"f/{self.config.aperture}")
+        if self.config.shutter_speed:
+            settings_desc.append(f"{self.config.shutter_speed}s")
+        
+        settings = " ".join(settings_desc) if settings_desc else "default settings"
+        
+        return f"Burst from {start_desc} {' or '.join(limits)} with {settings}"
+    
+    def _format_time_reference(self, ref_type: str) -> str:
+        """Format time reference for display."""
+        if ref_type == 'start':
+            if self.config.time_ref == '-':
+                return str(self.config.start_time)
+            else:
+                return f"{self.config.time_ref} {self.config.start_operator} {self.config.start_time}"
+        else:  # end
+            return f"{self.config.time_ref} {self.config.end_operator} {self.config.end_time}"
+
+
+class BracketAction(BaseAction):
+    """Exposure bracket around a base shutter speed at a specific time."""
+    
+    def validate(self) -> bool:
+        """Validate bracket action configuration."""
+        if self.config.action_type != ActionType.BRACKET.value:
+            return False
+        
+        return (self.config.start_time is not None and 
+                self.config.shutter_speed is not None and
+                self.config.interval_or_count is not None and
+                self.config.interval_or_count >= 1 and
+                self.config.bracket_step is not None and
+                self.config.bracket_step > 0)
+    
+    def get_description(self) -> str:
+        """Get description of bracket action."""
+        if self.config.time_ref == '-':
+            time_desc = f"at {self.config.start_time}"
+        else:
+            time_desc = f"at {self.config.time_ref} {self.config.start_operator} {self.config.start_time}"
+        
+        settings_desc = []
+        if self.config.iso:
+            settings_desc.append(f"ISO {self.config.iso}")
+        if self.config.aperture:
+            settings_desc.append(f"f/{self.config.aperture}")
+        
+        settings = " ".join(settings_desc) if settings_desc else "default settings"
+        
+        return (f"Bracket {time_desc}: {int(self.config.interval_or_count)} frames "
+                f"{self.config.bracket_step:g} EV apart around {self.config.shutter_speed}s with {settings}")
+
+
 def create_action(config: ActionConfig) -> BaseAction:
     """
     Factory function to create appropriate action object.
@@ -168,7 +250,9 @@ def create_action(config: ActionConfig) -> BaseAction:
     action_map = {
         ActionType.PHOTO.value: PhotoAction,
         ActionType.LOOP.value: LoopAction,
-        ActionType.INTERVAL.value: IntervalAction
+        ActionType.INTERVAL.value: IntervalAction,
+        ActionType.BURST.value: BurstAction,
+        ActionType.BRACKET.value: BracketAction
     }
     
     action_class = action_map.get(config.action_type)
@@ -0,0 +1,481 @@
+"""
+Asyncio execution engine for Eclipse Photography Controller.
+
+Runs a shot plan as cooperating tasks on a single event loop. One dispatcher
+coroutine owns the timeline: it releases every shot and wakes each one at
+its mirror lockup and staging instants, leaving the release barrier only the
+final alignment on the deadline. Camera I/O runs on one persistent worker
+thread per camera instead of fresh threads per shot;
+background work such as status polling and progress reports runs on the
+same loop and is held off around trigger windows so it never delays a shot.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from .shot_plan import ShotPlan, ShotEvent
+from .event_scheduler import EventScheduler, ConflictPolicy, OverrunPolicy
+from config.eclipse_config import CameraStatus
+from utils.constants import (
+    MAX_CONCURRENT_SHOTS, SHOT_MERGE_WINDOW, LOOP_OVERRUN_TOLERANCE, MAX_CAPTURE_TIMEOUT,
+    STATUS_POLL_INTERVAL, PROGRESS_LOG_INTERVAL, BACKGROUND_GUARD_WINDOW
+)
+
+if TYPE_CHECKING:
+    from .action_scheduler import ActionScheduler
+
+
+class AsyncEventScheduler(EventScheduler):
+    """
+    Event scheduler running the shot timeline on an asyncio event loop.
+    
+    Shares the timeline, conflict and overrun policies of EventScheduler;
+    only the execution model differs.
+    """
+    
+    def __init__(self, action_scheduler: 'ActionScheduler',
+                 conflict_policy: ConflictPolicy = ConflictPolicy.QUEUE,
+                 max_concurrent: int = MAX_CONCURRENT_SHOTS,
+                 merge_window: float = SHOT_MERGE_WINDOW,
+                 overrun_policy: OverrunPolicy = OverrunPolicy.SKIP,
+                 overrun_tolerance: float = LOOP_OVERRUN_TOLERANCE,
+                 status_interval: Optional[float] = STATUS_POLL_INTERVAL,
+                 progress_interval: Optional[float] = PROGRESS_LOG_INTERVAL,
+                 background_guard: float = BACKGROUND_GUARD_WINDOW):
+        """
+        Initialize asyncio event scheduler.
+        
+        Args:
+            action_scheduler: Scheduler providing statistics and camera access
+            conflict_policy: Policy for shots whose cameras are busy
+            max_concurrent: Maximum number of shots in flight
+            merge_window: Window in seconds for MERGE policy coalescing
+            overrun_policy: Policy for Boucle shots that miss their grid slot
+            overrun_tolerance: Fraction of the loop interval a shot may be late
+            status_interval: Seconds between camera status polls (None to disable)
+            progress_interval: Seconds between progress reports (None to disable)
+            background_guard: Seconds before a release during which background work waits
+        """
+        super().__init__(action_scheduler, conflict_policy, max_concurrent, merge_window,
+                         overrun_policy, overrun_tolerance, background_guard)
+        self.logger = logging.getLogger('async_scheduler')
+        
+        self.camera_status: Dict[int, CameraStatus] = {}
+        self._background: List[Tuple[str, Callable[[], Any], float]] = []
+        self._next_release_ns: Optional[int] = None
+        self._shots_in_flight = 0
+        self._in_flight: Set[asyncio.Task] = set()
+        
+        # Shot timeline instants awaited by in-flight shots: (instant_ns, sequence, future)
+        self._timers: List[Tuple[int, int, asyncio.Future]] = []
+        self._waiting_shots = 0  # In-flight shots waiting for an instant or a shot slot
+        self._timeline_changed: Optional[asyncio.Event] = None
+        
+        if status_interval:
+            self.add_background_task('status', self._poll_status, status_interval)
+        if progress_interval:
+            self.add_background_task('progress', self._log_progress, progress_interval)
+    
+    def add_background_task(self, name: str, func: Callable[[], Any], interval: float):
+        """
+        Register periodic background work.
+        
+        Args:
+            name: Task name used in logs
+            func: Coroutine function, or blocking callable run off the loop
+            interval: Seconds between runs
+        """
+        self._background.append((name, func, interval))
+    
+    def run(self, plan: Optional[ShotPlan] = None, should_stop: Optional[Callable[[], bool]] = None,
+            stop_on_failure: bool = False) -> Dict[int, int]:
+        """
+        Run all scheduled events on a new event loop until the queue is empty.
+        
+        Args:
+            plan: Optional plan to schedule before running
+            should_stop: Optional callback polled before each event to abort the run
+            stop_on_failure: If True, stop dispatching after the first failed shot
+        
+        Returns:
+            Dictionary mapping action index to number of successful shots
+        """
+        return asyncio.run(self.run_async(plan, should_stop, stop_on_failure))
+    
+    async def run_async(self, plan: Optional[ShotPlan] = None, should_stop: Optional[Callable[[], bool]] = None,
+                        stop_on_failure: bool = False) -> Dict[int, int]:
+        """Coroutine version of run() for callers already inside an event loop."""
+        if plan is not None:
+            self.schedule_plan(plan)
+        
+        self.logger.info(f"Async scheduler started: {self.pending()} shots, "
+                         f"policy={self.conflict_policy.value}, overrun={self.overrun_policy.value}, "
+                         f"max_concurrent={self.max_concurrent}")
+        
+        self._should_stop = should_stop
+        self._stop_on_failure = stop_on_failure
+        self._aborted = False
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._in_flight = set()
+        self._timers = []
+        self._waiting_shots = 0
+        self._timeline_changed = asyncio.Event()
+        background = self._start_background()
+        
+        try:
+            await self._prearm_async(self._lookahead())
+            
+            while True:
+                dispatching = bool(self._queue) and not self._aborted
+                if dispatching and should_stop is not None and should_stop():
+                    self.logger.info("Stop requested, aborting async scheduler")
+                    self._abort()
+                    continue
+                if dispatching and stop_on_failure and self._failed:
+                    self.logger.error("Stop on failure enabled, aborting async scheduler")
+                    self._abort()
+                    continue
+                
+                if self.clock.is_instant:
+                    # Simulated time jumps on every sleep: let in-flight shots reach their next instant first
+                    await self._settle()
+                
+                release_ns = self._queue[0][0] if dispatching else None
+                timer_ns = self._timers[0][0] if self._timers else None
+                if release_ns is None and timer_ns is None:
+                    if not self._in_flight:
+                        break
+                    # Shots parked for busy cameras start as in-flight shots complete
+                    await self._timeline_event()
+                    continue
+                
+                # The dispatcher alone waits for the instants of the timeline
+                self._next_release_ns = release_ns
+                if release_ns is None or (timer_ns is not None and timer_ns < release_ns):
+                    reached = await self._wait_timeline(timer_ns)
+                else:
+                    reached = await self._wait_timeline(release_ns, should_stop)
+                if not reached:
+                    continue
+                
+                self._fire_timers()
+                self._dispatch_due()
+        
+        finally:
+            self._next_release_ns = None
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+        
+        self._log_summary()
+        return dict(self.results)
+    
+    def _dispatch_due(self):
+        """Pop the shot whose release time has come, reserve its cameras and start it."""
+        batch = self._pop_due()
+        if batch is None:
+            return
+        
+        event = batch[0]
+        cameras = self._target_cameras(event)
+        acquired = self._acquire(cameras, batch)
+        self._acquiring = None
+        if not acquired:
+            return
+        
+        if event.interval_ns and not self._check_overrun(event, cameras):
+            return
+        
+        self._start_shot(self._fire_async(batch, cameras))
+    
+    async def _wait_timeline(self, instant_ns: int, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Sleep until an instant of the timeline.
+        
+        The wait is cut short when the timeline changes (a shot asks for an
+        earlier instant, or completes and frees cameras for parked shots).
+        
+        Returns:
+            True if the instant was reached, False if interrupted
+        """
+        self._timeline_changed.clear()
+        wait = asyncio.ensure_future(self.time_calculator.waiter.wait_async(instant_ns, should_stop))
+        changed = asyncio.ensure_future(self._timeline_changed.wait())
+        await asyncio.wait({wait, changed}, return_when=asyncio.FIRST_COMPLETED)
+        
+        changed.cancel()
+        if not wait.done():
+            wait.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await wait
+            return False
+        return not wait.result().interrupted
+    
+    async def _timeline_event(self):
+        """Wait until a shot asks for an instant or completes."""
+        self._timeline_changed.clear()
+        await self._timeline_changed.wait()
+    
+    def _fire_timers(self):
+        """Wake the shots whose instant has come."""
+        now_ns = self.clock.monotonic_ns()
+        while self._timers and self._timers[0][0] <= now_ns:
+            _, _, future = heapq.heappop(self._timers)
+            if not future.done():
+                future.set_result(None)
+    
+    async def _settle(self):
+        """Let in-flight shots run until each one is done or waiting for an instant or a slot (instant clock)."""
+        while len(self._in_flight) > self._waiting_shots:
+            await self._timeline_event()
+    
+    async def _until(self, instant_ns: int):
+        """Wait for an instant of a shot's timeline: the dispatcher wakes the shot when it comes."""
+        if instant_ns <= self.clock.monotonic_ns():
+            return
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (instant_ns, next(self._sequence), future))
+        await self._wait_for(future)
+    
+    async def _wait_for(self, awaitable):
+        """Await an instant or a shot slot, counting the shot as waiting so an instant clock may jump."""
+        self._waiting_shots += 1
+        self._timeline_changed.set()
+        try:
+            return await awaitable
+        finally:
+            self._waiting_shots -= 1
+    
+    def _start_shot(self, coro):
+        """Run a shot as an in-flight task on the loop."""
+        task = asyncio.create_task(coro)
+        self._in_flight.add(task)
+        task.add_done_callback(self._shot_done)
+    
+    def _shot_done(self, task: asyncio.Task):
+        """Forget a completed shot and wake the dispatcher."""
+        self._in_flight.discard(task)
+        self._timeline_changed.set()
+    
+    def _dispatch_parked(self, batch: List[ShotEvent], cameras: Set[int]):
+        """Start a parked shot whose cameras were just reserved."""
+        self._start_shot(self._fire_parked_async(batch, cameras))
+    
+    async def _fire_parked_async(self, batch: List[ShotEvent], cameras: Set[int]):
+        """Fire a shot that waited for its cameras, applying the overrun policy to loop shots."""
+        event = batch[0]
+        if event.interval_ns and not self._check_overrun(event, cameras):
+            return
+        await self._fire_async(batch, cameras)
+    
+    async def _fire_async(self, batch: List[ShotEvent], cameras: Set[int]):
+        """Configure and trigger the cameras for a shot."""
+        event = batch[0]
+        success = False
+        
+        try:
+            await self._wait_for(self._slots.acquire())
+            self._shots_in_flight += 1
+            try:
+                success = await self._shoot(event, cameras)
+            finally:
+                self._shots_in_flight -= 1
+                self._slots.release()
+        
+        except Exception as e:
+            self.logger.error(f"Error firing {event.describe()}: {e}", exc_info=True)
+        
+        finally:
+            self._release(cameras)
+        
+        self._record_result(batch, success)
+    
+    async def _shoot(self, event: ShotEvent, cameras: Set[int]) -> bool:
+        """Apply settings, mirror lockup and capture on the shot's cameras, then pre-arm their next shot."""
+        settings = event.settings
+        stale = [cid for cid in cameras if self._camera_settings.get(cid) != settings]
+        if stale:
+            configured = await self._run_on_cameras(stale, 'configure_settings', settings)
+            for camera_id, ok in configured.items():
+                if ok:
+                    self._camera_settings[camera_id] = settings
+                else:
+                    self.logger.warning(f"Configuration failed for camera {camera_id}")
+        
+        mirror_up = None
+        if event.mlu_delay > 0:
+            await self._until(self.action_scheduler.mirror_raise_ns(event))
+            raised_ns = self.clock.monotonic_ns()
+            locked = await self._run_on_cameras(cameras, 'mirror_lockup', True, event.mlu_delay,
+                                                self.action_scheduler.test_mode)
+            mirror_up = {
+                camera_id: self.camera_manager.cameras[camera_id].mirror_up_ns if ok else None
+                for camera_id, ok in locked.items()
+            }
+            self.action_scheduler.record_mirror_latency(raised_ns, mirror_up)
+            await self._until(event.deadline_ns - self.release_margin_ns)
+        
+        staged_ns = self.clock.monotonic_ns()
+        trigger_time = self.action_scheduler.release_time(event)
+        capture_results, capture_timings = await self._capture(cameras, event)
+        if mirror_up is not None:
+            self.action_scheduler.check_mirror_lockup(event, mirror_up, capture_timings)
+        if event.bracket:
+            # The cameras are left on another rung of the ladder
+            for camera_id in cameras:
+                self._camera_settings.pop(camera_id, None)
+        
+        lateness_ns = self.action_scheduler.release_lateness(event, capture_timings, staged_ns)
+        success = self.action_scheduler.record_shot(event, lateness_ns, trigger_time, capture_results,
+                                                    capture_timings)
+        
+        await self._prearm_async(self._lookahead(cameras))
+        return success
+    
+    async def _prearm_async(self, lookahead: Dict[int, ShotEvent]):
+        """Apply and verify the settings of the next shots, one group per settings change."""
+        await asyncio.gather(*(
+            self._prearm_group(event, camera_ids)
+            for event, camera_ids in self._prearm_groups(lookahead)
+        ))
+    
+    async def _prearm_group(self, event: ShotEvent, camera_ids: List[int]):
+        """Pre-arm cameras sharing the same next settings on their worker threads."""
+        configured = await self._run_on_cameras(camera_ids, 'configure_settings', event.settings)
+        armed = [cid for cid, ok in configured.items() if ok]
+        verified = await self._run_on_cameras(armed, 'verify_settings', event.settings)
+        self._mark_prearmed(event, camera_ids, verified)
+    
+    async def _capture(self, cameras: Set[int], event: ShotEvent
+                       ) -> Tuple[Dict[int, Any], Dict[int, Tuple[int, int]]]:
+        """
+        Release the shutters of a shot's cameras together at its deadline.
+        
+        Returns:
+            Tuple of (camera ID -> captured file, burst or bracket frame list
+            or None, camera ID -> monotonic (start, end) of its capture, or
+            shutter open and close of a bulb exposure)
+        """
+        camera_ids = [cid for cid in cameras if cid in self.camera_manager.cameras]
+        futures = {
+            camera_id: asyncio.wrap_future(future)
+            for camera_id, future in self.camera_manager.submit_captures(
+                camera_ids, self.action_scheduler.test_mode, event.deadline_ns, event.burst_ns,
+                event.burst_frames, event.bracket, event.bulb_ns).items()
+        }
+        timeout = MAX_CAPTURE_TIMEOUT + event.capture_ns / 1e9
+        if futures:
+            await asyncio.wait(futures.values(), timeout=timeout)
+        
+        results: Dict[int, Any] = {}
+        timings: Dict[int, Tuple[int, int]] = {}
+        for camera_id, future in futures.items():
+            if not future.done():
+                self.logger.error(f"Camera {camera_id} capture timed out after {timeout:g}s")
+                self.camera_manager.record_capture(camera_id, False, f"timed out after {timeout:g}s")
+                results[camera_id] = None
+            elif future.exception() is not None:
+                self.logger.error(f"Camera {camera_id} capture_image failed: {future.exception()}")
+                self.camera_manager.record_capture(camera_id, False, str(future.exception()))
+                results[camera_id] = None
+            else:
+                results[camera_id], start_ns, end_ns = future.result()
+                timings[camera_id] = (start_ns, end_ns)
+                self.camera_manager.record_capture(camera_id, results[camera_id] is not None)
+        return results, timings
+    
+    async def _run_on_cameras(self, camera_ids: Iterable[int], method: str, *args) -> Dict[int, Any]:
+        """
+        Call a CameraController method on several cameras concurrently.
+        
+        Each call runs on the camera's persistent worker thread, so a camera
+        handle is never used from two threads at once.
+        
+        Returns:
+            Dictionary mapping camera ID to the call result (None on error)
+        """
+        camera_ids = [cid for cid in camera_ids if cid in self.camera_manager.cameras]
+        
+        calls = [
+            asyncio.wrap_future(
+                self.camera_manager.get_worker(cid).submit(getattr(self.camera_manager.cameras[cid], method), *args)
+            )
+            for cid in camera_ids
+        ]
+        outcomes = await asyncio.gather(*calls, return_exceptions=True)
+        
+        results = {}
+        for camera_id, outcome in zip(camera_ids, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Camera {camera_id} {method} failed: {outcome}")
+                outcome = None
+            results[camera_id] = outcome
+        return results
+    
+    def _start_background(self) -> List[asyncio.Task]:
+        """Start the registered periodic tasks."""
+        if self.clock.is_instant:
+            # Periodic sleeps would advance the simulated time on their own
+            self.logger.debug("Instant clock: background tasks disabled")
+            return []
+        
+        return [
+            asyncio.create_task(self._run_periodic(name, func, interval))
+            for name, func, interval in self._background
+        ]
+    
+    def near_trigger(self) -> bool:
+        """True if a shot is in flight or the next release is within the guard window."""
+        if self._shots_in_flight:
+            return True
+        if self._next_release_ns is None:
+            return False
+        return self._next_release_ns - self.clock.monotonic_ns() < self.background_guard_ns
+    
+    async def _run_periodic(self, name: str, func: Callable[[], Any], interval: float):
+        """Run background work every interval, outside trigger windows."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            await self.clock.async_sleep(interval)
+            
+            while self.near_trigger():
+                await self.clock.async_sleep(self.background_guard_ns / 1_000_000_000)
+            
+            try:
+                if asyncio.iscoroutinefunction(func):
+                    await func()
+                else:
+                    await loop.run_in_executor(None, func)
+            except Exception as e:
+                self.logger.warning(f"Background task {name} failed: {e}")
+    
+    async def _poll_status(self):
+        """
+        Refresh the status of the active cameras.
+        
+        Statuses come from the manager's health monitor when it runs, so the
+        cameras are not queried a second time; otherwise they are read on
+        the camera worker threads.
+        """
+        health = getattr(self.camera_manager, 'health', None)
+        if health is not None:
+            statuses = health.snapshots(list(self.camera_manager.active_cameras))
+        else:
+            statuses = await self._run_on_cameras(self.camera_manager.active_cameras, 'get_status')
+        for camera_id, status in statuses.items():
+            if status is not None:
+                self.camera_status[camera_id] = status
+                if not status.connected:
+                    self.logger.warning(f"Camera {camera_id} reported disconnected")
+    
+    async def _log_progress(self):
+        """Report shot progress."""
+        with self._results_lock:
+            fired = sum(self.results.values())
+        self.logger.info(f"Progress: {fired} shots fired, {self.pending()} pending, "
+                         f"{len(self.skipped)} skipped")
@@ -0,0 +1,201 @@
+"""
+Precision deadline waiting for Eclipse Photography Controller.
+
+Waits for monotonic deadlines with a hybrid strategy: a single coarse sleep
+until shortly before the deadline, then a short busy-wait to absorb the
+scheduler wake-up latency. This gives millisecond trigger accuracy while
+keeping the CPU idle during long waits.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.constants import DEADLINE_SPIN_WINDOW, MAX_DEADLINE_SPIN_WINDOW
+
+
+@dataclass
+class WaitResult:
+    """Outcome of a deadline wait."""
+    deadline_ns: int      # Requested monotonic deadline
+    woke_ns: int          # Monotonic time when the wait returned
+    interrupted: bool = False
+    
+    @property
+    def error_ns(self) -> int:
+        """Signed wake-up error in nanoseconds (positive = late)."""
+        return self.woke_ns - self.deadline_ns
+    
+    @property
+    def lateness_ns(self) -> int:
+        """Lateness in nanoseconds (0 if the deadline was met or not reached)."""
+        return max(0, self.error_ns)
+
+
+class DeadlineWaiter:
+    """
+    Hybrid sleep/spin waiter for monotonic deadlines.
+    
+    The spin window is calibrated from the measured oversleep of
+    time.sleep() on the host, so slow boards such as the Raspberry Pi get a
+    wider safety margin than desktop machines.
+    """
+    
+    def __init__(self, spin_window: float = DEADLINE_SPIN_WINDOW, progress_interval: int = 20,
+                 clock: Optional[Clock] = None):
+        """
+        Initialize deadline waiter.
+        
+        Args:
+            spin_window: Busy-wait duration before the deadline in seconds
+            progress_interval: Maximum length of a single sleep, and how often
+                progress is logged during long waits (seconds)
+            clock: Clock to read and sleep on (default: system clock)
+        """
+        self.clock = clock or SYSTEM_CLOCK
+        self.spin_window_ns = int(spin_window * 1_000_000_000)
+        self.progress_interval = progress_interval
+        self.logger = logging.getLogger('deadline_waiter')
+        
+        # Achieved accuracy statistics
+        self.wait_count = 0
+        self.max_error_ns = 0
+        self.total_abs_error_ns = 0
+    
+    def calibrate(self, samples: int = 20, sleep_time: float = 0.001) -> int:
+        """
+        Calibrate the spin window from the host's sleep overshoot.
+        
+        Args:
+            samples: Number of short sleeps to measure
+            sleep_time: Duration of each measured sleep in seconds
+        
+        Returns:
+            New spin window in nanoseconds
+        """
+        requested_ns = int(sleep_time * 1_000_000_000)
+        overshoots = []
+        
+        for _ in range(samples):
+            start_ns = self.clock.monotonic_ns()
+            self.clock.sleep(sleep_time)
+            overshoots.append(self.clock.monotonic_ns() - start_ns - requested_ns)
+        
+        overshoots.sort()
+        worst_ns = overshoots[min(len(overshoots) - 1, int(len(overshoots) * 0.9))]
+        
+        # Twice the 90th percentile oversleep, bounded to keep CPU use low
+        max_window_ns = int(MAX_DEADLINE_SPIN_WINDOW * 1_000_000_000)
+        self.spin_window_ns = min(max(self.spin_window_ns, 2 * worst_ns), max_window_ns)
+        
+        self.logger.info(f"Deadline waiter calibrated: sleep overshoot p90 {worst_ns / 1e6:.3f}ms, "
+                         f"spin window {self.spin_window_ns / 1e6:.3f}ms")
+        return self.spin_window_ns
+    
+    def wait(self, deadline_ns: int, should_stop: Optional[Callable[[], bool]] = None,
+             progress_interval: Optional[int] = None) -> WaitResult:
+        """
+        Wait until a monotonic deadline.
+        
+        Args:
+            deadline_ns: Deadline in time.monotonic_ns() reference
+            should_stop: Optional callback checked at each coarse wake-up
+            progress_interval: Maximum sleep and progress log period for this
+                wait (seconds), None for the waiter default
+        
+        Returns:
+            WaitResult with the achieved wake-up error
+        """
+        while True:
+            now_ns = self.clock.monotonic_ns()
+            sleep_ns = self._coarse_sleep_ns(deadline_ns, now_ns, progress_interval)
+            if sleep_ns is None:
+                break
+            
+            if should_stop is not None and should_stop():
+                return WaitResult(deadline_ns, now_ns, interrupted=True)
+            
+            self.clock.sleep(sleep_ns / 1_000_000_000)
+        
+        return self._spin(deadline_ns)
+    
+    async def wait_async(self, deadline_ns: int, should_stop: Optional[Callable[[], bool]] = None,
+                         progress_interval: Optional[int] = None) -> WaitResult:
+        """
+        Wait until a monotonic deadline without blocking the event loop.
+        
+        Other tasks run during the coarse sleep; only the final spin window
+        holds the loop.
+        
+        Args:
+            deadline_ns: Deadline in time.monotonic_ns() reference
+            should_stop: Optional callback checked at each coarse wake-up
+            progress_interval: Maximum sleep and progress log period for this
+                wait (seconds), None for the waiter default
+        
+        Returns:
+            WaitResult with the achieved wake-up error
+        """
+        while True:
+            now_ns = self.clock.monotonic_ns()
+            sleep_ns = self._coarse_sleep_ns(deadline_ns, now_ns, progress_interval)
+            if sleep_ns is None:
+                break
+            
+            if should_stop is not None and should_stop():
+                return WaitResult(deadline_ns, now_ns, interrupted=True)
+            
+            await self.clock.async_sleep(sleep_ns / 1_000_000_000)
+        
+        return self._spin(deadline_ns)
+    
+    def _coarse_sleep_ns(self, deadline_ns: int, now_ns: int,
+                         progress_interval: Optional[int] = None) -> Optional[int]:
+        """Get the next coarse sleep duration, or None once inside the spin window."""
+        remaining_ns = deadline_ns - now_ns
+        if remaining_ns <= self.spin_window_ns:
+            return None
+        
+        sleep_ns = remaining_ns - self.spin_window_ns
+        if progress_interval is None:
+            progress_interval = self.progress_interval
+        progress_ns = progress_interval * 1_000_000_000
+        if sleep_ns > progress_ns:
+            self.logger.info(f"Waiting: {remaining_ns // 1_000_000_000}s remaining")
+            sleep_ns = progress_ns
+        return sleep_ns
+    
+    def _spin(self, deadline_ns: int) -> WaitResult:
+        """Short calibrated spin to absorb wake-up latency."""
+        while self.clock.monotonic_ns() < deadline_ns:
+            pass
+        
+        result = WaitResult(deadline_ns, self.clock.monotonic_ns())
+        self._record(result)
+        return result
+    
+    def _record(self, result: WaitResult):
+        """Record the achieved error of a completed wait."""
+        error_ns = result.error_ns
+        self.wait_count += 1
+        self.total_abs_error_ns += abs(error_ns)
+        self.max_error_ns = max(self.max_error_ns, error_ns)
+        
+        if error_ns > 1_000_000:
+            self.logger.debug(f"Deadline reached {error_ns / 1e6:.3f}ms late")
+    
+    def get_stats(self) -> dict:
+        """
+        Get achieved waiting accuracy.
+        
+        Returns:
+            Dictionary with wait count, mean and max error in milliseconds
+        """
+        mean_ns = self.total_abs_error_ns / self.wait_count if self.wait_count else 0
+        return {
+            'waits': self.wait_count,
+            'mean_error_ms': mean_ns / 1e6,
+            'max_error_ms': self.max_error_ns / 1e6,
+            'spin_window_ms': self.spin_window_ns / 1e6
+        }
@@ -0,0 +1,566 @@
+"""
+Event-driven shot scheduler for Eclipse Photography Controller.
+
+Merges the shots of every action into a single priority queue ordered by
+deadline, so overlapping or out-of-order actions fire at their intended
+instants instead of waiting for the previous action to finish.
+"""
+
+import dataclasses
+import heapq
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from enum import Enum
+from typing import Dict, List, Optional, Callable, Set, Tuple, TYPE_CHECKING
+
+from .shot_plan import ShotPlan, ShotEvent
+from config.eclipse_config import CameraSettings
+from utils.constants import (
+    MAX_CONCURRENT_SHOTS, SHOT_MERGE_WINDOW, LOOP_OVERRUN_TOLERANCE, RELEASE_SYNC_MARGIN, BACKGROUND_GUARD_WINDOW,
+    PARKED_SHOT_POLL
+)
+
+if TYPE_CHECKING:
+    from .action_scheduler import ActionScheduler
+
+
+class ConflictPolicy(Enum):
+    """Policy applied when a shot is due while its cameras are still busy."""
+    QUEUE = "queue"   # Fire as soon as the cameras are free (late)
+    SKIP = "skip"     # Drop the conflicting shot
+    MERGE = "merge"   # Fold shots with identical settings due within the merge window, else queue
+
+
+class ExecutionEngine(Enum):
+    """Engine running the shot timeline."""
+    THREADS = "threads"   # Dispatcher thread and shot worker threads
+    ASYNCIO = "asyncio"   # Single event loop with per-camera I/O workers
+
+
+class OverrunPolicy(Enum):
+    """Policy applied when a Boucle shot cannot fire on its grid slot."""
+    SKIP = "skip"           # Drop the late shot, the remaining shots stay on the grid
+    COMPRESS = "compress"   # Fire late shots back-to-back until back on the grid
+    SHIFT = "shift"         # Fire late and delay the remaining shots of the loop, up to its end
+
+
+class EventScheduler:
+    """
+    Priority-queue scheduler running shot events on one timeline.
+    
+    The dispatcher thread owns the deadlines: it sleeps until the next event
+    is due and hands it to a worker. Shots targeting disjoint camera sets run
+    concurrently; shots competing for the same cameras are resolved by the
+    conflict policy. A shot queued behind busy cameras is parked rather than
+    waited for, so the dispatcher keeps releasing the shots of other cameras
+    on time; it fires as soon as the shot holding its cameras releases them.
+    As soon as a capture completes, the worker pre-arms its cameras with the
+    settings of their next shot, so configuration happens in the idle gap
+    between shots rather than at the trigger.
+    """
+    
+    def __init__(self, action_scheduler: 'ActionScheduler',
+                 conflict_policy: ConflictPolicy = ConflictPolicy.QUEUE,
+                 max_concurrent: int = MAX_CONCURRENT_SHOTS,
+                 merge_window: float = SHOT_MERGE_WINDOW,
+                 overrun_policy: OverrunPolicy = OverrunPolicy.SKIP,
+                 overrun_tolerance: float = LOOP_OVERRUN_TOLERANCE,
+                 background_guard: float = BACKGROUND_GUARD_WINDOW):
+        """
+        Initialize event scheduler.
+        
+        Args:
+            action_scheduler: Scheduler providing shot execution and statistics
+            conflict_policy: Policy for shots whose cameras are busy
+            max_concurrent: Maximum number of shots in flight
+            merge_window: Window in seconds for MERGE policy coalescing
+            overrun_policy: Policy for Boucle shots that miss their grid slot
+            overrun_tolerance: Fraction of the loop interval a shot may be late
+            background_guard: Seconds before a release during which background work waits
+        """
+        self.action_scheduler = action_scheduler
+        self.camera_manager = action_scheduler.camera_manager
+        self.time_calculator = action_scheduler.time_calculator
+        self.clock = action_scheduler.clock
+        self.conflict_policy = conflict_policy
+        self.max_concurrent = max(1, max_concurrent)
+        self.merge_window_ns = int(merge_window * 1_000_000_000)
+        self.overrun_policy = overrun_policy
+        self.overrun_tolerance = overrun_tolerance
+        self.release_margin_ns = int(RELEASE_SYNC_MARGIN * 1_000_000_000)
+        self.background_guard_ns = int(background_guard * 1_000_000_000)
+        self.logger = logging.getLogger('event_scheduler')
+        
+        # Heap entries: (release_ns, deadline_ns, sequence, event)
+        self._queue: List[Tuple[int, int, int, ShotEvent]] = []
+        self._sequence = itertools.count()
+        
+        self._queue_lock = threading.Lock()  # Workers shift queued loop shots on overrun
+        
+        self._busy_cameras: Set[int] = set()
+        self._busy_changed = threading.Condition()
+        self._results_lock = threading.Lock()
+        self._camera_settings: Dict[int, CameraSettings] = {}
+        self._action_end_ns: Dict[int, int] = {}
+        self._acquiring: Optional[ShotEvent] = None  # Popped shot not yet reserved or parked
+        
+        # Shots waiting for busy cameras, in deadline order: (batch, cameras)
+        self._parked: List[Tuple[List[ShotEvent], Set[int]]] = []
+        self._should_stop: Optional[Callable[[], bool]] = None
+        self._stop_on_failure = False
+        self._aborted = False
+        self._pool: Optional[ThreadPoolExecutor] = None
+        
+        self.results: Dict[int, int] = {}
+        self.skipped: List[ShotEvent] = []
+        self.merged: List[ShotEvent] = []
+        self.overruns: List[ShotEvent] = []
+        self.prearmed: List[ShotEvent] = []
+        self._failed = False
+    
+    def schedule(self, event: ShotEvent):
+        """
+        Add a shot event to the timeline.
+        
+        Events are released early by their MLU lead and the release sync
+        margin, so the mirrors are up and the cameras staged when the
+        shutter opens at the deadline itself.
+        """
+        release_ns = event.deadline_ns - event.lead_ns - self.release_margin_ns
+        with self._queue_lock:
+            heapq.heappush(self._queue, (release_ns, event.deadline_ns, next(self._sequence), event))
+        with self._results_lock:
+            self.results.setdefault(event.action_index, 0)
+        
+        if event.interval_ns:
+            end_ns = self._action_end_ns.get(event.action_index, event.deadline_ns)
+            self._action_end_ns[event.action_index] = max(end_ns, event.deadline_ns)
+    
+    def schedule_plan(self, plan: ShotPlan):
+        """Add every event of a compiled plan to the timeline."""
+        for event in plan:
+            self.schedule(event)
+    
+    def pending(self) -> int:
+        """Get number of events still waiting in the queue."""
+        return len(self._queue)
+    
+    def near_trigger(self) -> bool:
+        """
+        True if a shot is in flight or the next release is within the guard window.
+        
+        Polled from other threads by background work (downloads, status
+        queries) that must keep the cameras free around triggers.
+        """
+        if self._busy_cameras:
+            return True
+        try:
+            next_release_ns = self._queue[0][0]
+        except IndexError:
+            return False
+        return next_release_ns - self.clock.monotonic_ns() < self.background_guard_ns
+    
+    def run(self, plan: Optional[ShotPlan] = None, should_stop: Optional[Callable[[], bool]] = None,
+            stop_on_failure: bool = False) -> Dict[int, int]:
+        """
+        Run all scheduled events until the queue is empty.
+        
+        Args:
+            plan: Optional plan to schedule before running
+            should_stop: Optional callback polled before each event to abort the run
+            stop_on_failure: If True, stop dispatching after the first failed shot
+        
+        Returns:
+            Dictionary mapping action index to number of successful shots
+        """
+        if plan is not None:
+            self.schedule_plan(plan)
+        
+        self.logger.info(f"Event scheduler started: {self.pending()} shots, "
+                         f"policy={self.conflict_policy.value}, overrun={self.overrun_policy.value}, "
+                         f"max_concurrent={self.max_concurrent}")
+        
+        in_flight = set()
+        self._should_stop = should_stop
+        self._stop_on_failure = stop_on_failure
+        self._aborted = False
+        self._prearm(self._lookahead())
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='Shot') as pool:
+            self._pool = pool
+            while self._queue:
+                if should_stop is not None and should_stop():
+                    self.logger.info("Stop requested, aborting event scheduler")
+                    self._abort()
+                    break
+                if stop_on_failure and self._failed:
+                    self.logger.error("Stop on failure enabled, aborting event scheduler")
+                    self._abort()
+                    break
+                
+                if self.clock.is_instant:
+                    # Simulated time jumps on every sleep: let in-flight shots fire first
+                    futures_wait(in_flight)
+                    in_flight.clear()
+                
+                release_ns = self._queue[0][0]
+                if self.time_calculator.wait_until_deadline(release_ns, should_stop=should_stop).interrupted:
+                    continue
+                
+                batch = self._pop_due()
+                if batch is None:
+                    continue
+                
+                event = batch[0]
+                cameras = self._target_cameras(event)
+                acquired = self._acquire(cameras, batch)
+                self._acquiring = None
+                if not acquired:
+                    continue
+                
+                if event.interval_ns and not self._check_overrun(event, cameras):
+                    continue
+                
+                future = pool.submit(self._fire, batch, cameras)
+                if self.clock.is_instant:
+                    in_flight.add(future)
+            
+            self._wait_parked()
+        
+        self._pool = None
+        self._log_summary()
+        return dict(self.results)
+    
+    def _log_summary(self):
+        """Log skipped, merged and overrunning shots at the end of a run."""
+        if self.skipped:
+            self.logger.warning(f"{len(self.skipped)} shots skipped due to camera conflicts or overruns")
+        if self.merged:
+            self.logger.info(f"{len(self.merged)} shots merged with identical neighbours")
+        if self.overruns:
+            self.logger.warning(f"{len(self.overruns)} loop shots overran their slot "
+                                f"(policy={self.overrun_policy.value})")
+        if self.prearmed:
+            self.logger.info(f"{len(self.prearmed)} settings changes applied ahead of their shot")
+    
+    def _target_cameras(self, event: ShotEvent) -> Set[int]:
+        """Get the camera IDs a shot will use, leaving out cameras lost since planning."""
+        active = set(self.camera_manager.active_cameras)
+        if event.camera_ids is not None:
+            return set(event.camera_ids) & active
+        return active
+    
+    def _pop_mergeable(self, event: ShotEvent) -> List[ShotEvent]:
+        """Pop queued events that can share the trigger of the given event."""
+        merged = []
+        while self._queue:
+            candidate = self._queue[0][3]
+            if (candidate.deadline_ns - event.deadline_ns > self.merge_window_ns
+                    or candidate.settings != event.settings
+                    or candidate.camera_ids != event.camera_ids
+                    or candidate.mlu_delay != event.mlu_delay
+                    or candidate.burst_ns != event.burst_ns
+                    or candidate.burst_frames != event.burst_frames
+                    or candidate.bracket != event.bracket
+                    or candidate.bulb_ns != event.bulb_ns):
+                break
+            heapq.heappop(self._queue)
+            merged.append(candidate)
+            self.merged.append(candidate)
+            self.logger.info(f"{candidate.describe()} merged into {event.describe()}")
+        return merged
+    
+    def _pop_due(self) -> Optional[List[ShotEvent]]:
+        """
+        Pop the next shot once its release time has come.
+        
+        Returns:
+            The shot followed by the shots merged into it, or None if the
+            queue head moved (loop shots shifted by a worker) during the wait
+        """
+        with self._queue_lock:
+            if not self._queue or self._queue[0][0] > self.clock.monotonic_ns():
+                return None
+            
+            # Set before the pop: a worker looking ahead must see the shot at all times
+            self._acquiring = self._queue[0][3]
+            _, _, _, event = heapq.heappop(self._queue)
+            batch = [event]
+            if self.conflict_policy == ConflictPolicy.MERGE:
+                batch.extend(self._pop_mergeable(event))
+            return batch
+    
+    def _acquire(self, cameras: Set[int], batch: List[ShotEvent]) -> bool:
+        """
+        Reserve cameras for a shot, applying the conflict policy if they are busy.
+        
+        Cameras awaited by parked shots count as busy, so a later shot never
+        overtakes an earlier one on the same camera.
+        
+        Returns:
+            True if the cameras were reserved, False if the shot was skipped
+            or parked until its cameras are released
+        """
+        event = batch[0]
+        with self._busy_changed:
+            busy = (self._busy_cameras | self._parked_cameras()) & cameras
+            if not busy:
+                self._busy_cameras |= cameras
+                return True
+            
+            if self.conflict_policy == ConflictPolicy.SKIP:
+                self.logger.warning(f"{event.describe()} skipped: cameras {sorted(busy)} busy")
+                self.skipped.append(event)
+                return False
+            
+            self.logger.warning(f"{event.describe()} waiting for cameras {sorted(busy)}")
+            self._parked.append((batch, cameras))
+            return False
+    
+    def _parked_cameras(self) -> Set[int]:
+        """Get the cameras awaited by parked shots (busy lock held)."""
+        cameras: Set[int] = set()
+        for _, parked in self._parked:
+            cameras |= parked
+        return cameras
+    
+    def _unpark(self) -> List[Tuple[List[ShotEvent], Set[int]]]:
+        """
+        Reserve the cameras of the parked shots that can fire now (busy lock held).
+        
+        Returns:
+            List of (batch, cameras) to fire, in deadline order
+        """
+        if self._parked_cancelled():
+            self._drop_parked()
+            return []
+        
+        ready = []
+        waiting = []
+        blocked = set(self._busy_cameras)
+        for batch, cameras in self._parked:
+            if cameras & blocked:
+                waiting.append((batch, cameras))
+            else:
+                self._busy_cameras |= cameras
+                ready.append((batch, cameras))
+            blocked |= cameras
+        
+        self._parked = waiting
+        return ready
+    
+    def _parked_cancelled(self) -> bool:
+        """True once parked shots must not fire: run aborted, stop requested or failed with stop_on_failure."""
+        return (self._aborted
+                or (self._should_stop is not None and self._should_stop())
+                or (self._stop_on_failure and self._failed))
+    
+    def _drop_parked(self):
+        """Drop the parked shots of a stopped run (busy lock held)."""
+        if self._parked:
+            self.logger.info(f"{len(self._parked)} shots waiting for busy cameras dropped")
+        self._parked = []
+    
+    def _abort(self):
+        """Stop the run: parked shots are dropped along with the queued ones."""
+        with self._busy_changed:
+            self._aborted = True
+            self._drop_parked()
+    
+    def _wait_parked(self):
+        """Wait until every parked shot has been handed to a worker, or the run is stopped."""
+        with self._busy_changed:
+            while self._parked:
+                if self._parked_cancelled():
+                    self._drop_parked()
+                    break
+                self._busy_changed.wait(PARKED_SHOT_POLL)
+    
+    def _dispatch_parked(self, batch: List[ShotEvent], cameras: Set[int]):
+        """Hand a parked shot whose cameras were just reserved to a worker (busy lock held)."""
+        self._pool.submit(self._fire_parked, batch, cameras)
+    
+    def _fire_parked(self, batch: List[ShotEvent], cameras: Set[int]):
+        """Fire a shot that waited for its cameras, applying the overrun policy to loop shots (worker thread)."""
+        event = batch[0]
+        if event.interval_ns and not self._check_overrun(event, cameras):
+            return
+        self._fire(batch, cameras)
+    
+    def _check_overrun(self, event: ShotEvent, cameras: Set[int]) -> bool:
+        """
+        Apply the overrun policy to a Boucle shot about to fire.
+        
+        A shot overruns when it starts later than the tolerated fraction of
+        its loop interval, typically because the previous capture was slow.
+        
+        Returns:
+            True if the shot should fire, False if it was skipped
+        """
+        lateness_ns = self.clock.monotonic_ns() - (event.deadline_ns - event.lead_ns)
+        if lateness_ns <= event.interval_ns * self.overrun_tolerance:
+            return True
+        
+        self.overruns.append(event)
+        
+        if self.overrun_policy == OverrunPolicy.SKIP:
+            self.logger.warning(f"{event.describe()} skipped: {lateness_ns / 1e6:.0f}ms behind the loop grid")
+            self.skipped.append(event)
+            self._release(cameras)
+            return False
+        
+        if self.overrun_policy == OverrunPolicy.SHIFT:
+            self._shift_action(event.action_index, lateness_ns)
+        
+        return True
+    
+    def _shift_action(self, action_index: int, delay_ns: int):
+        """Delay the queued shots of a loop, dropping those pushed past its end."""
+        end_ns = self._action_end_ns[action_index]
+        kept = []
+        dropped = 0
+        
+        with self._queue_lock:
+            for release_ns, deadline_ns, sequence, event in self._queue:
+                if event.action_index != action_index:
+                    kept.append((release_ns, deadline_ns, sequence, event))
+                elif deadline_ns + delay_ns <= end_ns:
+                    shifted = dataclasses.replace(event, deadline_ns=deadline_ns + delay_ns)
+                    kept.append((release_ns + delay_ns, shifted.deadline_ns, sequence, shifted))
+                else:
+                    dropped += 1
+                    self.skipped.append(event)
+            
+            heapq.heapify(kept)
+            self._queue = kept
+        
+        self.logger.warning(f"Action {action_index + 1}: remaining loop shots shifted by "
+                            f"{delay_ns / 1e6:.0f}ms, {dropped} dropped past the loop end")
+    
+    def _release(self, cameras: Set[int]):
+        """Release cameras reserved by a shot and fire the parked shots waiting for them."""
+        with self._busy_changed:
+            self._busy_cameras -= cameras
+            for batch, reserved in self._unpark():
+                self._dispatch_parked(batch, reserved)
+            self._busy_changed.notify_all()
+    
+    def _lookahead(self, cameras: Optional[Set[int]] = None) -> Dict[int, ShotEvent]:
+        """
+        Get the next queued shot of each camera.
+        
+        Args:
+            cameras: Cameras to look up (default: every camera with a queued shot)
+        
+        Returns:
+            Dictionary mapping camera ID to its earliest queued shot
+        """
+        nearest: Dict[int, ShotEvent] = {}
+        
+        # Snapshot: the dispatcher may push or pop while a worker looks ahead
+        candidates = [event for _, _, _, event in list(self._queue)]
+        candidates.extend(batch[0] for batch, _ in list(self._parked))
+        acquiring = self._acquiring
+        if acquiring is not None:
+            candidates.append(acquiring)
+        
+        for event in candidates:
+            for camera_id in self._target_cameras(event):
+                if cameras is not None and camera_id not in cameras:
+                    continue
+                if camera_id not in nearest or event.deadline_ns < nearest[camera_id].deadline_ns:
+                    nearest[camera_id] = event
+        return nearest
+    
+    def _prearm_groups(self, lookahead: Dict[int, ShotEvent]) -> List[Tuple[ShotEvent, List[int]]]:
+        """Group the cameras whose next shot needs a settings change by target settings."""
+        groups: List[Tuple[ShotEvent, List[int]]] = []
+        
+        for camera_id, event in sorted(lookahead.items()):
+            if self._camera_settings.get(camera_id) == event.settings:
+                continue
+            for group_event, camera_ids in groups:
+                if group_event.settings == event.settings:
+                    camera_ids.append(camera_id)
+                    break
+            else:
+                groups.append((event, [camera_id]))
+        return groups
+    
+    def _prearm(self, lookahead: Dict[int, ShotEvent]):
+        """Apply and verify the settings of the next shots on idle cameras."""
+        for event, camera_ids in self._prearm_groups(lookahead):
+            try:
+                configured = self.camera_manager.configure_all(event.settings, camera_ids=camera_ids)
+                armed = [cid for cid, ok in configured.items() if ok]
+                verified = self.camera_manager.verify_all(event.settings, camera_ids=armed) if armed else {}
+            except Exception as e:
+                self.logger.warning(f"Pre-arming for {event.describe()} failed: {e}")
+                verified = {}
+            
+            self._mark_prearmed(event, camera_ids, verified)
+    
+    def _mark_prearmed(self, event: ShotEvent, camera_ids: List[int], verified: Dict[int, bool]):
+        """Record which cameras hold the settings of their next shot."""
+        failed = []
+        for camera_id in camera_ids:
+            if verified.get(camera_id):
+                self._camera_settings[camera_id] = event.settings
+            else:
+                # Unknown state: the settings are applied again when the shot fires
+                self._camera_settings.pop(camera_id, None)
+                failed.append(camera_id)
+        
+        if failed:
+            self.logger.warning(f"Pre-arming cameras {failed} for {event.describe()} failed, "
+                                f"settings will be applied at trigger time")
+            return
+        
+        self.prearmed.append(event)
+        slack_ns = event.deadline_ns - event.lead_ns - self.clock.monotonic_ns()
+        if slack_ns < 0:
+            self.logger.warning(f"Cameras {camera_ids} pre-armed for {event.describe()} "
+                                f"{-slack_ns / 1e6:.0f}ms after its release")
+        else:
+            self.logger.debug(f"Cameras {camera_ids} pre-armed for {event.describe()}, "
+                              f"{slack_ns / 1e9:.3f}s ahead")
+    
+    def _fire(self, batch: List[ShotEvent], cameras: Set[int]):
+        """Configure and trigger the cameras for a shot, then pre-arm the next one (worker thread)."""
+        event = batch[0]
+        success = False
+        
+        try:
+            # Only reached when pre-arming could not apply the settings in advance
+            stale = [cid for cid in cameras if self._camera_settings.get(cid) != event.settings]
+            if stale:
+                if self.action_scheduler.configure_cameras(event.settings, stale):
+                    for camera_id in stale:
+                        self._camera_settings[camera_id] = event.settings
+            
+            success = self.action_scheduler.execute_shot(event, sorted(cameras))
+            if event.bracket:
+                # The cameras are left on another rung of the ladder
+                for camera_id in cameras:
+                    self._camera_settings.pop(camera_id, None)
+            
+            self._prearm(self._lookahead(cameras))
+        
+        except Exception as e:
+            self.logger.error(f"Error firing {event.describe()}: {e}", exc_info=True)
+        
+        finally:
+            self._release(cameras)
+        
+        self._record_result(batch, success)
+    
+    def _record_result(self, batch: List[ShotEvent], success: bool):
+        """Count a fired shot for every event it covered."""
+        with self._results_lock:
+            for shot in batch:
+                if success:
+                    self.results[shot.action_index] += 1
+            if not success:
+                self._failed = True
@@ -0,0 +1,258 @@
+"""
+Trigger timing instrumentation for Eclipse Photography Controller.
+
+Records, for every fired shot, the delay between its scheduled instant and
+the trigger of each camera, how long each camera takes to return from the
+capture, and the skew between cameras. Samples are kept in compact
+fixed-bucket histograms broken down by camera, action and eclipse phase, so
+memory stays constant however long the sequence is.
+"""
+
+import bisect
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from .shot_plan import ShotEvent
+from .time_calculator import EclipsePhase
+
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations."""
+    
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns: Optional[int] = None
+    
+    def record(self, value_ns: int):
+        """
+        Add a sample.
+        
+        Args:
+            value_ns: Duration in nanoseconds (negative values count as 0)
+        """
+        value_ns = max(0, value_ns)
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ns / 1e6)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        self.min_ns = value_ns if self.min_ns is None else min(self.min_ns, value_ns)
+        self.max_ns = value_ns if self.max_ns is None else max(self.max_ns, value_ns)
+    
+    def percentile(self, percent: float) -> float:
+        """
+        Get an upper estimate of a percentile.
+        
+        Args:
+            percent: Percentile between 0 and 100
+        
+        Returns:
+            Upper bound in milliseconds of the bucket holding the percentile
+            (capped by the maximum sample), or 0 if empty
+        """
+        if not self.count:
+            return 0.0
+        
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                break
+        
+        max_ms = self.max_ns / 1e6
+        if index < len(LATENCY_BUCKETS_MS):
+            return min(LATENCY_BUCKETS_MS[index], max_ms)
+        return max_ms
+    
+    @property
+    def mean_ms(self) -> float:
+        """Mean of the samples in milliseconds."""
+        return self.total_ns / self.count / 1e6 if self.count else 0.0
+    
+    def to_dict(self) -> Dict[str, float]:
+        """
+        Summarize the histogram.
+        
+        Returns:
+            Dictionary with count, mean, p50, p95 and max in milliseconds
+        """
+        return {
+            'count': self.count,
+            'mean_ms': self.mean_ms,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'max_ms': (self.max_ns or 0) / 1e6
+        }
+    
+    def format(self) -> str:
+        """Get a one-line human-readable summary."""
+        summary = self.to_dict()
+        return (f"n={summary['count']} mean={summary['mean_ms']:.1f}ms p50<={summary['p50_ms']:.1f}ms "
+                f"p95<={summary['p95_ms']:.1f}ms max={summary['max_ms']:.1f}ms")
+
+
+class ShotMetrics:
+    """
+    Trigger timing histograms for fired shots.
+    
+    Trigger latency is the delay between a shot's deadline and the moment a
+    camera's capture call started; capture duration is how long the call took
+    to return; skew is the spread of trigger instants across the cameras of
+    one shot. For mirror lockup shots, the settle shortfall is how much less
+    than the MLU delay a mirror had to settle before its shutter opened.
+    """
+    
+    def __init__(self):
+        """Initialize empty metrics."""
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Discard all recorded samples."""
+        with self._lock:
+            self.trigger_latency = LatencyHistogram()
+            self.capture_duration = LatencyHistogram()
+            self.camera_skew = LatencyHistogram()
+            self.latency_by_camera: Dict[int, LatencyHistogram] = defaultdict(LatencyHistogram)
+            self.duration_by_camera: Dict[int, LatencyHistogram] = defaultdict(LatencyHistogram)
+            self.latency_by_action: Dict[int, LatencyHistogram] = defaultdict(LatencyHistogram)
+            self.latency_by_phase: Dict[EclipsePhase, LatencyHistogram] = defaultdict(LatencyHistogram)
+            self.skew_by_phase: Dict[EclipsePhase, LatencyHistogram] = defaultdict(LatencyHistogram)
+            self.mirror_shortfall = LatencyHistogram()
+            self.mirror_failures = 0
+    
+    def record(self, event: ShotEvent, phase: EclipsePhase, lateness_ns: int,
+               capture_timings: Optional[Dict[int, Tuple[int, int]]] = None):
+        """
+        Record the timing of a fired shot.
+        
+        Args:
+            event: Shot event that was fired
+            phase: Eclipse phase of the shot
+            lateness_ns: Shot lateness, used when no per-camera timings are available
+            capture_timings: Dictionary mapping camera ID to monotonic (start, end)
+                of its capture call
+        """
+        with self._lock:
+            if not capture_timings:
+                self.trigger_latency.record(lateness_ns)
+                self.latency_by_action[event.action_index].record(lateness_ns)
+                self.latency_by_phase[phase].record(lateness_ns)
+                return
+            
+            starts = []
+            for camera_id, (start_ns, end_ns) in capture_timings.items():
+                self.latency_by_camera[camera_id].record(start_ns - event.deadline_ns)
+                self.duration_by_camera[camera_id].record(end_ns - start_ns)
+                self.capture_duration.record(end_ns - start_ns)
+                starts.append(start_ns)
+            
+            # The shot counts as triggered when its first camera fires
+            shot_latency_ns = min(starts) - event.deadline_ns
+            self.trigger_latency.record(shot_latency_ns)
+            self.latency_by_action[event.action_index].record(shot_latency_ns)
+            self.latency_by_phase[phase].record(shot_latency_ns)
+            
+            if len(starts) > 1:
+                skew_ns = max(starts) - min(starts)
+                self.camera_skew.record(skew_ns)
+                self.skew_by_phase[phase].record(skew_ns)
+    
+    def record_mirror_lockup(self, event: ShotEvent, mirror_up: Dict[int, Optional[int]],
+                             capture_timings: Dict[int, Tuple[int, int]]) -> Dict[int, int]:
+        """
+        Record the mirror settle time of a mirror lockup shot.
+        
+        Args:
+            event: Shot event that was fired
+            mirror_up: Dictionary mapping camera ID to the monotonic instant
+                its mirror went up (None if the lockup failed)
+            capture_timings: Dictionary mapping camera ID to monotonic (start, end)
+                of its capture call
+        
+        Returns:
+            Dictionary mapping camera ID to its settle time in nanoseconds,
+            for the cameras fired with the mirror up
+        """
+        settle = {
+            camera_id: capture_timings[camera_id][0] - up_ns
+            for camera_id, up_ns in mirror_up.items()
+            if up_ns is not None and camera_id in capture_timings
+        }
+        with self._lock:
+            self.mirror_failures += sum(1 for up_ns in mirror_up.values() if up_ns is None)
+            for settle_ns in settle.values():
+                self.mirror_shortfall.record(event.mlu_ns - settle_ns)
+        return settle
+    
+    def summary(self) -> Dict[str, object]:
+        """
+        Summarize all histograms.
+        
+        Returns:
+            Nested dictionary of histogram summaries
+        """
+        with self._lock:
+            return {
+                'trigger_latency': self.trigger_latency.to_dict(),
+                'capture_duration': self.capture_duration.to_dict(),
+                'camera_skew': self.camera_skew.to_dict(),
+                'mirror_shortfall': self.mirror_shortfall.to_dict(),
+                'mirror_failures': self.mirror_failures,
+                'by_camera': {
+                    camera_id: {
+                        'trigger_latency': histogram.to_dict(),
+                        'capture_duration': self.duration_by_camera[camera_id].to_dict()
+                    }
+                    for camera_id, histogram in sorted(self.latency_by_camera.items())
+                },
+                'by_action': {
+                    action_index: histogram.to_dict()
+                    for action_index, histogram in sorted(self.latency_by_action.items())
+                },
+                'by_phase': {
+                    phase.value: {
+                        'trigger_latency': histogram.to_dict(),
+                        'camera_skew': self.skew_by_phase[phase].to_dict()
+                    }
+                    for phase, histogram in self.latency_by_phase.items()
+                }
+            }
+    
+    def format_report(self) -> List[str]:
+        """
+        Format the metrics as report lines for the log.
+        
+        Returns:
+            List of human-readable lines
+        """
+        with self._lock:
+            if not self.trigger_latency.count:
+                return ["Trigger timing: no shots recorded"]
+            
+            lines = [
+                f"Trigger latency: {self.trigger_latency.format()}",
+                f"Camera skew: {self.camera_skew.format()}",
+                f"Capture duration: {self.capture_duration.format()}",
+            ]
+            if self.mirror_shortfall.count or self.mirror_failures:
+                lines.append(f"Mirror settle shortfall: {self.mirror_shortfall.format()}, "
+                             f"{self.mirror_failures} releases without lockup")
+            for phase in EclipsePhase:
+                if phase in self.latency_by_phase:
+                    lines.append(f"  Phase {phase.value}: latency {self.latency_by_phase[phase].format()}")
+            for camera_id, histogram in sorted(self.latency_by_camera.items()):
+                lines.append(f"  Camera {camera_id}: latency {histogram.format()}, "
+                             f"capture {self.duration_by_camera[camera_id].format()}")
+            for action_index, histogram in sorted(self.latency_by_action.items()):
+                lines.append(f"  Action {action_index + 1}: latency {histogram.format()}")
+            return lines
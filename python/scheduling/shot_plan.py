@@ -0,0 +1,520 @@
+"""
+Shot plan compiler for Eclipse Photography Controller.
+
+Resolves every configured action into a flat, time-sorted list of shot
+events before the sequence starts. Each event carries an absolute monotonic
+deadline and pre-formatted GPhoto2 settings, so the executor only has to
+sleep and fire during the eclipse.
+"""
+
+import logging
+from dataclasses import dataclass, field, replace
+from datetime import datetime, time
+from typing import Iterator, List, Optional, Tuple
+
+from .time_calculator import TimeCalculator, wrap_day_offset, SECONDS_PER_DAY
+from .action_types import ActionType
+from config.eclipse_config import ActionConfig, CameraSettings, SystemConfig
+from hardware.camera_controller import (
+    format_gphoto2_aperture, format_gphoto2_shutter, parse_gphoto2_shutter, needs_bulb
+)
+from hardware.setting_values import SettingsResolver, ValueIndex
+from utils.constants import (
+    DEFAULT_ISO, DEFAULT_APERTURE, DEFAULT_SHUTTER, BURST_MAX_DURATION, GPHOTO2_SHUTTER_VALUES, MLU_RAISE_LEAD_MAX,
+    BULB_SHUTTER, LATE_PLAN_TOLERANCE
+)
+
+
+@dataclass
+class ShotEvent:
+    """A single resolved trigger of all cameras at an absolute instant."""
+    deadline_ns: int            # Monotonic deadline (time.monotonic_ns() reference)
+    wall_seconds: float         # Target time in seconds since midnight
+    action_index: int           # Index of the source action in SystemConfig.actions
+    shot_index: int             # Index of the shot within its action
+    action_type: str            # 'Photo', 'Boucle', 'Interval', 'Burst', 'Bracket'
+    settings: CameraSettings    # Pre-formatted GPhoto2 settings
+    mlu_delay: int = 0          # Mirror lockup delay in milliseconds
+    line_number: Optional[int] = None
+    camera_ids: Optional[List[int]] = None
+    interval_ns: int = 0        # Grid period of Boucle shots (0 for other actions)
+    burst_ns: int = 0           # Time the release is held in continuous drive (0: single frame)
+    burst_frames: int = 0       # Frames requested from a burst (0: as many as the window allows)
+    bracket: Tuple[str, ...] = ()  # Bracket shutter values in capture order (empty: single frame)
+    bulb_ns: int = 0            # Host-timed bulb exposure (0: the camera times the shutter)
+    
+    @property
+    def is_burst(self) -> bool:
+        """True if the shot holds the release for a continuous-drive burst."""
+        return self.burst_ns > 0
+    
+    @property
+    def is_bulb(self) -> bool:
+        """True if the shot is a bulb exposure timed by the host."""
+        return self.bulb_ns > 0
+    
+    @property
+    def capture_ns(self) -> int:
+        """Time the cameras are expected to spend in the capture (burst hold, bracket or bulb exposures)."""
+        exposures_s = sum(parse_gphoto2_shutter(shutter) for shutter in self.bracket)
+        # Long exposure noise reduction may add a dark frame as long as the bulb exposure
+        return self.burst_ns + int(exposures_s * 1_000_000_000) + 2 * self.bulb_ns
+    
+    @property
+    def wall_time(self) -> time:
+        """Target time of day, rounded down to the microsecond."""
+        seconds = self.wall_seconds % SECONDS_PER_DAY
+        whole = int(seconds)
+        return time(whole // 3600, (whole % 3600) // 60, whole % 60,
+                    int(round((seconds - whole) * 1_000_000)) % 1_000_000)
+    
+    @property
+    def mlu_ns(self) -> int:
+        """Mirror lockup delay in nanoseconds."""
+        return self.mlu_delay * 1_000_000
+    
+    @property
+    def lead_ns(self) -> int:
+        """
+        Time before the deadline at which the shot is dispatched: MLU delay plus the longest mirror-up lead.
+        
+        The mirrors are raised within this window, by the measured command
+        latency (see ActionScheduler.mirror_raise_ns).
+        """
+        if not self.mlu_delay:
+            return 0
+        return self.mlu_ns + int(MLU_RAISE_LEAD_MAX * 1_000_000_000)
+    
+    @property
+    def settings_used(self) -> List[CameraSettings]:
+        """Settings the cameras are set to during the shot: one per bracket rung, or the shot settings."""
+        if not self.bracket:
+            return [self.settings]
+        return [replace(self.settings, shutter=shutter) for shutter in self.bracket]
+    
+    def describe(self) -> str:
+        """Get short human-readable description of the event."""
+        source = f"line {self.line_number}" if self.line_number else f"action {self.action_index + 1}"
+        return (f"{self.action_type} #{self.shot_index + 1} ({source}) at "
+                f"{self.wall_time.strftime('%H:%M:%S.%f')[:-3]}")
+
+
+@dataclass
+class ShotPlan:
+    """Time-sorted shot events compiled from a configuration."""
+    events: List[ShotEvent]
+    anchor_monotonic_ns: int     # Monotonic clock value at compile time
+    anchor_wall_seconds: float   # Wall clock (seconds since midnight) at compile time
+    action_count: int = 0
+    rejected: List[Tuple[int, str]] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.events)
+    
+    def __iter__(self) -> Iterator[ShotEvent]:
+        return iter(self.events)
+    
+    def events_for_action(self, action_index: int) -> List[ShotEvent]:
+        """Get the events generated by a specific action."""
+        return [event for event in self.events if event.action_index == action_index]
+    
+    def wall_seconds_to_deadline_ns(self, wall_seconds: float) -> int:
+        """
+        Convert a wall-clock target to a monotonic deadline using the plan anchor.
+        
+        The target is taken at its next occurrence after the anchor, unless it
+        passed less than PASSED_TARGET_WINDOW before it.
+        """
+        return self.anchor_monotonic_ns + int(round(
+            wrap_day_offset(wall_seconds - self.anchor_wall_seconds) * 1_000_000_000))
+
+
+def bracket_ladder(base_seconds: float, step_ev: float, count: int,
+                   shutters: Optional[ValueIndex] = None) -> List[str]:
+    """
+    Build the shutter values of an exposure bracket.
+    
+    The count rungs are spaced by step_ev around the base exposure (one
+    more on the long side for an even count) and snapped to the nearest
+    accepted shutter value. Rungs that snap to the same value, at the ends
+    of the table, are kept once.
+    
+    Args:
+        base_seconds: Exposure of the centre rung in seconds
+        step_ev: Exposure step between rungs in EV
+        count: Number of rungs
+        shutters: Accepted shutter values (default: GPhoto2 shutter table)
+    
+    Returns:
+        Shutter values from the shortest to the longest exposure
+    """
+    if shutters is None:
+        shutters = ValueIndex(GPHOTO2_SHUTTER_VALUES, parse_gphoto2_shutter)
+    
+    ladder: List[str] = []
+    first = -((count - 1) // 2)
+    for offset in range(first, first + count):
+        rung = shutters.nearest(base_seconds * 2 ** (offset * step_ev))
+        if rung is not None and rung not in ladder:
+            ladder.append(rung)
+    return ladder
+
+
+def bracket_order(ladder: List[str], start: str) -> Tuple[str, ...]:
+    """
+    Order the rungs of a bracket for the shortest cycle.
+    
+    The camera is pre-armed on the start rung, so it fires first with no
+    settings change. The shorter side of the ladder is then visited before
+    sweeping to the far end, which keeps every shutter change to adjacent
+    values except the single turn-around. Cameras that step their shutter
+    dial through intermediate values (many Sony and older Nikon bodies)
+    pay for the distance between two values.
+    
+    Args:
+        ladder: Shutter values from the shortest to the longest exposure
+        start: Rung the cameras are pre-armed on
+    
+    Returns:
+        Shutter values in capture order
+    """
+    index = ladder.index(start)
+    shorter = ladder[index - 1::-1] if index else []
+    longer = ladder[index + 1:]
+    if len(shorter) <= len(longer):
+        return (start, *shorter, *longer)
+    return (start, *longer, *shorter)
+
+
+def action_camera_settings(action: ActionConfig) -> CameraSettings:
+    """
+    Build GPhoto2 camera settings for an action, applying defaults.
+    
+    Args:
+        action: Action configuration
+    
+    Returns:
+        CameraSettings with GPhoto2-formatted aperture and shutter strings
+        (BULB_SHUTTER for a host-timed exposure)
+    """
+    if action_bulb_ns(action):
+        shutter = BULB_SHUTTER
+    elif action.shutter_speed:
+        shutter = format_gphoto2_shutter(action.shutter_speed)
+    else:
+        shutter = DEFAULT_SHUTTER
+    return CameraSettings(
+        iso=action.iso or DEFAULT_ISO,
+        aperture=format_gphoto2_aperture(action.aperture) if action.aperture else DEFAULT_APERTURE,
+        shutter=shutter
+    )
+
+
+def action_bulb_ns(action: ActionConfig) -> int:
+    """
+    Get the host-timed bulb exposure of an action.
+    
+    Bracket rungs are snapped to the preset speeds instead, so a Bracket is
+    never a bulb exposure.
+    
+    Args:
+        action: Action configuration
+    
+    Returns:
+        Exposure in nanoseconds, or 0 if the camera times the shutter
+    """
+    if (not action.shutter_speed or action.action_type == ActionType.BRACKET.value
+            or not needs_bulb(action.shutter_speed)):
+        return 0
+    return int(round(action.shutter_speed * 1_000_000_000))
+
+
+class PlanCompiler:
+    """
+    Compiler turning action configurations into a shot plan.
+    
+    Replaces the lazy, per-iteration time resolution of the legacy
+    execute_*_action methods with a single pass done before the first action.
+    """
+    
+    def __init__(self, time_calculator: TimeCalculator, resolver: Optional[SettingsResolver] = None):
+        """
+        Initialize plan compiler.
+        
+        Args:
+            time_calculator: Time calculator holding the eclipse contact times
+            resolver: Resolver snapping settings to the values the cameras
+                accept (default: GPhoto2 value tables)
+        """
+        self.time_calculator = time_calculator
+        self.resolver = resolver or SettingsResolver()
+        self.logger = logging.getLogger('plan_compiler')
+    
+    def compile(self, actions: List[ActionConfig], now: Optional[datetime] = None) -> ShotPlan:
+        """
+        Compile a list of actions into a time-sorted shot plan.
+        
+        Invalid actions are logged and recorded in ShotPlan.rejected instead of
+        aborting the whole plan. A plan starting more than LATE_PLAN_TOLERANCE
+        in the past is reported, its passed shots being run late or skipped.
+        
+        Args:
+            actions: Actions in configuration file order
+            now: Wall clock reference for the anchor (defaults to the time calculator anchor)
+        
+        Returns:
+            Compiled ShotPlan
+        """
+        if now is None:
+            # Share the time calculator anchor so plan and waits use one reference
+            anchor_monotonic_ns = self.time_calculator.anchor_monotonic_ns
+            anchor_wall_seconds = self.time_calculator.anchor_wall_seconds
+        else:
+            anchor_monotonic_ns = self.time_calculator.clock.monotonic_ns()
+            anchor_wall_seconds = (now.hour * 3600 + now.minute * 60 + now.second
+                                   + now.microsecond / 1_000_000)
+        
+        plan = ShotPlan(
+            events=[],
+            anchor_monotonic_ns=anchor_monotonic_ns,
+            anchor_wall_seconds=anchor_wall_seconds,
+            action_count=len(actions)
+        )
+        
+        for action_index, action in enumerate(actions):
+            try:
+                plan.events.extend(self.compile_action(action, action_index, plan))
+            except ValueError as e:
+                self.logger.error(f"Cannot compile {action.action_type} ({self._location(action, action_index)}): {e}")
+                plan.rejected.append((action_index, str(e)))
+        
+        plan.events.sort(key=lambda event: (event.deadline_ns, event.action_index, event.shot_index))
+        
+        self.logger.info(f"Shot plan compiled: {len(plan.events)} shots from "
+                         f"{len(actions) - len(plan.rejected)}/{len(actions)} actions")
+        self._check_start(plan)
+        
+        return plan
+    
+    def compile_action(self, action: ActionConfig, action_index: int, plan: ShotPlan) -> List[ShotEvent]:
+        """
+        Compile a single action into its shot events.
+        
+        Args:
+            action: Action configuration
+            action_index: Index of the action in the configuration
+            plan: Plan providing the monotonic anchor
+        
+        Returns:
+            List of shot events for the action (unsorted)
+        
+        Raises:
+            ValueError: If the action cannot be resolved
+        """
+        action_type = ActionType(action.action_type)
+        settings = self.resolve_settings(action, action_index)
+        start_seconds = self._resolve_seconds(action, 'start')
+        
+        interval_ns = 0
+        burst_ns = 0
+        burst_frames = 0
+        bracket: Tuple[str, ...] = ()
+        bulb_ns = action_bulb_ns(action)
+        if bulb_ns and action_type == ActionType.BURST:
+            raise ValueError(f"Burst cannot use a bulb exposure of {action.shutter_speed:g}s")
+        
+        if action_type == ActionType.PHOTO:
+            offsets = [0.0]
+        elif action_type == ActionType.BRACKET:
+            offsets = [0.0]
+            bracket = self._bracket_shutters(action)
+            # Pre-arm the first rung so the bracket starts without a settings change
+            settings = replace(settings, shutter=bracket[0])
+        elif action_type == ActionType.LOOP:
+            offsets = self._loop_offsets(action, start_seconds)
+            interval_ns = int(round(self._loop_interval(action) * 1_000_000_000))
+        elif action_type == ActionType.BURST:
+            offsets = [0.0]
+            burst_ns, burst_frames = self._burst_limits(action, start_seconds)
+        else:
+            offsets = self._interval_offsets(action, start_seconds)
+        
+        # Offsets follow the start, so the shots of an action never straddle two days
+        start_ns = plan.wall_seconds_to_deadline_ns(start_seconds)
+        
+        return [
+            ShotEvent(
+                deadline_ns=start_ns + int(round(offset * 1_000_000_000)),
+                wall_seconds=(start_seconds + offset) % SECONDS_PER_DAY,
+                action_index=action_index,
+                shot_index=shot_index,
+                action_type=action.action_type,
+                settings=settings,
+                mlu_delay=action.mlu_delay,
+                line_number=action.line_number,
+                camera_ids=action.camera_ids,
+                interval_ns=interval_ns,
+                burst_ns=burst_ns,
+                burst_frames=burst_frames,
+                bracket=bracket,
+                bulb_ns=bulb_ns
+            )
+            for shot_index, offset in enumerate(offsets)
+        ]
+    
+    def resolve_settings(self, action: ActionConfig, action_index: int) -> CameraSettings:
+        """
+        Build the camera settings of an action, snapped to accepted values.
+        
+        Values moved to a different stop are reported; notation-only changes
+        ("f/4" to "f/4.0") are silent.
+        
+        Args:
+            action: Action configuration
+            action_index: Index of the action in the configuration, for the log
+        
+        Returns:
+            Camera settings using values the cameras accept
+        """
+        settings = action_camera_settings(action)
+        resolved = self.resolver.resolve(settings)
+        adjustments = self.resolver.adjustments(settings, resolved)
+        if adjustments:
+            self.logger.warning(f"{action.action_type} ({self._location(action, action_index)}) "
+                                f"settings snapped to supported values: {', '.join(adjustments)}")
+        return resolved
+    
+    def _check_start(self, plan: ShotPlan):
+        """Report a plan whose first shots are already well in the past."""
+        late_ns = self.time_calculator.clock.monotonic_ns() - int(LATE_PLAN_TOLERANCE * 1_000_000_000)
+        passed = [event for event in plan.events if event.deadline_ns < late_ns]
+        if passed:
+            self.logger.error(f"Shot plan starts in the past: {len(passed)}/{len(plan.events)} shots "
+                              f"already passed, from {passed[0].describe()}")
+    
+    def _resolve_seconds(self, action: ActionConfig, time_type: str) -> int:
+        """Resolve the start or end of an action to seconds since midnight."""
+        if time_type == 'start':
+            if action.time_ref == '-':
+                target = action.start_time
+            else:
+                target = self.time_calculator.convert_relative_time(
+                    action.time_ref, action.start_operator, action.start_time
+                )
+        else:
+            if action.end_time is None:
+                raise ValueError("End time not specified for action")
+            if action.time_ref == '-':
+                target = action.end_time
+            else:
+                target = self.time_calculator.convert_relative_time(
+                    action.time_ref, action.end_operator, action.end_time
+                )
+        return self.time_calculator.time_to_seconds(target)
+    
+    def _action_duration(self, action: ActionConfig, start_seconds: int) -> int:
+        """Get the duration of a Boucle/Interval window in seconds."""
+        end_seconds = self._resolve_seconds(action, 'end')
+        return (end_seconds - start_seconds) % SECONDS_PER_DAY
+    
+    def _loop_interval(self, action: ActionConfig) -> float:
+        """Get the Boucle interval in seconds, clamped to the 1s minimum of the Lua script."""
+        interval = action.interval_or_count
+        if interval is None or interval <= 0:
+            raise ValueError("Invalid interval for loop action")
+        return max(1.0, interval)
+    
+    def _loop_offsets(self, action: ActionConfig, start_seconds: int) -> List[float]:
+        """Offsets of Boucle shots: every interval from start up to end inclusive."""
+        interval = self._loop_interval(action)
+        if interval != action.interval_or_count:
+            self.logger.warning(f"Loop interval {action.interval_or_count}s set to minimum 1s")
+        
+        duration = self._action_duration(action, start_seconds)
+        count = int(duration // interval) + 1
+        return [k * interval for k in range(count)]
+    
+    def _interval_offsets(self, action: ActionConfig, start_seconds: int) -> List[float]:
+        """Offsets of Interval shots: count photos spread evenly, endpoints included."""
+        photo_count = int(action.interval_or_count or 0)
+        if photo_count <= 0:
+            raise ValueError("Invalid photo count for interval action")
+        if photo_count == 1:
+            return [0.0]
+        
+        duration = self._action_duration(action, start_seconds)
+        if duration <= 0:
+            raise ValueError("Invalid duration for interval action")
+        
+        step = duration / (photo_count - 1)
+        return [k * step for k in range(photo_count)]
+    
+    @staticmethod
+    def _location(action: ActionConfig, action_index: int) -> str:
+        """Describe where an action comes from in the configuration."""
+        return f"line {action.line_number}" if action.line_number else f"action {action_index + 1}"
+    
+    def _bracket_shutters(self, action: ActionConfig) -> Tuple[str, ...]:
+        """Get the shutter values of a Bracket in capture order."""
+        count = action.interval_or_count or 0
+        step = action.bracket_step or 0
+        if count < 1 or count != int(count):
+            raise ValueError("Invalid frame count for bracket action")
+        if step <= 0:
+            raise ValueError("Invalid EV step for bracket action")
+        if not action.shutter_speed:
+            raise ValueError("Bracket requires a base shutter speed")
+        
+        shutters = self.resolver.shutters
+        ladder = bracket_ladder(action.shutter_speed, step, int(count), shutters)
+        if not ladder:
+            raise ValueError("No shutter speed available for bracket action")
+        if len(ladder) < count:
+            self.logger.warning(f"Bracket of {int(count)} frames reduced to {len(ladder)}: "
+                                f"exposures beyond {ladder[0]} - {ladder[-1]}s not available")
+        
+        return bracket_order(ladder, shutters.nearest(action.shutter_speed))
+    
+    def _burst_limits(self, action: ActionConfig, start_seconds: int) -> Tuple[int, int]:
+        """
+        Get the hold time and frame count of a Burst.
+        
+        A burst given only a frame count holds the release for at most
+        BURST_MAX_DURATION, so a camera that stops delivering frames cannot
+        keep it pressed for the rest of the eclipse.
+        
+        Returns:
+            Tuple of (hold time in nanoseconds, requested frames or 0)
+        """
+        frames = action.interval_or_count or 0
+        if frames < 0 or frames != int(frames):
+            raise ValueError("Invalid frame count for burst action")
+        
+        if action.end_time is None:
+            if not frames:
+                raise ValueError("Burst requires an end time or a frame count")
+            duration = BURST_MAX_DURATION
+        else:
+            duration = self._action_duration(action, start_seconds)
+            if duration <= 0:
+                raise ValueError("Invalid duration for burst action")
+        return duration * 1_000_000_000, int(frames)
+
+
+def compile_shot_plan(config: SystemConfig, time_calculator: Optional[TimeCalculator] = None,
+                      now: Optional[datetime] = None, resolver: Optional[SettingsResolver] = None) -> ShotPlan:
+    """
+    Convenience function to compile a system configuration into a shot plan.
+    
+    Args:
+        config: Parsed system configuration
+        time_calculator: Time calculator to use (created from config if None)
+        now: Wall clock reference for the anchor (defaults to the time calculator anchor)
+        resolver: Resolver snapping settings to accepted values (default: GPhoto2 value tables)
+    
+    Returns:
+        Compiled ShotPlan
+    """
+    if time_calculator is None:
+        time_calculator = TimeCalculator(config.eclipse_timings)
+    return PlanCompiler(time_calculator, resolver).compile(config.actions, now)
@@ -8,11 +8,46 @@ original Magic Lantern Lua script functions:
 - convert_time() -> convert_relative_time()
 """
 
-import time as time_module
 import logging
-from datetime import datetime, time
+from datetime import time
+from enum import Enum
+from typing import Optional, Callable
 
+from .deadline_waiter import DeadlineWaiter, WaitResult
 from config.eclipse_config import EclipseTimings
+from utils.clock import Clock, SYSTEM_CLOCK
+from utils.constants import PASSED_TARGET_WINDOW
+
+
+SECONDS_PER_DAY = 86400
+
+
+def wrap_day_offset(offset_seconds: float, past_window: float = PASSED_TARGET_WINDOW) -> float:
+    """
+    Normalize an offset to the next occurrence, unless it recently passed.
+    
+    A target less than past_window behind is considered passed (e.g. on a
+    restart during the eclipse); any other target is rolled forward to its
+    next occurrence, so a rig started the evening before a morning eclipse
+    waits for it.
+    
+    Args:
+        offset_seconds: Raw difference between two times of day
+        past_window: How long a target stays passed rather than tomorrow (seconds)
+        
+    Returns:
+        Offset in the range [-past_window, 24h - past_window)
+    """
+    return (offset_seconds + past_window) % SECONDS_PER_DAY - past_window
+
+
+class EclipsePhase(Enum):
+    """Phase of the eclipse a shot belongs to."""
+    BEFORE_C1 = "before C1"
+    PARTIAL_BEFORE = "C1-C2"
+    TOTALITY = "totality"
+    PARTIAL_AFTER = "C3-C4"
+    AFTER_C4 = "after C4"
 
 
 class TimeCalculator:
@@ -23,16 +58,26 @@ class TimeCalculator:
     times based on eclipse contact points (C1, C2, Max, C3, C4).
     """
     
-    def __init__(self, eclipse_timings: EclipseTimings):
+    def __init__(self, eclipse_timings: EclipseTimings, clock: Optional[Clock] = None):
         """
         Initialize with eclipse timing configuration.
         
         Args:
             eclipse_timings: Eclipse contact times (C1, C2, Max, C3, C4)
+            clock: Clock to read and wait on (default: system clock)
         """
         self.eclipse_timings = eclipse_timings
+        self.clock = clock or SYSTEM_CLOCK
         self.logger = logging.getLogger('time_calculator')
         
+        # Anchor the monotonic clock to the wall clock once; every deadline is
+        # derived from this pair so waits are immune to wall clock steps
+        self.anchor_monotonic_ns = self.clock.monotonic_ns()
+        now = self.clock.now()
+        self.anchor_wall_seconds = (self.time_to_seconds(now.time())
+                                    + now.microsecond / 1_000_000)
+        self.waiter = DeadlineWaiter(clock=self.clock)
+        
         # Pre-calculate reference times in seconds for efficiency
         self._ref_times_seconds = {
             'C1': self.time_to_seconds(eclipse_timings.c1),
@@ -140,54 +185,93 @@ class TimeCalculator:
         result_seconds = result_seconds % 86400
         return self.seconds_to_time(result_seconds)
     
-    def wait_until(self, target_time: time, check_interval: float = 0.25, progress_interval: int = 20):
+    def wall_seconds_to_deadline_ns(self, wall_seconds: float) -> int:
+        """
+        Convert a time of day to a monotonic deadline.
+        
+        Args:
+            wall_seconds: Target in seconds since midnight (may be fractional)
+            
+        Returns:
+            Deadline in time.monotonic_ns() reference: the next occurrence,
+            or the last one if it passed less than PASSED_TARGET_WINDOW ago
+        """
+        now_ns = self.clock.monotonic_ns()
+        now_wall = self.anchor_wall_seconds + (now_ns - self.anchor_monotonic_ns) / 1_000_000_000
+        offset = wrap_day_offset(wall_seconds - now_wall)
+        return now_ns + int(round(offset * 1_000_000_000))
+    
+    def wait_until(self, target_time: time, check_interval: float = 0.25, progress_interval: int = 20) -> WaitResult:
         """
         Wait until the specified target time is reached.
         
+        The target is converted once to a monotonic deadline and waited for
+        with a hybrid sleep/spin, keeping sub-second precision of the target.
+        
         Args:
             target_time: Time to wait for
-            check_interval: How often to check time (seconds)
+            check_interval: Ignored, kept for compatibility (waits are deadline driven)
             progress_interval: How often to show progress (seconds)
+            
+        Returns:
+            WaitResult with the achieved wake-up error
         """
         self.logger.info(f"Waiting until {target_time}")
         
-        last_progress_time = time_module.time()
+        target_seconds = self.time_to_seconds(target_time) + target_time.microsecond / 1_000_000
+        deadline_ns = self.wall_seconds_to_deadline_ns(target_seconds)
+        remaining = (deadline_ns - self.clock.monotonic_ns()) / 1_000_000_000
+        
+        if remaining <= 0:
+            if remaining >= -30:
+                self.logger.info(f"Target time {target_time} reached (delta: {remaining:.3f}s)")
+            else:
+                self.logger.warning(f"Target time {target_time} already passed by {abs(remaining):.0f}s, proceeding")
+            now_ns = self.clock.monotonic_ns()
+            return WaitResult(deadline_ns, now_ns)
+        
+        result = self.wait_until_deadline(deadline_ns, progress_interval)
+        self.logger.info(f"Target time {target_time} reached (error: {result.error_ns / 1e6:+.3f}ms)")
+        return result
+    
+    def wait_until_deadline(self, deadline_ns: int, progress_interval: Optional[int] = None,
+                            should_stop: Optional[Callable[[], bool]] = None) -> WaitResult:
+        """
+        Wait until a monotonic deadline is reached.
         
-        while True:
-            now = datetime.now().time()
-            now_seconds = self.time_to_seconds(now)
-            target_seconds = self.time_to_seconds(target_time)
-            
-            remaining = target_seconds - now_seconds
-            
-            # If target is in the past by less than 30 seconds, consider it reached
-            if -30 <= remaining <= 0:
-                self.logger.info(f"Target time {target_time} reached (delta: {remaining}s)")
-                break
-            
-            # If target is in the past by more than 30s, it likely already passed
-            # Only wait for tomorrow if the difference is very large (> 12 hours)
-            if remaining < -30:
-                if abs(remaining) < 43200:  # Less than 12 hours ago
-                    self.logger.warning(f"Target time {target_time} already passed by {abs(remaining)}s, proceeding")
-                    break
-                else:
-                    # Target is tomorrow
-                    remaining += 86400
-            
-            # Check if we've reached the target
-            if remaining <= 0:
-                self.logger.info(f"Target time {target_time} reached")
-                break
-            
-            # Show progress periodically for long waits
-            current_time = time_module.time()
-            if remaining > progress_interval and (current_time - last_progress_time) >= progress_interval:
-                self.logger.info(f"Waiting: {remaining}s remaining until {target_time}")
-                last_progress_time = current_time
+        Sleeps in a single call until shortly before the deadline, then spins
+        for the calibrated window, instead of polling the wall clock.
+        
+        Args:
+            deadline_ns: Deadline in time.monotonic_ns() reference
+            progress_interval: How often to show progress (seconds), None for the waiter default
+            should_stop: Optional callback checked at each coarse wake-up
             
-            # Sleep for check interval
-            time_module.sleep(check_interval)
+        Returns:
+            WaitResult with the achieved wake-up error
+        """
+        return self.waiter.wait(deadline_ns, should_stop, progress_interval)
+    
+    def eclipse_phase(self, wall_seconds: float) -> EclipsePhase:
+        """
+        Get the eclipse phase of a time of day.
+        
+        Args:
+            wall_seconds: Time in seconds since midnight
+        
+        Returns:
+            Phase delimited by the contact times (C2 and C3 belong to totality)
+        """
+        refs = self._ref_times_seconds
+        if wall_seconds < refs['C1']:
+            return EclipsePhase.BEFORE_C1
+        if wall_seconds < refs['C2']:
+            return EclipsePhase.PARTIAL_BEFORE
+        if wall_seconds <= refs['C3']:
+            return EclipsePhase.TOTALITY
+        if wall_seconds <= refs['C4']:
+            return EclipsePhase.PARTIAL_AFTER
+        return EclipsePhase.AFTER_C4
     
     def get_time_difference(self, time1: time, time2: time) -> int:
         """
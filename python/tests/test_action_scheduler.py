@@ -5,12 +5,14 @@ Tests the execution of photographic actions with proper timing.
 """
 
 import unittest
-from unittest.mock import Mock, patch
-from datetime import time
+from unittest.mock import ANY, Mock, patch
+from datetime import datetime, time
 
 from config.eclipse_config import EclipseTimings, ActionConfig
 from scheduling.time_calculator import TimeCalculator
 from scheduling.action_scheduler import ActionScheduler
+from scheduling.shot_plan import PlanCompiler
+from utils.clock import VirtualClock
 from hardware.multi_camera_manager import MultiCameraManager
 
 
@@ -41,6 +43,7 @@ class TestActionScheduler(unittest.TestCase):
             1: Mock()
         }
         self.camera_manager.configure_all.return_value = {0: True, 1: True}
+        self.camera_manager.raise_mirrors.return_value = {0: 0, 1: 0}
         self.camera_manager.capture_all.return_value = {
             0: "camera0_image.jpg",
             1: "camera1_image.jpg"
@@ -62,8 +65,7 @@ class TestActionScheduler(unittest.TestCase):
         self.assertEqual(self.scheduler.photos_taken, 0)
         self.assertEqual(self.scheduler.execution_errors, 0)
     
-    @patch('scheduling.action_scheduler.time')
-    def test_execute_photo_action_absolute_time(self, mock_time):
+    def test_execute_photo_action_absolute_time(self):
         """Test execution of photo action with absolute time."""
         # Create photo action with absolute time
         action = ActionConfig(
@@ -77,20 +79,18 @@ class TestActionScheduler(unittest.TestCase):
             mlu_delay=500
         )
         
-        # Mock time to simulate reaching target time
-        mock_time.time.return_value = 1000
-        
-        # Mock wait_until to not actually wait
+        # Mock wait_until and wait_until_deadline to not actually wait
         with patch.object(self.time_calculator, 'wait_until'):
-            result = self.scheduler.execute_photo_action(action)
+            with patch.object(self.time_calculator, 'wait_until_deadline'):
+                result = self.scheduler.execute_photo_action(action)
         
         self.assertTrue(result)
         self.camera_manager.configure_all.assert_called_once()
-        self.camera_manager.capture_all.assert_called_once_with(True)
+        self.camera_manager.raise_mirrors.assert_called_once_with(None, True, 500)
+        self.camera_manager.capture_all.assert_called_once_with(True, release_at_ns=ANY, bulb_ns=0)
         self.assertEqual(self.scheduler.photos_taken, 2)  # 2 cameras
     
-    @patch('scheduling.action_scheduler.time')
-    def test_execute_photo_action_relative_time(self, mock_time):
+    def test_execute_photo_action_relative_time(self):
         """Test execution of photo action with relative time."""
         # Create photo action with relative time (Max - 10 seconds)
         action = ActionConfig(
@@ -137,8 +137,7 @@ class TestActionScheduler(unittest.TestCase):
         self.assertFalse(result)
         self.assertEqual(self.scheduler.photos_taken, 0)
     
-    @patch('scheduling.action_scheduler.time')
-    def test_execute_loop_action(self, mock_time):
+    def test_execute_loop_action(self):
         """Test execution of loop action."""
         # Create loop action (C2 + 0 to C2 + 1 minute, every 10 seconds)
         action = ActionConfig(
@@ -154,32 +153,17 @@ class TestActionScheduler(unittest.TestCase):
             shutter_speed=0.002  # 1/500
         )
         
-        # Mock time progression
-        mock_time.time.side_effect = [
-            1000,  # Loop start
-            1010,  # First capture + interval
-            1020,  # Second capture + interval
-            1070   # End of loop (beyond end time)
-        ]
-        
-        # Mock current time to simulate progression
-        time_sequence = [
-            time(16, 2, 49),  # Start time
-            time(16, 2, 59),  # During loop
-            time(16, 3, 9),   # During loop
-            time(16, 3, 49)   # End time reached
-        ]
+        # Rehearse on an instant virtual clock starting before C2
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0))
+        scheduler = ActionScheduler(self.camera_manager, TimeCalculator(self.timings, clock), test_mode=True)
         
-        with patch('datetime.datetime') as mock_datetime:
-            mock_datetime.now.return_value.time.side_effect = time_sequence
-            
-            with patch.object(self.time_calculator, 'wait_until'):
-                with patch('time.sleep'):  # Don't actually sleep
-                    result = self.scheduler.execute_loop_action(action)
+        result = scheduler.execute_loop_action(action)
         
         self.assertTrue(result)
-        # Should have made multiple capture calls
-        self.assertGreater(self.camera_manager.capture_all.call_count, 1)
+        # One capture per grid slot: C2 + 0, 10, ..., 60 seconds
+        self.assertEqual(self.camera_manager.capture_all.call_count, 7)
+        self.assertEqual(scheduler.trigger_times[(0, 6)].replace(microsecond=0).time(), time(16, 3, 49))
+        self.assertLess(scheduler.get_execution_stats()['max_lateness_ms'], 50)
     
     def test_execute_interval_action(self):
         """Test execution of interval action."""
@@ -302,25 +286,70 @@ class TestActionScheduler(unittest.TestCase):
     
     def test_apply_mirror_lockup(self):
         """Test mirror lockup application."""
-        with patch('time.sleep') as mock_sleep:
-            self.scheduler._apply_mirror_lockup(500)  # 500ms delay
         
-        # Should have called mirror_lockup on all cameras
-        for camera_id in self.camera_manager.active_cameras:
-            camera = self.camera_manager.cameras[camera_id]
-            camera.mirror_lockup.assert_called_with(True, 500)
+        with patch('time.sleep') as mock_sleep:
+            mirror_up = self.scheduler._apply_mirror_lockup(500)  # 500ms delay
         
-        # Should have slept for 0.5 seconds
-        mock_sleep.assert_called_with(0.5)
+        # Should have locked all cameras up in parallel, without waiting for the delay
+        self.camera_manager.raise_mirrors.assert_called_once_with(None, True, 500)
+        self.assertEqual(mirror_up, {0: 0, 1: 0})
+        mock_sleep.assert_not_called()
     
     def test_apply_mirror_lockup_zero_delay(self):
         """Test mirror lockup with zero delay."""
         self.scheduler._apply_mirror_lockup(0)
         
-        # Should not have called mirror_lockup when delay is 0
-        for camera_id in self.camera_manager.active_cameras:
-            camera = self.camera_manager.cameras[camera_id]
-            camera.mirror_lockup.assert_not_called()
+        # Should not have locked any mirror when delay is 0
+        self.camera_manager.raise_mirrors.assert_not_called()
+    
+    def test_mirror_lockup_shot_opens_at_deadline(self):
+        """Test that mirrors go up ahead of the MLU delay and the shutters open at the deadline."""
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0))
+        scheduler = ActionScheduler(self.camera_manager, TimeCalculator(self.timings, clock), test_mode=True)
+        action = ActionConfig(action_type="Photo", time_ref="C2", start_operator="-",
+                              start_time=time(0, 0, 10), mlu_delay=2000)
+        event = PlanCompiler(scheduler.time_calculator).compile([action]).events[0]
+        calls = []
+        
+        def raise_mirrors(camera_ids, test_mode, delay_ms):
+            calls.append(('raise', clock.monotonic_ns()))
+            clock.sleep(0.05)  # Mirror-up command latency
+            return {0: clock.monotonic_ns(), 1: None}
+        
+        def capture_all(test_mode, camera_ids=None, capture_timings=None, release_at_ns=None, **kwargs):
+            calls.append(('capture', release_at_ns))
+            capture_timings.update({0: (release_at_ns, release_at_ns), 1: (release_at_ns, release_at_ns)})
+            return {0: "img_0.jpg", 1: "img_1.jpg"}
+        
+        self.camera_manager.raise_mirrors.side_effect = raise_mirrors
+        self.camera_manager.capture_all.side_effect = capture_all
+        
+        with patch('time.sleep') as mock_sleep:
+            with self.assertLogs('action_scheduler', level='WARNING') as logs:
+                self.assertTrue(scheduler.execute_shot(event))
+        
+        mock_sleep.assert_not_called()
+        self.assertAlmostEqual(calls[0][1], event.deadline_ns - event.mlu_ns - 250_000_000, delta=1_000_000)
+        self.assertEqual(calls[1], ('capture', event.deadline_ns))
+        self.assertIn("cameras [1] fired without mirror lockup", logs.output[0])
+        
+        # The next lockup is issued ahead by the latency seen, so the mirror settles for the whole delay
+        self.assertAlmostEqual(scheduler.mirror_raise_ns(event), event.deadline_ns - event.mlu_ns - 50_000_000,
+                               delta=1_000_000)
+        self.assertEqual(scheduler.metrics.mirror_shortfall.max_ns, 0)
+        self.assertEqual(scheduler.metrics.mirror_failures, 1)
+    
+    def test_mirror_lead_follows_slow_bodies(self):
+        """Test that the mirror-up lead grows to a slow body's latency, within the dispatch lead."""
+        action = ActionConfig(action_type="Photo", time_ref="C2", start_operator="-",
+                              start_time=time(0, 0, 10), mlu_delay=2000)
+        event = PlanCompiler(self.scheduler.time_calculator).compile([action]).events[0]
+        
+        self.scheduler.record_mirror_latency(0, {0: 100_000_000, 1: 600_000_000})
+        self.assertEqual(self.scheduler.mirror_raise_ns(event), event.deadline_ns - event.mlu_ns - 600_000_000)
+        
+        self.scheduler.record_mirror_latency(0, {0: 5_000_000_000})
+        self.assertEqual(self.scheduler.mirror_raise_ns(event), event.deadline_ns - event.lead_ns)
     
     def test_get_execution_stats(self):
         """Test execution statistics retrieval."""
@@ -350,6 +379,111 @@ class TestActionScheduler(unittest.TestCase):
         self.assertEqual(self.scheduler.photos_taken, 0)
         self.assertEqual(self.scheduler.execution_errors, 0)
     
+    def test_execute_plan(self):
+        """Test execution of a compiled shot plan."""
+        actions = [
+            ActionConfig(action_type="Photo", time_ref="Max", start_operator="-",
+                         start_time=time(0, 0, 10), aperture=4.0, iso=1600, shutter_speed=1.0),
+            ActionConfig(action_type="Photo", time_ref="Max", start_operator="+",
+                         start_time=time(0, 0, 5), aperture=4.0, iso=1600, shutter_speed=1.0),
+            ActionConfig(action_type="Photo", time_ref="Max", start_operator="+",
+                         start_time=time(0, 0, 10), aperture=4.0, iso=1600, shutter_speed=2.0),
+        ]
+        # Anchor after the sequence so every deadline has already passed
+        plan = PlanCompiler(self.time_calculator).compile(actions, datetime(2026, 8, 12, 16, 10, 0))
+        
+        result = self.scheduler.execute_plan(plan)
+        
+        self.assertTrue(result)
+        self.assertEqual(self.camera_manager.capture_all.call_count, 3)
+        # Settings only change once between the second and third shots
+        self.assertEqual(self.camera_manager.configure_all.call_count, 2)
+        self.assertEqual(self.scheduler.actions_executed, 3)
+        self.assertEqual(self.scheduler.photos_taken, 6)
+    
+    def test_execute_plan_stop_requested(self):
+        """Test that a stop request aborts the shot plan."""
+        actions = [
+            ActionConfig(action_type="Photo", time_ref="Max", start_operator="+",
+                         start_time=time(0, 0, 0))
+        ]
+        plan = PlanCompiler(self.time_calculator).compile(actions, datetime(2026, 8, 12, 16, 10, 0))
+        
+        self.scheduler.execute_plan(plan, should_stop=lambda: True)
+        
+        self.camera_manager.capture_all.assert_not_called()
+    
+    def test_execute_burst_action(self):
+        """Test that a burst holds the release and reports frames against the request."""
+        self.camera_manager.capture_all.return_value = {
+            0: [f"IMG_{index}.CR2" for index in range(12)],
+            1: [f"IMG_{index}.CR2" for index in range(9)]
+        }
+        action = ActionConfig(action_type="Burst", time_ref="C2", start_operator="-",
+                              start_time=time(0, 0, 5), end_operator="+",
+                              end_time=time(0, 0, 3), interval_or_count=10.0)
+        
+        # Rehearse on an instant virtual clock starting before C2
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0))
+        scheduler = ActionScheduler(self.camera_manager, TimeCalculator(self.timings, clock), test_mode=True)
+        
+        self.assertTrue(scheduler.execute_action(action))
+        
+        kwargs = self.camera_manager.capture_all.call_args[1]
+        self.assertEqual(kwargs['burst_ns'], 8 * 1_000_000_000)
+        self.assertEqual(kwargs['burst_frames'], 10)
+        self.assertEqual(scheduler.photos_taken, 21)
+        
+        stats = scheduler.get_execution_stats()
+        self.assertEqual(stats['bursts'], 1)
+        self.assertEqual(stats['burst_frames'], 21)
+        self.assertEqual(stats['burst_frames_requested'], 20)
+    
+    def test_execute_bracket_action(self):
+        """Test that a bracket passes its ladder to the cameras and reports its cycle."""
+        self.camera_manager.capture_all.return_value = {
+            0: ["IMG_1.CR2", "IMG_2.CR2", "IMG_3.CR2"],
+            1: ["IMG_1.CR2", "IMG_2.CR2"]
+        }
+        action = ActionConfig(action_type="Bracket", time_ref="Max", start_operator="-",
+                              start_time=time(0, 0, 2), interval_or_count=3.0, bracket_step=2.0,
+                              aperture=8.0, iso=100, shutter_speed=0.008)
+        
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0))
+        scheduler = ActionScheduler(self.camera_manager, TimeCalculator(self.timings, clock), test_mode=True)
+        
+        self.assertTrue(scheduler.execute_action(action))
+        
+        kwargs = self.camera_manager.capture_all.call_args[1]
+        self.assertEqual(kwargs['bracket'], ('1/125', '1/500', '1/30'))
+        self.assertGreater(kwargs['timeout'], 1 / 125 + 1 / 500 + 1 / 30)
+        self.assertEqual(scheduler.photos_taken, 5)
+        self.assertEqual(scheduler.get_execution_stats()['brackets'], 1)
+    
+    def test_bulb_exposure_measured(self):
+        """Test that a bulb shot passes its exposure to the cameras and reports the measured durations."""
+        action = ActionConfig(action_type="Photo", time_ref="Max", start_operator="+",
+                              start_time=time(0, 0, 0), shutter_speed=45.0)
+        
+        def capture_all(test_mode, camera_ids=None, capture_timings=None, release_at_ns=None, **kwargs):
+            capture_timings.update({0: (release_at_ns, release_at_ns + 45_002_000_000),
+                                    1: (release_at_ns, release_at_ns + 45_080_000_000)})
+            return {0: "img_0.jpg", 1: "img_1.jpg"}
+        
+        self.camera_manager.capture_all.side_effect = capture_all
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0))
+        scheduler = ActionScheduler(self.camera_manager, TimeCalculator(self.timings, clock), test_mode=True)
+        event = PlanCompiler(scheduler.time_calculator).compile([action]).events[0]
+        
+        with self.assertLogs('action_scheduler', level='WARNING') as logs:
+            self.assertTrue(scheduler.execute_shot(event))
+        
+        self.assertEqual(self.camera_manager.capture_all.call_args[1]['bulb_ns'], 45_000_000_000)
+        self.assertIn("camera 1 bulb 45.080s for 45s", logs.output[0])
+        stats = scheduler.get_execution_stats()
+        self.assertEqual(stats['bulb_exposures'], 2)
+        self.assertAlmostEqual(stats['max_bulb_error_ms'], 80.0)
+    
     def test_execute_action_with_validation_error(self):
         """Test action execution with invalid action config."""
         # Create invalid action (missing required fields)
@@ -0,0 +1,255 @@
+"""
+Unit tests for asyncio event scheduler.
+
+Tests the single-loop execution engine and its background tasks.
+"""
+
+import threading
+import time as time_module
+import unittest
+from datetime import datetime, time
+from unittest.mock import Mock
+
+from config.eclipse_config import EclipseTimings, CameraSettings, ActionConfig
+from scheduling.time_calculator import TimeCalculator
+from scheduling.action_scheduler import ActionScheduler
+from scheduling.async_scheduler import AsyncEventScheduler
+from scheduling.event_scheduler import ConflictPolicy, ExecutionEngine
+from scheduling.shot_plan import ShotEvent, PlanCompiler
+from hardware.multi_camera_manager import MultiCameraManager
+from utils.clock import VirtualClock
+
+
+MS = 1_000_000
+
+
+class TestAsyncEventScheduler(unittest.TestCase):
+    """Test cases for AsyncEventScheduler class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.timings = EclipseTimings(
+            c1=time(14, 41, 5),
+            c2=time(16, 2, 49),
+            max=time(16, 3, 53),
+            c3=time(16, 4, 58),
+            c4=time(17, 31, 3),
+            test_mode=True
+        )
+        self.captures = []
+        self.capture_duration = 0.0
+        self._lock = threading.Lock()
+        
+        self.camera_manager = MultiCameraManager()
+        self.camera_manager.active_cameras = [0, 1]
+        self.camera_manager.cameras = {0: self._camera(0), 1: self._camera(1)}
+        self.addCleanup(self.camera_manager.disconnect_all)
+        self.scheduler = ActionScheduler(self.camera_manager, TimeCalculator(self.timings), test_mode=True)
+        self.settings = CameraSettings(iso=1600, aperture="f/8", shutter="1/125")
+    
+    def _camera(self, camera_id):
+        camera = Mock()
+        camera.configure_settings.return_value = True
+        
+        def capture_image(test_mode=False):
+            with self._lock:
+                self.captures.append((camera_id, time_module.monotonic_ns(), threading.current_thread().name))
+            time_module.sleep(self.capture_duration)
+            return f"img_{camera_id}.jpg"
+        
+        def mirror_lockup(enabled, delay_ms=0, test_mode=False):
+            camera.mirror_up_ns = time_module.monotonic_ns()
+            return True
+        
+        camera.capture_image.side_effect = capture_image
+        camera.mirror_lockup.side_effect = mirror_lockup
+        return camera
+    
+    def _event(self, offset_ms, action_index, shot_index=0, mlu_delay=0, camera_ids=None):
+        return ShotEvent(
+            deadline_ns=self.start_ns + offset_ms * MS,
+            wall_seconds=0.0,
+            action_index=action_index,
+            shot_index=shot_index,
+            action_type="Photo",
+            settings=self.settings,
+            mlu_delay=mlu_delay,
+            camera_ids=camera_ids
+        )
+    
+    def _engine(self, policy=ConflictPolicy.QUEUE, **kwargs):
+        kwargs.setdefault('status_interval', None)
+        kwargs.setdefault('progress_interval', None)
+        return AsyncEventScheduler(self.scheduler, policy, max_concurrent=2, **kwargs)
+    
+    def test_shots_fire_in_order_on_persistent_camera_threads(self):
+        """Test chronological firing with one long-lived worker thread per camera."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        engine = self._engine()
+        for event in [self._event(40, 0), self._event(0, 1), self._event(20, 2)]:
+            engine.schedule(event)
+        
+        results = engine.run()
+        
+        self.assertEqual(results, {0: 1, 1: 1, 2: 1})
+        self.assertEqual(len(self.captures), 6)
+        self.assertEqual(self.scheduler.photos_taken, 6)
+        for camera_id in (0, 1):
+            threads = {name for cid, _, name in self.captures if cid == camera_id}
+            self.assertEqual(len(threads), 1)
+            self.assertTrue(threads.pop().startswith(f"Camera{camera_id}"))
+        first_fire = min(fired_ns for _, fired_ns, _ in self.captures)
+        self.assertGreaterEqual(first_fire, self.start_ns)
+        self.assertLess(first_fire - self.start_ns, 20 * MS)
+    
+    def test_settings_configured_once(self):
+        """Test that unchanged settings are not reapplied between shots."""
+        self.start_ns = time_module.monotonic_ns() + 10 * MS
+        engine = self._engine()
+        engine.schedule(self._event(0, 0))
+        engine.schedule(self._event(10, 1))
+        
+        engine.run()
+        
+        for camera in self.camera_manager.cameras.values():
+            self.assertEqual(camera.configure_settings.call_count, 1)
+    
+    def test_next_settings_prearmed_after_capture(self):
+        """Test that the next shot's settings are applied and verified before its deadline."""
+        self.start_ns = time_module.monotonic_ns() + 10 * MS
+        other = CameraSettings(iso=400, aperture="f/8", shutter="1/500")
+        configured = []
+        for camera in self.camera_manager.cameras.values():
+            camera.configure_settings.side_effect = lambda settings: configured.append(
+                (time_module.monotonic_ns(), settings)) or True
+        engine = self._engine()
+        engine.schedule(self._event(0, 0))
+        second = self._event(80, 1)
+        second.settings = other
+        engine.schedule(second)
+        
+        results = engine.run()
+        
+        self.assertEqual(results, {0: 1, 1: 1})
+        prearm_ns = [configured_ns for configured_ns, settings in configured if settings == other]
+        self.assertEqual(len(prearm_ns), 2)
+        self.assertLess(max(prearm_ns), second.deadline_ns)
+        for camera in self.camera_manager.cameras.values():
+            camera.verify_settings.assert_called_with(other)
+    
+    def test_skip_policy(self):
+        """Test that SKIP drops a shot whose cameras are busy."""
+        self.capture_duration = 0.1
+        self.start_ns = time_module.monotonic_ns() + 10 * MS
+        engine = self._engine(ConflictPolicy.SKIP)
+        engine.schedule(self._event(0, 0))
+        engine.schedule(self._event(20, 1))
+        
+        results = engine.run()
+        
+        self.assertEqual(results, {0: 1, 1: 0})
+        self.assertEqual(len(engine.skipped), 1)
+    
+    def test_queued_shot_does_not_hold_other_cameras(self):
+        """Test that a shot waiting for busy cameras does not delay later shots on other cameras."""
+        self.capture_duration = 0.1
+        self.start_ns = time_module.monotonic_ns() + 10 * MS
+        engine = self._engine(ConflictPolicy.QUEUE)
+        engine.schedule(self._event(0, 0, camera_ids=[0]))
+        engine.schedule(self._event(10, 1, camera_ids=[0]))
+        engine.schedule(self._event(20, 2, camera_ids=[1]))
+        
+        results = engine.run()
+        
+        self.assertEqual(results, {0: 1, 1: 1, 2: 1})
+        fired = {camera_id: [fired_ns for cid, fired_ns, _ in self.captures if cid == camera_id]
+                 for camera_id in (0, 1)}
+        self.assertLess(fired[1][0] - (self.start_ns + 20 * MS), 50 * MS)
+        self.assertGreaterEqual(fired[0][1] - fired[0][0], 100 * MS)
+    
+    def test_mirror_lockup_before_deadline(self):
+        """Test that mirror lockup is applied and the capture waits for the deadline."""
+        self.start_ns = time_module.monotonic_ns() + 10 * MS
+        engine = self._engine()
+        engine.schedule(self._event(300, 0, mlu_delay=50))
+        
+        engine.run()
+        
+        for camera in self.camera_manager.cameras.values():
+            camera.mirror_lockup.assert_called_once_with(True, 50, True)
+        first_fired_ns = min(fired_ns for _, fired_ns, _ in self.captures)
+        self.assertGreaterEqual(first_fired_ns, self.start_ns + 300 * MS)
+        # The mirrors went up at least the MLU delay before the shutters opened
+        mirror_up_ns = max(camera.mirror_up_ns for camera in self.camera_manager.cameras.values())
+        self.assertGreaterEqual(first_fired_ns - mirror_up_ns, 50 * MS)
+        self.assertEqual(self.scheduler.metrics.mirror_shortfall.max_ns, 0)
+    
+    def test_background_task_runs_between_shots(self):
+        """Test that background work runs on the loop and is held off near triggers."""
+        self.start_ns = time_module.monotonic_ns() + 300 * MS
+        calls = []
+        engine = self._engine(background_guard=0.1)
+        engine.add_background_task('probe', lambda: calls.append(engine.near_trigger()), 0.05)
+        engine.schedule(self._event(0, 0))
+        
+        engine.run()
+        
+        self.assertGreater(len(calls), 0)
+        self.assertNotIn(True, calls)
+    
+    def test_status_polling(self):
+        """Test that camera status is polled in the background."""
+        self.start_ns = time_module.monotonic_ns() + 200 * MS
+        engine = self._engine(status_interval=0.05, background_guard=0.05)
+        engine.schedule(self._event(0, 0))
+        
+        engine.run()
+        
+        self.assertEqual(set(engine.camera_status), {0, 1})
+    
+    def test_action_scheduler_asyncio_engine(self):
+        """Test a full loop rehearsal through ActionScheduler on the asyncio engine."""
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 2, 40))
+        self.camera_manager.clock = clock
+        scheduler = ActionScheduler(self.camera_manager, TimeCalculator(self.timings, clock),
+                                    test_mode=True, engine=ExecutionEngine.ASYNCIO)
+        action = ActionConfig(action_type="Boucle", time_ref="C2", start_operator="+",
+                              start_time=time(0, 0, 0), end_operator="+",
+                              end_time=time(0, 0, 30), interval_or_count=10.0)
+        plan = PlanCompiler(scheduler.time_calculator).compile([action])
+        
+        start = time_module.monotonic()
+        result = scheduler.execute_plan(plan)
+        
+        self.assertTrue(result)
+        self.assertLess(time_module.monotonic() - start, 1.0)
+        self.assertEqual(scheduler.photos_taken, 8)
+        self.assertEqual(scheduler.trigger_times[(0, 3)].replace(microsecond=0).time(), time(16, 3, 19))
+    
+    def test_instant_rehearsal_with_mirror_lockup(self):
+        """Test that the dispatcher wakes overlapping MLU shots at their instants on an instant clock."""
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 2, 40))
+        self.camera_manager.clock = clock
+        scheduler = ActionScheduler(self.camera_manager, TimeCalculator(self.timings, clock),
+                                    test_mode=True, engine=ExecutionEngine.ASYNCIO)
+        actions = [
+            ActionConfig(action_type="Photo", time_ref="C2", start_operator="+", start_time=time(0, 0, 0),
+                         mlu_delay=500),
+            ActionConfig(action_type="Photo", time_ref="C2", start_operator="+", start_time=time(0, 0, 1),
+                         mlu_delay=500),
+        ]
+        plan = PlanCompiler(scheduler.time_calculator).compile(actions)
+        
+        start = time_module.monotonic()
+        result = scheduler.execute_plan(plan)
+        
+        self.assertTrue(result)
+        self.assertLess(time_module.monotonic() - start, 1.0)
+        self.assertEqual(scheduler.photos_taken, 4)
+        for camera in self.camera_manager.cameras.values():
+            self.assertEqual(camera.mirror_lockup.call_count, 2)
+        self.assertEqual(scheduler.trigger_times[(1, 0)].replace(microsecond=0).time(), time(16, 2, 50))
+
+
+if __name__ == '__main__':
+    unittest.main()
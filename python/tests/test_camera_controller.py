@@ -5,9 +5,15 @@ Tests camera connection, configuration, and capture functionality.
 """
 
 import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
 
 from config.eclipse_config import CameraSettings
-from hardware.camera_controller import CameraController, format_gphoto2_aperture, format_gphoto2_shutter
+from hardware.camera_controller import (
+    CameraController, TRIGGERED_PREFIX, format_gphoto2_aperture, format_gphoto2_shutter, needs_bulb
+)
+from scheduling.deadline_waiter import DeadlineWaiter
+from utils.clock import VirtualClock
 
 
 class TestCameraController(unittest.TestCase):
@@ -91,6 +97,47 @@ class TestCameraController(unittest.TestCase):
         # Should succeed with mock implementation
         self.assertTrue(result)
     
+    def test_configure_settings_sends_only_changes(self):
+        """Test that only widgets whose value changed are written."""
+        self.controller.connect()
+        settings = CameraSettings(iso=1600, aperture="f/8", shutter="1/125")
+        self.assertTrue(self.controller.configure_settings(settings))
+        
+        with patch.object(self.controller, '_get_config', wraps=self.controller._get_config) as get_config, \
+                patch.object(self.controller, '_set_config_value', return_value=True) as set_value:
+            # Unchanged settings: no camera access at all
+            self.assertTrue(self.controller.configure_settings(settings))
+            get_config.assert_not_called()
+            
+            faster = CameraSettings(iso=1600, aperture="f/8", shutter="1/500")
+            self.assertTrue(self.controller.configure_settings(faster))
+            get_config.assert_called_once()
+            set_value.assert_called_once_with("mock_config", 'shutterspeed', "1/500")
+    
+    def test_failed_configure_is_retried(self):
+        """Test that widgets which failed to apply are written again on the next call."""
+        self.controller.connect()
+        settings = CameraSettings(iso=1600, aperture="f/8", shutter="1/125")
+        
+        with patch.object(self.controller, '_set_config_value', return_value=False):
+            self.assertFalse(self.controller.configure_settings(settings))
+        
+        with patch.object(self.controller, '_set_config_value', return_value=True) as set_value:
+            self.assertTrue(self.controller.configure_settings(settings))
+            self.assertEqual(set_value.call_count, 3)
+    
+    def test_reconnect_resets_applied_settings(self):
+        """Test that settings are written in full after a reconnection."""
+        self.controller.connect()
+        settings = CameraSettings(iso=1600, aperture="f/8", shutter="1/125")
+        self.controller.configure_settings(settings)
+        self.controller.disconnect()
+        self.controller.connect()
+        
+        with patch.object(self.controller, '_set_config_value', return_value=True) as set_value:
+            self.controller.configure_settings(settings)
+            self.assertEqual(set_value.call_count, 3)
+    
     def test_capture_image_test_mode(self):
         """Test capture_image in test mode."""
         result = self.controller.capture_image(test_mode=True)
@@ -189,12 +236,369 @@ class TestCameraController(unittest.TestCase):
     
     def test_capabilities_cache_initialization(self):
         """Test that capabilities cache is properly initialized."""
-        self.assertIsInstance(self.controller._capabilities_cache, dict)
+        self.assertIsNone(self.controller.capabilities)
         self.assertIsInstance(self.controller._config_cache, dict)
-        self.assertEqual(len(self.controller._capabilities_cache), 0)
         self.assertEqual(len(self.controller._config_cache), 0)
 
 
+class TestCameraControllerConfigCache(unittest.TestCase):
+    """Test cases for the configuration tree cache, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a controller connected through a mocked gphoto2 module."""
+        self.gp = Mock()
+        self.gp.GP_EVENT_UNKNOWN = 0
+        self.gp.GP_EVENT_TIMEOUT = 1
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = lambda config, name: (0, f"widget_{name}")
+        self.gp.gp_widget_get_value.return_value = "85"
+        self.gp.gp_camera_wait_for_event.return_value = (self.gp.GP_EVENT_TIMEOUT, None)
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0))
+        self.controller = CameraController(0, "Cached Camera", clock=self.clock, config_ttl=5.0)
+        self.assertTrue(self.controller.connect())
+    
+    def test_widgets_indexed_at_connect(self):
+        """Test that the tree is downloaded and hot widgets indexed once at connect."""
+        self.assertEqual(self.gp.gp_camera_get_config.call_count, 1)
+        self.assertIn('shutterspeed', self.controller._config_cache)
+        lookups = self.gp.gp_widget_get_child_by_name.call_count
+        
+        self.controller.get_status()
+        self.controller.configure_settings(CameraSettings(iso=800, aperture="f/8", shutter="1/60"))
+        
+        self.assertEqual(self.gp.gp_camera_get_config.call_count, 1)
+        self.assertEqual(self.gp.gp_widget_get_child_by_name.call_count, lookups)
+    
+    def test_tree_downloaded_again_after_ttl(self):
+        """Test that the cached tree expires after its TTL."""
+        self.clock.advance(6)
+        self.controller.get_status()
+        
+        self.assertEqual(self.gp.gp_camera_get_config.call_count, 2)
+    
+    def test_property_change_event_invalidates_tree(self):
+        """Test that a property change reported by the camera drops the cached tree."""
+        self.gp.gp_camera_wait_for_event.side_effect = [
+            (self.gp.GP_EVENT_UNKNOWN, "PTP Property d102 changed"),
+            (self.gp.GP_EVENT_TIMEOUT, None),
+        ]
+        
+        self.controller.get_status()
+        
+        self.assertEqual(self.gp.gp_camera_get_config.call_count, 2)
+    
+    def test_property_change_event_forgets_applied_values(self):
+        """Test that a property change makes the next configure write every setting again."""
+        settings = CameraSettings(iso=800, aperture="f/8", shutter="1/60")
+        self.controller.configure_settings(settings)
+        self.gp.gp_camera_wait_for_event.side_effect = [
+            (self.gp.GP_EVENT_UNKNOWN, "PTP Property d102 changed"),
+            (self.gp.GP_EVENT_TIMEOUT, None),
+        ]
+        self.controller.drain_events()
+        self.gp.gp_widget_set_value.reset_mock()
+        
+        self.controller.configure_settings(settings)
+        
+        self.assertEqual(self.gp.gp_widget_set_value.call_count, 3)
+    
+    def test_verify_reads_fresh_tree(self):
+        """Test that verification reads the settings back from the camera."""
+        self.controller.verify_settings(CameraSettings(iso=800, aperture="f/8", shutter="1/60"))
+        
+        self.assertEqual(self.gp.gp_camera_get_config.call_count, 2)
+
+
+class TestCameraControllerTriggerMode(unittest.TestCase):
+    """Test cases for trigger-and-collect captures, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a controller in trigger mode on a mocked gphoto2 module."""
+        self.gp = Mock()
+        self.gp.GP_EVENT_UNKNOWN = 0
+        self.gp.GP_EVENT_TIMEOUT = 1
+        self.gp.GP_EVENT_FILE_ADDED = 2
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = lambda config, name: (0, f"widget_{name}")
+        self.events = []
+        self.gp.gp_camera_wait_for_event.side_effect = lambda camera, timeout: (
+            self.events.pop(0) if self.events else (self.gp.GP_EVENT_TIMEOUT, None))
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.files = []
+        self.controller = CameraController(0, "Trigger Camera")
+        self.assertTrue(self.controller.connect())
+        self.controller.trigger_mode = True
+        self.controller.file_added = lambda camera_id, path: self.files.append((camera_id, path))
+    
+    def _file_event(self, name):
+        file_path = Mock(folder="/store_00020001/DCIM/100CANON")
+        file_path.name = name
+        return self.gp.GP_EVENT_FILE_ADDED, file_path
+    
+    def test_trigger_does_not_wait_for_file(self):
+        """Test that a triggered frame returns at once and its file is collected later."""
+        first = self.controller.capture_image()
+        
+        self.assertEqual(first, f"{TRIGGERED_PREFIX}1")
+        self.gp.gp_camera_capture.assert_not_called()
+        self.assertEqual(self.controller.pending_frames, 1)
+        
+        # The first file is written while the second frame is triggered
+        self.events.append(self._file_event("IMG_0001.CR2"))
+        self.controller.capture_image()
+        
+        self.assertEqual(self.files, [(0, "/store_00020001/DCIM/100CANON/IMG_0001.CR2")])
+        self.assertEqual(self.controller.pending_frames, 1)
+    
+    def test_busy_camera_retried(self):
+        """Test that a trigger refused while the camera is busy is retried."""
+        self.gp.gp_camera_trigger_capture.side_effect = [RuntimeError("Camera busy"), None]
+        
+        self.assertEqual(self.controller.capture_image(), f"{TRIGGERED_PREFIX}1")
+        self.assertEqual(self.gp.gp_camera_trigger_capture.call_count, 2)
+    
+    def test_wait_for_files(self):
+        """Test that waiting collects pending files and reports the missing ones."""
+        self.controller.capture_image()
+        self.controller.capture_image()
+        self.events.append(self._file_event("IMG_0001.CR2"))
+        
+        self.assertEqual(self.controller.wait_for_files(50), 1)
+        
+        self.events.append(self._file_event("IMG_0002.CR2"))
+        self.assertEqual(self.controller.wait_for_files(50), 0)
+        self.assertEqual(len(self.files), 2)
+
+
+class TestCameraControllerBurst(unittest.TestCase):
+    """Test cases for continuous-drive bursts, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a controller on a mocked gphoto2 module reporting single-shot drive."""
+        self.gp = Mock()
+        self.gp.GP_EVENT_UNKNOWN = 0
+        self.gp.GP_EVENT_TIMEOUT = 1
+        self.gp.GP_EVENT_FILE_ADDED = 2
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = lambda config, name: (0, f"widget_{name}")
+        self.gp.gp_widget_get_value.return_value = "Single"
+        self.events = []
+        self.gp.gp_camera_wait_for_event.side_effect = lambda camera, timeout: (
+            self.events.pop(0) if self.events else (self.gp.GP_EVENT_TIMEOUT, None))
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.controller = CameraController(0, "Burst Camera")
+        self.assertTrue(self.controller.connect())
+    
+    def _file_event(self, name):
+        file_path = Mock(folder="/DCIM/100CANON")
+        file_path.name = name
+        return self.gp.GP_EVENT_FILE_ADDED, file_path
+    
+    def test_release_held_until_frame_count(self):
+        """Test that the release is held in continuous drive until the requested frames."""
+        self.events = [self._file_event(f"IMG_{index}.CR2") for index in range(4)]
+        
+        frames = self.controller.capture_burst(5_000_000_000, max_frames=3)
+        
+        # The frame still in the buffer at the release is collected too
+        self.assertEqual(frames, [f"/DCIM/100CANON/IMG_{index}.CR2" for index in range(4)])
+        values = [call[0] for call in self.gp.gp_widget_set_value.call_args_list]
+        self.assertEqual(values, [
+            ("widget_drivemode", "Continuous high speed"),
+            ("widget_eosremoterelease", "Press Full"),
+            ("widget_eosremoterelease", "Release Full"),
+            ("widget_drivemode", "Single"),
+        ])
+        self.gp.gp_camera_trigger_capture.assert_not_called()
+    
+    def test_release_let_go_after_duration(self):
+        """Test that a burst without frame count ends when its hold time elapses."""
+        start_ns = self.controller.clock.monotonic_ns()
+        
+        self.assertEqual(self.controller.capture_burst(50_000_000), [])
+        
+        self.assertGreaterEqual(self.controller.clock.monotonic_ns() - start_ns, 50_000_000)
+    
+    def test_frame_by_frame_without_remote_release(self):
+        """Test that cameras without remote release are triggered as each file arrives."""
+        def set_value(widget, value):
+            if widget == "widget_eosremoterelease":
+                raise RuntimeError("No such widget")
+        self.gp.gp_widget_set_value.side_effect = set_value
+        self.gp.gp_camera_trigger_capture.side_effect = lambda camera: self.events.append(
+            self._file_event(f"IMG_{len(self.events)}.CR2"))
+        
+        frames = self.controller.capture_burst(5_000_000_000, max_frames=3)
+        
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(self.gp.gp_camera_trigger_capture.call_count, 3)
+    
+    def test_simulated_burst_takes_its_time(self):
+        """Test that a test-mode burst simulates its frames over the hold time."""
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 2, 44))
+        controller = CameraController(1, "Test Camera", clock=clock)
+        start_ns = clock.monotonic_ns()
+        
+        frames = controller.capture_burst(2_000_000_000, test_mode=True)
+        
+        self.assertEqual(len(frames), 20)
+        self.assertGreaterEqual(clock.monotonic_ns() - start_ns, 2_000_000_000)
+        self.assertEqual(len(controller.capture_burst(2_000_000_000, max_frames=5, test_mode=True)), 5)
+    
+    def test_bracket_writes_shutter_only(self):
+        """Test that a bracket changes the shutter speed alone, skipping the rung already set."""
+        self.controller._applied_values['shutterspeed'] = "1/125"
+        self.gp.gp_camera_capture.return_value = Mock(folder="/DCIM/100CANON")
+        self.gp.gp_camera_capture.return_value.name = "IMG_0001.CR2"
+        
+        frames = self.controller.capture_bracket(("1/125", "1/500", "1/30"))
+        
+        self.assertEqual(len(frames), 3)
+        values = [call[0] for call in self.gp.gp_widget_set_value.call_args_list]
+        self.assertEqual(values, [("widget_shutterspeed", "1/500"), ("widget_shutterspeed", "1/30")])
+        self.assertEqual(self.gp.gp_camera_capture.call_count, 3)
+        self.assertEqual(self.controller._applied_values['shutterspeed'], "1/30")
+
+
+class TestCameraControllerMirrorLockup(unittest.TestCase):
+    """Test cases for mirror lockup through the remote release, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a controller connected through a mocked gphoto2 module."""
+        self.gp = Mock()
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = lambda config, name: (0, f"widget_{name}")
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.controller = CameraController(0, "MLU Camera")
+        self.assertTrue(self.controller.connect())
+    
+    def test_mirror_raised_by_remote_release(self):
+        """Test that a full press and release raises the mirror without waiting for the delay."""
+        self.assertTrue(self.controller.mirror_lockup(True, 2000))
+        
+        values = [call[0] for call in self.gp.gp_widget_set_value.call_args_list]
+        self.assertEqual(values, [("widget_eosremoterelease", "Press Full"),
+                                  ("widget_eosremoterelease", "Release Full")])
+        self.assertIsNotNone(self.controller.mirror_up_ns)
+        
+        # The capture releases the shutter and ends the lockup
+        self.gp.gp_camera_capture.return_value = Mock(folder="/DCIM/100CANON")
+        self.controller.capture_image()
+        self.assertIsNone(self.controller.mirror_up_ns)
+    
+    def test_no_remote_release(self):
+        """Test that a camera without remote release reports the lockup as failed."""
+        self.gp.gp_widget_set_value.side_effect = RuntimeError("No such widget")
+        
+        self.assertFalse(self.controller.mirror_lockup(True, 2000))
+        self.assertIsNone(self.controller.mirror_up_ns)
+
+
+class TestCameraControllerBulb(unittest.TestCase):
+    """Test cases for host-timed bulb exposures, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a controller connected through a mocked gphoto2 module."""
+        self.gp = Mock()
+        self.gp.GP_EVENT_TIMEOUT = 1
+        self.gp.GP_EVENT_FILE_ADDED = 2
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = lambda config, name: (0, f"widget_{name}")
+        file_path = Mock(folder="/DCIM/100CANON")
+        file_path.name = "IMG_0001.CR2"
+        self.gp.gp_camera_wait_for_event.return_value = (self.gp.GP_EVENT_FILE_ADDED, file_path)
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.controller = CameraController(0, "Bulb Camera")
+        self.assertTrue(self.controller.connect())
+    
+    def test_remote_release_held_for_exposure(self):
+        """Test that the release is held for the exposure and its duration measured."""
+        path = self.controller.capture_bulb(50_000_000)
+        
+        self.assertEqual(path, "/DCIM/100CANON/IMG_0001.CR2")
+        values = [call[0] for call in self.gp.gp_widget_set_value.call_args_list]
+        self.assertEqual(values, [("widget_shutterspeed", "bulb"),
+                                  ("widget_eosremoterelease", "Press Full"),
+                                  ("widget_eosremoterelease", "Release Full")])
+        open_ns, close_ns = self.controller.last_bulb
+        self.assertGreaterEqual(close_ns - open_ns, 50_000_000)
+        self.assertLess(close_ns - open_ns, 60_000_000)
+    
+    def test_bulb_widget_without_remote_release(self):
+        """Test that drivers without remote release are exposed through the bulb widget."""
+        def set_value(widget, value):
+            if widget == "widget_eosremoterelease":
+                raise RuntimeError("No such widget")
+        self.gp.gp_widget_set_value.side_effect = set_value
+        
+        self.assertIsNotNone(self.controller.capture_bulb(10_000_000))
+        
+        values = [call[0] for call in self.gp.gp_widget_set_value.call_args_list]
+        self.assertEqual(values[-2:], [("widget_bulb", "1"), ("widget_bulb", "0")])
+    
+    def test_exposure_timed_by_shared_waiter(self):
+        """Test that the release is closed by the deadline waiter handed to the camera."""
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 3, 0))
+        waiter = DeadlineWaiter(clock=clock)
+        controller = CameraController(1, "Waiter Camera", clock=clock, waiter=waiter)
+        self.assertTrue(controller.connect())
+        
+        self.assertIsNotNone(controller.capture_bulb(30_000_000_000))
+        
+        self.assertEqual(waiter.get_stats()['waits'], 1)
+        open_ns, close_ns = controller.last_bulb
+        self.assertGreaterEqual(close_ns - open_ns, 30_000_000_000)
+    
+    def test_needs_bulb(self):
+        """Test which exposures are timed by the host."""
+        self.assertTrue(needs_bulb(45.0))
+        self.assertTrue(needs_bulb(1.5))
+        self.assertFalse(needs_bulb(2.0))
+        self.assertFalse(needs_bulb(30.0))
+        self.assertFalse(needs_bulb(0.7))
+
+
 class TestCameraControllerWithRealGPhoto2(unittest.TestCase):
     """
     Test cases that would run with real GPhoto2 if available.
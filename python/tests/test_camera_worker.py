@@ -0,0 +1,275 @@
+"""
+Unit tests for camera workers.
+
+Tests the per-camera command threads and the parallel capture built on them.
+"""
+
+import threading
+import time as time_module
+import unittest
+from unittest.mock import Mock, patch
+
+from config.eclipse_config import CameraSettings, CameraStatus
+from hardware.camera_worker import CameraWorker, ReleaseBarrier, release_skew_ns
+from hardware.multi_camera_manager import MultiCameraManager, GPHOTO2_AVAILABLE
+
+
+class TestCameraWorker(unittest.TestCase):
+    """Test cases for CameraWorker class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = CameraWorker(3)
+        self.addCleanup(self.worker.stop, 1.0)
+    
+    def test_commands_run_in_order_on_one_thread(self):
+        """Test that commands run in submission order on the same named thread."""
+        calls = []
+        futures = [
+            self.worker.submit(lambda i=i: calls.append((i, threading.current_thread().name)))
+            for i in range(5)
+        ]
+        for future in futures:
+            future.result(timeout=1.0)
+        
+        self.assertEqual([i for i, _ in calls], list(range(5)))
+        self.assertEqual({name for _, name in calls}, {"Camera3"})
+    
+    def test_exception_reported_through_future(self):
+        """Test that a failing command does not kill the worker."""
+        def fail():
+            raise RuntimeError("USB error")
+        
+        with self.assertRaises(RuntimeError):
+            self.worker.submit(fail).result(timeout=1.0)
+        
+        self.assertEqual(self.worker.submit(lambda: 42).result(timeout=1.0), 42)
+    
+    def test_stop_rejects_new_commands(self):
+        """Test that a stopped worker finishes and refuses new commands."""
+        self.worker.stop(timeout=1.0)
+        
+        self.assertFalse(self.worker.is_alive())
+        with self.assertRaises(RuntimeError):
+            self.worker.submit(lambda: None)
+
+
+class TestReleaseBarrier(unittest.TestCase):
+    """Test cases for ReleaseBarrier class."""
+    
+    def _release(self, barrier, parties, delays):
+        released = {}
+        
+        def worker(index):
+            time_module.sleep(delays[index])
+            synchronized = barrier.wait()
+            released[index] = (time_module.monotonic_ns(), synchronized)
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(parties)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(2.0)
+        return released
+    
+    def test_release_at_deadline(self):
+        """Test that staggered workers are released together at the deadline."""
+        release_at_ns = time_module.monotonic_ns() + 50_000_000
+        barrier = ReleaseBarrier(3, release_at_ns=release_at_ns)
+        
+        released = self._release(barrier, 3, [0.0, 0.01, 0.02])
+        
+        starts = [start_ns for start_ns, _ in released.values()]
+        self.assertTrue(all(synchronized for _, synchronized in released.values()))
+        self.assertGreaterEqual(min(starts), release_at_ns)
+        self.assertLess(max(starts) - min(starts), 5_000_000)
+    
+    def test_past_deadline_releases_after_margin(self):
+        """Test that a passed deadline is replaced by the margin after the last arrival."""
+        barrier = ReleaseBarrier(2, release_at_ns=0, margin=0.005)
+        start_ns = time_module.monotonic_ns()
+        
+        released = self._release(barrier, 2, [0.0, 0.0])
+        
+        self.assertGreaterEqual(barrier.release_ns, start_ns + 5_000_000)
+        self.assertGreaterEqual(min(start_ns for start_ns, _ in released.values()), barrier.release_ns)
+    
+    def test_missing_party_times_out(self):
+        """Test that a worker fires on its own when another never arrives."""
+        barrier = ReleaseBarrier(2, timeout=0.05)
+        
+        self.assertFalse(barrier.wait())
+    
+    def test_release_skew(self):
+        """Test the spread of capture starts across cameras."""
+        self.assertIsNone(release_skew_ns({0: (100, 200)}))
+        self.assertEqual(release_skew_ns({0: (100, 200), 1: (130, 150), 2: (110, 400)}), 30)
+
+
+class TestMultiCameraCapture(unittest.TestCase):
+    """Test cases for MultiCameraManager.capture_all on camera workers."""
+    
+    def setUp(self):
+        """Set up a manager with three mocked cameras."""
+        self.manager = MultiCameraManager()
+        self.addCleanup(self.manager.disconnect_all)
+        self.capture_threads = {}
+        self.delays = {0: 0.0, 1: 0.0, 2: 0.0}
+        
+        for camera_id in self.delays:
+            camera = Mock()
+            
+            def capture_image(test_mode=False, camera_id=camera_id):
+                self.capture_threads.setdefault(camera_id, set()).add(threading.current_thread().name)
+                time_module.sleep(self.delays[camera_id])
+                return f"img_{camera_id}.jpg"
+            
+            camera.capture_image.side_effect = capture_image
+            self.manager.cameras[camera_id] = camera
+        self.manager.active_cameras = list(self.delays)
+    
+    def test_captures_reuse_persistent_threads(self):
+        """Test that successive captures run on the same worker thread per camera."""
+        for _ in range(3):
+            results = self.manager.capture_all(test_mode=True)
+            self.assertEqual(results, {cid: f"img_{cid}.jpg" for cid in self.delays})
+        
+        for camera_id, names in self.capture_threads.items():
+            self.assertEqual(names, {f"Camera{camera_id}"})
+    
+    def test_timeout_bounds_whole_capture(self):
+        """Test that the timeout applies to the whole shot, not to each camera."""
+        self.delays = {0: 0.3, 1: 0.3, 2: 0.0}
+        timings = {}
+        
+        start = time_module.monotonic()
+        results = self.manager.capture_all(test_mode=True, capture_timings=timings, timeout=0.1)
+        
+        self.assertLess(time_module.monotonic() - start, 0.25)
+        self.assertEqual(results, {0: None, 1: None, 2: "img_2.jpg"})
+        self.assertEqual(set(timings), {2})
+    
+    def test_cameras_start_together(self):
+        """Test that all cameras start their capture within a few milliseconds."""
+        timings = {}
+        self.manager.capture_all(test_mode=True, capture_timings=timings)
+        
+        starts = [start_ns for start_ns, _ in timings.values()]
+        self.assertLess(max(starts) - min(starts), 5_000_000)
+    
+    def test_cameras_released_at_deadline(self):
+        """Test that no camera fires before the requested release instant."""
+        timings = {}
+        release_at_ns = time_module.monotonic_ns() + 30_000_000
+        self.manager.capture_all(test_mode=True, capture_timings=timings, release_at_ns=release_at_ns)
+        
+        starts = [start_ns for start_ns, _ in timings.values()]
+        self.assertEqual(len(starts), 3)
+        self.assertGreaterEqual(min(starts), release_at_ns)
+        self.assertLess(max(starts) - min(starts), 5_000_000)
+    
+    def test_bulb_timings_are_shutter_open_and_close(self):
+        """Test that a bulb exposure reports the measured shutter open and close as its timings."""
+        for camera_id, camera in self.manager.cameras.items():
+            camera.capture_bulb.return_value = f"img_{camera_id}.jpg"
+            camera.last_bulb = (1000 + camera_id, 2000 + camera_id)
+        timings = {}
+        
+        results = self.manager.capture_all(test_mode=True, capture_timings=timings, bulb_ns=1000)
+        
+        self.assertEqual(results, {cid: f"img_{cid}.jpg" for cid in self.delays})
+        self.assertEqual(timings, {cid: (1000 + cid, 2000 + cid) for cid in self.delays})
+        self.manager.cameras[0].capture_bulb.assert_called_once_with(1000, True)
+    
+    def test_busy_camera_fires_unsynchronized(self):
+        """Test that a camera still busy with a previous command does not hold the others."""
+        self.manager.get_worker(2).submit(time_module.sleep, 0.1)
+        timings = {}
+        
+        self.manager.capture_all(test_mode=True, capture_timings=timings)
+        
+        self.assertEqual(len(timings), 3)
+        self.assertGreater(timings[2][0] - max(timings[0][0], timings[1][0]), 50_000_000)
+
+
+class TestMultiCameraFanOut(unittest.TestCase):
+    """Test cases for the parallel configuration, status and discovery of MultiCameraManager."""
+    
+    def setUp(self):
+        """Set up a manager with three slow mocked cameras."""
+        self.manager = MultiCameraManager()
+        self.addCleanup(self.manager.disconnect_all)
+        self.settings = CameraSettings(iso=1600, aperture="f/8", shutter="1/125")
+        self.delays = {0: 0.1, 1: 0.1, 2: 0.1}
+        
+        for camera_id in self.delays:
+            camera = Mock()
+            camera.name = f"Camera {camera_id}"
+            
+            def slow(result, camera_id=camera_id):
+                def call(*args, **kwargs):
+                    time_module.sleep(self.delays[camera_id])
+                    return result
+                return call
+            
+            camera.configure_settings.side_effect = slow(True)
+            camera.verify_settings.side_effect = slow(True)
+            camera.get_status.side_effect = slow(CameraStatus(connected=True, battery_level=80))
+            self.manager.cameras[camera_id] = camera
+        self.manager.active_cameras = list(self.delays)
+    
+    def test_configure_costs_slowest_camera(self):
+        """Test that cameras are configured concurrently."""
+        start = time_module.monotonic()
+        results = self.manager.configure_all(self.settings)
+        
+        self.assertEqual(results, {0: True, 1: True, 2: True})
+        self.assertLess(time_module.monotonic() - start, 0.25)
+        self.assertEqual(self.manager.verify_all(self.settings, camera_ids=[1]), {1: True})
+    
+    def test_failures_and_timeouts_are_isolated(self):
+        """Test that a failing or hung camera does not affect the others."""
+        self.delays[2] = 0.5
+        self.manager.cameras[1].configure_settings.side_effect = RuntimeError("USB error")
+        
+        start = time_module.monotonic()
+        results = self.manager.configure_all(self.settings, timeout=0.2)
+        
+        self.assertLess(time_module.monotonic() - start, 0.4)
+        self.assertEqual(results, {0: True, 1: False, 2: False})
+    
+    def test_status_timeout_reports_disconnected(self):
+        """Test that a camera missing the status deadline is reported with the error."""
+        self.delays[0] = 0.5
+        
+        status = self.manager.get_all_status(timeout=0.2)
+        
+        self.assertFalse(status[0].connected)
+        self.assertIn("timed out", status[0].last_error)
+        self.assertTrue(status[1].connected)
+        self.assertFalse(self.manager.validate_all_cameras(timeout=0.2))
+    
+    @unittest.skipIf(GPHOTO2_AVAILABLE, "Discovery test relies on the mock camera list")
+    def test_discovery_connects_in_parallel(self):
+        """Test that cameras are connected concurrently, each on its own worker."""
+        self.manager.disconnect_all()
+        connect_threads = []
+        
+        def connect(controller, address):
+            connect_threads.append(threading.current_thread().name)
+            time_module.sleep(0.1)
+            return address != "usb:001,003"
+        
+        with patch('hardware.multi_camera_manager.CameraController.connect', autospec=True,
+                   side_effect=connect):
+            start = time_module.monotonic()
+            cameras = self.manager.discover_cameras()
+        
+        self.assertLess(time_module.monotonic() - start, 0.19)
+        self.assertEqual(cameras, [0])
+        self.assertEqual(sorted(connect_threads), ["Camera0", "Camera1"])
+        self.assertEqual(list(self.manager.cameras), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Unit tests for camera capability discovery.
+
+Tests the on-disk capability cache and the probing done at connection.
+"""
+
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from config.eclipse_config import CameraSettings
+from hardware.camera_controller import CameraController
+from hardware.capabilities import CameraCapabilities, CapabilityCache
+from hardware.multi_camera_manager import MultiCameraManager
+from utils.validation import SystemValidator
+
+
+class TestCapabilityCache(unittest.TestCase):
+    """Test cases for CapabilityCache class."""
+    
+    def setUp(self):
+        """Set up a cache in a temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.cache = CapabilityCache(self.tmp_dir)
+        self.capabilities = CameraCapabilities(
+            model="Canon EOS 6D", serial="0123456789", firmware="1.1.8", lens="EF100-400mm",
+            choices={'iso': ["100", "200"], 'f-number': ["f/8"], 'batterylevel': []})
+    
+    def test_round_trip_per_body(self):
+        """Test that capabilities are stored per model and serial number."""
+        self.assertTrue(self.cache.save(self.capabilities))
+        
+        self.assertEqual(self.cache.load("Canon EOS 6D", "0123456789"), self.capabilities)
+        self.assertIsNone(self.cache.load("Canon EOS 6D", "9876543210"))
+        self.assertEqual(self.cache.path("Canon EOS 6D", "0123456789").name, "Canon_EOS_6D_0123456789.json")
+    
+    def test_corrupt_file_ignored(self):
+        """Test that an unreadable cache file is treated as missing."""
+        self.cache.path("Canon EOS 6D", "0123456789").write_text("{not json")
+        
+        with self.assertLogs('capability_cache', level='WARNING'):
+            self.assertIsNone(self.cache.load("Canon EOS 6D", "0123456789"))
+    
+    def test_unsupported_settings(self):
+        """Test that only values missing from a listed set of choices are refused."""
+        settings = CameraSettings(iso=400, aperture="f/8", shutter="1/125")
+        
+        self.assertEqual(self.capabilities.unsupported(settings), ["iso=400"])
+        self.assertTrue(self.capabilities.supports('batterylevel', "85%"))
+
+
+class TestCapabilityDiscovery(unittest.TestCase):
+    """Test cases for capability discovery at connection, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a mocked gphoto2 module describing one camera body."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.cache = CapabilityCache(self.tmp_dir)
+        
+        self.values = {'cameramodel': "Canon EOS 6D", 'serialnumber': "0123456789",
+                       'deviceversion': "1.1.8", 'lensname': "EF100-400mm"}
+        self.choices = {'iso': ["100", "200", "400"], 'f-number': ["f/8", "f/11"],
+                        'shutterspeed': ["1/125", "bulb"], 'capturetarget': ["Internal RAM", "Memory card"]}
+        
+        def get_child_by_name(config, name):
+            if name not in self.values and name not in self.choices and name != 'batterylevel':
+                raise RuntimeError(f"No widget {name}")
+            return 0, name
+        
+        def count_choices(widget):
+            if widget not in self.choices:
+                raise RuntimeError("Not a choice widget")
+            return len(self.choices[widget])
+        
+        self.gp = Mock()
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = get_child_by_name
+        self.gp.gp_widget_get_value.side_effect = lambda widget: self.values.get(widget, "")
+        self.gp.gp_widget_count_choices.side_effect = count_choices
+        self.gp.gp_widget_get_choice.side_effect = lambda widget, index: self.choices[widget][index]
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def _connect(self) -> CameraController:
+        controller = CameraController(0, "Canon EOS 6D", capability_cache=self.cache)
+        self.assertTrue(controller.connect())
+        return controller
+    
+    def test_probe_then_load_from_cache(self):
+        """Test that a body is probed once and loaded from the cache on the next connection."""
+        first = self._connect().capabilities
+        
+        self.assertEqual(first.choices['iso'], ["100", "200", "400"])
+        self.assertEqual(first.choices['batterylevel'], [])
+        self.assertNotIn('drivemode', first.choices)
+        
+        self.gp.gp_widget_get_choice.reset_mock()
+        self.assertEqual(self._connect().capabilities, first)
+        self.gp.gp_widget_get_choice.assert_not_called()
+    
+    def test_lens_change_probes_again(self):
+        """Test that a different lens makes the stored capabilities stale."""
+        self._connect()
+        self.values['lensname'] = "EF400mm f/5.6L"
+        self.choices['f-number'] = ["f/5.6", "f/8"]
+        
+        capabilities = self._connect().capabilities
+        
+        self.assertEqual(capabilities.choices['f-number'], ["f/5.6", "f/8"])
+        self.assertEqual(self.cache.load("Canon EOS 6D", "0123456789").lens, "EF400mm f/5.6L")
+    
+    def test_unsupported_value_refused_before_writing(self):
+        """Test that configure_settings refuses a value the camera does not list."""
+        controller = self._connect()
+        
+        with self.assertLogs('camera_0', level='ERROR'):
+            self.assertFalse(controller.configure_settings(CameraSettings(iso=1600, aperture="f/8",
+                                                                          shutter="1/125")))
+        self.gp.gp_widget_set_value.assert_not_called()
+    
+    def test_plan_validated_against_capabilities(self):
+        """Test that the plan check reports the refused values per camera without camera access."""
+        manager = MultiCameraManager()
+        self.addCleanup(manager.disconnect_all)
+        manager.cameras[0] = self._connect()
+        manager.active_cameras = [0]
+        plan = [Mock(settings_used=[CameraSettings(iso=400, aperture="f/8", shutter="1/125")], camera_ids=None),
+                Mock(settings_used=[CameraSettings(iso=400, aperture="f/16", shutter="1/125"),
+                                    CameraSettings(iso=400, aperture="f/16", shutter="1/250")],
+                     camera_ids=None)]
+        
+        self.gp.gp_camera_get_config.reset_mock()
+        with self.assertLogs('system_validator', level='ERROR') as logs:
+            self.assertFalse(SystemValidator().validate_plan_settings(manager, plan))
+        
+        self.assertIn("does not support f-number=f/16, shutterspeed=1/250", logs.output[0])
+        self.gp.gp_camera_get_config.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
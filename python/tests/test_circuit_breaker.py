@@ -0,0 +1,130 @@
+"""
+Unit tests for the per-camera circuit breaker.
+
+Tests the exclusion of failing cameras from captures and their recovery.
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+
+from hardware.camera_controller import CameraController
+from hardware.multi_camera_manager import MultiCameraManager
+
+
+class TestCameraControllerProbe(unittest.TestCase):
+    """Test cases for CameraController.probe, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a controller connected through a mocked gphoto2 module."""
+        self.gp = Mock()
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = lambda config, name: (0, f"widget_{name}")
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.controller = CameraController(0, "EOS R")
+        self.assertTrue(self.controller.connect())
+    
+    def test_probe_reads_camera_not_cache(self):
+        """Test that a camera failing I/O fails the probe, though get_status reports no error."""
+        self.assertTrue(self.controller.probe())
+        self.gp.gp_camera_get_config.side_effect = RuntimeError("I/O error")
+        
+        status = self.controller.get_status()
+        with self.assertLogs('camera_0', level='ERROR'):
+            answered = self.controller.probe()
+        
+        self.assertTrue(status.connected)
+        self.assertIsNone(status.last_error)
+        self.assertFalse(answered)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for CircuitBreaker class."""
+    
+    def setUp(self):
+        """Set up a manager with a healthy and a failing mocked camera."""
+        self.manager = MultiCameraManager()
+        self.addCleanup(self.manager.disconnect_all)
+        
+        for camera_id in (0, 1):
+            camera = Mock()
+            camera.name = f"EOS R{camera_id}"
+            camera.trigger_mode = False
+            camera.last_bulb = None
+            camera.probe.return_value = True
+            self.manager.cameras[camera_id] = camera
+        self.manager.cameras[0].capture_image.return_value = "/DCIM/IMG_0001.CR2"
+        self.manager.cameras[1].capture_image.return_value = None
+        self.manager.active_cameras = [0, 1]
+        
+        self.breaker = self.manager.enable_circuit_breaker(threshold=3, probe_interval=3600)
+    
+    def _fail_captures(self, count: int):
+        with self.assertLogs('multi_camera_manager', level='ERROR'):
+            for _ in range(count):
+                self.manager.capture_all()
+    
+    def test_trips_after_consecutive_failures(self):
+        """Test that a camera is left out of captures after the threshold of failures in a row."""
+        with self.assertLogs('circuit_breaker', level='ERROR'):
+            self._fail_captures(3)
+        
+        self.assertEqual(self.manager.active_cameras, [0])
+        self.assertEqual(self.manager.capture_all(), {0: "/DCIM/IMG_0001.CR2"})
+        self.assertEqual(self.manager.cameras[1].capture_image.call_count, 3)
+        self.assertEqual(self.breaker.tripped_cameras(), [1])
+    
+    def test_success_resets_count(self):
+        """Test that only consecutive failures count towards the threshold."""
+        self._fail_captures(2)
+        self.manager.cameras[1].capture_image.return_value = "/DCIM/IMG_0002.CR2"
+        self.manager.capture_all()
+        self.manager.cameras[1].capture_image.return_value = None
+        self._fail_captures(2)
+        
+        self.assertEqual(self.manager.active_cameras, [0, 1])
+    
+    def test_timed_out_capture_counted_once(self):
+        """Test that a capture completing after its timeout does not count a second time."""
+        release = threading.Event()
+        self.manager.cameras[1].capture_image.side_effect = (
+            lambda test_mode=False: "/DCIM/IMG_LATE.CR2" if release.wait(2.0) else None)
+        with self.assertLogs('multi_camera_manager', level='WARNING'):
+            self.manager.capture_all(timeout=0.1)
+        
+        release.set()
+        self.manager.get_worker(1).submit(lambda: None).result(2.0)
+        self.manager.cameras[1].capture_image.side_effect = None
+        with self.assertLogs('circuit_breaker', level='ERROR'):
+            self._fail_captures(2)
+        
+        self.assertEqual(self.manager.active_cameras, [0])
+    
+    def test_restored_when_answering_then_on_probation(self):
+        """Test that a probed camera rejoins, and trips again on its next failure."""
+        self.manager.cameras[1].probe.return_value = False
+        with self.assertLogs('circuit_breaker', level='ERROR'):
+            self._fail_captures(3)
+        self.assertEqual(self.breaker.probe_once(), [])
+        
+        self.manager.cameras[1].probe.return_value = True
+        self.assertEqual(self.breaker.probe_once(), [1])
+        self.assertEqual(self.manager.active_cameras, [0, 1])
+        
+        with self.assertLogs('circuit_breaker', level='ERROR'):
+            self._fail_captures(1)
+        self.assertEqual(self.manager.active_cameras, [0])
+        self.assertIn("2 cameras taken out after failed captures, 1 restored", self.breaker.format_report()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
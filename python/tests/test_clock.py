@@ -0,0 +1,66 @@
+"""
+Unit tests for clock abstraction.
+
+Tests the real and virtual clocks used for rehearsals.
+"""
+
+import time as time_module
+import unittest
+from datetime import datetime
+
+from utils.clock import Clock, VirtualClock, INSTANT
+
+
+class TestClock(unittest.TestCase):
+    """Test cases for Clock and VirtualClock classes."""
+    
+    def test_system_clock_follows_real_time(self):
+        """Test that the system clock reads the real clocks."""
+        clock = Clock()
+        
+        self.assertFalse(clock.is_virtual)
+        self.assertLess(abs(clock.time() - time_module.time()), 1.0)
+        self.assertGreaterEqual(clock.monotonic_ns(), 0)
+    
+    def test_instant_sleep_advances_time(self):
+        """Test that sleeping on an instant clock jumps the simulated time."""
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0), INSTANT)
+        
+        start = time_module.monotonic()
+        start_ns = clock.monotonic_ns()
+        clock.sleep(3600)
+        
+        self.assertLess(time_module.monotonic() - start, 0.1)
+        self.assertGreaterEqual(clock.monotonic_ns() - start_ns, 3600 * 1_000_000_000)
+        self.assertEqual(clock.now().replace(microsecond=0), datetime(2026, 8, 12, 17, 0, 0))
+    
+    def test_warp_factor(self):
+        """Test that a warped clock runs faster than real time."""
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0), warp=100.0)
+        
+        start = time_module.monotonic()
+        clock.sleep(5)
+        elapsed = time_module.monotonic() - start
+        
+        self.assertLess(elapsed, 0.5)
+        self.assertGreaterEqual((clock.now() - datetime(2026, 8, 12, 16, 0, 0)).total_seconds(), 5)
+    
+    def test_wall_and_monotonic_agree(self):
+        """Test that simulated wall and monotonic times advance together."""
+        clock = VirtualClock(datetime(2026, 8, 12, 16, 0, 0))
+        start_ns = clock.monotonic_ns()
+        start_wall = clock.time()
+        
+        clock.advance(90)
+        
+        self.assertAlmostEqual(clock.time() - start_wall, 90, delta=0.1)
+        self.assertAlmostEqual((clock.monotonic_ns() - start_ns) / 1e9, 90, delta=0.1)
+    
+    def test_invalid_warp(self):
+        """Test that a negative warp factor is rejected."""
+        with self.assertRaises(ValueError):
+            VirtualClock(warp=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -144,6 +144,47 @@ Photo,Max"""  # Too few fields
         with self.assertRaises(ConfigParserError):
             self.parser.parse_eclipse_config(config_file)
     
+    def test_parse_burst_actions(self):
+        """Test parsing burst lines limited by a window, a frame count, or both."""
+        content = """Config,14:41:05,16:02:49,16:03:53,16:04:58,17:31:03,0
+Burst,C2,-,00:00:05,+,00:00:03,-,-,-,8,400,0.001,0
+Burst,C3,-,00:00:03,+,-,30,8,400,0.001,0"""
+        
+        config = self.parser.parse_eclipse_config(self._create_temp_config(content))
+        
+        window, count = config.actions
+        self.assertEqual(window.action_type, "Burst")
+        self.assertEqual(window.end_time, time(0, 0, 3))
+        self.assertIsNone(window.interval_or_count)
+        self.assertEqual(window.shutter_speed, 0.001)
+        self.assertIsNone(count.end_time)
+        self.assertEqual(count.interval_or_count, 30.0)
+    
+    def test_burst_without_limit(self):
+        """Test that a burst needs an end time or a frame count."""
+        content = """Config,14:41:05,16:02:49,16:03:53,16:04:58,17:31:03,0
+Burst,C2,-,00:00:05,+,-,-,8,400,0.001,0"""
+        
+        with self.assertRaises(ConfigParserError):
+            self.parser.parse_eclipse_config(self._create_temp_config(content))
+    
+    def test_parse_bracket_action(self):
+        """Test parsing a bracket line with its frame count and EV step."""
+        content = """Config,14:41:05,16:02:49,16:03:53,16:04:58,17:31:03,0
+Bracket,Max,-,00:00:02,-,-,5,1.5,-,8,100,0.008,0
+Bracket,Max,-,00:00:02,-,-,5,-,-,8,100,0.008,0"""
+        
+        with self.assertRaises(ConfigParserError):
+            self.parser.parse_eclipse_config(self._create_temp_config(content))
+        
+        config = self.parser.parse_eclipse_config(self._create_temp_config(content.rsplit("\n", 1)[0]))
+        bracket = config.actions[0]
+        self.assertEqual(bracket.action_type, "Bracket")
+        self.assertEqual(bracket.interval_or_count, 5.0)
+        self.assertEqual(bracket.bracket_step, 1.5)
+        self.assertEqual(bracket.shutter_speed, 0.008)
+        self.assertEqual(bracket.iso, 100)
+    
     def test_invalid_time_reference(self):
         """Test error handling for invalid time references."""
         content = """Config,14:41:05,16:02:49,16:03:53,16:04:58,17:31:03,0
@@ -0,0 +1,65 @@
+"""
+Unit tests for deadline waiter.
+
+Tests the hybrid sleep/spin waiting accuracy and interruption.
+"""
+
+import time as time_module
+import unittest
+
+from scheduling.deadline_waiter import DeadlineWaiter
+from utils.constants import MAX_DEADLINE_SPIN_WINDOW
+
+
+MS = 1_000_000
+
+
+class TestDeadlineWaiter(unittest.TestCase):
+    """Test cases for DeadlineWaiter class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.waiter = DeadlineWaiter()
+    
+    def test_wait_accuracy(self):
+        """Test that deadlines are reached within a millisecond-level error."""
+        for delay_ms in (5, 20, 50):
+            deadline_ns = time_module.monotonic_ns() + delay_ms * MS
+            result = self.waiter.wait(deadline_ns)
+            
+            self.assertFalse(result.interrupted)
+            self.assertGreaterEqual(result.error_ns, 0)
+            self.assertLess(result.error_ns, 5 * MS)
+        
+        stats = self.waiter.get_stats()
+        self.assertEqual(stats['waits'], 3)
+        self.assertLess(stats['max_error_ms'], 5)
+    
+    def test_past_deadline_returns_immediately(self):
+        """Test that a past deadline is reported as late without waiting."""
+        deadline_ns = time_module.monotonic_ns() - 100 * MS
+        result = self.waiter.wait(deadline_ns)
+        
+        self.assertGreaterEqual(result.lateness_ns, 100 * MS)
+    
+    def test_should_stop_interrupts_wait(self):
+        """Test that a stop request interrupts a long wait."""
+        start = time_module.monotonic()
+        deadline_ns = time_module.monotonic_ns() + 10_000 * MS
+        result = self.waiter.wait(deadline_ns, should_stop=lambda: True)
+        
+        self.assertTrue(result.interrupted)
+        self.assertLess(time_module.monotonic() - start, 0.1)
+        self.assertEqual(self.waiter.get_stats()['waits'], 0)
+    
+    def test_calibrate_bounds(self):
+        """Test that the calibrated spin window stays within bounds."""
+        initial_ns = self.waiter.spin_window_ns
+        window_ns = self.waiter.calibrate(samples=5)
+        
+        self.assertGreaterEqual(window_ns, initial_ns)
+        self.assertLessEqual(window_ns, int(MAX_DEADLINE_SPIN_WINDOW * 1_000_000_000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+"""
+Unit tests for the image download pipeline.
+
+Tests the transfer of captured images to the host and its background queue.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time as time_module
+import unittest
+from unittest.mock import Mock, patch
+
+from hardware.camera_controller import CameraController
+from hardware.download_pipeline import DownloadPipeline, write_buffer
+from hardware.multi_camera_manager import MultiCameraManager
+from utils.constants import CAPTURE_TARGET_RAM
+
+
+class TestCameraControllerDownload(unittest.TestCase):
+    """Test cases for CameraController.download_file, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a controller connected through a mocked gphoto2 module."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        
+        self.gp = Mock()
+        self.gp.GP_EVENT_TIMEOUT = 1
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = lambda config, name: (0, f"widget_{name}")
+        self.gp.gp_file_get_data_and_size.return_value = b"x" * 100
+        self.gp.gp_camera_file_get_info.return_value.file.size = 100
+        self.gp.gp_widget_get_value.return_value = CAPTURE_TARGET_RAM
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.controller = CameraController(0, "Download Camera")
+        self.assertTrue(self.controller.connect())
+        self.target = os.path.join(self.tmp_dir, "IMG_0001.CR2")
+    
+    def test_download_writes_host_file(self):
+        """Test that the image is fetched from its camera folder and kept on the card."""
+        size = self.controller.download_file("/store_00020001/DCIM/100CANON/IMG_0001.CR2", self.target)
+        
+        self.assertEqual(size, 100)
+        self.assertEqual(os.path.getsize(self.target), 100)
+        self.assertEqual(self.gp.gp_camera_file_get.call_args[0][1:3],
+                         ("/store_00020001/DCIM/100CANON", "IMG_0001.CR2"))
+        self.gp.gp_camera_file_delete.assert_not_called()
+    
+    def test_delete_only_verified_copy(self):
+        """Test that the card copy is deleted only when the host copy has the right size."""
+        self.controller.download_file("/DCIM/IMG_0001.CR2", self.target, delete=True)
+        self.gp.gp_camera_file_delete.assert_called_once()
+        
+        self.gp.gp_camera_file_get_info.return_value.file.size = 200
+        self.controller.download_file("/DCIM/IMG_0001.CR2", self.target, delete=True)
+        self.assertEqual(self.gp.gp_camera_file_delete.call_count, 1)
+    
+    def test_download_error_returns_none(self):
+        """Test that a transfer error is reported without raising."""
+        self.gp.gp_camera_file_get.side_effect = RuntimeError("I/O error")
+        
+        self.assertIsNone(self.controller.download_file("/DCIM/IMG_0001.CR2", self.target))
+    
+    def test_ram_capture_streams_to_host(self):
+        """Test that a RAM capture is written to the host and freed from the camera."""
+        self.gp.gp_camera_capture.return_value = Mock(folder="/")
+        self.gp.gp_camera_capture.return_value.name = "capt0000.cr2"
+        
+        self.assertTrue(self.controller.enable_ram_capture(self.tmp_dir))
+        path = self.controller.capture_image()
+        
+        self.gp.gp_widget_set_value.assert_called_with("widget_capturetarget", CAPTURE_TARGET_RAM)
+        self.assertEqual(path, os.path.join(self.tmp_dir, "camera0_Download_Camera", "capt0000.cr2"))
+        self.assertEqual(os.path.getsize(path), 100)
+        self.gp.gp_camera_file_delete.assert_called_once_with(self.controller.camera, "/", "capt0000.cr2")
+    
+    def test_capture_target_checked_on_camera(self):
+        """Test that a target the camera does not report keeps captures on the card."""
+        self.gp.gp_widget_get_value.return_value = "Memory card"
+        
+        self.assertFalse(self.controller.enable_ram_capture(self.tmp_dir))
+        self.assertIsNone(self.controller.ram_capture_dir)
+
+
+class TestWriteBuffer(unittest.TestCase):
+    """Test cases for write_buffer function."""
+    
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+    
+    def test_partial_writes_continue_from_view(self):
+        """Test that short writes resume at the right offset of the buffer."""
+        data = bytearray(range(256)) * 40
+        path = os.path.join(self.tmp_dir, "image.raw")
+        real_write = os.write
+        
+        with patch('hardware.download_pipeline.os.write',
+                   side_effect=lambda fd, view: real_write(fd, view[:1000])) as write:
+            self.assertEqual(write_buffer(path, data), len(data))
+        
+        self.assertEqual(write.call_count, 11)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), bytes(data))
+    
+    def test_replaces_existing_file(self):
+        """Test that an existing file is truncated to the new image."""
+        path = os.path.join(self.tmp_dir, "image.raw")
+        write_buffer(path, b"x" * 500)
+        
+        self.assertEqual(write_buffer(path, memoryview(b"abc")), 3)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b"abc")
+
+
+class TestDownloadPipeline(unittest.TestCase):
+    """Test cases for DownloadPipeline class."""
+    
+    def setUp(self):
+        """Set up a manager with two mocked cameras."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        
+        self.manager = MultiCameraManager()
+        self.addCleanup(self.manager.disconnect_all)
+        self.download_threads = []
+        self.download_delay = 0.0
+        
+        for camera_id in (0, 1):
+            camera = Mock()
+            camera.name = f"EOS R{camera_id}"
+            camera.capture_image.side_effect = lambda test_mode=False, cid=camera_id: f"/DCIM/IMG_{cid}.CR2"
+            camera.download_file.side_effect = self._download
+            camera.ram_capture_dir = None
+            camera.trigger_mode = False
+            self.manager.cameras[camera_id] = camera
+        self.manager.active_cameras = [0, 1]
+    
+    def _download(self, camera_path, target_path, delete=False):
+        self.download_threads.append(threading.current_thread().name)
+        time_module.sleep(self.download_delay)
+        with open(target_path, 'wb') as f:
+            f.write(b"x" * 1000)
+        return 1000
+    
+    def test_captures_downloaded_on_camera_workers(self):
+        """Test that real captures are downloaded per camera and accounted for."""
+        pipeline = self.manager.enable_downloads(self.tmp_dir)
+        
+        self.manager.capture_all()
+        self.manager.capture_all(test_mode=True)
+        self.assertEqual(pipeline.stop(timeout=2.0), 0)
+        
+        stats = pipeline.stats()
+        self.assertEqual(stats['downloaded'], 2)
+        self.assertEqual(stats['bytes'], 2000)
+        self.assertEqual(sorted(self.download_threads), ["Camera0", "Camera1"])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, "camera0_EOS_R0", "IMG_0.CR2")))
+    
+    def test_triggered_frames_downloaded_when_reported(self):
+        """Test that trigger mode downloads the reported file, not the trigger placeholder."""
+        pipeline = self.manager.enable_downloads(self.tmp_dir)
+        self.manager.enable_trigger_mode()
+        
+        self.manager.capture_all(camera_ids=[0])
+        self.manager.cameras[0].file_added(0, "/DCIM/IMG_0001.CR2")
+        pipeline.stop(timeout=2.0)
+        
+        self.assertEqual(pipeline.stats()['downloaded'], 1)
+        self.assertEqual(self.manager.cameras[0].download_file.call_args[0][0], "/DCIM/IMG_0001.CR2")
+    
+    def test_ram_captures_not_downloaded_again(self):
+        """Test that images already streamed from RAM skip the download queue."""
+        pipeline = self.manager.enable_downloads(self.tmp_dir)
+        self.manager.cameras[1].ram_capture_dir = self.tmp_dir
+        
+        self.manager.capture_all()
+        pipeline.stop(timeout=2.0)
+        
+        self.assertEqual(self.download_threads, ["Camera0"])
+    
+    def test_name_collision_keeps_both_images(self):
+        """Test that a reused camera file name does not overwrite an earlier download."""
+        pipeline = DownloadPipeline(self.manager, self.tmp_dir)
+        pipeline.enqueue(0, "/DCIM/IMG_0.CR2")
+        pipeline.enqueue(0, "/DCIM/IMG_0.CR2")
+        pipeline.stop(timeout=2.0)
+        
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tmp_dir, "camera0_EOS_R0"))),
+                         ["IMG_0.CR2", "IMG_0_1.CR2"])
+    
+    def test_downloads_held_off_near_trigger(self):
+        """Test that no download starts while the hold-off callback is True."""
+        near_trigger = threading.Event()
+        near_trigger.set()
+        pipeline = DownloadPipeline(self.manager, self.tmp_dir, hold_off=near_trigger.is_set)
+        
+        pipeline.enqueue(0, "/DCIM/IMG_0.CR2")
+        time_module.sleep(0.15)
+        self.assertEqual(self.download_threads, [])
+        self.assertEqual(pipeline.backlog(), 1)
+        
+        near_trigger.clear()
+        pipeline.stop(timeout=2.0)
+        self.assertEqual(pipeline.stats()['downloaded'], 1)
+    
+    def test_full_queue_defers_without_blocking(self):
+        """Test that images beyond the queue bound stay on the card."""
+        self.download_delay = 0.2
+        pipeline = DownloadPipeline(self.manager, self.tmp_dir, max_queue=1)
+        
+        start = time_module.monotonic()
+        queued = [pipeline.enqueue(0, f"/DCIM/IMG_{i}.CR2") for i in range(4)]
+        
+        self.assertLess(time_module.monotonic() - start, 0.1)
+        self.assertFalse(queued[-1])
+        self.assertGreaterEqual(pipeline.stats()['deferred'], 1)
+        self.assertLessEqual(pipeline.stats()['max_backlog'], 2)
+        pipeline.stop(timeout=2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+"""
+Unit tests for event scheduler.
+
+Tests the merged timeline execution and conflict policies.
+"""
+
+import threading
+import time as time_module
+import unittest
+from datetime import time
+from unittest.mock import Mock
+
+from config.eclipse_config import EclipseTimings, CameraSettings
+from scheduling.time_calculator import TimeCalculator
+from scheduling.action_scheduler import ActionScheduler
+from scheduling.event_scheduler import EventScheduler, ConflictPolicy, OverrunPolicy
+from scheduling.shot_plan import ShotEvent
+from hardware.multi_camera_manager import MultiCameraManager
+
+
+MS = 1_000_000
+
+
+class TestEventScheduler(unittest.TestCase):
+    """Test cases for EventScheduler class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        timings = EclipseTimings(
+            c1=time(14, 41, 5),
+            c2=time(16, 2, 49),
+            max=time(16, 3, 53),
+            c3=time(16, 4, 58),
+            c4=time(17, 31, 3),
+            test_mode=True
+        )
+        self.camera_manager = Mock(spec=MultiCameraManager)
+        self.camera_manager.active_cameras = [0, 1]
+        self.camera_manager.cameras = {0: Mock(), 1: Mock()}
+        self.configured = []
+        self.verified_ok = True
+        
+        def configure_all(settings, camera_ids=None):
+            ids = camera_ids if camera_ids is not None else [0, 1]
+            self.configured.append((time_module.monotonic_ns(), settings, list(ids)))
+            return {cid: True for cid in ids}
+        
+        self.camera_manager.configure_all.side_effect = configure_all
+        self.camera_manager.verify_all.side_effect = lambda settings, camera_ids=None: {
+            cid: self.verified_ok for cid in camera_ids
+        }
+        self.fired = []
+        self.capture_duration = 0.0
+        self._fired_lock = threading.Lock()
+        
+        def capture_all(test_mode=False, camera_ids=None, capture_timings=None, timeout=None,
+                        release_at_ns=None, burst_ns=0, burst_frames=0, bracket=(), bulb_ns=0):
+            while release_at_ns is not None and time_module.monotonic_ns() < release_at_ns:
+                pass
+            start_ns = time_module.monotonic_ns()
+            with self._fired_lock:
+                self.fired.append((start_ns, camera_ids))
+            time_module.sleep(self.capture_duration)
+            ids = camera_ids if camera_ids is not None else [0, 1]
+            if capture_timings is not None:
+                for cid in ids:
+                    capture_timings[cid] = (start_ns, time_module.monotonic_ns())
+            return {cid: f"img_{cid}.jpg" for cid in ids}
+        
+        self.camera_manager.capture_all.side_effect = capture_all
+        self.scheduler = ActionScheduler(self.camera_manager, TimeCalculator(timings), test_mode=True)
+        self.settings = CameraSettings(iso=1600, aperture="f/8", shutter="1/125")
+    
+    def _event(self, offset_ms, action_index, shot_index=0, camera_ids=None, settings=None, interval_ms=0):
+        return ShotEvent(
+            deadline_ns=self.start_ns + offset_ms * MS,
+            wall_seconds=0.0,
+            action_index=action_index,
+            shot_index=shot_index,
+            action_type="Photo",
+            settings=settings or self.settings,
+            camera_ids=camera_ids,
+            interval_ns=interval_ms * MS
+        )
+    
+    def _run(self, events, policy=ConflictPolicy.QUEUE, overrun_policy=OverrunPolicy.SKIP):
+        event_scheduler = EventScheduler(self.scheduler, policy, max_concurrent=2,
+                                         overrun_policy=overrun_policy)
+        for event in events:
+            event_scheduler.schedule(event)
+        return event_scheduler, event_scheduler.run()
+    
+    def test_out_of_order_events_fire_chronologically(self):
+        """Test that events scheduled out of order fire in deadline order."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        events = [self._event(60, 0), self._event(0, 1), self._event(30, 2)]
+        
+        _, results = self._run(events)
+        
+        self.assertEqual(results, {0: 1, 1: 1, 2: 1})
+        self.assertEqual(len(self.fired), 3)
+        fire_times = [fired_ns for fired_ns, _ in self.fired]
+        self.assertEqual(fire_times, sorted(fire_times))
+        self.assertGreaterEqual(fire_times[0], self.start_ns)
+    
+    def test_near_trigger_guard_window(self):
+        """Test that background work is held off before a release and while a shot is in flight."""
+        self.start_ns = time_module.monotonic_ns()
+        event_scheduler = EventScheduler(self.scheduler, background_guard=0.5)
+        self.assertFalse(event_scheduler.near_trigger())
+        
+        event_scheduler.schedule(self._event(2000, 0))
+        self.assertFalse(event_scheduler.near_trigger())
+        event_scheduler.schedule(self._event(100, 1))
+        self.assertTrue(event_scheduler.near_trigger())
+        
+        observed = []
+        self.camera_manager.capture_all.side_effect = lambda *args, **kwargs: (
+            observed.append(event_scheduler.near_trigger()) or {0: "img_0.jpg", 1: "img_1.jpg"})
+        event_scheduler.run()
+        
+        self.assertEqual(observed, [True, True])
+        self.assertFalse(event_scheduler.near_trigger())
+        self.assertFalse(self.scheduler.near_trigger())  # No plan running
+    
+    def test_skip_policy_drops_conflicting_shot(self):
+        """Test that SKIP drops a shot whose cameras are busy."""
+        self.capture_duration = 0.1
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        events = [self._event(0, 0), self._event(20, 1)]
+        
+        event_scheduler, results = self._run(events, ConflictPolicy.SKIP)
+        
+        self.assertEqual(results, {0: 1, 1: 0})
+        self.assertEqual(len(event_scheduler.skipped), 1)
+        self.assertEqual(len(self.fired), 1)
+    
+    def test_queue_policy_fires_late(self):
+        """Test that QUEUE fires a conflicting shot once the cameras are free."""
+        self.capture_duration = 0.1
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        events = [self._event(0, 0), self._event(20, 1)]
+        
+        _, results = self._run(events, ConflictPolicy.QUEUE)
+        
+        self.assertEqual(results, {0: 1, 1: 1})
+        self.assertGreaterEqual(self.fired[1][0] - self.fired[0][0], 100 * MS)
+    
+    def test_queued_shot_does_not_hold_other_cameras(self):
+        """Test that a shot waiting for busy cameras does not delay later shots on other cameras."""
+        self.capture_duration = 0.1
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        events = [self._event(0, 0, camera_ids=[0]), self._event(10, 1, camera_ids=[0]),
+                  self._event(20, 2, camera_ids=[1])]
+        
+        _, results = self._run(events, ConflictPolicy.QUEUE)
+        
+        self.assertEqual(results, {0: 1, 1: 1, 2: 1})
+        fired = {tuple(camera_ids): fired_ns for fired_ns, camera_ids in self.fired[1:]}
+        self.assertLess(fired[(1,)] - (self.start_ns + 20 * MS), 50 * MS)
+        self.assertGreaterEqual(fired[(0,)] - self.fired[0][0], 100 * MS)
+    
+    def test_stop_drops_queued_shot(self):
+        """Test that a stop request drops a shot still waiting for its cameras."""
+        self.capture_duration = 0.1
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        event_scheduler = EventScheduler(self.scheduler, ConflictPolicy.QUEUE)
+        event_scheduler.schedule(self._event(0, 0))
+        event_scheduler.schedule(self._event(10, 1))
+        
+        results = event_scheduler.run(should_stop=lambda: time_module.monotonic_ns() > self.start_ns + 50 * MS)
+        
+        self.assertEqual(results, {0: 1, 1: 0})
+        self.assertEqual(len(self.fired), 1)
+    
+    def test_merge_policy_coalesces_identical_shots(self):
+        """Test that MERGE fires identical shots within the window once."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        other = CameraSettings(iso=400, aperture="f/8", shutter="1/500")
+        events = [self._event(0, 0), self._event(50, 1), self._event(100, 2, settings=other)]
+        
+        event_scheduler, results = self._run(events, ConflictPolicy.MERGE)
+        
+        self.assertEqual(results, {0: 1, 1: 1, 2: 1})
+        self.assertEqual(len(self.fired), 2)
+        self.assertEqual(len(event_scheduler.merged), 1)
+    
+    def test_disjoint_cameras_run_concurrently(self):
+        """Test that shots on disjoint camera sets overlap in time."""
+        self.capture_duration = 0.1
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        events = [self._event(0, 0, camera_ids=[0]), self._event(10, 1, camera_ids=[1])]
+        
+        _, results = self._run(events, ConflictPolicy.SKIP)
+        
+        self.assertEqual(results, {0: 1, 1: 1})
+        self.assertLess(self.fired[1][0] - self.fired[0][0], 100 * MS)
+    
+    def test_shot_captures_its_reserved_cameras(self):
+        """Test that a shot triggers the cameras it reserved, not every active camera."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        events = [self._event(0, 0), self._event(10, 1, camera_ids=[1, 5])]
+        
+        self._run(events)
+        
+        self.assertEqual([camera_ids for _, camera_ids in self.fired], [[0, 1], [1]])
+    
+    def test_settings_applied_only_on_change(self):
+        """Test that cameras are reconfigured only when settings change."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        other = CameraSettings(iso=400, aperture="f/8", shutter="1/500")
+        events = [self._event(0, 0), self._event(10, 0, 1), self._event(20, 1, settings=other)]
+        
+        self._run(events)
+        
+        self.assertEqual(self.camera_manager.configure_all.call_count, 2)
+    
+    def test_next_settings_prearmed_after_capture(self):
+        """Test that the next shot's settings are applied in the gap before its deadline."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        other = CameraSettings(iso=400, aperture="f/8", shutter="1/500")
+        events = [self._event(0, 0), self._event(100, 1, settings=other)]
+        
+        event_scheduler, results = self._run(events)
+        
+        self.assertEqual(results, {0: 1, 1: 1})
+        self.assertEqual([settings for _, settings, _ in self.configured], [self.settings, other])
+        configured_ns = self.configured[1][0]
+        self.assertGreater(configured_ns, self.fired[0][0])
+        self.assertLess(configured_ns, self.start_ns + 100 * MS)
+        self.assertEqual(event_scheduler.prearmed, events)
+    
+    def test_prearm_only_for_cameras_of_next_shot(self):
+        """Test that each camera is pre-armed for its own next shot."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        other = CameraSettings(iso=400, aperture="f/8", shutter="1/500")
+        events = [self._event(0, 0), self._event(50, 1, camera_ids=[1], settings=other)]
+        
+        self._run(events)
+        
+        self.assertEqual([(settings, ids) for _, settings, ids in self.configured],
+                         [(self.settings, [0, 1]), (other, [1])])
+    
+    def test_failed_verification_reapplied_at_trigger(self):
+        """Test that settings are applied again at trigger time when pre-arming is not verified."""
+        self.verified_ok = False
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        
+        event_scheduler, results = self._run([self._event(0, 0)])
+        
+        self.assertEqual(results, {0: 1})
+        self.assertEqual(len(self.configured), 2)
+        self.assertEqual(event_scheduler.prearmed, [])
+    
+    def _loop_events(self):
+        """Four loop shots 100ms apart."""
+        self.capture_duration = 0.18
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        return [self._event(k * 100, 0, k, interval_ms=100) for k in range(4)]
+    
+    def test_overrun_skip_keeps_grid(self):
+        """Test that SKIP drops overrunning loop shots and keeps the others on the grid."""
+        event_scheduler, results = self._run(self._loop_events(), overrun_policy=OverrunPolicy.SKIP)
+        
+        self.assertEqual(results, {0: 2})
+        self.assertEqual([event.shot_index for event in event_scheduler.skipped], [1, 3])
+        self.assertLess(self.fired[1][0] - (self.start_ns + 200 * MS), 20 * MS)
+    
+    def test_overrun_compress_fires_every_shot(self):
+        """Test that COMPRESS fires late loop shots back-to-back."""
+        event_scheduler, results = self._run(self._loop_events(), overrun_policy=OverrunPolicy.COMPRESS)
+        
+        self.assertEqual(results, {0: 4})
+        self.assertGreater(len(event_scheduler.overruns), 0)
+    
+    def test_overrun_shift_drops_shots_past_end(self):
+        """Test that SHIFT delays the rest of the loop and drops shots past its end."""
+        event_scheduler, results = self._run(self._loop_events(), overrun_policy=OverrunPolicy.SHIFT)
+        
+        self.assertEqual(results, {0: 3})
+        self.assertEqual([event.shot_index for event in event_scheduler.skipped], [3])
+    
+    def test_shot_lateness_recorded(self):
+        """Test that the lateness of every fired shot is recorded."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        self._run([self._event(0, 0), self._event(10, 1)])
+        
+        self.assertEqual(set(self.scheduler.shot_lateness), {(0, 0), (1, 0)})
+        self.assertLess(self.scheduler.get_execution_stats()['max_lateness_ms'], 50)
+
+    def test_trigger_latency_recorded_per_camera(self):
+        """Test that per-camera trigger latency feeds the shot metrics."""
+        self.start_ns = time_module.monotonic_ns() + 20 * MS
+        self._run([self._event(0, 0), self._event(10, 1, camera_ids=[1])])
+        
+        latency = self.scheduler.get_execution_stats()['latency']
+        self.assertEqual(latency['trigger_latency']['count'], 2)
+        self.assertEqual(latency['by_camera'][0]['trigger_latency']['count'], 1)
+        self.assertEqual(latency['by_camera'][1]['trigger_latency']['count'], 2)
+        self.assertEqual(set(latency['by_action']), {0, 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
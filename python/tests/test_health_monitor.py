@@ -0,0 +1,101 @@
+"""
+Unit tests for the camera health monitor.
+
+Tests the background status polls and the cached statuses served to queries.
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from config.eclipse_config import CameraStatus
+from hardware.health_monitor import HealthMonitor
+from hardware.multi_camera_manager import MultiCameraManager
+from utils.clock import VirtualClock
+
+
+class TestHealthMonitor(unittest.TestCase):
+    """Test cases for HealthMonitor class."""
+    
+    def setUp(self):
+        """Set up a manager with two mocked cameras on a virtual clock."""
+        self.clock = VirtualClock()
+        self.manager = MultiCameraManager(clock=self.clock)
+        self.addCleanup(self.manager.disconnect_all)
+        
+        for camera_id in (0, 1):
+            camera = Mock()
+            camera.get_status.return_value = CameraStatus(connected=True, battery_level=50 + camera_id)
+            self.manager.cameras[camera_id] = camera
+        self.manager.active_cameras = [0, 1]
+        self.monitor = HealthMonitor(self.manager, interval=60, ttl=90, clock=self.clock)
+    
+    def test_snapshots_expire_after_ttl(self):
+        """Test that polled statuses are served until they are older than the TTL."""
+        self.assertEqual(self.monitor.poll_once(), 2)
+        
+        self.clock.advance(89)
+        self.assertEqual(self.monitor.snapshot(1).battery_level, 51)
+        self.clock.advance(2)
+        self.assertEqual(self.monitor.snapshots(), {})
+    
+    def test_busy_camera_deferred(self):
+        """Test that a camera whose worker is busy is left for the next round."""
+        release = threading.Event()
+        self.manager.get_worker(0).submit(release.wait)
+        self.addCleanup(release.set)
+        
+        self.assertEqual(self.monitor.poll_once(), 1)
+        
+        self.manager.cameras[0].get_status.assert_not_called()
+        self.assertEqual(list(self.monitor.snapshots()), [1])
+        self.assertIn("1 deferred", self.monitor.format_report()[0])
+    
+    def test_polls_wait_for_hold_off(self):
+        """Test that no camera is polled while the hold-off callback is True."""
+        hold_off = [True, True, False]
+        self.monitor.hold_off = lambda: hold_off.pop(0) if hold_off else False
+        
+        self.monitor.poll_once()
+        
+        self.assertEqual(hold_off, [])
+        self.assertEqual(self.manager.cameras[0].get_status.call_count, 1)
+
+
+class TestManagerStatusCache(unittest.TestCase):
+    """Test cases for the status queries of MultiCameraManager with a health monitor."""
+    
+    def setUp(self):
+        """Set up a manager with one mocked camera and a stopped health monitor."""
+        self.clock = VirtualClock()
+        self.manager = MultiCameraManager(clock=self.clock)
+        self.addCleanup(self.manager.disconnect_all)
+        
+        camera = Mock()
+        camera.name = "EOS R"
+        camera.model = "Canon EOS R"
+        camera.get_status.return_value = CameraStatus(connected=True, battery_level=80)
+        self.manager.cameras[0] = camera
+        self.manager.active_cameras = [0]
+        self.manager.enable_health_monitor(ttl=90).stop(timeout=2.0)
+        camera.get_status.reset_mock()
+    
+    def test_status_served_from_cache(self):
+        """Test that fresh statuses are returned without querying the camera."""
+        self.manager.health.record(0, CameraStatus(connected=True, battery_level=75))
+        
+        self.assertEqual(self.manager.get_all_status()[0].battery_level, 75)
+        self.assertEqual(self.manager.get_camera_info()[0]['status'].battery_level, 75)
+        self.manager.cameras[0].get_status.assert_not_called()
+    
+    def test_stale_status_queried_and_cached(self):
+        """Test that a camera without a fresh status is queried once and then cached."""
+        self.clock.advance(91)
+        
+        self.assertEqual(self.manager.get_all_status()[0].battery_level, 80)
+        self.assertEqual(self.manager.get_all_status()[0].battery_level, 80)
+        self.assertEqual(self.manager.cameras[0].get_status.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
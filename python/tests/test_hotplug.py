@@ -0,0 +1,127 @@
+"""
+Unit tests for camera hot-plug handling.
+
+Tests the detection of unplugged cameras and their background reconnection.
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from config.eclipse_config import CameraSettings
+from hardware.camera_controller import CameraController
+from hardware.hotplug import HotplugMonitor
+from hardware.multi_camera_manager import MultiCameraManager
+
+
+class TestCameraControllerReconnect(unittest.TestCase):
+    """Test cases for CameraController.reconnect, against a simulated GPhoto2 backend."""
+    
+    def setUp(self):
+        """Set up a configured controller connected through a mocked gphoto2 module."""
+        self.gp = Mock()
+        self.gp.gp_camera_get_config.side_effect = lambda camera: object()
+        self.gp.gp_widget_get_child_by_name.side_effect = lambda config, name: (0, f"widget_{name}")
+        
+        patchers = [
+            patch('hardware.camera_controller.gp', self.gp),
+            patch('hardware.camera_controller.GPHOTO2_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.controller = CameraController(0, "Canon EOS 6D")
+        self.assertTrue(self.controller.connect("usb:001,005"))
+        self.settings = CameraSettings(iso=400, aperture="f/8", shutter="1/125")
+        self.assertTrue(self.controller.configure_settings(self.settings))
+    
+    def test_settings_restored_at_new_port(self):
+        """Test that the camera is opened at its new port with its settings written again."""
+        self.gp.gp_widget_set_value.reset_mock()
+        
+        self.assertTrue(self.controller.reconnect("usb:001,009"))
+        
+        self.assertEqual(self.controller.address, "usb:001,009")
+        self.gp.gp_port_info_list_lookup_path.assert_called_with(self.gp.gp_port_info_list_new.return_value,
+                                                                  "usb:001,009")
+        self.assertEqual(self.gp.gp_widget_set_value.call_count, 3)
+    
+    def test_left_disconnected_if_settings_fail(self):
+        """Test that a camera whose settings cannot be restored does not report connected."""
+        self.gp.gp_camera_set_config.side_effect = RuntimeError("I/O error")
+        
+        with self.assertLogs('camera_0', level='ERROR'):
+            self.assertFalse(self.controller.reconnect())
+        
+        self.assertFalse(self.controller.connected)
+
+
+class TestHotplugMonitor(unittest.TestCase):
+    """Test cases for HotplugMonitor class."""
+    
+    def setUp(self):
+        """Set up a manager with two mocked cameras on the bus."""
+        self.manager = MultiCameraManager()
+        self.addCleanup(self.manager.disconnect_all)
+        self.bus = [("Canon EOS 6D", "usb:001,005"), ("Canon EOS R", "usb:001,006")]
+        self.manager.autodetect = lambda: list(self.bus)
+        
+        for camera_id, (name, address) in enumerate(self.bus):
+            camera = Mock()
+            camera.name = name
+            camera.address = address
+            self.manager.cameras[camera_id] = camera
+        self.manager.active_cameras = [0, 1]
+        self.monitor = HotplugMonitor(self.manager, use_udev=False)
+    
+    def test_unplugged_camera_leaves_fan_out(self):
+        """Test that a camera missing from the bus is no longer used by operations."""
+        del self.bus[0]
+        
+        with self.assertLogs('hotplug', level='ERROR'):
+            self.assertEqual(self.monitor.scan_once(), ([0], []))
+        
+        self.assertEqual(self.manager.active_cameras, [1])
+        self.assertEqual(list(self.manager.configure_all(CameraSettings(iso=400, aperture="f/8",
+                                                                        shutter="1/125"))), [1])
+    
+    def test_returning_camera_reconnected_in_background(self):
+        """Test that a camera back on a new port is reconnected on its worker and rejoins."""
+        camera = self.manager.cameras[0]
+        reconnecting = threading.Event()
+        release = threading.Event()
+        
+        def reconnect(address):
+            reconnecting.set()
+            release.wait(2.0)
+            return True
+        camera.reconnect.side_effect = reconnect
+        
+        self.bus[0] = ("Canon EOS 6D", "usb:001,007")
+        with self.assertLogs('hotplug', level='INFO'):
+            self.assertEqual(self.monitor.scan_once(), ([0], [0]))
+        
+        # The scan returned while the reconnection is still running
+        self.assertTrue(reconnecting.wait(2.0))
+        self.assertEqual(self.manager.active_cameras, [1])
+        self.assertEqual(self.monitor.scan_once(), ([], []))
+        
+        release.set()
+        self.manager.get_worker(0).submit(lambda: None).result(2.0)
+        camera.reconnect.assert_called_once_with("usb:001,007")
+        self.assertEqual(self.manager.active_cameras, [0, 1])
+        self.assertIn("1 cameras lost, 1 reconnected", self.monitor.format_report()[0])
+    
+    def test_failed_scan_keeps_cameras(self):
+        """Test that an autodetect error is not mistaken for unplugged cameras."""
+        self.manager.autodetect = Mock(side_effect=RuntimeError("USB error"))
+        
+        with self.assertLogs('hotplug', level='WARNING'):
+            self.assertEqual(self.monitor.scan_once(), ([], []))
+        
+        self.assertEqual(self.manager.active_cameras, [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
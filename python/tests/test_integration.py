@@ -8,7 +8,7 @@ import unittest
 import tempfile
 import shutil
 from pathlib import Path
-from datetime import time
+from datetime import date, datetime, time
 from unittest.mock import patch, Mock
 
 from config.config_parser import parse_config_file
@@ -16,6 +16,7 @@ from scheduling.time_calculator import TimeCalculator
 from scheduling.action_scheduler import ActionScheduler
 
 from hardware.multi_camera_manager import MultiCameraManager
+from utils.clock import VirtualClock
 from utils.validation import SystemValidator
 
 
@@ -51,6 +52,17 @@ Interval,C3,-,00:01:00,+,00:02:00,5,-,-,11,200,0.004,1000
         """Clean up test fixtures."""
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
+    def _rehearsal_clock(self) -> VirtualClock:
+        """Clock starting before the first action of the test configuration."""
+        return VirtualClock(start=datetime.combine(date.today(), time(16, 0, 0)))
+    
+    @staticmethod
+    def _raise_mirrors(camera_manager: Mock, clock: VirtualClock):
+        """Make the mocked manager report its mirrors up at the lockup instant."""
+        camera_manager.raise_mirrors.side_effect = (
+            lambda camera_ids=None, test_mode=False, delay_ms=0:
+            {camera_id: clock.monotonic_ns() for camera_id in camera_ids or camera_manager.active_cameras})
+    
     def test_complete_configuration_parsing(self):
         """Test complete configuration file parsing and validation."""
         # Parse configuration
@@ -152,7 +164,8 @@ Interval,C3,-,00:01:00,+,00:02:00,5,-,-,11,200,0.004,1000
         config = parse_config_file(str(self.config_file))
         
         # Create time calculator
-        calculator = TimeCalculator(config.eclipse_timings)
+        clock = self._rehearsal_clock()
+        calculator = TimeCalculator(config.eclipse_timings, clock)
         
         # Create mock camera manager
         camera_manager = Mock(spec=MultiCameraManager)
@@ -160,6 +173,7 @@ Interval,C3,-,00:01:00,+,00:02:00,5,-,-,11,200,0.004,1000
         camera_manager.cameras = {0: Mock()}
         camera_manager.configure_all.return_value = {0: True}
         camera_manager.capture_all.return_value = {0: "test_image.jpg"}
+        self._raise_mirrors(camera_manager, clock)
         
         # Create scheduler
         scheduler = ActionScheduler(camera_manager, calculator, test_mode=True)
@@ -217,7 +231,8 @@ Config,invalid_time,16:02:49,16:03:53,16:04:58,17:31:03,1
         config = parse_config_file(str(self.config_file))
         
         # Create components
-        calculator = TimeCalculator(config.eclipse_timings)
+        clock = self._rehearsal_clock()
+        calculator = TimeCalculator(config.eclipse_timings, clock)
         validator = SystemValidator()
         
         # Mock camera manager for full workflow
@@ -231,6 +246,7 @@ Config,invalid_time,16:02:49,16:03:53,16:04:58,17:31:03,1
         camera_manager.configure_all.return_value = {0: True, 1: True}
         camera_manager.capture_all.return_value = {0: "img1.jpg", 1: "img2.jpg"}
         camera_manager.validate_all_cameras.return_value = True
+        self._raise_mirrors(camera_manager, clock)
         
         # Create scheduler
         scheduler = ActionScheduler(camera_manager, calculator, test_mode=True)
@@ -0,0 +1,105 @@
+"""
+Unit tests for setting value lookup.
+
+Tests the sorted value indexes and the snapping of settings to accepted values.
+"""
+
+import unittest
+from datetime import time
+from unittest.mock import Mock
+
+from config.eclipse_config import ActionConfig, CameraSettings, EclipseTimings
+from hardware.camera_controller import parse_gphoto2_shutter
+from hardware.capabilities import CameraCapabilities
+from hardware.multi_camera_manager import MultiCameraManager
+from hardware.setting_values import SettingsResolver, ValueIndex, parse_aperture
+from scheduling.shot_plan import PlanCompiler
+from scheduling.time_calculator import TimeCalculator
+
+
+class TestValueIndex(unittest.TestCase):
+    """Test cases for ValueIndex class."""
+    
+    def test_nearest_in_stops(self):
+        """Test that lookups pick the closest value on a logarithmic scale."""
+        index = ValueIndex(["1/1000", "1/2000", "bulb", "1/4000", "1/500"], parse_gphoto2_shutter)
+        
+        self.assertEqual(index.values, ["1/4000", "1/2000", "1/1000", "1/500"])
+        self.assertEqual(index.nearest(0.00048), "1/2000")
+        self.assertEqual(index.nearest(1.0), "1/500")
+        self.assertEqual(index.snap("1/2100"), "1/2000")
+        self.assertEqual(index.snap("bulb"), "bulb")
+    
+    def test_notation_differences_resolved(self):
+        """Test that a value written differently resolves to the camera's spelling."""
+        index = ValueIndex(["f/4.0", "f/5.6", "f/8", "implicit auto"], parse_aperture)
+        
+        self.assertEqual(index.snap("f/4"), "f/4.0")
+        self.assertIsNone(index.snap("auto"))
+        self.assertIsNone(ValueIndex([], parse_aperture).nearest(8.0))
+
+
+class TestSettingsResolver(unittest.TestCase):
+    """Test cases for SettingsResolver class."""
+    
+    def setUp(self):
+        """Set up a resolver restricted to a few camera choices."""
+        self.resolver = SettingsResolver({
+            'iso': ["Auto", "100", "200", "400", "800"],
+            'shutterspeed': ["bulb", "1/250", "1/125", "1/60", "1/30"]
+        })
+    
+    def test_resolve_to_camera_choices(self):
+        """Test that every setting is resolved against the camera choices or the GPhoto2 tables."""
+        settings = CameraSettings(iso=1600, aperture="f/4", shutter="1/100")
+        
+        resolved = self.resolver.resolve(settings)
+        
+        self.assertEqual(resolved, CameraSettings(iso=800, aperture="f/4.0", shutter="1/125"))
+        self.assertEqual(self.resolver.adjustments(settings, resolved), ["ISO 1600 -> 800", "shutter 1/100 -> 1/125"])
+    
+    def test_bulb_kept(self):
+        """Test that a bulb exposure is not snapped to a preset speed."""
+        settings = CameraSettings(iso=100, aperture="f/8", shutter="bulb")
+        
+        self.assertEqual(SettingsResolver().resolve(settings), settings)
+    
+    def test_plan_compiled_with_camera_choices(self):
+        """Test that the compiled plan and its brackets only use accepted values."""
+        timings = EclipseTimings(c1=time(10, 0, 0), c2=time(11, 0, 0), max=time(11, 1, 0),
+                                 c3=time(11, 2, 0), c4=time(12, 0, 0))
+        compiler = PlanCompiler(TimeCalculator(timings), self.resolver)
+        photo = ActionConfig(action_type="Photo", time_ref="Max", start_operator="+", start_time=time(0, 0, 0),
+                             iso=3200, shutter_speed=1 / 100)
+        bracket = ActionConfig(action_type="Bracket", time_ref="Max", start_operator="+",
+                               start_time=time(0, 0, 10), interval_or_count=5.0, bracket_step=1.0,
+                               shutter_speed=1 / 125)
+        
+        with self.assertLogs('plan_compiler', level='WARNING') as logs:
+            events = compiler.compile([photo, bracket]).events
+        
+        self.assertEqual((events[0].settings.iso, events[0].settings.shutter), (800, "1/125"))
+        self.assertEqual(events[1].bracket, ("1/125", "1/250", "1/60", "1/30"))
+        self.assertIn("ISO 3200 -> 800, shutter 1/100 -> 1/125", logs.output[0])
+
+
+class TestManagerSettingsResolver(unittest.TestCase):
+    """Test cases for MultiCameraManager.settings_resolver."""
+    
+    def test_choices_common_to_all_cameras(self):
+        """Test that settings are only snapped to values every camera accepts."""
+        manager = MultiCameraManager()
+        for camera_id, apertures in enumerate((["f/5.6", "f/8", "f/11"], ["f/8", "f/11", "f/16"])):
+            manager.cameras[camera_id] = Mock(capabilities=CameraCapabilities(
+                model="Canon", serial=str(camera_id), choices={'f-number': apertures, 'batterylevel': []}))
+        manager.cameras[2] = Mock(capabilities=None)
+        manager.active_cameras = [0, 1, 2]
+        
+        resolver = manager.settings_resolver()
+        
+        self.assertEqual(resolver.indexes['f-number'].values, ["f/8", "f/11"])
+        self.assertEqual(resolver.resolve(CameraSettings(iso=100, aperture="f/5.6", shutter="1")).aperture, "f/8")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests for shot metrics.
+
+Tests the latency histograms and their per-camera and per-phase breakdown.
+"""
+
+import unittest
+
+from config.eclipse_config import CameraSettings
+from scheduling.shot_metrics import LatencyHistogram, ShotMetrics
+from scheduling.shot_plan import ShotEvent
+from scheduling.time_calculator import EclipsePhase
+
+
+MS = 1_000_000
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for LatencyHistogram class."""
+    
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        
+        self.assertEqual(histogram.to_dict(), {
+            'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0
+        })
+    
+    def test_percentiles_use_bucket_bounds(self):
+        """Test that percentiles report the upper bound of their bucket."""
+        histogram = LatencyHistogram()
+        for value_ms in (0.3, 0.4, 0.8, 3, 40):
+            histogram.record(int(value_ms * MS))
+        
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.percentile(50), 1)
+        self.assertEqual(histogram.percentile(95), 40)
+        self.assertAlmostEqual(histogram.mean_ms, 8.9)
+    
+    def test_negative_and_overflow_samples(self):
+        """Test that early samples count as zero and long ones land in the overflow bucket."""
+        histogram = LatencyHistogram()
+        histogram.record(-5 * MS)
+        histogram.record(8000 * MS)
+        
+        self.assertEqual(histogram.min_ns, 0)
+        self.assertEqual(histogram.counts[0], 1)
+        self.assertEqual(histogram.counts[-1], 1)
+        self.assertEqual(histogram.percentile(100), 8000)
+
+
+class TestShotMetrics(unittest.TestCase):
+    """Test cases for ShotMetrics class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.metrics = ShotMetrics()
+        self.settings = CameraSettings(iso=1600, aperture="f/8", shutter="1/125")
+    
+    def _event(self, action_index=0, deadline_ns=1000 * MS):
+        return ShotEvent(
+            deadline_ns=deadline_ns,
+            wall_seconds=0.0,
+            action_index=action_index,
+            shot_index=0,
+            action_type="Photo",
+            settings=self.settings
+        )
+    
+    def test_per_camera_latency_and_skew(self):
+        """Test that per-camera timings give latency, duration and skew."""
+        event = self._event()
+        timings = {
+            0: (event.deadline_ns + 2 * MS, event.deadline_ns + 302 * MS),
+            1: (event.deadline_ns + 7 * MS, event.deadline_ns + 207 * MS),
+        }
+        
+        self.metrics.record(event, EclipsePhase.TOTALITY, 0, timings)
+        summary = self.metrics.summary()
+        
+        self.assertEqual(summary['trigger_latency']['max_ms'], 2)
+        self.assertEqual(summary['camera_skew']['max_ms'], 5)
+        self.assertEqual(summary['by_camera'][1]['trigger_latency']['max_ms'], 7)
+        self.assertEqual(summary['by_camera'][0]['capture_duration']['max_ms'], 300)
+        self.assertEqual(summary['by_phase']['totality']['camera_skew']['count'], 1)
+    
+    def test_breakdown_by_phase_and_action(self):
+        """Test that shots are grouped by eclipse phase and action."""
+        self.metrics.record(self._event(0), EclipsePhase.PARTIAL_BEFORE, 3 * MS)
+        self.metrics.record(self._event(1), EclipsePhase.TOTALITY, 1 * MS)
+        self.metrics.record(self._event(1), EclipsePhase.TOTALITY, 2 * MS)
+        summary = self.metrics.summary()
+        
+        self.assertEqual(summary['by_phase']['C1-C2']['trigger_latency']['count'], 1)
+        self.assertEqual(summary['by_phase']['totality']['trigger_latency']['count'], 2)
+        self.assertEqual(summary['by_action'][1]['count'], 2)
+        self.assertEqual(summary['camera_skew']['count'], 0)
+    
+    def test_mirror_settle_shortfall(self):
+        """Test that mirror lockup shots record how much settle time was missing."""
+        event = self._event()
+        event.mlu_delay = 500
+        timings = {0: (event.deadline_ns, event.deadline_ns), 1: (event.deadline_ns, event.deadline_ns)}
+        mirror_up = {0: event.deadline_ns - 520 * MS, 1: event.deadline_ns - 480 * MS, 2: None}
+        
+        settle = self.metrics.record_mirror_lockup(event, mirror_up, timings)
+        
+        self.assertEqual(settle, {0: 520 * MS, 1: 480 * MS})
+        self.assertEqual(self.metrics.mirror_shortfall.max_ns, 20 * MS)
+        self.assertEqual(self.metrics.summary()['mirror_failures'], 1)
+    
+    def test_reset_and_report(self):
+        """Test that reset discards samples and the report reflects it."""
+        self.metrics.record(self._event(), EclipsePhase.TOTALITY, 1 * MS, {0: (1000 * MS, 1100 * MS)})
+        
+        report = self.metrics.format_report()
+        self.assertTrue(report[0].startswith("Trigger latency: n=1"))
+        self.assertTrue(any("Phase totality" in line for line in report))
+        
+        self.metrics.reset()
+        self.assertEqual(self.metrics.format_report(), ["Trigger timing: no shots recorded"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,241 @@
+"""
+Unit tests for shot plan compiler.
+
+Tests the resolution of actions into time-sorted shot events.
+"""
+
+import unittest
+from datetime import datetime, time
+
+from config.eclipse_config import EclipseTimings, ActionConfig, SystemConfig
+from scheduling.time_calculator import TimeCalculator
+from scheduling.shot_plan import (
+    PlanCompiler, compile_shot_plan, action_camera_settings, bracket_ladder, bracket_order
+)
+from utils.constants import BURST_MAX_DURATION
+
+
+class TestShotPlan(unittest.TestCase):
+    """Test cases for PlanCompiler and ShotPlan."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.timings = EclipseTimings(
+            c1=time(14, 41, 5),
+            c2=time(16, 2, 49),
+            max=time(16, 3, 53),
+            c3=time(16, 4, 58),
+            c4=time(17, 31, 3),
+            test_mode=True
+        )
+        self.calculator = TimeCalculator(self.timings)
+        self.compiler = PlanCompiler(self.calculator)
+        # Anchor one hour before C2
+        self.now = datetime(2026, 8, 12, 15, 2, 49)
+    
+    def _photo(self, ref, op, offset, **kwargs):
+        return ActionConfig(action_type="Photo", time_ref=ref, start_operator=op,
+                            start_time=offset, **kwargs)
+    
+    def test_photo_event_deadline(self):
+        """Test that a photo resolves to a deadline relative to the anchor."""
+        plan = self.compiler.compile([self._photo("C2", "+", time(0, 0, 10))], self.now)
+        
+        self.assertEqual(len(plan), 1)
+        event = plan.events[0]
+        self.assertEqual(event.wall_time, time(16, 2, 59))
+        self.assertEqual(event.deadline_ns - plan.anchor_monotonic_ns, 3610 * 1_000_000_000)
+    
+    def test_events_sorted_across_actions(self):
+        """Test that out-of-order lines are merged into chronological order."""
+        actions = [
+            self._photo("Max", "+", time(0, 0, 5), line_number=3),
+            self._photo("C2", "-", time(0, 0, 5), line_number=4),
+        ]
+        plan = self.compiler.compile(actions, self.now)
+        
+        self.assertEqual([event.line_number for event in plan], [4, 3])
+    
+    def test_preformatted_settings(self):
+        """Test that GPhoto2 settings are formatted at compile time."""
+        action = self._photo("Max", "-", time(0, 0, 10), aperture=5.6, iso=800,
+                             shutter_speed=0.004, mlu_delay=500)
+        plan = self.compiler.compile([action], self.now)
+        
+        event = plan.events[0]
+        self.assertEqual(event.settings.aperture, "f/5.6")
+        self.assertEqual(event.settings.shutter, "1/250")
+        self.assertEqual(event.settings.iso, 800)
+        self.assertEqual(event.mlu_ns, 500_000_000)
+    
+    def test_default_settings(self):
+        """Test default settings when the action leaves them unspecified."""
+        settings = action_camera_settings(self._photo("-", "", time(16, 0, 0)))
+        
+        self.assertEqual(settings.iso, 1600)
+        self.assertEqual(settings.aperture, "f/8")
+        self.assertEqual(settings.shutter, "1/125")
+    
+    def test_loop_grid(self):
+        """Test that loop shots sit on an exact grid up to the end time."""
+        action = ActionConfig(action_type="Boucle", time_ref="C2", start_operator="+",
+                              start_time=time(0, 0, 0), end_operator="+",
+                              end_time=time(0, 1, 0), interval_or_count=10.0)
+        plan = self.compiler.compile([action], self.now)
+        
+        self.assertEqual(len(plan), 7)  # 0, 10, ..., 60
+        steps = {b.deadline_ns - a.deadline_ns for a, b in zip(plan.events, plan.events[1:])}
+        self.assertEqual(steps, {10 * 1_000_000_000})
+    
+    def test_loop_minimum_interval(self):
+        """Test that loop intervals below 1s are clamped like the Lua script."""
+        action = ActionConfig(action_type="Boucle", time_ref="C2", start_operator="+",
+                              start_time=time(0, 0, 0), end_operator="+",
+                              end_time=time(0, 0, 5), interval_or_count=0.5)
+        plan = self.compiler.compile([action], self.now)
+        
+        self.assertEqual(len(plan), 6)
+    
+    def test_interval_includes_endpoints(self):
+        """Test interval photos spread evenly including both endpoints."""
+        action = ActionConfig(action_type="Interval", time_ref="C2", start_operator="+",
+                              start_time=time(0, 0, 0), end_operator="+",
+                              end_time=time(0, 1, 0), interval_or_count=5.0)
+        plan = self.compiler.compile([action], self.now)
+        
+        self.assertEqual(len(plan), 5)
+        self.assertEqual(plan.events[0].wall_time, time(16, 2, 49))
+        self.assertEqual(plan.events[-1].wall_time, time(16, 3, 49))
+        self.assertEqual(plan.events[1].wall_time, time(16, 3, 4))
+    
+    def test_burst_single_held_event(self):
+        """Test that a burst compiles to one event holding the release for its window."""
+        action = ActionConfig(action_type="Burst", time_ref="C2", start_operator="-",
+                              start_time=time(0, 0, 5), end_operator="+",
+                              end_time=time(0, 0, 3), interval_or_count=40.0)
+        plan = self.compiler.compile([action], self.now)
+        
+        self.assertEqual(len(plan), 1)
+        event = plan.events[0]
+        self.assertTrue(event.is_burst)
+        self.assertEqual(event.wall_time, time(16, 2, 44))
+        self.assertEqual(event.burst_ns, 8 * 1_000_000_000)
+        self.assertEqual(event.burst_frames, 40)
+    
+    def test_burst_frame_count_only(self):
+        """Test that a burst without end time is bounded by the maximum hold time."""
+        action = ActionConfig(action_type="Burst", time_ref="C3", start_operator="-",
+                              start_time=time(0, 0, 2), interval_or_count=20.0)
+        event = self.compiler.compile([action], self.now).events[0]
+        
+        self.assertEqual(event.burst_ns, BURST_MAX_DURATION * 1_000_000_000)
+        self.assertEqual(event.burst_frames, 20)
+    
+    def test_bracket_ladder_snapped_around_base(self):
+        """Test that bracket rungs are centred on the base and snapped to gphoto2 values."""
+        self.assertEqual(bracket_ladder(1 / 125, 1.0, 5), ['1/500', '1/250', '1/125', '1/60', '1/30'])
+        self.assertEqual(bracket_ladder(1 / 125, 1.0, 4), ['1/250', '1/125', '1/60', '1/30'])
+        # Rungs beyond the longest shutter speed collapse onto it
+        self.assertEqual(bracket_ladder(30, 2.0, 5), ['2', '8', '30'])
+    
+    def test_bracket_order_starts_on_base(self):
+        """Test that a bracket starts on the base rung and sweeps the short side first."""
+        ladder = ['1/500', '1/250', '1/125', '1/60', '1/30']
+        
+        self.assertEqual(bracket_order(ladder, '1/125'), ('1/125', '1/250', '1/500', '1/60', '1/30'))
+    
+    def test_bracket_event_prearmed_on_base(self):
+        """Test that a bracket compiles to one event armed with its first rung."""
+        action = ActionConfig(action_type="Bracket", time_ref="Max", start_operator="-",
+                              start_time=time(0, 0, 2), interval_or_count=3.0, bracket_step=2.0,
+                              aperture=8.0, iso=100, shutter_speed=0.008)
+        plan = self.compiler.compile([action], self.now)
+        
+        self.assertEqual(len(plan), 1)
+        event = plan.events[0]
+        self.assertEqual(event.bracket, ('1/125', '1/500', '1/30'))
+        self.assertEqual(event.settings.shutter, '1/125')
+        self.assertAlmostEqual(event.capture_ns / 1e9, 1 / 125 + 1 / 500 + 1 / 30, places=6)
+    
+    def test_bulb_exposure_beyond_preset_speeds(self):
+        """Test that long or off-preset exposures are compiled to host-timed bulb shots."""
+        corona = self._photo("Max", "+", time(0, 0, 0), shutter_speed=45.0)
+        earthshine = self._photo("Max", "+", time(0, 0, 10), shutter_speed=1.5)
+        preset = self._photo("Max", "+", time(0, 0, 20), shutter_speed=2.0)
+        events = self.compiler.compile([corona, earthshine, preset], self.now).events
+        
+        self.assertEqual([event.bulb_ns for event in events], [45_000_000_000, 1_500_000_000, 0])
+        self.assertEqual([event.settings.shutter for event in events], ["bulb", "bulb", "2"])
+        self.assertEqual(events[0].capture_ns, 90_000_000_000)
+    
+    def test_burst_bulb_rejected(self):
+        """Test that a burst cannot hold a bulb exposure."""
+        action = ActionConfig(action_type="Burst", time_ref="C2", start_operator="-",
+                              start_time=time(0, 0, 5), interval_or_count=5.0, shutter_speed=45.0)
+        plan = self.compiler.compile([action], self.now)
+        
+        self.assertEqual(len(plan), 0)
+        self.assertIn("bulb", plan.rejected[0][1])
+    
+    def test_invalid_action_rejected(self):
+        """Test that an invalid action is rejected without aborting the plan."""
+        actions = [
+            ActionConfig(action_type="Interval", time_ref="C2", start_operator="+",
+                         start_time=time(0, 0, 0), end_operator="+",
+                         end_time=time(0, 0, 0), interval_or_count=5.0),
+            self._photo("Max", "+", time(0, 0, 0)),
+        ]
+        plan = self.compiler.compile(actions, self.now)
+        
+        self.assertEqual(len(plan), 1)
+        self.assertEqual([index for index, _ in plan.rejected], [0])
+    
+    def test_target_after_midnight(self):
+        """Test that a target shortly after midnight is scheduled for tomorrow."""
+        plan = self.compiler.compile([self._photo("-", "", time(0, 0, 30))],
+                                     datetime(2026, 8, 12, 23, 59, 0))
+        
+        offset_ns = plan.events[0].deadline_ns - plan.anchor_monotonic_ns
+        self.assertEqual(offset_ns, 90 * 1_000_000_000)
+    
+    def test_plan_compiled_evening_before(self):
+        """Test that a plan compiled 14 hours before its shots schedules them ahead."""
+        plan = self.compiler.compile([self._photo("C1", "+", time(0, 0, 0))],
+                                     datetime(2026, 8, 12, 0, 41, 5))
+        
+        offset_ns = plan.events[0].deadline_ns - plan.anchor_monotonic_ns
+        self.assertEqual(offset_ns, 14 * 3600 * 1_000_000_000)
+    
+    def test_loop_across_passed_window(self):
+        """Test that a loop whose start has just passed stays on one continuous grid."""
+        action = ActionConfig(action_type="Boucle", time_ref="C2", start_operator="+",
+                              start_time=time(0, 0, 0), end_operator="+",
+                              end_time=time(0, 1, 0), interval_or_count=10.0)
+        plan = self.compiler.compile([action], datetime(2026, 8, 12, 16, 3, 19))
+        
+        offsets = [(event.deadline_ns - plan.anchor_monotonic_ns) // 1_000_000_000 for event in plan]
+        self.assertEqual(offsets, [-30, -20, -10, 0, 10, 20, 30])
+    
+    def test_plan_starting_in_the_past_reported(self):
+        """Test that a plan whose shots passed hours ago is reported at compile time."""
+        with self.assertLogs('plan_compiler', level='ERROR') as logs:
+            self.compiler.compile([self._photo("C1", "+", time(0, 0, 0))],
+                                  datetime(2026, 8, 12, 16, 41, 5))
+        
+        self.assertIn("1/1 shots already passed", logs.output[0])
+    
+    def test_compile_shot_plan(self):
+        """Test the convenience function on a complete configuration."""
+        config = SystemConfig(
+            eclipse_timings=self.timings,
+            verification=None,
+            actions=[self._photo("Max", "-", time(0, 0, 10))]
+        )
+        plan = compile_shot_plan(config, now=self.now)
+        
+        self.assertEqual(plan.action_count, 1)
+        self.assertEqual(len(plan.events_for_action(0)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
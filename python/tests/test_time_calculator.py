@@ -5,13 +5,14 @@ Tests time conversion and calculation functions equivalent to the
 original Magic Lantern Lua script.
 """
 
+import time as time_module
 import unittest
-from datetime import time
-from unittest.mock import patch
+from datetime import datetime, time
 
 
 from config.eclipse_config import EclipseTimings
-from scheduling.time_calculator import TimeCalculator
+from scheduling.time_calculator import TimeCalculator, EclipsePhase
+from utils.clock import VirtualClock
 
 
 class TestTimeCalculator(unittest.TestCase):
@@ -177,25 +178,98 @@ class TestTimeCalculator(unittest.TestCase):
         invalid_calc = TimeCalculator(invalid_timings)
         self.assertFalse(invalid_calc.validate_eclipse_sequence())
     
-    @patch('time.time')
-    @patch('time.sleep')
-    @patch('datetime.datetime')
-    def test_wait_until(self, mock_datetime, mock_sleep, mock_time):
-        """Test wait_until functionality."""
-        # Mock current time progression
-        mock_datetime.now.return_value.time.side_effect = [
-            time(15, 59, 58),  # 2 seconds before target
-            time(15, 59, 59),  # 1 second before target
-            time(16, 0, 0),    # Target reached
-        ]
+    def _anchored_calculator(self, now):
+        """Create a calculator on a real-speed clock starting at the given time."""
+        return TimeCalculator(self.timings, VirtualClock(now, warp=1.0))
+    
+    def test_wait_until(self):
+        """Test wait_until reaches a sub-second target precisely."""
+        calc = self._anchored_calculator(datetime(2026, 8, 12, 15, 59, 58))
+        
+        start = time_module.monotonic()
+        result = calc.wait_until(time(15, 59, 58, 50000))
+        elapsed = time_module.monotonic() - start
+        
+        self.assertGreaterEqual(result.error_ns, 0)
+        self.assertLess(result.error_ns, 5_000_000)
+        self.assertLess(elapsed, 0.5)
+    
+    def test_wait_until_past_target(self):
+        """Test wait_until returns immediately for a target already passed."""
+        calc = self._anchored_calculator(datetime(2026, 8, 12, 16, 0, 10))
+        
+        start = time_module.monotonic()
+        result = calc.wait_until(time(16, 0, 0))
+        
+        self.assertLess(time_module.monotonic() - start, 0.1)
+        self.assertGreater(result.error_ns, 0)
+    
+    def test_wait_until_target_next_morning(self):
+        """Test that a start 14 hours before C1 waits for it instead of treating it as passed."""
+        clock = VirtualClock(datetime(2026, 8, 11, 20, 0, 0))
+        calc = TimeCalculator(EclipseTimings(
+            c1=time(10, 0, 0), c2=time(11, 0, 0), max=time(11, 1, 0), c3=time(11, 2, 0),
+            c4=time(12, 30, 0), test_mode=False), clock)
+        
+        offset_ns = calc.wall_seconds_to_deadline_ns(10 * 3600) - calc.anchor_monotonic_ns
+        calc.wait_until(time(10, 0, 0))
+        
+        self.assertAlmostEqual(offset_ns / 1e9, 14 * 3600, delta=0.5)
+        self.assertEqual(clock.now().replace(microsecond=0), datetime(2026, 8, 12, 10, 0, 0))
+    
+    def test_wall_seconds_to_deadline_recently_passed(self):
+        """Test that a target passed within the window stays in the past."""
+        calc = self._anchored_calculator(datetime(2026, 8, 12, 18, 0, 0))
         
-        mock_time.side_effect = [100, 101, 102]  # For progress timing
+        offset_ns = calc.wall_seconds_to_deadline_ns(16 * 3600) - calc.anchor_monotonic_ns
         
-        target_time = time(16, 0, 0)
-        self.calc.wait_until(target_time, check_interval=0.1)
+        self.assertAlmostEqual(offset_ns / 1e9, -2 * 3600, delta=0.5)
+    
+    def test_wall_seconds_to_deadline_wraps_midnight(self):
+        """Test that a time shortly after midnight resolves to tomorrow."""
+        calc = self._anchored_calculator(datetime(2026, 8, 12, 23, 59, 0))
+        
+        offset_ns = calc.wall_seconds_to_deadline_ns(30) - calc.anchor_monotonic_ns
+        
+        self.assertAlmostEqual(offset_ns / 1e9, 90, delta=0.5)
+    
+    def test_wait_until_instant_clock(self):
+        """Test that an instant virtual clock reaches a distant target immediately."""
+        clock = VirtualClock(datetime(2026, 8, 12, 14, 0, 0))
+        calc = TimeCalculator(self.timings, clock)
+        
+        start = time_module.monotonic()
+        calc.wait_until(self.timings.c2)
+        
+        self.assertLess(time_module.monotonic() - start, 0.5)
+        self.assertEqual(clock.now().replace(microsecond=0).time(), self.timings.c2)
+    
+    def test_progress_interval_applies_to_one_wait(self):
+        """Test that a wait's progress interval bounds its sleeps without changing the shared waiter."""
+        clock = VirtualClock(datetime(2026, 8, 12, 14, 0, 0))
+        calc = TimeCalculator(self.timings, clock)
+        sleeps = []
+        clock.sleep = lambda seconds: (sleeps.append(seconds), VirtualClock.sleep(clock, seconds))
+        
+        calc.wait_until_deadline(clock.monotonic_ns() + 30_000_000_000, progress_interval=5)
+        
+        self.assertEqual(max(sleeps), 5)
+        self.assertEqual(calc.waiter.progress_interval, 20)
+    
+    def test_eclipse_phase(self):
+        """Test that times of day map to the phase delimited by the contacts."""
+        cases = [
+            (time(14, 0, 0), EclipsePhase.BEFORE_C1),
+            (time(15, 0, 0), EclipsePhase.PARTIAL_BEFORE),
+            (self.timings.c2, EclipsePhase.TOTALITY),
+            (self.timings.c3, EclipsePhase.TOTALITY),
+            (time(17, 0, 0), EclipsePhase.PARTIAL_AFTER),
+            (time(18, 0, 0), EclipsePhase.AFTER_C4),
+        ]
         
-        # Should have called sleep at least once
-        self.assertTrue(mock_sleep.called)
+        for time_of_day, expected in cases:
+            with self.subTest(time=time_of_day):
+                self.assertEqual(self.calc.eclipse_phase(self.calc.time_to_seconds(time_of_day)), expected)
     
     def test_pre_calculated_references(self):
         """Test that reference times are pre-calculated correctly."""
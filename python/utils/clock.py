@@ -0,0 +1,136 @@
+"""
+Clock abstraction for Eclipse Photography Controller.
+
+Every component reads time and sleeps through a Clock instance instead of
+calling datetime.now(), time.time() and time.sleep() directly. The default
+SystemClock uses the real clocks; VirtualClock runs a simulated timeline
+faster than real time, so a complete eclipse sequence can be rehearsed in
+seconds while still producing the simulated trigger times.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+INSTANT = 0.0  # Time warp factor for instant rehearsals (sleeps return immediately)
+
+
+class Clock:
+    """Real-time system clock, base class for simulated clocks."""
+    
+    def monotonic_ns(self) -> int:
+        """Get monotonic time in nanoseconds."""
+        return time.monotonic_ns()
+    
+    def time(self) -> float:
+        """Get wall clock time in seconds since the epoch."""
+        return time.time()
+    
+    def now(self) -> datetime:
+        """Get current local date and time."""
+        return datetime.now()
+    
+    def sleep(self, seconds: float):
+        """Sleep for the given duration in seconds."""
+        if seconds > 0:
+            time.sleep(seconds)
+    
+    async def async_sleep(self, seconds: float):
+        """Sleep without blocking the event loop."""
+        await asyncio.sleep(max(0.0, seconds))
+    
+    @property
+    def is_virtual(self) -> bool:
+        """True if the clock does not follow real time."""
+        return False
+    
+    @property
+    def is_instant(self) -> bool:
+        """True if sleeping returns immediately."""
+        return False
+
+
+class VirtualClock(Clock):
+    """
+    Simulated clock for rehearsals and tests.
+    
+    Simulated time runs `warp` times faster than real time: sleeping one
+    simulated second takes 1/warp real seconds. With warp INSTANT, sleeps
+    return immediately and jump the simulated time forward instead.
+    """
+    
+    def __init__(self, start: Optional[datetime] = None, warp: float = INSTANT):
+        """
+        Initialize virtual clock.
+        
+        Args:
+            start: Simulated date and time at creation (default: now)
+            warp: Speed-up factor over real time, or INSTANT
+        """
+        if warp < 0:
+            raise ValueError(f"Invalid time warp factor: {warp}")
+        
+        self.start = start or datetime.now()
+        self.warp = warp
+        self._real_start_ns = time.monotonic_ns()
+        self._jump_ns = 0
+        self._lock = threading.Lock()
+    
+    def _elapsed_ns(self) -> int:
+        """Simulated nanoseconds elapsed since creation."""
+        real_ns = time.monotonic_ns() - self._real_start_ns
+        if self.warp != INSTANT:
+            real_ns = int(real_ns * self.warp)
+        return real_ns + self._jump_ns
+    
+    def monotonic_ns(self) -> int:
+        """Get simulated monotonic time in nanoseconds."""
+        return self._real_start_ns + self._elapsed_ns()
+    
+    def time(self) -> float:
+        """Get simulated wall clock time in seconds since the epoch."""
+        return self.now().timestamp()
+    
+    def now(self) -> datetime:
+        """Get simulated local date and time."""
+        return self.start + timedelta(microseconds=self._elapsed_ns() // 1000)
+    
+    def sleep(self, seconds: float):
+        """Sleep for a simulated duration."""
+        if seconds <= 0:
+            return
+        
+        if self.warp != INSTANT:
+            time.sleep(seconds / self.warp)
+            return
+        
+        self.advance(seconds)
+    
+    async def async_sleep(self, seconds: float):
+        """Sleep for a simulated duration without blocking the event loop."""
+        if self.warp == INSTANT:
+            self.advance(max(0.0, seconds))
+            await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(max(0.0, seconds) / self.warp)
+    
+    def advance(self, seconds: float):
+        """Jump the simulated time forward without sleeping."""
+        with self._lock:
+            self._jump_ns += int(seconds * 1_000_000_000)
+    
+    @property
+    def is_virtual(self) -> bool:
+        """True if the clock does not follow real time."""
+        return True
+    
+    @property
+    def is_instant(self) -> bool:
+        """True if sleeping returns immediately."""
+        return self.warp == INSTANT
+
+
+SYSTEM_CLOCK = Clock()
@@ -20,17 +20,59 @@ TIME_REFERENCES = ['C1', 'C2', 'Max', 'C3', 'C4', '-']
 TIME_OPERATORS = ['+', '-']
 
 # Action types
-ACTION_TYPES = ['Photo', 'Boucle', 'Interval']
+ACTION_TYPES = ['Photo', 'Boucle', 'Interval', 'Burst', 'Bracket']
 
 # Camera validation thresholds
 MIN_BATTERY_LEVEL = 20  # percent
 MIN_FREE_SPACE_MB = 100  # megabytes
 MAX_CAPTURE_TIMEOUT = 30  # seconds
+CONFIG_CACHE_TTL = 5.0  # seconds a downloaded camera configuration tree is reused
+CAMERA_CONNECT_TIMEOUT = 15  # seconds a camera may take to connect during discovery
+CAMERA_COMMAND_TIMEOUT = 10  # seconds a camera may take to configure or report status
+CAPTURE_TARGET_RAM = "Internal RAM"  # capturetarget choice keeping images in the camera buffer
+CAPTURE_TARGET_CARD = "Memory card"  # capturetarget choice writing images to the card
+TRIGGER_BUSY_RETRIES = 20  # trigger attempts while a camera is still busy with the previous frame
+TRIGGER_BUSY_WAIT_MS = 10  # milliseconds spent draining events between busy trigger attempts
+FILE_COLLECT_TIMEOUT = 30  # seconds allowed at the end of a sequence for triggered frames to be written
+BURST_DRIVE_MODE = "Continuous high speed"  # drivemode choice used while a burst holds the release
+BURST_MAX_DURATION = 30  # seconds a burst given only a frame count may hold the release
+BURST_FLUSH_TIMEOUT = 10  # seconds allowed after a burst for the camera buffer to report its files
+BURST_SIMULATED_FPS = 10  # frame rate of simulated bursts in test mode
+BULB_SHUTTER = "bulb"  # shutterspeed value selecting bulb mode
+BULB_MIN_EXPOSURE = 1.0  # seconds from which an exposure off the preset speeds is timed by the host
+BULB_FILE_TIMEOUT = 30  # seconds allowed after a bulb exposure, on top of its dark frame, for the file
+BULB_ERROR_WARNING = 0.05  # bulb exposure error in seconds above which a shot is reported
 
 # Timing constraints
 MAX_WAIT_TIME = 24 * 3600  # 24 hours in seconds
+PASSED_TARGET_WINDOW = 6 * 3600  # seconds a time of day stays passed before it means tomorrow
+LATE_PLAN_TOLERANCE = 30  # seconds a compiled plan may start in the past before it is reported
 MIN_INTERVAL = 0.1  # minimum interval between captures in seconds
 DEFAULT_CHECK_INTERVAL = 0.25  # default time check interval in seconds
+MAX_CONCURRENT_SHOTS = 2  # shots in flight at once (on disjoint camera sets)
+SHOT_MERGE_WINDOW = 0.2  # seconds within which identical shots are merged
+PARKED_SHOT_POLL = 0.1  # seconds between stop checks while shots wait for busy cameras
+DEADLINE_SPIN_WINDOW = 0.002  # seconds of busy-wait before a deadline
+MAX_DEADLINE_SPIN_WINDOW = 0.005  # upper bound for the calibrated spin window
+LOOP_OVERRUN_TOLERANCE = 0.5  # fraction of the loop interval a shot may be late before overrunning
+REHEARSAL_LEAD_TIME = 10  # seconds between the start of a time-warped rehearsal and its first shot
+STATUS_POLL_INTERVAL = 30  # seconds between background camera status polls
+HEALTH_STATUS_TTL = 90  # seconds a polled camera status is served from the cache
+HEALTH_HOLD_OFF_POLL = 0.1  # seconds between checks while status polls are held off around triggers
+HOTPLUG_POLL_INTERVAL = 2.0  # seconds between USB camera scans looking for unplugged or returning cameras
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failed captures taking a camera out of the shots
+BREAKER_PROBE_INTERVAL = 10  # seconds between checks of cameras taken out after failed captures
+PROGRESS_LOG_INTERVAL = 60  # seconds between background progress reports
+BACKGROUND_GUARD_WINDOW = 2.0  # seconds before a trigger during which background work is held off
+RELEASE_SYNC_MARGIN = 0.002  # seconds cameras are staged ahead of a synchronized release
+RELEASE_SYNC_TIMEOUT = 0.5  # seconds a staged camera waits for the others before firing alone
+RELEASE_SKEW_WARNING = 0.005  # inter-camera release skew in seconds above which a shot is reported
+MLU_RAISE_LEAD = 0.25  # seconds allowed for the mirror-up command to reach every camera, until measured
+MLU_RAISE_LEAD_MAX = 1.0  # upper bound in seconds on the measured mirror-up command latency used as lead
+DOWNLOAD_QUEUE_SIZE = 64  # captured images waiting for download per camera
+DOWNLOAD_HOLD_OFF_POLL = 0.1  # seconds between checks while downloads are held off around triggers
+DOWNLOAD_DRAIN_TIMEOUT = 300  # seconds allowed at the end of a sequence to finish pending downloads
+CAPABILITY_CACHE_DIR = "~/.cache/eclipse_oz/capabilities"  # probed camera capabilities, one file per body
 
 # Eclipse timing constraints (for validation)
 MAX_TOTALITY_DURATION = 7 * 60 + 32  # Maximum possible totality ~7m32s in seconds
@@ -92,5 +134,7 @@ CONFIG_FIELD_COUNTS = {
     'Photo': 13,    # Photo,time_ref,op,time,_,_,_,_,_,aperture,iso,shutter,mlu
     'Boucle': 13,   # Boucle,time_ref,op,start,op,end,interval,_,_,aperture,iso,shutter,mlu
     'Interval': 13, # Interval,time_ref,op,start,op,end,count,_,_,aperture,iso,shutter,mlu
+    'Burst': 13,    # Burst,time_ref,op,start,op,end,frames,_,_,aperture,iso,shutter,mlu
+    'Bracket': 13,  # Bracket,time_ref,op,time,_,_,count,step_ev,_,aperture,iso,base_shutter,mlu
     'Verif': 5      # Verif,battery,storage,mode,af (simplified)
 }
\ No newline at end of file
@@ -9,10 +9,9 @@ import logging
 import platform
 import shutil
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
 
 from config.eclipse_config import SystemConfig, VerificationConfig, CameraStatus
-from hardware.multi_camera_manager import MultiCameraManager
 from .constants import MIN_BATTERY_LEVEL, MIN_FREE_SPACE_MB, ERROR_MESSAGES
 
 
@@ -21,6 +20,12 @@ class ValidationError(Exception):
     pass
 
 
+if TYPE_CHECKING:
+    # Imported for annotations only: hardware modules import utils.clock
+    from hardware.multi_camera_manager import MultiCameraManager
+    from scheduling.shot_plan import ShotPlan
+
+
 class SystemValidator:
     """
     System and hardware validation utilities.
@@ -63,7 +68,7 @@ class SystemValidator:
         
         return overall_result
     
-    def validate_cameras(self, camera_manager: MultiCameraManager, 
+    def validate_cameras(self, camera_manager: 'MultiCameraManager', 
                         verification_config: Optional[VerificationConfig] = None) -> bool:
         """
         Validate camera readiness for photography.
@@ -128,6 +133,36 @@ class SystemValidator:
         
         return all_cameras_ready
     
+    def validate_plan_settings(self, camera_manager: 'MultiCameraManager', plan: 'ShotPlan') -> bool:
+        """
+        Validate that every camera supports the settings the plan will apply.
+        
+        The check uses the capabilities found when the cameras connected, so
+        it runs before the event without any camera access; cameras whose
+        capabilities are unknown accept everything.
+        
+        Args:
+            camera_manager: Multi-camera manager instance
+            plan: Compiled shot plan
+        
+        Returns:
+            True if no camera refuses a planned setting, False otherwise
+        """
+        refused: Dict[int, List[str]] = {}
+        for event in plan:
+            for camera_id, values in camera_manager.unsupported_settings(event.settings_used,
+                                                                         event.camera_ids).items():
+                camera_refused = refused.setdefault(camera_id, [])
+                camera_refused.extend(value for value in values if value not in camera_refused)
+        
+        for camera_id, values in refused.items():
+            self.logger.error(f"{camera_manager.cameras[camera_id].name} does not support "
+                              f"{', '.join(values)}")
+        
+        if not refused:
+            self.logger.info("All planned settings supported by the cameras")
+        return not refused
+    
     def validate_configuration(self, config: SystemConfig) -> bool:
         """
         Validate eclipse configuration.